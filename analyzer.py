@@ -16,7 +16,6 @@ Technical: Main analysis engine with multiprocessing support
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from collections import defaultdict
 from concurrent.futures import ProcessPoolExecutor, as_completed
 import multiprocessing as mp
 import time
@@ -35,8 +34,14 @@ from config import (
     get_all_configs, get_output_dirs, THEME, MAX_MEMORY_GB
 )
 from data_loader import resample_to_ohlc
+from ohlc_cache import default_ohlc_cache
 from features_core import extract_core_features
 from features_advanced import extract_advanced_features
+from features_sliding import SlidingWindowFeatures
+from feature_table import (
+    build_feature_table, grouped_feature_stats, grouped_pattern_counts,
+    SIGNATURE_FEATURES
+)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -64,7 +69,7 @@ def classify_movement(pips_change):
     return "Muito Grande", direction
 
 
-def get_movement_targets(ohlc_df, lookback):
+def get_movement_targets(ohlc_df, lookback, include_window_data=True):
     """
     Find all movement targets in OHLC data (Target Acquisition)
     Technical: Identify price movements and their preceding patterns
@@ -72,6 +77,9 @@ def get_movement_targets(ohlc_df, lookback):
     Args:
         ohlc_df:  OHLC DataFrame
         lookback: Number of candles to look back
+        include_window_data: Attach a copy of each lookback window; callers
+            that extract features with SlidingWindowFeatures only need
+            the target index
         
     Returns: 
         dict:  Targets organized by level and direction
@@ -94,15 +102,15 @@ def get_movement_targets(ohlc_df, lookback):
         window_start = i - lookback
         window_end = i
         
-        window_data = ohlc_df.iloc[window_start:window_end]. copy()
-        
-        if len(window_data) >= MIN_SAMPLES:
-            targets[level][direction].append({
+        if window_end - window_start >= MIN_SAMPLES:
+            target = {
                 "index": i,
                 "timestamp": ohlc_df.iloc[i]["timestamp"],
                 "movement_pips": float(current_pips),
-                "window_data": window_data
-            })
+            }
+            if include_window_data:
+                target["window_data"] = ohlc_df.iloc[window_start:window_end].copy()
+            targets[level][direction].append(target)
     
     return targets
 
@@ -230,6 +238,9 @@ def create_pattern_signature(features, n_bins=5):
     Create a pattern signature from features (Crystal Signature)
     Technical: Discretize features into a pattern string
     
+    Single-window version of feature_table.SignatureCodec, which encodes
+    whole feature tables at once as integer codes.
+    
     Args:
         features: Feature dictionary
         n_bins: Number of bins for discretization
@@ -241,10 +252,7 @@ def create_pattern_signature(features, n_bins=5):
         return "UNKNOWN"
     
     # Key features for signature
-    key_features = [
-        "dfa_alpha", "hurst", "d1_mean", "stat_trend_slope",
-        "ohlc_up_ratio", "photon_efficiency"
-    ]
+    key_features = SIGNATURE_FEATURES
     
     signature_parts = []
     
@@ -271,7 +279,7 @@ def create_pattern_signature(features, n_bins=5):
 # 🌌 UNIVERSE PROCESSING (Dimensional Analysis)
 # ═══════════════════════════════════════════════════════════════
 
-def process_universe(df, interval, lookback, universe_name):
+def process_universe(df, interval, lookback, universe_name, bars=None):
     """
     Process a single universe (Dimensional Creation)
     Technical: Complete analysis for one interval/lookback configuration
@@ -281,6 +289,8 @@ def process_universe(df, interval, lookback, universe_name):
         interval: Candle interval in minutes
         lookback:  Lookback period in candles
         universe_name: Name for this universe
+        bars: Optional universe_scheduler.IntervalBars with the interval's
+            candles and movement targets (shared across lookbacks)
         
     Returns: 
         dict: Universe analysis results
@@ -290,8 +300,7 @@ def process_universe(df, interval, lookback, universe_name):
     results = {
         level: {direction: {
             "total_occurrences": 0,
-            "patterns": defaultdict(lambda: {"count": 0, "features": []}),
-            "all_features": [],
+            "patterns": {},
             "feature_stats": {},
             "debug_stats": {"targets_found": 0, "features_extracted": 0, "features_failed": 0}
         } for direction in DIRECTIONS}
@@ -299,14 +308,33 @@ def process_universe(df, interval, lookback, universe_name):
     }
     
     try:
-        # Resample to OHLC
-        ohlc = resample_to_ohlc(df, interval)
+        # Resample to OHLC (bars shared across universes with the same interval)
+        if bars is not None:
+            ohlc = bars.ohlc
+        else:
+            ohlc = resample_to_ohlc(df, interval, cache=default_ohlc_cache())
         
         if len(ohlc) < lookback + 10:
             return None
         
         # Find targets
-        targets = get_movement_targets(ohlc, lookback)
+        if bars is not None:
+            targets = bars.targets(lookback)
+        else:
+            targets = get_movement_targets(ohlc, lookback, include_window_data=False)
+        
+        # Window features slide over the series; each window is extracted once
+        window_features = SlidingWindowFeatures(ohlc, lookback)
+        window_features.prefetch(
+            target["index"]
+            for level_targets in targets.values()
+            for target_list in level_targets.values()
+            for target in target_list
+        )
+        
+        # One feature table row per extracted target (signatures are
+        # encoded for the whole table afterwards)
+        records, levels, directions, indices = [], [], [], []
         
         # Process each level and direction
         for level in MOVEMENT_LEVELS.keys():
@@ -321,32 +349,27 @@ def process_universe(df, interval, lookback, universe_name):
                 
                 # Extract features for each target
                 for target in target_list:
-                    features = extract_window_features(target["window_data"])
+                    features = window_features.features(target["index"])
                     
                     if features:
-                        # Store features
-                        results[level][direction]["all_features"].append(features)
+                        records.append(features)
+                        levels.append(level)
+                        directions.append(direction)
+                        indices.append(target["index"])
                         results[level][direction]["debug_stats"]["features_extracted"] += 1
-                        
-                        # Create pattern signature
-                        signature = create_pattern_signature(features)
-                        results[level][direction]["patterns"][signature]["count"] += 1
-                        results[level][direction]["patterns"][signature]["features"].append(features)
                     else:
                         results[level][direction]["debug_stats"]["features_failed"] += 1
         
-        # Calculate feature statistics
-        for level in MOVEMENT_LEVELS.keys():
-            for direction in DIRECTIONS:
-                all_feats = results[level][direction]["all_features"]
-                
-                if all_feats: 
-                    results[level][direction]["feature_stats"] = calculate_feature_stats(all_feats)
+        feature_table = build_feature_table(records, levels, directions, indices)
+        del records, window_features
         
-        # Convert defaultdicts to regular dicts
-        for level in results: 
-            for direction in results[level]:
-                results[level][direction]["patterns"] = dict(results[level][direction]["patterns"])
+        # Pattern counts and feature statistics per level/direction
+        for (level, direction), counts in grouped_pattern_counts(feature_table).items():
+            results[level][direction]["patterns"] = {
+                signature: {"count": count} for signature, count in counts.items()
+            }
+        for (level, direction), stats in grouped_feature_stats(feature_table).items():
+            results[level][direction]["feature_stats"] = stats
         
     except Exception as e:
         print(f"   ❌ Error in universe {universe_name}: {e}")
@@ -355,10 +378,9 @@ def process_universe(df, interval, lookback, universe_name):
     universe_time = time.time() - universe_start
 
     # Extract metadata from OHLC
-    ohlc_dict = ohlc.to_dict("records") if len(ohlc) > 0 else []
-    start_date = str(ohlc_dict[0]["timestamp"]) if len(ohlc_dict) > 0 else ""
-    end_date = str(ohlc_dict[-1]["timestamp"]) if len(ohlc_dict) > 0 else ""
-    total_candles = len(ohlc_dict)
+    start_date = str(ohlc["timestamp"].iloc[0]) if len(ohlc) > 0 else ""
+    end_date = str(ohlc["timestamp"].iloc[-1]) if len(ohlc) > 0 else ""
+    total_candles = len(ohlc)
 
     
     return {
@@ -370,7 +392,8 @@ def process_universe(df, interval, lookback, universe_name):
             results[l][d]["total_occurrences"]
             for l in results for d in results[l]
         ),
-        "ohlc_data":  ohlc_dict,
+        "features": feature_table,
+        "ohlc": ohlc,
         "metadata": {
             "start_date": start_date,
             "end_date":   end_date,
@@ -381,33 +404,6 @@ def process_universe(df, interval, lookback, universe_name):
     }
 
 
-def calculate_feature_stats(feature_list):
-    """
-    Calculate statistics for a list of feature dictionaries
-    Technical: Aggregate feature statistics across multiple samples
-    """
-    if not feature_list:
-        return {}
-    
-    stats = {}
-    
-    # Get all feature names
-    all_keys = set()
-    for f in feature_list:
-        all_keys.update(f.keys())
-    
-    for key in all_keys:
-        values = [f[key] for f in feature_list if key in f and isinstance(f[key], (int, float))]
-        
-        if values:
-            stats[f"{key}_mean"] = float(np.mean(values))
-            stats[f"{key}_std"] = float(np.std(values))
-            stats[f"{key}_min"] = float(np.min(values))
-            stats[f"{key}_max"] = float(np.max(values))
-    
-    return stats
-
-
 # ═══════════════════════════════════════════════════════════════
 # ⚡ PARALLEL PROCESSING (Photon Burst Mode)
 # ═══════════════════════════════════════════════════════════════
@@ -417,8 +413,19 @@ def process_universe_wrapper(args):
     Wrapper for multiprocessing (Photon Clone)
     Technical:  Unpack arguments for process_universe
     """
-    df, interval, lookback, universe_name = args
-    return process_universe(df, interval, lookback, universe_name)
+    df, interval, lookback, universe_name = args[:4]
+    if df is None:
+        # Attached to the parent's shared tick store (see _run_parallel)
+        from tick_store import get_worker_dataframe
+        df = get_worker_dataframe()
+    
+    # Scheduled tasks carry their interval group's base lookback: candles
+    # and targets are built once per interval in each worker
+    bars = None
+    if len(args) > 4 and args[4] is not None:
+        from universe_scheduler import get_interval_bars
+        bars = get_interval_bars(df, interval, args[4])
+    return process_universe(df, interval, lookback, universe_name, bars=bars)
 
 
 class UltraNecrozmaAnalyzer:
@@ -647,8 +654,17 @@ class UltraNecrozmaAnalyzer:
             has_psutil = False
             print("⚠️  psutil not available - CPU/RAM monitoring disabled")
         
-        for i, config in enumerate(self.configs, 1):
+        # Universes of one interval run back to back and share its candles
+        # and movement targets; the shared bars are released after the group
+        from universe_scheduler import group_by_interval, get_interval_bars, release_interval_bars
+        groups = group_by_interval(self.configs)
+        ordered_configs = [config for group in groups.values() for config in group]
+        
+        for i, config in enumerate(ordered_configs, 1):
             universe_name = config['name']
+            group = groups[int(config["interval"])]
+            if config is group[0]:
+                release_interval_bars()
             print(f"\n🌌 [{i}/{len(self.configs)}] Processing {universe_name}...", flush=True)
             
             # Check if universe already exists
@@ -682,11 +698,18 @@ class UltraNecrozmaAnalyzer:
                 continue
             
             # Universe doesn't exist, process it
+            try:
+                bars = get_interval_bars(self.df, config["interval"], group[0]["lookback"])
+            except Exception as e:
+                print(f"   ⚠️ Shared {config['interval']}min bars unavailable ({e}), resampling...", flush=True)
+                bars = None
+            
             result = process_universe(
                 self.df,
                 config["interval"],
                 config["lookback"],
-                universe_name
+                universe_name,
+                bars=bars
             )
             
             if result:
@@ -742,6 +765,8 @@ class UltraNecrozmaAnalyzer:
                         print(f"   💾 RAM after cleanup: {mem_after:.1f}GB\n", flush=True)
                     else:
                         gc.collect()
+        
+        release_interval_bars()
     
     def _run_parallel(self):
         """Run analysis in parallel (Photon Burst Mode)"""
@@ -790,71 +815,101 @@ class UltraNecrozmaAnalyzer:
             print("\n   ✅ All universes already exist in cache!")
             return
         
-        # Prepare arguments for universes that need processing
-        args_list = [
-            (self.df, config["interval"], config["lookback"], config["name"])
-            for config in configs_to_process
-        ]
-        
-        completed = 0
+        # Publish ticks once in shared memory; workers attach by name instead
+        # of receiving a pickled copy of the DataFrame with every task
+        from tick_store import SharedTickStore, init_worker_store
+        pool_kwargs = {}
+        tick_store = None
+        try:
+            tick_store = SharedTickStore.create(self.df)
+            pool_kwargs = {"initializer": init_worker_store, "initargs": (tick_store.name,)}
+            print(f"   💎 Shared tick store: {tick_store.name} ({len(tick_store):,} rows)")
+        except Exception as e:
+            print(f"   ⚠️  Shared tick store unavailable ({e}), sending data to each worker")
         
-        # Use ProcessPoolExecutor for parallel processing
-        with ProcessPoolExecutor(max_workers=NUM_WORKERS) as executor:
-            # Submit all tasks
-            future_to_config = {
-                executor.submit(process_universe_wrapper, args): args[3]
-                for args in args_list
-            }
+        try:
+            # Bars of every interval from one tick scan; the longest universes
+            # are queued first so short ones fill the pool at the end
+            from universe_scheduler import schedule_universes, warm_bars
+            bar_counts = {}
+            try:
+                bar_counts = warm_bars(self.df, sorted({c["interval"] for c in configs_to_process}))
+                if bar_counts:
+                    print(f"   🕐 OHLC bars ready for {len(bar_counts)} intervals (one tick scan)")
+            except Exception as e:
+                print(f"   ⚠️  OHLC pre-build failed ({e}), workers will resample")
+            scheduled = schedule_universes(configs_to_process, bar_counts)
             
-            # Process completed tasks
-            for future in as_completed(future_to_config):
-                universe_name = future_to_config[future]
-                completed += 1
+            # Prepare arguments for universes that need processing
+            task_df = None if tick_store is not None else self.df
+            args_list = [
+                (task_df, config["interval"], config["lookback"], config["name"], config["base_lookback"])
+                for config in scheduled
+            ]
+            
+            completed = 0
+            
+            # Use ProcessPoolExecutor for parallel processing
+            with ProcessPoolExecutor(max_workers=NUM_WORKERS, **pool_kwargs) as executor:
+                # Submit all tasks
+                future_to_config = {
+                    executor.submit(process_universe_wrapper, args): args[3]
+                    for args in args_list
+                }
                 
-                try:
-                    result = future. result()
+                # Process completed tasks
+                for future in as_completed(future_to_config):
+                    universe_name = future_to_config[future]
+                    completed += 1
                     
-                    if result:
-                        self.results[universe_name] = result
-                        self.universes_processed += 1
-                        self.total_patterns += result["total_patterns"]
+                    try:
+                        result = future. result()
                         
-                        print(f"   ✅ [{completed}/{len(configs_to_process)}] {universe_name}:  "
-                              f"{result['total_patterns']} patterns ({result['processing_time']:.1f}s)")
-                    else:
-                        print(f"   ⚠️ [{completed}/{len(configs_to_process)}] {universe_name}: No results")
-                    
-                except Exception as e: 
-                    print(f"   ❌ [{completed}/{len(configs_to_process)}] {universe_name}: Error - {e}")
-                
-                self.evolve()
-                
-                # Progress update and checkpoint
-                if completed % 5 == 0 or completed == len(self.configs):
-                    progress = completed / len(self.configs) * 100
-                    print(f"\n   📊 Progress: {progress:.1f}% | "
-                          f"Evolution: {self.evolution_stage} | "
-                          f"Power: {self.light_power:.1f}%\n")
+                        if result:
+                            self.results[universe_name] = result
+                            self.universes_processed += 1
+                            self.total_patterns += result["total_patterns"]
+                            
+                            print(f"   ✅ [{completed}/{len(configs_to_process)}] {universe_name}:  "
+                                  f"{result['total_patterns']} patterns ({result['processing_time']:.1f}s)")
+                        else:
+                            print(f"   ⚠️ [{completed}/{len(configs_to_process)}] {universe_name}: No results")
+                        
+                    except Exception as e: 
+                        print(f"   ❌ [{completed}/{len(configs_to_process)}] {universe_name}: Error - {e}")
                     
-                    # Send Telegram notification
-                    if self.lore_system:
-                        try:
-                            from lore import EventType
-                            self.lore_system.broadcast(
-                                EventType.UNIVERSE_PROGRESS,
-                                percentage=f"{progress:.0f}",
-                                completed=completed,
-                                total=len(self.configs),
-                                total_patterns=f"{self.total_patterns:,}",
-                                current_evolution=self.evolution_stage,
-                                power=f"{self.light_power:.1f}"
-                            )
-                        except Exception as e:
-                            # Don't crash if notification fails
-                            pass
+                    self.evolve()
                     
-                    self._save_checkpoint(completed)
-                    gc.collect()
+                    # Progress update and checkpoint
+                    if completed % 5 == 0 or completed == len(self.configs):
+                        progress = completed / len(self.configs) * 100
+                        print(f"\n   📊 Progress: {progress:.1f}% | "
+                              f"Evolution: {self.evolution_stage} | "
+                              f"Power: {self.light_power:.1f}%\n")
+                        
+                        # Send Telegram notification
+                        if self.lore_system:
+                            try:
+                                from lore import EventType
+                                self.lore_system.broadcast(
+                                    EventType.UNIVERSE_PROGRESS,
+                                    percentage=f"{progress:.0f}",
+                                    completed=completed,
+                                    total=len(self.configs),
+                                    total_patterns=f"{self.total_patterns:,}",
+                                    current_evolution=self.evolution_stage,
+                                    power=f"{self.light_power:.1f}"
+                                )
+                            except Exception as e:
+                                # Don't crash if notification fails
+                                pass
+                        
+                        self._save_checkpoint(completed)
+                        gc.collect()
+        finally:
+            # Unlink even when a worker fails or the run is interrupted
+            if tick_store is not None:
+                tick_store.unlink()
     
     def _save_checkpoint(self, step):
         """Save checkpoint (Dimensional Anchor)"""
@@ -898,7 +953,7 @@ class UltraNecrozmaAnalyzer:
             for level in result["results"]:
                 for direction in result["results"][level]: 
                     level_data = result["results"][level][direction]
-                    total_features += len(level_data. get("all_features", []))
+                    total_features += level_data.get("debug_stats", {}).get("features_extracted", 0)
                     
                     # Count patterns with multiple occurrences
                     for pattern, data in level_data. get("patterns", {}).items():
@@ -989,7 +1044,7 @@ class UltraNecrozmaAnalyzer:
                 
                 if use_parquet:
                     # Save as Parquet
-                    self._save_universe_parquet(name, result_simplified)
+                    self._save_universe_parquet(name, result_simplified, result.get("features"))
                 else:
                     # Save as JSON (legacy)
                     universe_file = self.output_dirs["universes"] / f"{config.FILE_PREFIX}{name}.json"
@@ -1020,13 +1075,16 @@ class UltraNecrozmaAnalyzer:
             "summary_file": str(summary_file)
         }
     
-    def _save_universe_parquet(self, name: str, result_simplified: dict):
+    def _save_universe_parquet(self, name: str, result_simplified: dict, feature_table=None):
         """
         Save universe result as Parquet with metadata sidecar
         
         Args:
             name: Universe name
             result_simplified: Simplified result dictionary
+            feature_table: Optional per-target feature table (feature_table
+                module), saved as features/{name}.parquet next to the
+                universe files
         """
         from config import STORAGE_CONFIG
         
@@ -1076,16 +1134,28 @@ class UltraNecrozmaAnalyzer:
                 metadata_file = self.output_dirs["universes"] / f"{config.FILE_PREFIX}{name}_metadata.json"
                 with open(metadata_file, "w") as f:
                     json.dump(metadata, f, indent=2, default=str)
+        
+        # Per-target features, one column per feature
+        if (
+            STORAGE_CONFIG.get("save_feature_table", True)
+            and feature_table is not None and not feature_table.empty
+        ):
+            compression = STORAGE_CONFIG.get("compression", "snappy")
+            features_dir = self.output_dirs["universes"] / "features"
+            features_dir.mkdir(parents=True, exist_ok=True)
+            features_file = features_dir / f"{config.FILE_PREFIX}{name}.parquet"
+            feature_table.to_parquet(features_file, compression=compression, index=False)
     
     def _simplify_result(self, result):
         """Simplify result for JSON serialization"""
+        ohlc = result.get("ohlc")
         simplified = {
             "name": result["name"],
             "config": result["config"],
             "processing_time": result["processing_time"],
             "total_patterns":  result["total_patterns"],
             "results": {},
-            "ohlc_data":  result.get("ohlc_data", []),
+            "ohlc_data": ohlc.to_dict("records") if ohlc is not None else result.get("ohlc_data", []),
             "metadata": result.get("metadata", {}),
         }
         
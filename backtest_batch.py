@@ -25,6 +25,7 @@ from strategy_factory import StrategyFactory
 from backtester import Backtester
 from config import PARQUET_FILE, STRATEGY_TEMPLATES, STRATEGY_PARAMS
 from batch_utils import prepare_features
+from tick_store import SharedTickStore
 
 
 class BatchProgressTracker:
@@ -140,6 +141,13 @@ def parse_arguments():
         help="Path to input parquet data file (overrides config)"
     )
     
+    parser.add_argument(
+        "--shm-store",
+        type=str,
+        default=None,
+        help="Name of a shared tick store to attach to instead of loading the parquet"
+    )
+    
     parser.add_argument(
         "--batch-number",
         type=int,
@@ -177,10 +185,15 @@ def main():
     mem_start = process.memory_info().rss / (1024 ** 3)  # GB
     
     try:
-        # Step 1: Load data
-        print(f"\n📊 Loading data from: {parquet_path}")
+        # Step 1: Load data (or attach to the parent's shared tick store)
         load_start = time.time()
-        df = load_crystal(parquet_path)
+        if args.shm_store:
+            print(f"\n📊 Attaching to shared tick store: {args.shm_store}")
+            tick_store = SharedTickStore.attach(args.shm_store)
+            df = tick_store.to_dataframe()
+        else:
+            print(f"\n📊 Loading data from: {parquet_path}")
+            df = load_crystal(parquet_path)
         load_time = time.time() - load_start
         print(f"   ✅ Loaded {len(df):,} rows in {load_time:.1f}s")
         
@@ -223,25 +236,23 @@ def main():
         backtester = Backtester()
         results = {}
         
-        # Process each strategy with progress updates
+        # Process each strategy with progress updates; SL/TP variants that
+        # share signals are simulated together (see Backtester.backtest_group)
         print()  # Newline before progress starts
-        for strategy in batch_strategies:
-            # Update progress before processing
-            progress.update(strategy.name)
+        outcomes = backtester.iter_strategy_results(batch_strategies, df, n_workers=1)
+        for name, strategy_results, error in outcomes:
+            progress.update(name)
             
-            try:
-                # Backtest the strategy (returns dict of {lot_size: BacktestResults})
-                strategy_results = backtester.backtest(strategy, df)
-                
-                # Store results
-                results[strategy.name] = strategy_results
-                
-            except Exception as e:
+            if error is not None:
                 # Clear progress line before printing error, then restore it
                 BatchProgressTracker.clear_progress_line()
-                print(f"   ⚠️  Strategy '{strategy.name}' failed: {e}")
+                print(f"   ⚠️  Strategy '{name}' failed: {error}")
                 # Restore progress line (last printed progress)
                 progress.reprint_current()
+                continue
+            
+            # Store results (dict of {lot_size: BacktestResults})
+            results[name] = strategy_results
         
         # Finish progress tracking
         progress.finish()
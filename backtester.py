@@ -18,8 +18,11 @@ Features:
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional
+from dataclasses import dataclass, field, fields, replace
+import importlib
+import inspect
+import json
 import warnings
 import time
 from datetime import datetime, timedelta
@@ -27,10 +30,14 @@ from datetime import datetime, timedelta
 warnings.filterwarnings("ignore")
 
 from config import BACKTEST_CONFIG, MONTE_CARLO_CONFIG, METRIC_THRESHOLDS
+from utils.caching import SignalCache, dataframe_fingerprint
+
+if TYPE_CHECKING:
+    from strategy_templates.base import Strategy
 
 # Try to import Numba for JIT acceleration
 try:
-    from numba import njit
+    from numba import njit, prange
     NUMBA_AVAILABLE = True
 except ImportError:
     NUMBA_AVAILABLE = False
@@ -43,6 +50,7 @@ except ImportError:
         if args and callable(args[0]):
             return args[0]
         return decorator
+    prange = range
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -65,6 +73,12 @@ DEFAULT_PIP_DECIMAL_PLACES = 4
 DEFAULT_LOT_SIZES = [0.01, 0.1, 1.0]  # micro, mini, standard
 DEFAULT_COMMISSION_PER_LOT = 0.05  # $0.05 per side per standard lot
 
+# Memory budget for shared signal series (0 disables the cache)
+DEFAULT_SIGNAL_CACHE_MB = 256
+
+# Worker processes for test_strategies (1 = in-process)
+DEFAULT_BACKTEST_WORKERS = 1
+
 
 # ═══════════════════════════════════════════════════════════════
 # ⚡ NUMBA JIT TRADE SIMULATION
@@ -186,6 +200,358 @@ def _simulate_trades_numba(
     )
 
 
+@njit(cache=True)
+def _walk_trades_numba(
+    signals: np.ndarray,
+    bid_prices: np.ndarray,
+    ask_prices: np.ndarray,
+    stop_loss_pips: float,
+    take_profit_pips: float,
+    pip_value: float,
+    write: bool,
+    offset: int,
+    entry_indices: np.ndarray,
+    exit_indices: np.ndarray,
+    entry_prices: np.ndarray,
+    exit_prices: np.ndarray,
+    trade_pips: np.ndarray,
+    trade_types: np.ndarray,
+    exit_reasons: np.ndarray
+) -> int:
+    """
+    Walk one signal series with a single (SL, TP) pair.
+    
+    Same execution rules as _simulate_trades_numba, but results are kept in
+    pips (lot-independent). With write=False only the trade count is
+    returned, so callers can size the output arrays before the real pass.
+    """
+    n = len(signals)
+    trade_count = 0
+    in_position = False
+    entry_price = 0.0
+    entry_idx = 0
+    position_type = 0
+    
+    for i in range(n):
+        if in_position:
+            if position_type == 1:  # Long
+                exit_price = bid_prices[i]
+                pips = (exit_price - entry_price) / pip_value
+            else:  # Short
+                exit_price = ask_prices[i]
+                pips = (entry_price - exit_price) / pip_value
+            
+            should_exit = False
+            exit_reason = 0
+            final_pips = pips
+            
+            if pips <= -stop_loss_pips:
+                should_exit = True
+                exit_reason = 0  # stop_loss
+                final_pips = -stop_loss_pips
+            elif pips >= take_profit_pips:
+                should_exit = True
+                exit_reason = 1  # take_profit
+                final_pips = take_profit_pips
+            elif (position_type == 1 and signals[i] == -1) or \
+                 (position_type == -1 and signals[i] == 1):
+                should_exit = True
+                exit_reason = 2  # signal
+                final_pips = pips
+            
+            if should_exit:
+                if write:
+                    k = offset + trade_count
+                    entry_indices[k] = entry_idx
+                    exit_indices[k] = i
+                    entry_prices[k] = entry_price
+                    exit_prices[k] = exit_price
+                    trade_pips[k] = final_pips
+                    trade_types[k] = position_type
+                    exit_reasons[k] = exit_reason
+                trade_count += 1
+                in_position = False
+        
+        if not in_position and signals[i] != 0:
+            in_position = True
+            position_type = signals[i]
+            entry_idx = i
+            if position_type == 1:
+                entry_price = ask_prices[i]
+            else:
+                entry_price = bid_prices[i]
+    
+    return trade_count
+
+
+@njit(cache=True, parallel=True)
+def _simulate_trades_batch_numba(
+    signals: np.ndarray,      # int8: 1=buy, -1=sell, 0=neutral
+    bid_prices: np.ndarray,   # float64
+    ask_prices: np.ndarray,   # float64
+    sl_tp_pairs: np.ndarray,  # float64 (n_combos, 2): [stop_loss_pips, take_profit_pips]
+    lot_sizes: np.ndarray,    # float64 (n_lots,)
+    pip_value: float,         # 0.0001 for EUR/USD
+    pip_value_per_lot: float, # $10 per pip per standard lot
+    commission_per_lot: float
+) -> tuple:
+    """
+    Simulate many (SL, TP) combinations and lot sizes in one parallel call.
+    
+    Each (SL, TP) pair is walked once over the bid/ask arrays (in parallel
+    with prange); lot size only scales PnL linearly, so it is applied to the
+    per-trade pips afterwards instead of re-running the simulation.
+    
+    Trades of combo c live in the flat arrays at
+    [trade_offsets[c], trade_offsets[c + 1]).
+    
+    Returns:
+        tuple: (trade_offsets, entry_indices, exit_indices, entry_prices,
+                exit_prices, trade_pips, trade_types, exit_reasons,
+                gross_pnls, net_pnls, commissions)
+                gross_pnls/net_pnls are (n_trades, n_lots), commissions is
+                the round-trip commission per trade for each lot (n_lots,).
+    """
+    n_combos = sl_tp_pairs.shape[0]
+    n_lots = len(lot_sizes)
+    
+    # Pass 1: count trades per combo to size the flat output arrays
+    counts = np.zeros(n_combos, dtype=np.int64)
+    empty_i64 = np.zeros(0, dtype=np.int64)
+    empty_f64 = np.zeros(0, dtype=np.float64)
+    empty_i8 = np.zeros(0, dtype=np.int8)
+    for c in prange(n_combos):
+        counts[c] = _walk_trades_numba(
+            signals, bid_prices, ask_prices,
+            sl_tp_pairs[c, 0], sl_tp_pairs[c, 1], pip_value,
+            False, 0,
+            empty_i64, empty_i64, empty_f64, empty_f64, empty_f64,
+            empty_i8, empty_i8
+        )
+    
+    trade_offsets = np.zeros(n_combos + 1, dtype=np.int64)
+    for c in range(n_combos):
+        trade_offsets[c + 1] = trade_offsets[c] + counts[c]
+    total = trade_offsets[n_combos]
+    
+    entry_indices = np.zeros(total, dtype=np.int64)
+    exit_indices = np.zeros(total, dtype=np.int64)
+    entry_prices = np.zeros(total, dtype=np.float64)
+    exit_prices = np.zeros(total, dtype=np.float64)
+    trade_pips = np.zeros(total, dtype=np.float64)
+    trade_types = np.zeros(total, dtype=np.int8)
+    exit_reasons = np.zeros(total, dtype=np.int8)
+    
+    # Pass 2: fill each combo's slice (disjoint ranges, safe in parallel)
+    for c in prange(n_combos):
+        _walk_trades_numba(
+            signals, bid_prices, ask_prices,
+            sl_tp_pairs[c, 0], sl_tp_pairs[c, 1], pip_value,
+            True, trade_offsets[c],
+            entry_indices, exit_indices, entry_prices, exit_prices,
+            trade_pips, trade_types, exit_reasons
+        )
+    
+    # Scale pips to USD for every lot size
+    gross_pnls = np.zeros((total, n_lots), dtype=np.float64)
+    net_pnls = np.zeros((total, n_lots), dtype=np.float64)
+    commissions = np.zeros(n_lots, dtype=np.float64)
+    for l in range(n_lots):
+        pip_value_usd = pip_value_per_lot * lot_sizes[l]
+        commission = 2 * commission_per_lot * lot_sizes[l]  # Entry + exit
+        commissions[l] = commission
+        for k in prange(total):
+            gross = trade_pips[k] * pip_value_usd
+            gross_pnls[k, l] = gross
+            net_pnls[k, l] = gross - commission
+    
+    return (
+        trade_offsets,
+        entry_indices,
+        exit_indices,
+        entry_prices,
+        exit_prices,
+        trade_pips,
+        trade_types,
+        exit_reasons,
+        gross_pnls,
+        net_pnls,
+        commissions
+    )
+
+
+# ═══════════════════════════════════════════════════════════════
+# 📐 NUMBA JIT PERFORMANCE METRICS
+# ═══════════════════════════════════════════════════════════════
+
+# Output order of _compute_metrics_numba
+METRIC_FIELDS = (
+    "n_trades", "win_rate", "profit_factor", "total_return",
+    "sharpe_ratio", "sortino_ratio", "calmar_ratio", "max_drawdown",
+    "avg_win", "avg_loss", "largest_win", "largest_loss",
+    "expectancy", "recovery_factor", "ulcer_index",
+    "max_consecutive_wins", "max_consecutive_losses",
+)
+METRIC_COUNT = len(METRIC_FIELDS)
+
+
+@njit(cache=True)
+def _compute_metrics_numba(pnl: np.ndarray, initial_capital: float,
+                           risk_free_rate: float, annualization: float) -> np.ndarray:
+    """
+    Every performance metric of a trade PnL sequence
+    
+    Two passes over pnl and no intermediate arrays: the first accumulates
+    win/loss stats, streaks, the mean return and the equity walk (running
+    peak, drawdown, squared drawdown); the second computes the sample
+    standard deviations for Sharpe and Sortino.
+    
+    Args:
+        pnl: Net PnL per trade in account currency
+        initial_capital: Starting equity
+        risk_free_rate: Per-trade risk-free return subtracted from pnl
+        annualization: Factor applied to Sharpe/Sortino (sqrt of periods)
+        
+    Returns:
+        float64 array ordered as METRIC_FIELDS
+    """
+    out = np.zeros(METRIC_COUNT, dtype=np.float64)
+    n = len(pnl)
+    if n == 0:
+        return out
+    
+    n_wins = 0
+    n_losses = 0
+    total_profit = 0.0
+    total_loss = 0.0
+    largest_win = 0.0
+    largest_loss = 0.0
+    win_streak = 0
+    loss_streak = 0
+    max_win_streak = 0
+    max_loss_streak = 0
+    sum_excess = 0.0
+    sum_downside = 0.0
+    n_downside = 0
+    
+    # Equity walk: the curve starts at initial_capital (drawdown 0)
+    equity = initial_capital
+    peak = initial_capital
+    min_drawdown = 0.0
+    sum_sq_drawdown_pct = 0.0
+    
+    for i in range(n):
+        x = pnl[i]
+        if x > 0:
+            n_wins += 1
+            total_profit += x
+            if n_wins == 1 or x > largest_win:
+                largest_win = x
+            win_streak += 1
+            loss_streak = 0
+            if win_streak > max_win_streak:
+                max_win_streak = win_streak
+        elif x < 0:
+            n_losses += 1
+            total_loss += x
+            if n_losses == 1 or x < largest_loss:
+                largest_loss = x
+            loss_streak += 1
+            win_streak = 0
+            if loss_streak > max_loss_streak:
+                max_loss_streak = loss_streak
+        else:
+            win_streak = 0
+            loss_streak = 0
+        
+        excess = x - risk_free_rate
+        sum_excess += excess
+        if excess < 0:
+            sum_downside += excess
+            n_downside += 1
+        
+        equity += x
+        if equity > peak:
+            peak = equity
+        drawdown = (equity - peak) / peak
+        if drawdown < min_drawdown:
+            min_drawdown = drawdown
+        sum_sq_drawdown_pct += (drawdown * 100.0) ** 2
+    
+    mean_excess = sum_excess / n
+    mean_downside = sum_downside / n_downside if n_downside > 0 else 0.0
+    sq_dev = 0.0
+    sq_dev_downside = 0.0
+    for i in range(n):
+        excess = pnl[i] - risk_free_rate
+        sq_dev += (excess - mean_excess) ** 2
+        if excess < 0:
+            sq_dev_downside += (excess - mean_downside) ** 2
+    
+    win_rate = n_wins / n
+    avg_win = total_profit / n_wins if n_wins > 0 else 0.0
+    avg_loss = total_loss / n_losses if n_losses > 0 else 0.0
+    total_loss = abs(total_loss)
+    
+    sharpe = 0.0
+    sortino = 0.0
+    if n >= 2:
+        std = np.sqrt(sq_dev / (n - 1))
+        if std != 0:
+            sharpe = annualization * mean_excess / std
+        # Sample std needs at least two downside returns
+        if n_downside >= 2:
+            std_downside = np.sqrt(sq_dev_downside / (n_downside - 1))
+            if std_downside != 0:
+                sortino = annualization * mean_excess / std_downside
+    
+    total_return = (equity - initial_capital) / initial_capital
+    max_drawdown = abs(min_drawdown)
+    ratio_to_dd = total_return / max_drawdown if max_drawdown > 0 else 0.0
+    
+    out[0] = n
+    out[1] = win_rate
+    out[2] = total_profit / total_loss if total_loss > 0 else 0.0
+    out[3] = total_return
+    out[4] = sharpe
+    out[5] = sortino
+    out[6] = ratio_to_dd                                   # Calmar
+    out[7] = max_drawdown
+    out[8] = avg_win
+    out[9] = avg_loss
+    out[10] = largest_win
+    out[11] = largest_loss
+    out[12] = win_rate * avg_win + (1 - win_rate) * avg_loss
+    out[13] = ratio_to_dd                                  # Recovery factor
+    out[14] = np.sqrt(sum_sq_drawdown_pct / (n + 1))
+    out[15] = max_win_streak
+    out[16] = max_loss_streak
+    return out
+
+
+def compute_metrics(pnl: np.ndarray, initial_capital: float = DEFAULT_INITIAL_CAPITAL,
+                    risk_free_rate: float = DEFAULT_RISK_FREE_RATE) -> Dict:
+    """
+    Performance metrics dict for a PnL array (see _compute_metrics_numba)
+    
+    Args:
+        pnl: Net PnL per trade
+        initial_capital: Starting equity
+        risk_free_rate: Per-trade risk-free return
+        
+    Returns:
+        Dict keyed by METRIC_FIELDS (counts as int, the rest as float)
+    """
+    values = _compute_metrics_numba(
+        np.ascontiguousarray(pnl, dtype=np.float64), float(initial_capital),
+        float(risk_free_rate), float(np.sqrt(TRADING_DAYS_PER_YEAR))
+    )
+    metrics = {name: float(value) for name, value in zip(METRIC_FIELDS, values)}
+    for name in ("n_trades", "max_consecutive_wins", "max_consecutive_losses"):
+        metrics[name] = int(metrics[name])
+    return metrics
+
+
 # ═══════════════════════════════════════════════════════════════
 # 📊 PROGRESS TRACKING
 # ═══════════════════════════════════════════════════════════════
@@ -275,6 +641,8 @@ class BacktestResults:
     gross_pnl: float = 0.0
     total_commission: float = 0.0
     net_pnl: float = 0.0  
+    max_consecutive_wins: int = 0
+    max_consecutive_losses: int = 0
     """
     Detailed trade information including:
     - entry_time, exit_time: Timestamps as strings
@@ -312,6 +680,8 @@ class BacktestResults:
             "gross_pnl": self.gross_pnl,
             "total_commission": self.total_commission,
             "net_pnl": self.net_pnl,
+            "max_consecutive_wins": self.max_consecutive_wins,
+            "max_consecutive_losses": self.max_consecutive_losses,
         }
         
         # Add detailed trades if available
@@ -355,10 +725,18 @@ class Backtester:
         self.lot_sizes = backtester_config.get('lot_sizes', DEFAULT_LOT_SIZES)
         self.commission_per_lot = backtester_config.get('commission_per_lot', DEFAULT_COMMISSION_PER_LOT)
         
+        # Signal cache: strategies differing only in SL/TP share one signal series
+        signal_cache_mb = backtester_config.get('signal_cache_mb', DEFAULT_SIGNAL_CACHE_MB)
+        self.signal_cache = SignalCache(signal_cache_mb) if signal_cache_mb > 0 else None
+        self.n_workers = backtester_config.get('n_workers', DEFAULT_BACKTEST_WORKERS)
+        self._pinned_fingerprint = None  # (df, fingerprint) for the duration of one batch call
+        
         # Track detailed trade information
         self.trades_detailed = []
         self.df = None  # Store DataFrame for context retrieval
         self.save_detailed_trades = False  # Default False for performance (skips price_history and market_context collection)
+        self._context_df = None
+        self._context_columns = None
     
     def _pips_to_usd(self, pips: float) -> float:
         """
@@ -379,6 +757,24 @@ class Backtester:
         pip_value = self.pip_value_per_lot * self.lot_size
         return pips * pip_value
         
+    def _generate_signals(self, strategy, df: pd.DataFrame) -> pd.Series:
+        """Generate signals, reusing cached series for equivalent strategies"""
+        # The cache is keyed by a fingerprint that batch calls compute once
+        # (see _pin_fingerprint); hashing the whole df for a single backtest()
+        # would cost more than generating its signals
+        pinned = self._pinned_fingerprint
+        if self.signal_cache is None or pinned is None or pinned[0] is not df:
+            return strategy.generate_signals(df)
+        
+        return self.signal_cache.get_signals(strategy, df, pinned[1])
+    
+    def _pin_fingerprint(self, df: Optional[pd.DataFrame]):
+        """Reuse one content fingerprint of df until unpinned (df=None)"""
+        if df is None or self.signal_cache is None:
+            self._pinned_fingerprint = None
+        else:
+            self._pinned_fingerprint = (df, dataframe_fingerprint(df))
+    
     def _calculate_returns(self, trades: pd.DataFrame) -> pd.Series:
         """Calculate returns from trades"""
         if len(trades) == 0:
@@ -406,13 +802,14 @@ class Backtester:
             return pd.Series([initial_capital])
         
         # Build equity curve: start with initial capital, then cumsum of PnL
-        # This is more efficient than a loop for large trade counts
-        equity_curve = pd.concat([
-            pd.Series([initial_capital]),
-            initial_capital + trades["pnl"].cumsum()
-        ], ignore_index=True)
-        
-        return equity_curve
+        # (one array, no intermediate Series)
+        pnl = trades["pnl"].to_numpy(dtype=np.float64)
+        equity = np.empty(len(pnl) + 1, dtype=np.float64)
+        equity[0] = initial_capital
+        np.cumsum(pnl, out=equity[1:])
+        equity[1:] += initial_capital
+        
+        return pd.Series(equity)
     
     def _calculate_sharpe_ratio(self, returns: pd.Series, 
                                risk_free_rate: float = 0.0) -> float:
@@ -474,69 +871,17 @@ class Backtester:
     
     def _calculate_metrics(self, trades: pd.DataFrame, 
                           equity_curve: pd.Series) -> Dict:
-        """Calculate all performance metrics"""
+        """
+        Calculate all performance metrics
+        
+        One compiled pass over the PnL column (see _compute_metrics_numba);
+        only the initial capital is taken from the equity curve.
+        """
         if len(trades) == 0:
             return self._empty_metrics()
         
-        # Basic stats
-        winning_trades = trades[trades["pnl"] > 0]
-        losing_trades = trades[trades["pnl"] < 0]
-        
-        n_trades = len(trades)
-        n_wins = len(winning_trades)
-        n_losses = len(losing_trades)
-        
-        win_rate = n_wins / n_trades if n_trades > 0 else 0.0
-        
-        # PnL stats
-        total_profit = winning_trades["pnl"].sum() if n_wins > 0 else 0.0
-        total_loss = abs(losing_trades["pnl"].sum()) if n_losses > 0 else 0.0
-        
-        profit_factor = total_profit / total_loss if total_loss > 0 else 0.0
-        
-        avg_win = winning_trades["pnl"].mean() if n_wins > 0 else 0.0
-        avg_loss = losing_trades["pnl"].mean() if n_losses > 0 else 0.0
-        
-        largest_win = winning_trades["pnl"].max() if n_wins > 0 else 0.0
-        largest_loss = losing_trades["pnl"].min() if n_losses > 0 else 0.0
-        
-        # Expectancy
-        expectancy = (win_rate * avg_win) + ((1 - win_rate) * avg_loss)
-        
-        # Returns-based metrics
-        returns = self._calculate_returns(trades)
-        
-        sharpe = self._calculate_sharpe_ratio(returns)
-        sortino = self._calculate_sortino_ratio(returns)
-        
-        # Equity-based metrics
-        initial_capital = equity_curve.iloc[0] if len(equity_curve) > 0 else 10000
-        final_capital = equity_curve.iloc[-1] if len(equity_curve) > 0 else initial_capital
-        
-        total_return = (final_capital - initial_capital) / initial_capital
-        max_dd = self._calculate_max_drawdown(equity_curve)
-        calmar = self._calculate_calmar_ratio(total_return, max_dd)
-        ulcer = self._calculate_ulcer_index(equity_curve)
-        
-        recovery_factor = total_return / max_dd if max_dd > 0 else 0.0
-        
-        return {
-            "n_trades": n_trades,
-            "win_rate": win_rate,
-            "profit_factor": profit_factor,
-            "total_return": total_return,
-            "sharpe_ratio": sharpe,
-            "sortino_ratio": sortino,
-            "calmar_ratio": calmar,
-            "max_drawdown": max_dd,
-            "avg_win": avg_win,
-            "avg_loss": avg_loss,
-            "largest_win": largest_win,
-            "largest_loss": largest_loss,
-            "expectancy": expectancy,
-            "recovery_factor": recovery_factor,
-            "ulcer_index": ulcer,
-        }
+        initial_capital = equity_curve.iloc[0] if len(equity_curve) > 0 else DEFAULT_INITIAL_CAPITAL
+        return compute_metrics(trades["pnl"].to_numpy(), initial_capital)
     
     def _empty_metrics(self) -> Dict:
         """Return empty metrics dict"""
@@ -556,6 +901,8 @@ class Backtester:
             "expectancy": 0.0,
             "recovery_factor": 0.0,
             "ulcer_index": 0.0,
+            "max_consecutive_wins": 0,
+            "max_consecutive_losses": 0,
         }
     
     def _get_market_context(self, idx: int) -> Dict:
@@ -737,6 +1084,269 @@ class Backtester:
         
         self.trades_detailed.append(trade_detail)
     
+    def _market_context_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Per-bar market context columns for self.df, computed once per DataFrame
+        
+        Same definitions as _get_market_context: 21-bar trailing window
+        (idx - 20 .. idx) for volatility and relative volume, bar values for
+        momentum and spread.
+        
+        Returns:
+            dict: volatility, trend_strength, volume_relative, spread_pips arrays
+        """
+        df = self.df
+        if self._context_df is df and len(self._context_columns['volatility']) == len(df):
+            return self._context_columns
+        
+        n = len(df)
+        
+        if 'pips_change' in df.columns:
+            volatility = df['pips_change'].rolling(21, min_periods=2).std().to_numpy(dtype=np.float64, copy=True)
+        elif 'high' in df.columns and 'low' in df.columns and 'close' in df.columns:
+            range_mean = (df['high'] - df['low']).rolling(21, min_periods=1).mean().to_numpy(dtype=np.float64)
+            close_mean = df['close'].rolling(21, min_periods=1).mean().to_numpy(dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                volatility = np.where(close_mean > 0, range_mean / close_mean, 0.0)
+        else:
+            volatility = np.zeros(n)
+        if n:
+            volatility[0] = 0.0  # Single-bar window
+        
+        if 'momentum' in df.columns:
+            trend_strength = np.abs(df['momentum'].to_numpy(dtype=np.float64))
+        else:
+            trend_strength = np.zeros(n)
+        
+        if 'volume' in df.columns:
+            volume = df['volume'].to_numpy(dtype=np.float64)
+            volume_avg = df['volume'].rolling(21, min_periods=1).mean().to_numpy(dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                volume_relative = np.where(volume_avg > 0, volume / volume_avg, 1.0)
+            if n:
+                volume_relative[0] = 1.0
+        else:
+            volume_relative = np.ones(n)
+        
+        if 'spread_pips' in df.columns:
+            spread_pips = df['spread_pips'].to_numpy(dtype=np.float64)
+        elif 'spread' in df.columns:
+            spread_pips = df['spread'].to_numpy(dtype=np.float64)
+        else:
+            spread_pips = np.full(n, 1.5)
+        
+        self._context_df = df
+        self._context_columns = {
+            'volatility': volatility,
+            'trend_strength': trend_strength,
+            'volume_relative': volume_relative,
+            'spread_pips': spread_pips,
+        }
+        return self._context_columns
+    
+    def _patterns_at(self, indices: np.ndarray) -> np.ndarray:
+        """Pattern labels at the given bars as strings ('unknown' without a pattern column)"""
+        if 'pattern' not in self.df.columns:
+            return np.full(len(indices), 'unknown', dtype=object)
+        values = self.df['pattern'].to_numpy()[indices]
+        return np.array([str(v) for v in values], dtype=object)
+    
+    def market_context_batch(self, indices: np.ndarray) -> pd.DataFrame:
+        """
+        Market context for many bars at once
+        
+        Vectorized equivalent of calling _get_market_context for each index:
+        the rolling columns are computed once per DataFrame and gathered
+        with array indexing.
+        
+        Args:
+            indices: Bar indices into self.df (all must be < len(self.df))
+        
+        Returns:
+            DataFrame with one row per index: volatility, trend_strength,
+            volume_relative, spread_pips, pattern_detected, pattern_lag1,
+            pattern_lag2 (missing before the first bar), hour_of_day, day_of_week
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        columns = self._market_context_columns()
+        
+        context = pd.DataFrame({
+            name: values[indices] for name, values in columns.items()
+        })
+        
+        context['pattern_detected'] = self._patterns_at(indices)
+        for lag in (1, 2):
+            lagged = self._patterns_at(np.maximum(indices - lag, 0))
+            lagged[indices < lag] = None
+            context[f'pattern_lag{lag}'] = lagged
+        
+        index = self.df.index
+        if isinstance(index, pd.DatetimeIndex):
+            timestamps = index[indices]
+            context['hour_of_day'] = np.asarray(timestamps.hour, dtype=np.int64)
+            context['day_of_week'] = np.asarray(timestamps.day_name(), dtype=object)
+        else:
+            timestamps = index[indices]
+            context['hour_of_day'] = [int(ts.hour) if hasattr(ts, 'hour') else 0 for ts in timestamps]
+            context['day_of_week'] = [
+                ts.strftime('%A') if hasattr(ts, 'strftime') else 'Unknown' for ts in timestamps
+            ]
+        
+        return context
+    
+    def detailed_trades_table(self, trades: pd.DataFrame, pip_value: float = 0.0001) -> pd.DataFrame:
+        """
+        Columnar detailed-trade table for all trades at once
+        
+        Holds the fields of _record_detailed_trade (market context flattened
+        into columns, price history omitted) plus the context at exit,
+        prefixed with 'exit_'.
+        
+        Args:
+            trades: Trades DataFrame from simulate_trades
+            pip_value: Value of 1 pip in price terms
+        
+        Returns:
+            DataFrame with one row per trade
+        """
+        entry_idx = trades['entry_idx'].to_numpy(dtype=np.int64)
+        exit_idx = trades['exit_idx'].to_numpy(dtype=np.int64)
+        entry_prices = trades['entry_price'].to_numpy(dtype=np.float64)
+        exit_prices = trades['exit_price'].to_numpy(dtype=np.float64)
+        pnl_usd = trades['pnl'].to_numpy(dtype=np.float64)
+        directions = trades['type'].to_numpy()
+        
+        is_long = directions == 'long'
+        pnl_pips = np.where(is_long, exit_prices - entry_prices, entry_prices - exit_prices) / pip_value
+        pnl_pct = pnl_usd / self.initial_capital * 100 if self.initial_capital > 0 else np.zeros(len(trades))
+        
+        index = self.df.index
+        entry_time = index[entry_idx]
+        exit_time = index[exit_idx]
+        if isinstance(index, pd.DatetimeIndex):
+            duration_minutes = np.asarray(
+                (exit_time - entry_time).total_seconds() / 60
+            ).astype(np.int64)
+        else:
+            duration_minutes = []
+            for entry, exit_, i, j in zip(entry_time, exit_time, entry_idx, exit_idx):
+                duration = 0
+                if entry and exit_:
+                    try:
+                        duration = int((exit_ - entry).total_seconds() / 60)
+                    except (AttributeError, TypeError):
+                        duration = int(j - i)
+                duration_minutes.append(duration)
+        
+        table = pd.DataFrame({
+            'entry_idx': entry_idx,
+            'exit_idx': exit_idx,
+            'entry_time': entry_time,
+            'exit_time': exit_time,
+            'entry_price': entry_prices,
+            'exit_price': exit_prices,
+            'direction': directions,
+            'pnl_pips': pnl_pips,
+            'pnl_usd': pnl_usd,
+            'pnl_pct': pnl_pct,
+            'duration_minutes': duration_minutes,
+            'exit_reason': trades['exit_reason'].to_numpy(),
+        })
+        
+        entry_context = self.market_context_batch(entry_idx)
+        exit_context = self.market_context_batch(exit_idx)
+        for name in entry_context.columns:
+            table[name] = entry_context[name].to_numpy()
+        for name in ('volatility', 'trend_strength', 'volume_relative', 'spread_pips', 'pattern_detected'):
+            table[f'exit_{name}'] = exit_context[name].to_numpy()
+        
+        return table
+    
+    def price_history_batch(self, entry_indices: np.ndarray, exit_indices: np.ndarray) -> List[Dict]:
+        """
+        Price history around many trades (batch form of _get_price_history)
+        
+        Price columns are converted to arrays once and timestamps are
+        formatted only for bars inside some trade's window.
+        
+        Args:
+            entry_indices: Entry bar indices
+            exit_indices: Exit bar indices
+        
+        Returns:
+            List of price history dicts, one per trade
+        """
+        n = len(self.df)
+        starts = np.maximum(np.asarray(entry_indices, dtype=np.int64) - 50, 0)
+        ends = np.minimum(np.asarray(exit_indices, dtype=np.int64) + 20, n)
+        
+        # Format timestamps of covered bars only
+        coverage = np.zeros(n + 1, dtype=np.int64)
+        np.add.at(coverage, starts, 1)
+        np.add.at(coverage, ends, -1)
+        covered = np.flatnonzero(np.cumsum(coverage[:-1]) > 0)
+        timestamps = np.empty(n, dtype=object)
+        timestamps[covered] = [str(ts) for ts in self.df.index[covered]]
+        
+        columns = {}
+        if 'bid' in self.df.columns and 'ask' in self.df.columns:
+            columns['bid'] = self.df['bid']
+            columns['ask'] = self.df['ask']
+        for name in ('mid_price', 'open', 'high', 'low', 'close', 'volume'):
+            if name in self.df.columns:
+                columns[name] = self.df[name]
+        arrays = {name: col.to_numpy(dtype=np.float64) for name, col in columns.items()}
+        
+        histories = []
+        for start, end in zip(starts, ends):
+            history = {'timestamps': timestamps[start:end].tolist()}
+            for name, values in arrays.items():
+                history[name] = values[start:end].tolist()
+            if 'volume' not in arrays:
+                history['volume'] = [0.0] * max(int(end - start), 0)
+            histories.append(history)
+        return histories
+    
+    def _detailed_trade_records(self, table: pd.DataFrame) -> List[Dict]:
+        """
+        Convert a detailed_trades_table to the per-trade dicts of trades_detailed
+        
+        Args:
+            table: Output of detailed_trades_table
+        
+        Returns:
+            List of trade dicts in the _record_detailed_trade layout
+        """
+        histories = self.price_history_batch(table['entry_idx'].to_numpy(), table['exit_idx'].to_numpy())
+        records = []
+        for row, price_history in zip(table.itertuples(index=False), histories):
+            pattern_sequence = [p for p in (row.pattern_lag2, row.pattern_lag1) if pd.notna(p)]
+            pattern_sequence.append(row.pattern_detected)
+            records.append({
+                'entry_time': str(row.entry_time) if row.entry_time else '',
+                'exit_time': str(row.exit_time) if row.exit_time else '',
+                'entry_price': float(row.entry_price),
+                'exit_price': float(row.exit_price),
+                'direction': row.direction,
+                'pnl_pips': float(row.pnl_pips),
+                'pnl_usd': float(row.pnl_usd),
+                'pnl_pct': float(row.pnl_pct),
+                'duration_minutes': int(row.duration_minutes),
+                'exit_reason': row.exit_reason,
+                'market_context': {
+                    'volatility': float(row.volatility),
+                    'trend_strength': float(row.trend_strength),
+                    'volume_relative': float(row.volume_relative),
+                    'spread_pips': float(row.spread_pips),
+                    'pattern_detected': row.pattern_detected,
+                    'pattern_sequence': pattern_sequence,
+                    'hour_of_day': int(row.hour_of_day),
+                    'day_of_week': row.day_of_week,
+                },
+                'price_history': price_history,
+            })
+        return records
+    
     def simulate_trades(self, signals: pd.Series, prices: pd.Series,
                        stop_loss_pips: float = 20, 
                        take_profit_pips: float = 40,
@@ -785,6 +1395,23 @@ class Backtester:
             self.pip_value_per_lot, self.lot_size, self.commission_per_lot
         )
         
+        return self._build_trades_frame(
+            entry_indices, exit_indices, entry_prices, exit_prices,
+            pnls, gross_pnls, commissions, trade_types, exit_reasons,
+            pip_value
+        )
+    
+    def _build_trades_frame(self, entry_indices: np.ndarray, exit_indices: np.ndarray,
+                            entry_prices: np.ndarray, exit_prices: np.ndarray,
+                            pnls: np.ndarray, gross_pnls: np.ndarray,
+                            commissions: np.ndarray, trade_types: np.ndarray,
+                            exit_reasons: np.ndarray,
+                            pip_value: float) -> pd.DataFrame:
+        """
+        Build the trades DataFrame from Numba output arrays
+        
+        Also records detailed trades when save_detailed_trades is enabled.
+        """
         # Convert exit_reasons to strings
         exit_reason_map = {0: 'stop_loss', 1: 'take_profit', 2: 'signal'}
         exit_reasons_str = [exit_reason_map[r] for r in exit_reasons]
@@ -806,20 +1433,156 @@ class Backtester:
             'exit_reason': exit_reasons_str,
         })
         
-        # Record detailed trades if enabled
-        if self.save_detailed_trades:
-            for i in range(len(trades)):
-                self._record_detailed_trade(
-                    int(entry_indices[i]), int(exit_indices[i]),
-                    entry_prices[i], exit_prices[i],
-                    trade_types_str[i], 
-                    (exit_prices[i] - entry_prices[i]) / pip_value if trade_types[i] == 1 
-                    else (entry_prices[i] - exit_prices[i]) / pip_value,
-                    pnls[i], exit_reasons_str[i]
-                )
+        # Record detailed trades if enabled (context gathered for all trades at once)
+        if self.save_detailed_trades and self.df is not None and len(trades) > 0:
+            table = self.detailed_trades_table(trades, pip_value)
+            self.trades_detailed.extend(self._detailed_trade_records(table))
         
         return trades
     
+    def simulate_trades_batch(self, signals: pd.Series, prices: pd.Series,
+                              sl_tp_pairs: List[Tuple[float, float]],
+                              lot_sizes: List[float] = None,
+                              pip_value: float = 0.0001,
+                              bid_prices: pd.Series = None,
+                              ask_prices: pd.Series = None) -> Dict[str, np.ndarray]:
+        """
+        Simulate one signal series against many (SL, TP) pairs and lot sizes
+        in a single parallel Numba call.
+        
+        Args:
+            signals: Series with signals (1=buy, -1=sell, 0=neutral)
+            prices: Series with prices (mid_price or close as fallback)
+            sl_tp_pairs: List of (stop_loss_pips, take_profit_pips) tuples
+            lot_sizes: Lot sizes to price trades for (uses self.lot_sizes if None)
+            pip_value: Value of 1 pip in price terms (0.0001 for EUR/USD)
+            bid_prices: Series with bid prices (if None, uses prices)
+            ask_prices: Series with ask prices (if None, uses prices)
+            
+        Returns:
+            Dict of arrays (struct-of-arrays). Trades of pair c are the rows
+            [trade_offsets[c], trade_offsets[c + 1]) of every per-trade array;
+            gross_pnl/pnl have one column per lot size.
+        """
+        if lot_sizes is None:
+            lot_sizes = self.lot_sizes
+        
+        signals_arr = signals.values.astype(np.int8)
+        
+        if bid_prices is not None and ask_prices is not None:
+            bid_arr = bid_prices.values.astype(np.float64)
+            ask_arr = ask_prices.values.astype(np.float64)
+        else:
+            bid_arr = prices.values.astype(np.float64)
+            ask_arr = prices.values.astype(np.float64)
+        
+        sl_tp_arr = np.asarray(sl_tp_pairs, dtype=np.float64).reshape(-1, 2)
+        lot_arr = np.asarray(lot_sizes, dtype=np.float64)
+        
+        (trade_offsets, entry_indices, exit_indices, entry_prices, exit_prices,
+         trade_pips, trade_types, exit_reasons,
+         gross_pnls, net_pnls, commissions) = _simulate_trades_batch_numba(
+            signals_arr, bid_arr, ask_arr, sl_tp_arr, lot_arr,
+            pip_value, self.pip_value_per_lot, self.commission_per_lot
+        )
+        
+        return {
+            'sl_tp_pairs': sl_tp_arr,
+            'lot_sizes': lot_arr,
+            'trade_offsets': trade_offsets,
+            'entry_idx': entry_indices,
+            'exit_idx': exit_indices,
+            'entry_price': entry_prices,
+            'exit_price': exit_prices,
+            'pips': trade_pips,
+            'type': trade_types,
+            'exit_reason': exit_reasons,
+            'gross_pnl': gross_pnls,
+            'pnl': net_pnls,
+            'commission': commissions,
+        }
+    
+    def _results_from_batch(self, strategy_name: str, batch: Dict[str, np.ndarray],
+                            combo_idx: int, lot_idx: int,
+                            initial_capital: float,
+                            pip_value: float = 0.0001) -> BacktestResults:
+        """Build a BacktestResults for one (SL, TP) pair and lot size of a batch"""
+        start = batch['trade_offsets'][combo_idx]
+        end = batch['trade_offsets'][combo_idx + 1]
+        n = end - start
+        lot_size = float(batch['lot_sizes'][lot_idx])
+        
+        # Detailed trades are priced with the lot size being reported
+        original_lot_size = self.lot_size
+        self.lot_size = lot_size
+        self.trades_detailed = []
+        
+        try:
+            trades = self._build_trades_frame(
+                batch['entry_idx'][start:end],
+                batch['exit_idx'][start:end],
+                batch['entry_price'][start:end],
+                batch['exit_price'][start:end],
+                batch['pnl'][start:end, lot_idx],
+                batch['gross_pnl'][start:end, lot_idx],
+                np.full(n, batch['commission'][lot_idx]),
+                batch['type'][start:end],
+                batch['exit_reason'][start:end],
+                pip_value
+            )
+        finally:
+            self.lot_size = original_lot_size
+        
+        if len(trades) > 0:
+            gross_pnl = trades["gross_pnl"].sum()
+            total_commission = trades["commission"].sum()
+            net_pnl = gross_pnl - total_commission
+        else:
+            gross_pnl = 0.0
+            total_commission = 0.0
+            net_pnl = 0.0
+        
+        equity_curve = self._calculate_equity_curve(trades, initial_capital)
+        metrics = self._calculate_metrics(trades, equity_curve)
+        
+        return BacktestResults(
+            strategy_name=strategy_name,
+            trades=trades,
+            equity_curve=equity_curve,
+            trades_detailed=self.trades_detailed.copy(),
+            lot_size=lot_size,
+            gross_pnl=gross_pnl,
+            total_commission=total_commission,
+            net_pnl=net_pnl,
+            **metrics
+        )
+    
+    def _validated_prices(self, df: pd.DataFrame) -> pd.Series:
+        """Price series to trade on (mid_price, or close), after data quality checks"""
+        # ═══ VALIDATION: Check data quality ═══
+        if df is None or len(df) == 0:
+            raise ValueError("❌ DataFrame is empty!")
+        
+        # Check for price column
+        if "mid_price" in df.columns:
+            prices = df["mid_price"]
+        elif "close" in df.columns:
+            prices = df["close"]
+        else:
+            raise ValueError("❌ DataFrame must have 'mid_price' or 'close' column")
+        
+        # Validate price data quality
+        if prices.isnull().all():
+            raise ValueError("❌ All prices are null!")
+        
+        if prices.std() == 0:
+            raise ValueError("❌ Price data has no variation (constant prices)!")
+        
+        if (prices <= 0).any():
+            raise ValueError("❌ Price data contains zero or negative values!")
+        
+        return prices
+    
     def backtest(self, strategy, df: pd.DataFrame,
                 initial_capital: float = None,
                 multi_lot: bool = True,
@@ -848,38 +1611,14 @@ class Backtester:
         if initial_capital is None:
             initial_capital = self.initial_capital
         
-        # ═══ VALIDATION: Check data quality ═══
-        if df is None or len(df) == 0:
-            raise ValueError("❌ DataFrame is empty!")
-        
-        # Check for price column
-        if "mid_price" not in df.columns and "close" not in df.columns:
-            raise ValueError("❌ DataFrame must have 'mid_price' or 'close' column")
-        
-        # Get prices early for validation
-        if "mid_price" in df.columns:
-            prices = df["mid_price"]
-        elif "close" in df.columns:
-            prices = df["close"]
-        else:
-            raise ValueError("DataFrame must have 'mid_price' or 'close' column")
+        prices = self._validated_prices(df)
         
         # Get bid/ask prices if available
         bid_prices = df["bid"] if "bid" in df.columns else None
         ask_prices = df["ask"] if "ask" in df.columns else None
         
-        # Validate price data quality
-        if prices.isnull().all():
-            raise ValueError("❌ All prices are null!")
-        
-        if prices.std() == 0:
-            raise ValueError("❌ Price data has no variation (constant prices)!")
-        
-        if (prices <= 0).any():
-            raise ValueError("❌ Price data contains zero or negative values!")
-        
         # Generate signals once (same for all lot sizes)
-        signals = strategy.generate_signals(df)
+        signals = self._generate_signals(strategy, df)
         
         # Get stop loss and take profit
         stop_loss = strategy.params.get("stop_loss_pips", 20)
@@ -888,57 +1627,18 @@ class Backtester:
         # Determine lot sizes to test
         lot_sizes_to_test = self.lot_sizes if multi_lot else [self.lot_size]
         
-        # Test lot sizes
-        results_dict = {}
+        # Simulate once; lot size only scales PnL, so all lots come from one pass
+        batch = self.simulate_trades_batch(
+            signals, prices, [(stop_loss, take_profit)], lot_sizes_to_test,
+            bid_prices=bid_prices, ask_prices=ask_prices
+        )
         
-        for lot_size in lot_sizes_to_test:
-            # Reset detailed trades for each lot size
-            self.trades_detailed = []
-            
-            # Temporarily set lot size for this iteration
-            original_lot_size = self.lot_size
-            self.lot_size = lot_size
-            
-            # Simulate trades with current lot size
-            trades = self.simulate_trades(
-                signals, prices, stop_loss, take_profit,
-                bid_prices=bid_prices, ask_prices=ask_prices
-            )
-            
-            # Calculate metrics
-            if len(trades) > 0:
-                # Calculate gross and net PnL
-                gross_pnl = trades["gross_pnl"].sum() if "gross_pnl" in trades.columns else trades["pnl"].sum()
-                total_commission = trades["commission"].sum() if "commission" in trades.columns else 0.0
-                net_pnl = gross_pnl - total_commission if "commission" in trades.columns else trades["pnl"].sum()
-            else:
-                gross_pnl = 0.0
-                total_commission = 0.0
-                net_pnl = 0.0
-            
-            # Calculate equity curve
-            equity_curve = self._calculate_equity_curve(trades, initial_capital)
-            
-            # Calculate performance metrics
-            metrics = self._calculate_metrics(trades, equity_curve)
-            
-            # Create results object
-            results = BacktestResults(
-                strategy_name=strategy.name,
-                trades=trades,
-                equity_curve=equity_curve,
-                trades_detailed=self.trades_detailed.copy(),
-                lot_size=lot_size,
-                gross_pnl=gross_pnl,
-                total_commission=total_commission,
-                net_pnl=net_pnl,
-                **metrics
+        results_dict = {}
+        for lot_idx, lot_size in enumerate(lot_sizes_to_test):
+            results = self._results_from_batch(
+                strategy.name, batch, 0, lot_idx, initial_capital
             )
-            
             results_dict[lot_size] = results
-            
-            # Restore original lot size
-            self.lot_size = original_lot_size
         
         # Return dict for multi-lot, single result for backward compatibility
         if multi_lot:
@@ -946,17 +1646,129 @@ class Backtester:
         else:
             return results_dict[lot_sizes_to_test[0]]
     
+    def backtest_param_grid(self, strategy, df: pd.DataFrame,
+                            sl_tp_pairs: List[Tuple[float, float]],
+                            lot_sizes: List[float] = None,
+                            initial_capital: float = None,
+                            signals: pd.Series = None) -> Dict[Tuple[float, float], Dict[float, BacktestResults]]:
+        """
+        Backtest one signal series across many (SL, TP) pairs and lot sizes
+        
+        Signals are generated once and every combination is simulated in a
+        single batched Numba call, instead of one full pass per strategy
+        and lot size.
+        
+        Args:
+            strategy: Strategy object with generate_signals method
+            df: DataFrame with price and feature data (tick or OHLC)
+            sl_tp_pairs: List of (stop_loss_pips, take_profit_pips) tuples
+            lot_sizes: Lot sizes to test (uses self.lot_sizes if None)
+            initial_capital: Starting capital (uses config default if None)
+            signals: Precomputed signals (generated from strategy if None)
+            
+        Returns:
+            Dict mapping (stop_loss_pips, take_profit_pips) -> lot_size -> BacktestResults
+        """
+        prices = self._validated_prices(df)
+        
+        if initial_capital is None:
+            initial_capital = self.initial_capital
+        if lot_sizes is None:
+            lot_sizes = self.lot_sizes
+        
+        self.df = df
+        
+        if signals is None:
+            signals = self._generate_signals(strategy, df)
+        
+        batch = self.simulate_trades_batch(
+            signals, prices, sl_tp_pairs, lot_sizes,
+            bid_prices=df["bid"] if "bid" in df.columns else None,
+            ask_prices=df["ask"] if "ask" in df.columns else None
+        )
+        
+        # Detailed trades are skipped for the grid; later backtest() calls keep the setting
+        original_save_detailed = self.save_detailed_trades
+        self.save_detailed_trades = False
+        try:
+            results = {}
+            for combo_idx, (stop_loss, take_profit) in enumerate(sl_tp_pairs):
+                results[(stop_loss, take_profit)] = {
+                    lot_size: self._results_from_batch(
+                        strategy.name, batch, combo_idx, lot_idx, initial_capital
+                    )
+                    for lot_idx, lot_size in enumerate(lot_sizes)
+                }
+        finally:
+            self.save_detailed_trades = original_save_detailed
+        
+        return results
+    
+    def backtest_group(self, strategies: List['Strategy'], df: pd.DataFrame,
+                       initial_capital: float = None) -> List[Tuple[str, Optional[Dict[float, BacktestResults]], Optional[str]]]:
+        """
+        Backtest strategies that share one signal series (see signal_groups)
+        
+        The group's signals are generated once and all of its (SL, TP)
+        pairs go through a single backtest_param_grid call. If that fails,
+        each strategy is retried with backtest() so one bad member never
+        takes down the rest of its group.
+        
+        Args:
+            strategies: Strategies of the same class with equal signal_params()
+            df: DataFrame with price/feature data
+            initial_capital: Starting capital (uses config default if None)
+            
+        Returns:
+            List of (strategy name, {lot_size: BacktestResults} or None, error message or None),
+            in input order
+        """
+        if len(strategies) > 1:
+            try:
+                sl_tp = [
+                    (s.params.get("stop_loss_pips", 20), s.params.get("take_profit_pips", 40))
+                    for s in strategies
+                ]
+                grid = self.backtest_param_grid(
+                    strategies[0], df, list(dict.fromkeys(sl_tp)),
+                    initial_capital=initial_capital
+                )
+                # Results carry each member's own name; equal (SL, TP) pairs share trades
+                return [
+                    (s.name, {
+                        lot_size: replace(result, strategy_name=s.name)
+                        for lot_size, result in grid[pair].items()
+                    }, None)
+                    for s, pair in zip(strategies, sl_tp)
+                ]
+            except Exception:
+                pass
+        
+        outcomes = []
+        for strategy in strategies:
+            try:
+                # Backtest returns dict of {lot_size: BacktestResults}
+                outcomes.append((strategy.name, self.backtest(strategy, df, initial_capital=initial_capital), None))
+            except Exception as e:
+                outcomes.append((strategy.name, None, str(e)))
+        return outcomes
+    
     def test_strategies(self, strategies: List['Strategy'], df: pd.DataFrame, 
                         verbose: bool = True, 
-                        show_progress_bar: bool = True) -> Dict[str, Dict[float, 'BacktestResults']]:
+                        show_progress_bar: bool = True,
+                        n_workers: int = None) -> Dict[str, Dict[float, 'BacktestResults']]:
         """
         Backtest multiple strategies with enhanced progress tracking
         
+        With n_workers > 1 strategies run in a process pool (see
+        iter_strategy_results); results then carry metrics only.
+        
         Args:
             strategies: List of Strategy objects
             df: DataFrame with price/feature data
             verbose: Show progress (default: True)
             show_progress_bar: Use enhanced progress bar with ETA (default: True)
+            n_workers: Worker processes (default: backtester.n_workers from config)
             
         Returns:
             Dict mapping strategy name -> lot_size -> BacktestResults
@@ -975,24 +1787,22 @@ class Backtester:
             
             progress = BacktestProgress(total, self.lot_sizes)
         
-        for i, strategy in enumerate(strategies):
-            try:
-                # Backtest returns dict of {lot_size: BacktestResults}
-                strategy_results = self.backtest(strategy, df)
-                
-                # Update progress for each lot size
-                if verbose and show_progress_bar:
-                    for lot_size in self.lot_sizes:
-                        progress.update(i, strategy.name, lot_size)
-                elif verbose and i % 100 == 0:
-                    print(f"   📊 Backtesting {i+1}/{total} ({100*(i+1)/total:.1f}%)...")
-                
-                # Store results
-                results[strategy.name] = strategy_results
-                
-            except Exception as e:
+        outcomes = self.iter_strategy_results(strategies, df, n_workers=n_workers)
+        for i, (name, strategy_results, error) in enumerate(outcomes):
+            if error is not None:
                 if verbose:
-                    print(f"\n   ⚠️  Strategy '{strategy.name}' failed: {e}")
+                    print(f"\n   ⚠️  Strategy '{name}' failed: {error}")
+                continue
+            
+            # Update progress for each lot size
+            if verbose and show_progress_bar:
+                for lot_size in self.lot_sizes:
+                    progress.update(i, name, lot_size)
+            elif verbose and i % 100 == 0:
+                print(f"   📊 Backtesting {i+1}/{total} ({100*(i+1)/total:.1f}%)...")
+            
+            # Store results
+            results[name] = strategy_results
         
         # Finish progress tracking
         if verbose and show_progress_bar:
@@ -1000,6 +1810,99 @@ class Backtester:
         
         return results
     
+    def iter_strategy_results(self, strategies: List['Strategy'], df: pd.DataFrame,
+                              n_workers: int = None, initial_capital: float = None):
+        """
+        Backtest strategies, yielding results in input order
+        
+        Strategies that share signals (see signal_groups) are simulated
+        together through backtest_group. A failing strategy yields its
+        error message instead of results, so one bad strategy never stops
+        the run.
+        
+        With n_workers > 1 the data is published once to a pool of worker
+        processes (numeric columns through shared memory, the rest through
+        the pool initializer). Only strategy specs (class + params) go to the
+        workers and only metric rows come back, so those BacktestResults have
+        empty trades and equity_curve.
+        
+        Args:
+            strategies: List of Strategy objects
+            df: DataFrame with price/feature data
+            n_workers: Worker processes (default: self.n_workers)
+            initial_capital: Starting capital (uses config default if None)
+            
+        Yields:
+            Tuple of (strategy name, {lot_size: BacktestResults} or None, error message or None)
+        """
+        if n_workers is None:
+            n_workers = self.n_workers
+        
+        if n_workers > 1 and len(strategies) > 1:
+            yield from self._iter_strategy_results_parallel(
+                strategies, df, min(n_workers, len(strategies)), initial_capital
+            )
+            return
+        
+        # The df is hashed once for the whole run (the signal cache key)
+        self._pin_fingerprint(df)
+        try:
+            group_of = {}
+            for group in signal_groups(strategies):
+                for idx in group:
+                    group_of[idx] = group
+            
+            # Each signal group runs as one batch; outcomes wait here until
+            # their turn in input order
+            pending = {}
+            for idx in range(len(strategies)):
+                if idx not in pending:
+                    group = group_of[idx]
+                    outcomes = self.backtest_group(
+                        [strategies[i] for i in group], df, initial_capital
+                    )
+                    pending.update(zip(group, outcomes))
+                yield pending.pop(idx)
+        finally:
+            self._pin_fingerprint(None)
+    
+    def _iter_strategy_results_parallel(self, strategies: List['Strategy'], df: pd.DataFrame,
+                                        n_workers: int, initial_capital: float = None):
+        """Process-pool backend of iter_strategy_results"""
+        from utils.parallel import PersistentPool
+        
+        store, payload = share_backtest_data(df)
+        # One task per signal group, so its SL/TP variants share one batch run
+        groups = signal_groups(strategies)
+        tasks = [[strategy_spec(strategies[i]) for i in group] for group in groups]
+        
+        # Contiguous chunks keep related templates on the same worker,
+        # where they share its signal cache
+        chunk_size = max(1, len(tasks) // (n_workers * 4))
+        
+        # Spawned workers: Numba's threading layers are not fork-safe once a
+        # parallel kernel has run in this process
+        try:
+            with PersistentPool(
+                n_workers,
+                initializer=_init_backtest_worker,
+                initargs=(self.config, payload, initial_capital),
+                start_method="spawn"
+            ) as pool:
+                pending = {}
+                next_idx = 0
+                for group, outcomes in zip(groups, pool.imap(_backtest_group_worker, tasks, chunk_size)):
+                    pending.update(zip(group, outcomes))
+                    while next_idx in pending:
+                        name, rows, error = pending.pop(next_idx)
+                        next_idx += 1
+                        if error is not None:
+                            yield name, None, error
+                        else:
+                            yield name, results_from_metric_rows(name, rows), None
+        finally:
+            store.unlink()
+    
     def walk_forward_test(self, strategy, df: pd.DataFrame,
                          n_splits: int = None) -> List[BacktestResults]:
         """
@@ -1037,6 +1940,226 @@ class Backtester:
         return results
 
 
+# ═══════════════════════════════════════════════════════════════
+# 🚀 PARALLEL STRATEGY TESTING
+# ═══════════════════════════════════════════════════════════════
+
+# BacktestResults fields shipped back from workers (everything but per-trade data)
+METRIC_ROW_FIELDS = [
+    f.name for f in fields(BacktestResults)
+    if f.name not in ("trades", "equity_curve", "trades_detailed")
+]
+
+# Shared-memory column holding a DatetimeIndex
+SHARED_INDEX_COLUMN = "__index__"
+
+_worker_store = None
+_worker_backtester = None
+_worker_df = None
+_worker_initial_capital = None
+
+
+def signal_groups(strategies: List['Strategy']) -> List[List[int]]:
+    """
+    Group strategies that generate the same signals
+    
+    Strategies of one class with equal signal_params() differ only in
+    execution params (SL/TP), so each group can be simulated as a single
+    parameter grid. Strategies without signal_params() stay on their own.
+    
+    Args:
+        strategies: List of Strategy objects
+        
+    Returns:
+        Lists of indexes into strategies, ordered by first appearance
+    """
+    groups = {}
+    for idx, strategy in enumerate(strategies):
+        signal_params = getattr(strategy, "signal_params", None)
+        if signal_params is None:
+            key = idx
+        else:
+            key = (type(strategy), json.dumps(signal_params(), sort_keys=True, default=str))
+        groups.setdefault(key, []).append(idx)
+    return list(groups.values())
+
+
+def strategy_spec(strategy) -> Dict:
+    """
+    Picklable description of a strategy for worker processes
+    
+    Strategies built as ``cls(params)`` (every StrategyFactory template) are
+    described by module, class name and params; anything else is sent
+    as-is.
+    
+    Args:
+        strategy: Strategy object
+        
+    Returns:
+        Spec dict, or the strategy itself if it cannot be rebuilt from params
+    """
+    cls = type(strategy)
+    try:
+        parameters = list(inspect.signature(cls.__init__).parameters)[1:]
+    except (TypeError, ValueError):
+        parameters = []
+    
+    if parameters != ["params"]:
+        return strategy
+    
+    return {
+        "module": cls.__module__,
+        "class": cls.__qualname__,
+        "name": strategy.name,
+        "params": strategy.params,
+    }
+
+
+def strategy_from_spec(spec):
+    """
+    Rebuild a strategy from strategy_spec output
+    
+    Args:
+        spec: Spec dict (or a strategy object, returned unchanged)
+        
+    Returns:
+        Strategy object
+    """
+    if not isinstance(spec, dict):
+        return spec
+    
+    cls = getattr(importlib.import_module(spec["module"]), spec["class"])
+    strategy = cls(spec["params"])
+    strategy.name = spec["name"]
+    return strategy
+
+
+def results_from_metric_rows(strategy_name: str, rows: Dict[float, Tuple]) -> Dict[float, BacktestResults]:
+    """
+    BacktestResults from metric rows (trades and equity_curve left empty)
+    
+    Args:
+        strategy_name: Strategy name
+        rows: Dict mapping lot_size -> values in METRIC_ROW_FIELDS order
+        
+    Returns:
+        Dict mapping lot_size -> BacktestResults
+    """
+    return {
+        lot_size: BacktestResults(
+            trades=pd.DataFrame(),
+            equity_curve=pd.Series(dtype=np.float64),
+            **dict(zip(METRIC_ROW_FIELDS, row))
+        )
+        for lot_size, row in rows.items()
+    }
+
+
+def share_backtest_data(df: pd.DataFrame):
+    """
+    Publish a backtest DataFrame for worker processes
+    
+    Numeric columns (and a DatetimeIndex) go into a SharedTickStore; other
+    columns and non-datetime indexes travel in the returned payload.
+    
+    Args:
+        df: Backtest DataFrame
+        
+    Returns:
+        Tuple of (SharedTickStore to unlink when done, payload for restore_backtest_data)
+    """
+    from tick_store import SharedTickStore
+    
+    shared_cols = [
+        col for col in df.columns
+        if isinstance(df[col].dtype, np.dtype) and df[col].dtype.kind in "iuf"
+    ]
+    other_cols = [col for col in df.columns if col not in shared_cols]
+    
+    shared = df[shared_cols].reset_index(drop=True)
+    payload = {
+        "columns": list(df.columns),
+        "other": df[other_cols].reset_index(drop=True),
+        "index_name": df.index.name,
+    }
+    
+    if isinstance(df.index, pd.DatetimeIndex):
+        shared[SHARED_INDEX_COLUMN] = df.index
+        payload["index"] = None
+        payload["index_tz"] = df.index.tz
+        payload["index_unit"] = df.index.unit
+        payload["index_freq"] = df.index.freq
+    else:
+        payload["index"] = df.index
+    
+    store = SharedTickStore.create(shared)
+    payload["store_name"] = store.name
+    return store, payload
+
+
+def restore_backtest_data(store, payload: Dict) -> pd.DataFrame:
+    """
+    Rebuild the DataFrame published by share_backtest_data
+    
+    Args:
+        store: SharedTickStore attached to payload["store_name"]
+        payload: Payload from share_backtest_data
+        
+    Returns:
+        DataFrame with the original columns, dtypes and index
+    """
+    shared = store.to_dataframe()
+    
+    if payload["index"] is None:
+        index = pd.DatetimeIndex(shared.pop(SHARED_INDEX_COLUMN))
+        index = index.tz_convert(payload["index_tz"]) if payload["index_tz"] is not None else index.tz_localize(None)
+        index = pd.DatetimeIndex(index.as_unit(payload["index_unit"]), freq=payload["index_freq"])
+    else:
+        index = payload["index"]
+    
+    df = pd.concat([shared, payload["other"]], axis=1)[payload["columns"]]
+    df.index = index
+    df.index.name = payload["index_name"]
+    return df
+
+
+def _init_backtest_worker(config: Dict, payload: Dict, initial_capital: float = None):
+    """Pool initializer: attach the shared data and build this worker's Backtester"""
+    global _worker_store, _worker_backtester, _worker_df, _worker_initial_capital
+    from tick_store import SharedTickStore
+    
+    # Module-level reference keeps the segment mapped while the views are in use
+    _worker_store = SharedTickStore.attach(payload["store_name"])
+    _worker_df = restore_backtest_data(_worker_store, payload)
+    _worker_backtester = Backtester(config)
+    # The worker's data never changes, so it is hashed once
+    _worker_backtester._pin_fingerprint(_worker_df)
+    _worker_initial_capital = initial_capital
+
+
+def _backtest_group_worker(task):
+    """Pool task: backtest one signal group of strategy specs, returning compact metric rows"""
+    outcomes = [None] * len(task)
+    strategies = []
+    slots = []
+    for i, spec in enumerate(task):
+        try:
+            strategies.append(strategy_from_spec(spec))
+            slots.append(i)
+        except Exception as e:
+            name = spec["name"] if isinstance(spec, dict) else getattr(spec, "name", "unknown")
+            outcomes[i] = (name, None, str(e))
+    
+    group_outcomes = _worker_backtester.backtest_group(strategies, _worker_df, _worker_initial_capital)
+    for i, (name, results, error) in zip(slots, group_outcomes):
+        rows = None if results is None else {
+            lot_size: tuple(getattr(result, f) for f in METRIC_ROW_FIELDS)
+            for lot_size, result in results.items()
+        }
+        outcomes[i] = (name, rows, error)
+    return outcomes
+
+
 # ═══════════════════════════════════════════════════════════════
 # 🧪 TESTING
 # ═══════════════════════════════════════════════════════════════
@@ -32,7 +32,8 @@ from config import STRATEGY_TEMPLATES, STRATEGY_PARAMS, OUTPUT_DIR, PARQUET_FILE
 class BatchRunner:
     """Orchestrator for batch processing strategy backtests"""
     
-    def __init__(self, batch_size: int = 200, parquet_file: Path = None, skip_existing: bool = True, force_rerun: bool = False):
+    def __init__(self, batch_size: int = 200, parquet_file: Path = None, skip_existing: bool = True, force_rerun: bool = False,
+                 use_shared_memory: bool = True):
         """
         Initialize batch runner
         
@@ -41,8 +42,12 @@ class BatchRunner:
             parquet_file: Path to data parquet file (default: from config)
             skip_existing: Skip batches with existing results (default: True)
             force_rerun: Force rerun all batches, ignore cache (default: False)
+            use_shared_memory: Load data once into a shared tick store that
+                               batch workers attach to (default: True)
         """
         self.batch_size = batch_size
+        self.use_shared_memory = use_shared_memory
+        self.tick_store = None
         self.parquet_file = parquet_file or PARQUET_FILE
         self.output_dir = OUTPUT_DIR / "batch_results"
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -117,6 +122,10 @@ class BatchRunner:
             "--total-batches", str(self.num_batches)
         ]
         
+        # Workers attach to the shared tick store instead of re-reading the parquet
+        if self.tick_store is not None:
+            cmd += ["--shm-store", self.tick_store.name]
+        
         # Run subprocess (stream stdout for real-time progress display)
         # Note: stdout streams directly to terminal for real-time progress visibility
         # stderr is captured to error log file for debugging while still visible in terminal
@@ -153,6 +162,35 @@ class BatchRunner:
             print(f"\n   ❌ Batch {batch_idx} error: {e}")
             return False, elapsed, str(output_file), False  # from_cache=False
     
+    def open_tick_store(self, pending_batches: int):
+        """
+        Load data once and publish it in shared memory for batch workers
+        
+        Args:
+            pending_batches: Number of batches that still need processing
+        """
+        if not self.use_shared_memory or pending_batches == 0:
+            return
+        
+        from data_loader import load_crystal
+        from batch_utils import prepare_features
+        from tick_store import SharedTickStore
+        
+        try:
+            df = prepare_features(load_crystal(self.parquet_file))
+            self.tick_store = SharedTickStore.create(df)
+            print(f"💎 Shared tick store: {self.tick_store.name} "
+                  f"({len(self.tick_store):,} rows, {len(self.tick_store.columns)} columns)\n")
+        except Exception as e:
+            print(f"⚠️  Shared tick store unavailable ({e}), workers will load data themselves\n")
+            self.tick_store = None
+    
+    def close_tick_store(self):
+        """Release the shared tick store"""
+        if self.tick_store is not None:
+            self.tick_store.unlink()
+            self.tick_store = None
+    
     def run_all_batches(self) -> List[str]:
         """
         Run all batches sequentially
@@ -197,38 +235,44 @@ class BatchRunner:
         successful_files = []
         total_start = time.time()
         
-        for batch_idx, (start_idx, end_idx) in enumerate(batches, start=1):
-            batch_size = end_idx - start_idx
-            
-            # Get current RAM usage
-            mem = psutil.virtual_memory()
-            mem_pct = mem.percent
-            
-            print(f"\n{'─'*80}")
-            print(f"Batch {batch_idx:2d}/{self.num_batches}: {start_idx:5d}-{end_idx:5d}  ", end="")
-            
-            # Run batch (with cache detection)
-            success, elapsed, output_file, from_cache = self.run_batch(batch_idx - 1, start_idx, end_idx)
-            
-            if success:
-                # Check output file exists
-                if Path(output_file).exists():
-                    file_size_mb = Path(output_file).stat().st_size / (1024 ** 2)
-                    successful_files.append(output_file)
-                    
-                    if from_cache:
-                        # Cached batch
-                        print(f"📦 CACHED | {batch_size:3d} strategies | RAM: {mem_pct:4.1f}% | {file_size_mb:.2f}MB")
-                        self.cached_batches.append((batch_idx, start_idx, end_idx))
+        # Released in the finally block, also when a batch raises or the run is interrupted
+        self.open_tick_store(self.num_batches - len(cached_batch_indices))
+        
+        try:
+            for batch_idx, (start_idx, end_idx) in enumerate(batches, start=1):
+                batch_size = end_idx - start_idx
+                
+                # Get current RAM usage
+                mem = psutil.virtual_memory()
+                mem_pct = mem.percent
+                
+                print(f"\n{'─'*80}")
+                print(f"Batch {batch_idx:2d}/{self.num_batches}: {start_idx:5d}-{end_idx:5d}  ", end="")
+                
+                # Run batch (with cache detection)
+                success, elapsed, output_file, from_cache = self.run_batch(batch_idx - 1, start_idx, end_idx)
+                
+                if success:
+                    # Check output file exists
+                    if Path(output_file).exists():
+                        file_size_mb = Path(output_file).stat().st_size / (1024 ** 2)
+                        successful_files.append(output_file)
+                        
+                        if from_cache:
+                            # Cached batch
+                            print(f"📦 CACHED | {batch_size:3d} strategies | RAM: {mem_pct:4.1f}% | {file_size_mb:.2f}MB")
+                            self.cached_batches.append((batch_idx, start_idx, end_idx))
+                        else:
+                            # Newly processed batch
+                            print(f"✅ {elapsed:5.1f}s | {batch_size:3d} strategies | RAM: {mem_pct:4.1f}% | {file_size_mb:.2f}MB")
                     else:
-                        # Newly processed batch
-                        print(f"✅ {elapsed:5.1f}s | {batch_size:3d} strategies | RAM: {mem_pct:4.1f}% | {file_size_mb:.2f}MB")
+                        print(f"⚠️  {elapsed:5.1f}s | Output file missing!")
+                        self.failed_batches.append((batch_idx, start_idx, end_idx))
                 else:
-                    print(f"⚠️  {elapsed:5.1f}s | Output file missing!")
+                    print(f"❌ {elapsed:5.1f}s | FAILED")
                     self.failed_batches.append((batch_idx, start_idx, end_idx))
-            else:
-                print(f"❌ {elapsed:5.1f}s | FAILED")
-                self.failed_batches.append((batch_idx, start_idx, end_idx))
+        finally:
+            self.close_tick_store()
         
         total_elapsed = time.time() - total_start
         
@@ -362,6 +406,7 @@ if __name__ == "__main__":
     parser.add_argument("--no-merge", action="store_true", help="Skip merging results")
     parser.add_argument("--force-rerun", action="store_true", help="Force rerun all batches, ignore cache")
     parser.add_argument("--no-skip-existing", action="store_true", help="Don't skip existing batches (reprocess all)")
+    parser.add_argument("--no-shared-memory", action="store_true", help="Let each batch worker load the parquet itself")
     
     args = parser.parse_args()
     
@@ -374,7 +419,8 @@ if __name__ == "__main__":
         batch_size=args.batch_size, 
         parquet_file=parquet_path,
         skip_existing=skip_existing,
-        force_rerun=args.force_rerun
+        force_rerun=args.force_rerun,
+        use_shared_memory=not args.no_shared_memory
     )
     result_file = runner.run(merge=not args.no_merge)
     
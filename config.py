@@ -380,6 +380,13 @@ REGIME_CONFIG = {
     "min_cluster_size": 100,  # Base minimum cluster size for HDBSCAN (auto-scaled dynamically based on dataset size)
     "min_cluster_size_absolute": 10000,  # Absolute minimum cluster size threshold (prevents over-segmentation)
     "min_cluster_size_pct": 0.01,  # Minimum cluster size as percentage of dataset (1%)
+    # Scalable mode (used automatically above scalable_threshold rows)
+    "scalable_threshold": 200_000,  # Rows above which clustering is fit on samples
+    "selection_sample_size": 50_000,  # Stratified sample used to choose k
+    "silhouette_sample_size": 10_000,  # Rows used for each silhouette score
+    "hdbscan_fit_sample_size": 200_000,  # HDBSCAN is fit on this many rows, then predicts the rest
+    "minibatch_size": 4096,  # MiniBatchKMeans batch size
+    "predict_chunk_size": 500_000,  # Rows per chunk when assigning labels
 }
 
 # Feature importance
@@ -579,8 +586,9 @@ CORRELATION_CONFIG = {
 # ═══════════════════════════════════════════════════════════════
 
 TRADE_ANALYSIS_CONFIG = {
-    "top_n_for_detailed": 10,  # Trade log and Monte Carlo only for top 10
-    "monte_carlo_simulations": 1000,
+    "top_n_for_detailed": 10,  # Trade log only for top 10
+    "monte_carlo_simulations": 10000,  # Default runs per strategy (vectorized engine)
+    "monte_carlo_max_simulations": 100000,
     "sessions": {
         "london": {"start": 8, "end": 16},
         "new_york": {"start": 13, "end": 21},
@@ -756,6 +764,10 @@ STORAGE_CONFIG = {
     "partition_by": None,           # Can partition by "pair", "date", etc. (None = no partitioning)
     "enable_metadata_sidecar": True,  # Save metadata in separate JSON file alongside Parquet
     "auto_detect_format": True,     # Automatically detect and load from available format (Parquet preferred)
+    "metrics_backend": "parquet",   # "parquet" (partitioned metrics/ store) or "json" (all_strategies_metrics.json)
+    "trades_backend": "arrow",      # "arrow" (one trade archive per universe) or "json" (one file per strategy)
+    "detailed_trades_top_n": 200,   # Strategies per universe with detailed trades saved (Tier 2)
+    "save_feature_table": True,     # Save per-target features in universes/features/ (one column per feature)
 }
 
 
@@ -797,6 +809,8 @@ CACHE_CONFIG = {
     "skip_existing_universes": True,    # Skip universes that already exist
     "cache_labeling": True,             # Cache labeling results
     "cache_regimes": True,              # Cache regime detection (future)
+    "cache_ohlc": False,                # Persist resampled OHLC bars per (dataset, interval) (opt-in)
+    "ohlc_memory_entries": 8,           # OHLC bar sets kept in memory (LRU)
     "checkpoint_interval": 10,          # Save progress every N items
     "cache_dir": OUTPUT_DIR / "cache",  # Cache directory path
 }
\ No newline at end of file
@@ -3,5 +3,7 @@ Smart storage system for backtest results
 """
 
 from .smart_storage import SmartBacktestStorage
+from .metrics_store import MetricsStore
+from .trade_archive import TradeArchive
 
-__all__ = ['SmartBacktestStorage']
+__all__ = ['SmartBacktestStorage', 'MetricsStore', 'TradeArchive']
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - Columnar Metrics Store 💎🌟⚡
+
+Partitioned Parquet store for per-strategy backtest metrics (Tier 1):
+- One hive partition per universe (universe=<name>/part-<n>.parquet)
+- New universes are appended as new files; nothing else is rewritten
+- Primary key (strategy_name, universe, lot_size): re-saving a key
+  rewrites only that universe's partition
+- Reads push column selection and filters down to Parquet, and skip
+  partitions of universes that are not requested
+
+Replaces the single all_strategies_metrics.json file, which had to be
+loaded and rewritten in full for every universe.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+
+# Primary key of a metrics row
+KEY_COLUMNS = ["strategy_name", "universe", "lot_size"]
+
+# Hive partition column (stored in directory names, not in the files)
+PARTITION_COLUMN = "universe"
+
+
+class MetricsStore:
+    """
+    Append-only, partitioned Parquet store of strategy metrics
+
+    Usage:
+        store = MetricsStore("ultra_necrozma_results/backtest_results/metrics")
+        store.write("universe_001_5min_5lb", metric_rows)
+        df = store.load(columns=["strategy_name", "sharpe_ratio"],
+                        filters=[("sharpe_ratio", ">", 1.0)])
+    """
+
+    def __init__(self, root: str, compression: str = "zstd"):
+        """
+        Initialize metrics store
+
+        Args:
+            root: Store directory (created if missing)
+            compression: Parquet codec for new files
+        """
+        self.root = Path(root)
+        self.compression = compression
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _partition_dir(self, universe: str) -> Path:
+        """Directory holding one universe's files"""
+        return self.root / f"{PARTITION_COLUMN}={quote(str(universe), safe='')}"
+
+    @staticmethod
+    def _to_frame(rows: List[Dict]) -> pd.DataFrame:
+        """
+        Metric dicts as a DataFrame that Parquet can store
+
+        Nested values (dicts, lists) are stored as JSON strings; a missing
+        lot_size becomes 0.0 so every row has a complete key.
+        """
+        df = pd.DataFrame(rows)
+        if "lot_size" not in df.columns:
+            df["lot_size"] = 0.0
+        df["lot_size"] = pd.to_numeric(df["lot_size"], errors="coerce").fillna(0.0).astype(np.float64)
+        df["strategy_name"] = df["strategy_name"].astype(str)
+
+        for col in df.columns:
+            if df[col].dtype == object and col != "strategy_name":
+                values = df[col]
+                if values.map(lambda v: isinstance(v, (dict, list, tuple))).any():
+                    df[col] = values.map(lambda v: json.dumps(v, default=str) if v is not None else None)
+
+        return df.drop(columns=[PARTITION_COLUMN], errors="ignore")
+
+    def write(self, universe: str, rows: List[Dict]) -> int:
+        """
+        Upsert the metrics of one universe
+
+        Rows whose key is not yet stored are appended as a new file. If any
+        key already exists, the universe's partition is rewritten once with
+        the new rows replacing the old ones.
+
+        Args:
+            universe: Universe identifier
+            rows: Metric dicts, each with at least strategy_name
+
+        Returns:
+            int: Number of rows written
+        """
+        if not rows:
+            return 0
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        new_df = self._to_frame(rows)
+        # Last occurrence wins within one call, as with the JSON upsert
+        new_df = new_df.drop_duplicates(subset=["strategy_name", "lot_size"], keep="last")
+
+        partition = self._partition_dir(universe)
+        partition.mkdir(parents=True, exist_ok=True)
+        existing_files = sorted(partition.glob("part-*.parquet"))
+
+        if existing_files:
+            key_cols = ["strategy_name", "lot_size"]
+            old_df = pd.concat(
+                [pd.read_parquet(f) for f in existing_files], ignore_index=True
+            )
+            old_keys = pd.MultiIndex.from_frame(old_df[key_cols])
+            new_keys = pd.MultiIndex.from_frame(new_df[key_cols])
+            replaced = old_keys.isin(new_keys)
+
+            if replaced.any():
+                new_df = pd.concat([old_df[~replaced], new_df], ignore_index=True)
+            else:
+                existing_files = []  # Pure append: leave old files alone
+
+        table = pa.Table.from_pandas(new_df, preserve_index=False)
+        target = partition / f"part-{time.time_ns()}.parquet"
+        tmp = target.with_suffix(".tmp")
+        pq.write_table(table, tmp, compression=self.compression)
+        tmp.replace(target)
+
+        for old_file in existing_files:
+            old_file.unlink()
+
+        return len(rows)
+
+    def universes(self) -> List[str]:
+        """Universes present in the store"""
+        from urllib.parse import unquote
+        prefix = f"{PARTITION_COLUMN}="
+        return sorted(
+            unquote(d.name[len(prefix):]) for d in self.root.iterdir()
+            if d.is_dir() and d.name.startswith(prefix) and any(d.glob("part-*.parquet"))
+        )
+
+    def dataset(self, universes: Optional[List[str]] = None):
+        """pyarrow dataset over the store (optionally over some universes only)"""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        if universes is None:
+            files = sorted(self.root.glob(f"{PARTITION_COLUMN}=*/part-*.parquet"))
+        else:
+            files = sorted(
+                f for universe in universes
+                for f in self._partition_dir(universe).glob("part-*.parquet")
+            )
+        if not files:
+            return None
+
+        partitioning = ds.HivePartitioning(pa.schema([(PARTITION_COLUMN, pa.string())]))
+        # Footers only: unify per-file schemas (e.g. a metric that is int in one file, float in another)
+        schema = pa.unify_schemas(
+            [ds.dataset(f, format="parquet").schema for f in files],
+            promote_options="permissive"
+        )
+        schema = schema.append(pa.field(PARTITION_COLUMN, pa.string()))
+        return ds.dataset(
+            [str(f) for f in files], schema=schema, format="parquet",
+            partitioning=partitioning, partition_base_dir=str(self.root)
+        )
+
+    def load(self, columns: Optional[List[str]] = None,
+             filters: Optional[List] = None,
+             universes: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read metrics with column selection and predicate pushdown
+
+        Args:
+            columns: Columns to read (default: all). Key columns are always included.
+            filters: pyarrow/pandas-style filters, e.g. [("sharpe_ratio", ">", 1.0)]
+                or [[...], [...]] for OR of ANDs
+            universes: Only read these universes' partitions
+
+        Returns:
+            DataFrame with one row per (strategy_name, universe, lot_size)
+        """
+        dataset = self.dataset(universes)
+        if dataset is None:
+            return pd.DataFrame(columns=KEY_COLUMNS if columns is None else
+                                list(dict.fromkeys(KEY_COLUMNS + list(columns))))
+
+        import pyarrow.parquet as pq
+
+        if columns is not None:
+            columns = [c for c in dict.fromkeys(KEY_COLUMNS + list(columns)) if c in dataset.schema.names]
+        expression = pq.filters_to_expression(filters) if filters else None
+
+        table = dataset.to_table(columns=columns, filter=expression)
+        df = table.to_pandas()
+
+        # Key columns first, as in the JSON layout
+        ordered = KEY_COLUMNS + [c for c in df.columns if c not in KEY_COLUMNS]
+        return df[ordered]
+
+    def count(self) -> int:
+        """Number of stored rows (from Parquet footers)"""
+        import pyarrow.parquet as pq
+        return sum(
+            pq.ParquetFile(f).metadata.num_rows
+            for f in self.root.glob(f"{PARTITION_COLUMN}=*/part-*.parquet")
+        )
+
+    def import_json(self, metrics_file: Path) -> int:
+        """
+        Load an existing all_strategies_metrics.json into the store
+
+        Args:
+            metrics_file: Path to the legacy JSON file
+
+        Returns:
+            int: Number of rows imported
+        """
+        with open(metrics_file) as f:
+            strategies = json.load(f).get("strategies", [])
+
+        by_universe: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in strategies:
+            row = {"strategy_name": entry["strategy_name"], **entry.get("metrics", {})}
+            by_universe.setdefault(entry["universe"], []).append(row)
+
+        return sum(self.write(universe, rows) for universe, rows in by_universe.items())
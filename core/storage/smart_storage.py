@@ -7,6 +7,14 @@ Intelligent 2-tier storage system for backtest results:
 - Tier 1: Lightweight metrics for ALL strategies (fast loading)
 - Tier 2: Detailed trades for TOP N strategies only (on-demand)
 
+Tier 1 is either a single JSON file (metrics_backend="json") or the
+partitioned Parquet MetricsStore (metrics_backend="parquet"), which only
+writes the saved universe instead of rewriting every strategy.
+
+Tier 2 is either one indented JSON file per strategy (trades_backend="json")
+or one memory-mapped Arrow IPC TradeArchive file per universe
+(trades_backend="arrow") with O(1) lookup by strategy name.
+
 This reduces storage from ~115 GB to ~5 GB (95% reduction!)
 """
 
@@ -15,6 +23,9 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from .metrics_store import MetricsStore
+from .trade_archive import TradeArchive
+
 
 class SmartBacktestStorage:
     """
@@ -23,20 +34,36 @@ class SmartBacktestStorage:
     - Tier 2: Detailed trades for TOP N strategies only (heavy, on-demand)
     """
     
-    def __init__(self, output_dir: str = "ultra_necrozma_results/backtest_results"):
+    def __init__(self, output_dir: str = "ultra_necrozma_results/backtest_results",
+                 metrics_backend: str = "json", trades_backend: str = "json"):
         """
         Initialize smart storage
         
         Args:
             output_dir: Output directory for backtest results
+            metrics_backend: "json" (all_strategies_metrics.json) or
+                "parquet" (partitioned MetricsStore under metrics/)
+            trades_backend: "json" (one file per strategy) or
+                "arrow" (one TradeArchive file per universe)
         """
+        if metrics_backend not in ("json", "parquet"):
+            raise ValueError(f"Unknown metrics backend: {metrics_backend}")
+        if trades_backend not in ("json", "arrow"):
+            raise ValueError(f"Unknown trades backend: {trades_backend}")
+        
         self.output_dir = Path(output_dir)
+        self.metrics_backend = metrics_backend
+        self.trades_backend = trades_backend
         self.metrics_file = self.output_dir / "all_strategies_metrics.json"
+        self.metrics_dir = self.output_dir / "metrics"
         self.trades_dir = self.output_dir / "detailed_trades"
         
         # Create directories
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.trades_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.metrics_store = MetricsStore(self.metrics_dir) if metrics_backend == "parquet" else None
+        self.trade_archive = TradeArchive(self.trades_dir)
     
     def save_universe_results(self, universe_name: str, results: List[Dict], top_n: int = 50):
         """
@@ -52,27 +79,33 @@ class SmartBacktestStorage:
         # 1. Rank strategies by composite score
         ranked = self._rank_strategies(results)
         
-        # 2. Update global metrics file (ALL strategies)
-        all_metrics = self._load_all_metrics()
-        
-        for result in ranked:
-            strategy_metrics = {
-                "strategy_name": result["strategy_name"],
-                "universe": universe_name,
-                "metrics": self._extract_metrics_only(result)  # No trades!
-            }
+        # 2. Update global metrics (ALL strategies)
+        if self.metrics_store is not None:
+            self.metrics_store.write(
+                universe_name, [self._extract_metrics_only(result) for result in ranked]  # No trades!
+            )
+        else:
+            all_metrics = self._load_all_metrics()
+            index = self._metrics_index(all_metrics)
             
-            # Update or append
-            self._upsert_metrics(all_metrics, strategy_metrics)
-        
-        self._save_all_metrics(all_metrics)
+            for result in ranked:
+                strategy_metrics = {
+                    "strategy_name": result["strategy_name"],
+                    "universe": universe_name,
+                    "metrics": self._extract_metrics_only(result)  # No trades!
+                }
+                
+                # Update or append
+                self._upsert_metrics(all_metrics, strategy_metrics, index)
+            
+            self._save_all_metrics(all_metrics)
         
         # 3. Save detailed trades for TOP N only
         print(f"\n💾 Saving detailed trades for top {top_n} strategies...")
         
+        detailed_entries = []
         for i, result in enumerate(ranked[:top_n]):
             strategy_name = result["strategy_name"]
-            trade_file = self.trades_dir / f"{strategy_name}.json"
             
             # Save FULL data (metrics + trades + equity curve)
             detailed_data = {
@@ -85,16 +118,31 @@ class SmartBacktestStorage:
                 "drawdown_curve": result.get("drawdown_curve", [])
             }
             
+            if self.trades_backend == "arrow":
+                detailed_entries.append(detailed_data)
+                continue
+            
+            trade_file = self.trades_dir / f"{strategy_name}.json"
             with open(trade_file, 'w') as f:
                 json.dump(detailed_data, f, indent=2)
             
             file_size = trade_file.stat().st_size / 1e6
             print(f"  ✅ {i+1:2d}. {strategy_name[:50]:<50} ({file_size:.1f} MB)")
         
+        if detailed_entries:
+            archive_file = self.trade_archive.write_universe(universe_name, detailed_entries)
+            file_size = archive_file.stat().st_size / 1e6
+            print(f"  ✅ {len(detailed_entries)} strategies -> {archive_file.name} ({file_size:.1f} MB)")
+        
         # Print storage summary
         print(f"\n📊 Storage Summary:")
-        metrics_size = self.metrics_file.stat().st_size / 1e6 if self.metrics_file.exists() else 0
-        print(f"  All metrics: {len(all_metrics)} strategies ({metrics_size:.1f} MB)")
+        if self.metrics_store is not None:
+            n_metrics = self.metrics_store.count()
+            metrics_size = sum(f.stat().st_size for f in self.metrics_dir.rglob("*.parquet")) / 1e6
+        else:
+            n_metrics = len(all_metrics)
+            metrics_size = self.metrics_file.stat().st_size / 1e6 if self.metrics_file.exists() else 0
+        print(f"  All metrics: {n_metrics} strategies ({metrics_size:.1f} MB)")
         print(f"  Detailed trades: {min(top_n, len(ranked))} strategies saved")
     
     def load_strategy_trades(self, strategy_name: str) -> Optional[Dict]:
@@ -108,6 +156,10 @@ class SmartBacktestStorage:
         Returns:
             Dictionary with strategy data or None if not found
         """
+        archived = self.trade_archive.load(strategy_name)
+        if archived is not None:
+            return archived
+        
         trade_file = self.trades_dir / f"{strategy_name}.json"
         
         if not trade_file.exists():
@@ -116,6 +168,49 @@ class SmartBacktestStorage:
         with open(trade_file, 'r') as f:
             return json.load(f)
     
+    def load_metrics(self, columns: Optional[List[str]] = None,
+                     filters: Optional[List] = None,
+                     universes: Optional[List[str]] = None):
+        """
+        Load Tier 1 metrics as a flat DataFrame
+        
+        With the parquet backend, columns and filters are pushed down to
+        the Parquet reader; with the JSON backend they are applied after
+        loading the whole file.
+        
+        Args:
+            columns: Metric columns to return (key columns always included)
+            filters: Filters such as [("sharpe_ratio", ">", 1.0)]
+            universes: Only return these universes
+            
+        Returns:
+            DataFrame with one row per (strategy_name, universe, lot_size)
+        """
+        if self.metrics_store is not None:
+            return self.metrics_store.load(columns=columns, filters=filters, universes=universes)
+        
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from .metrics_store import KEY_COLUMNS
+        
+        rows = [
+            {"strategy_name": s["strategy_name"], "universe": s["universe"], **s.get("metrics", {})}
+            for s in self._load_all_metrics()
+            if universes is None or s["universe"] in universes
+        ]
+        if not rows:
+            return pd.DataFrame(columns=KEY_COLUMNS)
+        
+        df = MetricsStore._to_frame(rows)
+        df.insert(1, "universe", [row["universe"] for row in rows])
+        if filters:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            df = table.filter(pq.filters_to_expression(filters)).to_pandas()
+        if columns is not None:
+            df = df[[c for c in dict.fromkeys(KEY_COLUMNS + list(columns)) if c in df.columns]]
+        return df[KEY_COLUMNS + [c for c in df.columns if c not in KEY_COLUMNS]]
+    
     def get_available_detailed_strategies(self) -> List[str]:
         """
         Get list of strategies with detailed trades available
@@ -123,7 +218,8 @@ class SmartBacktestStorage:
         Returns:
             List of strategy names
         """
-        return [f.stem for f in self.trades_dir.glob("*.json")]
+        names = [f.stem for f in self.trades_dir.glob("*.json") if f.name != self.trade_archive.index_file.name]
+        return list(dict.fromkeys(names + self.trade_archive.strategies()))
     
     def _rank_strategies(self, results: List[Dict]) -> List[Dict]:
         """
@@ -213,22 +309,42 @@ class SmartBacktestStorage:
                 "strategies": metrics
             }, f, indent=2)
     
-    def _upsert_metrics(self, all_metrics: List[Dict], new_metric: Dict):
+    @staticmethod
+    def _metrics_key(metric: Dict) -> tuple:
+        """Primary key of a metrics entry: (strategy_name, universe, lot_size)"""
+        return (metric["strategy_name"], metric["universe"], metric.get("metrics", {}).get("lot_size"))
+    
+    def _metrics_index(self, all_metrics: List[Dict]) -> Dict:
+        """
+        Map each entry's primary key to its position in the metrics list
+        
+        Args:
+            all_metrics: List of all metrics
+            
+        Returns:
+            Dictionary of key -> list index
+        """
+        return {self._metrics_key(s): i for i, s in enumerate(all_metrics)}
+    
+    def _upsert_metrics(self, all_metrics: List[Dict], new_metric: Dict,
+                        index: Optional[Dict] = None):
         """
         Update existing or append new metric
         
         Args:
             all_metrics: List of all metrics (modified in place)
             new_metric: New metric to add or update
+            index: Optional key index from _metrics_index (kept in sync);
+                avoids scanning the list for every upsert
         """
-        existing_idx = next(
-            (i for i, s in enumerate(all_metrics) 
-             if s["strategy_name"] == new_metric["strategy_name"] 
-             and s["universe"] == new_metric["universe"]),
-            None
-        )
+        if index is None:
+            index = self._metrics_index(all_metrics)
+        
+        key = self._metrics_key(new_metric)
+        existing_idx = index.get(key)
         
         if existing_idx is not None:
             all_metrics[existing_idx] = new_metric
         else:
+            index[key] = len(all_metrics)
             all_metrics.append(new_metric)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - Detailed Trade Archive 💎🌟⚡
+
+Binary Tier 2 storage: one Arrow IPC file per universe
+(detailed_trades/<universe>.arrow) instead of one indented JSON file
+per strategy.
+
+- Each strategy is one record batch holding a single row:
+  strategy_name, rank, metrics (JSON), trades (list of structs),
+  equity_curve and drawdown_curve (lists of float64)
+- The file's schema metadata maps strategy_name -> batch number, and the
+  IPC footer holds every batch's offset, so one strategy is read without
+  touching the others
+- Files are memory-mapped and buffers are zstd-compressed; reading a
+  strategy only maps and decompresses that strategy's batch
+- archive_index.json maps strategy_name -> universe for lookups by
+  name alone (the most recently saved universe wins, as with the
+  per-strategy JSON files)
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+import pandas as pd
+
+
+ARCHIVE_FORMAT_VERSION = 1
+
+# Schema metadata key holding the strategy -> batch index
+ARCHIVE_METADATA_KEY = b"necrozma.trade_archive"
+
+ARCHIVE_SUFFIX = ".arrow"
+INDEX_FILE = "archive_index.json"
+
+
+class TradeArchive:
+    """
+    Per-universe Arrow IPC archive of detailed trades
+
+    Usage:
+        archive = TradeArchive("ultra_necrozma_results/backtest_results/detailed_trades")
+        archive.write_universe("universe_001_5min_5lb", entries)
+        data = archive.load("TrendFollower_L5_T0.5")           # legacy dict layout
+        trades_df = archive.load_trades_frame("TrendFollower_L5_T0.5")
+    """
+
+    def __init__(self, root: str, compression: Optional[str] = "zstd"):
+        """
+        Initialize trade archive
+
+        Args:
+            root: Archive directory (created if missing)
+            compression: IPC buffer codec for new files ("zstd", "lz4" or None)
+        """
+        self.root = Path(root)
+        self.compression = compression
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.root / INDEX_FILE
+        self._index = None
+
+    def _universe_file(self, universe: str) -> Path:
+        return self.root / f"{universe}{ARCHIVE_SUFFIX}"
+
+    # ═══════════════════════════════════════════════════════════════
+    # 📦 WRITE
+    # ═══════════════════════════════════════════════════════════════
+
+    def write_universe(self, universe: str, entries: List[Dict]) -> Path:
+        """
+        Write (or replace) the archive file of one universe
+
+        Args:
+            universe: Universe identifier
+            entries: Dicts with strategy_name, rank, metrics, trades,
+                equity_curve and drawdown_curve, best ranked first
+
+        Returns:
+            Path of the written file
+        """
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        rows = [
+            {
+                "strategy_name": str(entry["strategy_name"]),
+                "rank": int(entry.get("rank", i + 1)),
+                "metrics": json.dumps(entry.get("metrics", {}), default=str),
+                "trades": list(entry.get("trades") or []),
+                "equity_curve": [float(v) for v in entry.get("equity_curve") or []],
+                "drawdown_curve": [float(v) for v in entry.get("drawdown_curve") or []],
+            }
+            for i, entry in enumerate(entries)
+        ]
+
+        # Same name at several lot sizes: the best-ranked entry answers lookups
+        batch_index = {}
+        for i, row in enumerate(rows):
+            batch_index.setdefault(row["strategy_name"], i)
+
+        table = pa.Table.from_pylist(rows)
+        header = {
+            "format_version": ARCHIVE_FORMAT_VERSION,
+            "universe": universe,
+            "batches": batch_index,
+        }
+        schema = table.schema.with_metadata({ARCHIVE_METADATA_KEY: json.dumps(header).encode()})
+        table = table.replace_schema_metadata(schema.metadata)
+
+        path = self._universe_file(universe)
+        tmp = path.with_suffix(".tmp")
+        with pa.OSFile(str(tmp), "wb") as sink:
+            options = ipc.IpcWriteOptions(compression=self.compression)
+            with ipc.new_file(sink, schema, options=options) as writer:
+                # One single-row batch per strategy -> random access by batch number
+                for batch in table.to_batches(max_chunksize=1):
+                    writer.write_batch(batch)
+        tmp.replace(path)
+
+        index = self._load_index()
+        index.update({name: universe for name in batch_index})
+        self._save_index(index)
+
+        return path
+
+    def _load_index(self) -> Dict[str, str]:
+        if self._index is None:
+            if self.index_file.exists():
+                with open(self.index_file) as f:
+                    self._index = json.load(f)
+            else:
+                self._index = {}
+        return self._index
+
+    def _save_index(self, index: Dict[str, str]):
+        tmp = self.index_file.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        tmp.replace(self.index_file)
+        self._index = index
+
+    # ═══════════════════════════════════════════════════════════════
+    # 📥 READ
+    # ═══════════════════════════════════════════════════════════════
+
+    def strategies(self) -> List[str]:
+        """Strategy names with archived trades"""
+        return list(self._load_index())
+
+    def universes(self) -> List[str]:
+        """Universes with an archive file"""
+        return sorted(f.stem for f in self.root.glob(f"*{ARCHIVE_SUFFIX}"))
+
+    def _read_batch(self, strategy_name: str, universe: Optional[str] = None):
+        """
+        Memory-map the universe file and read one strategy's batch
+
+        Returns:
+            Tuple of (RecordBatch, universe) or (None, None) if not archived
+        """
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        if universe is None:
+            universe = self._load_index().get(strategy_name)
+            if universe is None:
+                return None, None
+
+        path = self._universe_file(universe)
+        if not path.exists():
+            return None, None
+
+        reader = ipc.open_file(pa.memory_map(str(path), "r"))
+        header = json.loads(reader.schema.metadata[ARCHIVE_METADATA_KEY])
+        batch_number = header["batches"].get(strategy_name)
+        if batch_number is None:
+            return None, None
+        return reader.get_batch(batch_number), universe
+
+    def load(self, strategy_name: str, universe: Optional[str] = None) -> Optional[Dict]:
+        """
+        Load one strategy in the layout of the per-strategy JSON files
+
+        Args:
+            strategy_name: Name of the strategy
+            universe: Universe to read (default: looked up in the index)
+
+        Returns:
+            Dictionary with strategy data or None if not archived
+        """
+        batch, universe = self._read_batch(strategy_name, universe)
+        if batch is None:
+            return None
+
+        row = batch.to_pylist()[0]
+        return {
+            "strategy_name": row["strategy_name"],
+            "universe": universe,
+            "rank": row["rank"],
+            "metrics": json.loads(row["metrics"]),
+            "trades": row["trades"] or [],
+            "equity_curve": row["equity_curve"] or [],
+            "drawdown_curve": row["drawdown_curve"] or [],
+        }
+
+    def load_trades_frame(self, strategy_name: str, universe: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Load one strategy's trades directly as a DataFrame
+
+        Top-level trade fields become columns; nested fields (market_context,
+        price_history) stay as dicts/lists.
+
+        Args:
+            strategy_name: Name of the strategy
+            universe: Universe to read (default: looked up in the index)
+
+        Returns:
+            DataFrame with one row per trade, or None if not archived
+        """
+        import pyarrow as pa
+
+        batch, _ = self._read_batch(strategy_name, universe)
+        if batch is None:
+            return None
+
+        trades = batch.column(batch.schema.get_field_index("trades")).flatten()
+        if not pa.types.is_struct(trades.type):
+            return pd.DataFrame()
+        return pa.Table.from_arrays(trades.flatten(), names=[f.name for f in trades.type]).to_pandas()
+
+    def load_curves(self, strategy_name: str, universe: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Load one strategy's equity and drawdown curves as float64 arrays
+
+        Args:
+            strategy_name: Name of the strategy
+            universe: Universe to read (default: looked up in the index)
+
+        Returns:
+            Dict with equity_curve and drawdown_curve, or None if not archived
+        """
+        batch, _ = self._read_batch(strategy_name, universe)
+        if batch is None:
+            return None
+
+        return {
+            name: batch.column(batch.schema.get_field_index(name)).flatten().to_numpy(zero_copy_only=False)
+            for name in ("equity_curve", "drawdown_curve")
+        }
@@ -439,6 +439,52 @@ def create_distribution_chart(data: pd.Series,
     return fig
 
 
+def create_binned_distribution_chart(histogram: Dict,
+                                     title: str = "",
+                                     x_label: str = "") -> go.Figure:
+    """
+    Create distribution histogram from precomputed bin counts
+    
+    Args:
+        histogram: Dict with edges, counts and mean (see query.metric_histogram)
+        title: Chart title
+        x_label: X-axis label
+        
+    Returns:
+        Plotly figure
+    """
+    edges = np.asarray(histogram['edges'])
+    centers = (edges[:-1] + edges[1:]) / 2
+    
+    fig = go.Figure(data=[go.Bar(
+        x=centers,
+        y=histogram['counts'],
+        width=np.diff(edges),
+        marker_color='#667eea',
+        name='Distribution'
+    )])
+    
+    if histogram.get('mean') is not None:
+        fig.add_vline(
+            x=histogram['mean'],
+            line_dash="dash",
+            line_color="red",
+            annotation_text=f"Mean: {histogram['mean']:.2f}",
+            annotation_position="top"
+        )
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_label,
+        yaxis_title='Frequency',
+        template='plotly_white',
+        showlegend=False,
+        bargap=0
+    )
+    
+    return fig
+
+
 def create_comparison_chart(df: pd.DataFrame,
                            strategies: List[str],
                            metrics: List[str],
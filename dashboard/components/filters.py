@@ -311,3 +311,122 @@ def create_parquet_filters(df: pd.DataFrame) -> dict:
         st.rerun()
     
     return filters
+
+
+def create_query_filters(options: dict) -> dict:
+    """
+    Create the filter panel from query-layer filter options
+    
+    Same widgets as create_parquet_filters, but built from precomputed
+    values and ranges (dashboard.utils.query.filter_options) instead of
+    a DataFrame of all strategies.
+    
+    Args:
+        options: Output of filter_options()
+        
+    Returns:
+        Dictionary of applied filters in the query-layer layout
+    """
+    st.sidebar.header("🔍 Filters")
+    
+    filters = {}
+    
+    # Universe filter (if available)
+    if len(options.get('universe', [])) > 1:
+        st.sidebar.subheader("Universe")
+        selected_universes = st.sidebar.multiselect(
+            "Select Universes",
+            options=options['universe'],
+            default=[]
+        )
+        if selected_universes:
+            filters['universe'] = selected_universes
+    
+    # Lot Size filter (if available)
+    if options.get('lot_size'):
+        st.sidebar.subheader("Lot Size")
+        lot_sizes = sorted(options['lot_size'])
+        selected_lots = st.sidebar.multiselect(
+            "Select Lot Sizes",
+            options=lot_sizes,
+            default=lot_sizes
+        )
+        if selected_lots and len(selected_lots) < len(lot_sizes):
+            filters['lot_size'] = selected_lots
+    
+    # Strategy Template filter
+    if options.get('template'):
+        st.sidebar.subheader("Strategy Template")
+        templates = sorted(options['template'])
+        selected_templates = st.sidebar.multiselect(
+            "Select Templates",
+            options=templates,
+            default=templates
+        )
+        if selected_templates and len(selected_templates) < len(templates):
+            filters['template'] = selected_templates
+    
+    # Sharpe Ratio filter
+    if 'sharpe_ratio' in options:
+        st.sidebar.subheader("Performance Metrics")
+        sharpe_min, sharpe_max = options['sharpe_ratio']
+        sharpe_max = max(sharpe_max, sharpe_min + 0.1)  # Ensure max > min
+        min_sharpe = st.sidebar.slider(
+            "Min Sharpe Ratio",
+            min_value=sharpe_min,
+            max_value=sharpe_max,
+            value=sharpe_min,
+            step=0.1
+        )
+        if min_sharpe > sharpe_min:
+            filters['sharpe_ratio'] = (min_sharpe, None)
+    
+    # Win Rate filter
+    if 'win_rate' in options:
+        min_win_rate = st.sidebar.slider(
+            "Min Win Rate (%)",
+            min_value=0.0,
+            max_value=100.0,
+            value=0.0,
+            step=5.0
+        )
+        if min_win_rate > 0:
+            filters['win_rate'] = (min_win_rate / 100.0, None)
+    
+    # Max Drawdown filter
+    if 'max_drawdown' in options:
+        dd_max = float(abs(options['max_drawdown'][0]) * 100)
+        dd_max = max(dd_max, 1.0)  # Ensure max > min
+        max_dd = st.sidebar.slider(
+            "Max Drawdown (%)",
+            min_value=0.0,
+            max_value=dd_max,
+            value=dd_max,
+            step=5.0
+        )
+        if max_dd < dd_max:
+            filters['max_drawdown'] = (-max_dd / 100.0, None)
+    
+    # Min Trades filter
+    if 'n_trades' in options:
+        trades_max = int(options['n_trades'][1])
+        trades_max = max(trades_max, 10)  # Ensure max > min
+        min_trades = st.sidebar.slider(
+            "Min Number of Trades",
+            min_value=0,
+            max_value=trades_max,
+            value=0,
+            step=10
+        )
+        if min_trades > 0:
+            filters['min_trades'] = min_trades
+    
+    # Reset button
+    if st.sidebar.button("🔄 Reset All Filters"):
+        # Clear session state if it exists
+        if hasattr(st, 'session_state'):
+            for key in list(st.session_state.keys()):
+                del st.session_state[key]
+        st.rerun()
+    
+    return filters
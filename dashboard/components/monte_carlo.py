@@ -3,7 +3,8 @@
 """
 ⚡🌟💎 NECROZMA - Monte Carlo Simulation Component 💎🌟⚡
 
-Monte Carlo simulation for strategy performance - LIMITED TO TOP 10 STRATEGIES ONLY
+Monte Carlo simulation for strategy performance, built on the vectorized
+engine in monte_carlo_engine (100k simulations stay interactive)
 """
 
 import plotly.graph_objects as go
@@ -11,14 +12,24 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional
 
+from monte_carlo_engine import simulate_equity, summarize_simulation
+
+
+def _trade_profits(trades: List[Dict]) -> np.ndarray:
+    """Profit of each trade ('profit', or 'pnl_usd' for detailed trades)"""
+    key = 'profit' if 'profit' in trades[0] else 'pnl_usd'
+    return np.array([t[key] for t in trades], dtype=np.float64)
+
 
 def render_monte_carlo(
     trades: List[Dict],
     simulations: int = 1000,
-    initial_capital: float = 10000.0
+    initial_capital: float = 10000.0,
+    method: str = "bootstrap",
+    result: Optional[Dict] = None
 ) -> go.Figure:
     """
-    Generate Monte Carlo simulation chart - FOR TOP 10 STRATEGIES ONLY
+    Generate Monte Carlo simulation chart
     
     Simulates random trade order to show:
     - Pessimistic scenario (5th percentile)
@@ -28,9 +39,11 @@ def render_monte_carlo(
     - Probability of ruin
     
     Args:
-        trades: List of trade dictionaries with 'profit' key
+        trades: List of trade dictionaries with 'profit' (or 'pnl_usd') key
         simulations: Number of Monte Carlo simulations (default: 1000)
         initial_capital: Starting capital
+        method: "bootstrap" (resample with replacement) or "permutation"
+        result: Precomputed simulate_equity result (skips the simulation)
         
     Returns:
         Plotly figure object
@@ -47,49 +60,26 @@ def render_monte_carlo(
         )
         return fig
     
-    # Extract profits
-    profits = np.array([t['profit'] for t in trades])
-    n_trades = len(profits)
-    
-    # Run Monte Carlo simulations
-    simulated_equity_curves = []
-    final_equities = []
-    
-    np.random.seed(42)
-    
-    for sim in range(simulations):
-        # Randomly shuffle trade order
-        shuffled_profits = np.random.choice(profits, size=n_trades, replace=True)
-        
-        # Calculate equity curve
-        cumulative_profit = np.cumsum(shuffled_profits)
-        equity_curve = initial_capital + cumulative_profit
-        
-        simulated_equity_curves.append(equity_curve)
-        final_equities.append(equity_curve[-1])
-    
-    # Convert to array for percentile calculations
-    simulated_equity_curves = np.array(simulated_equity_curves)
-    
-    # Calculate percentiles at each point
-    p5 = np.percentile(simulated_equity_curves, 5, axis=0)    # Pessimistic
-    p50 = np.percentile(simulated_equity_curves, 50, axis=0)   # Median
-    p95 = np.percentile(simulated_equity_curves, 95, axis=0)   # Optimistic
+    if result is None:
+        result = simulate_equity(
+            _trade_profits(trades), simulations=simulations,
+            initial_capital=initial_capital, method=method
+        )
+    simulations = result["simulations"]
     
-    # Calculate statistics
-    final_equities = np.array(final_equities)
-    prob_profit = (final_equities > initial_capital).mean() * 100
-    prob_ruin = (final_equities < initial_capital * 0.5).mean() * 100  # 50% loss = ruin
+    p5 = result["bands"][5]      # Pessimistic
+    p50 = result["bands"][50]    # Median
+    p95 = result["bands"][95]    # Optimistic
     
-    median_final = np.median(final_equities)
-    pessimistic_final = np.percentile(final_equities, 5)
-    optimistic_final = np.percentile(final_equities, 95)
+    prob_profit = result["prob_profit"]
+    prob_ruin = result["prob_ruin"]
+    median_final = np.median(result["final_equities"])
     
     # Create figure
     fig = go.Figure()
     
     # Trade numbers for x-axis
-    trade_nums = list(range(1, n_trades + 1))
+    trade_nums = result["trade_numbers"].tolist()
     
     # Optimistic scenario (95th percentile)
     fig.add_trace(go.Scatter(
@@ -180,7 +170,8 @@ def render_monte_carlo(
 def calculate_monte_carlo_stats(
     trades: List[Dict],
     simulations: int = 1000,
-    initial_capital: float = 10000.0
+    initial_capital: float = 10000.0,
+    method: str = "bootstrap"
 ) -> Dict:
     """
     Calculate Monte Carlo statistics without visualization
@@ -189,6 +180,7 @@ def calculate_monte_carlo_stats(
         trades: List of trade dictionaries
         simulations: Number of simulations
         initial_capital: Starting capital
+        method: "bootstrap" or "permutation"
         
     Returns:
         Dictionary with Monte Carlo statistics
@@ -196,40 +188,51 @@ def calculate_monte_carlo_stats(
     if not trades:
         return {}
     
-    profits = np.array([t['profit'] for t in trades])
-    n_trades = len(profits)
+    return summarize_simulation(simulate_equity(
+        _trade_profits(trades), simulations=simulations,
+        initial_capital=initial_capital, method=method
+    ))
+
+
+def render_drawdown_distribution(result: Dict, bins: int = 50) -> go.Figure:
+    """
+    Histogram of simulated max drawdowns and final equities
     
-    final_equities = []
-    max_drawdowns = []
+    Args:
+        result: simulate_equity result
+        bins: Number of histogram bins
+        
+    Returns:
+        Plotly figure object
+    """
+    from plotly.subplots import make_subplots
     
-    np.random.seed(42)
+    fig = make_subplots(rows=1, cols=2, subplot_titles=("Max Drawdown ($)", "Final Equity ($)"))
+    if not result:
+        return fig
     
-    for sim in range(simulations):
-        shuffled_profits = np.random.choice(profits, size=n_trades, replace=True)
-        cumulative_profit = np.cumsum(shuffled_profits)
-        equity_curve = initial_capital + cumulative_profit
-        
-        # Final equity
-        final_equities.append(equity_curve[-1])
-        
-        # Max drawdown
-        peak = np.maximum.accumulate(equity_curve)
-        drawdown = equity_curve - peak
-        max_dd = drawdown.min()
-        max_drawdowns.append(max_dd)
-    
-    final_equities = np.array(final_equities)
-    max_drawdowns = np.array(max_drawdowns)
-    
-    return {
-        'prob_profit': (final_equities > initial_capital).mean() * 100,
-        'prob_ruin': (final_equities < initial_capital * 0.5).mean() * 100,
-        'median_final': np.median(final_equities),
-        'p5_final': np.percentile(final_equities, 5),
-        'p95_final': np.percentile(final_equities, 95),
-        'median_max_dd': np.median(max_drawdowns),
-        'p95_max_dd': np.percentile(max_drawdowns, 95),
-    }
+    for col, (values, color) in enumerate([
+        (result["max_drawdowns"], 'rgba(245, 101, 101, 0.7)'),
+        (result["final_equities"], 'rgba(102, 126, 234, 0.7)'),
+    ], start=1):
+        counts, edges = np.histogram(values, bins=bins)
+        fig.add_trace(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts / len(values) * 100,
+            width=np.diff(edges),
+            marker_color=color,
+            showlegend=False,
+            hovertemplate='<b>$%{x:,.0f}</b><br>%{y:.2f}% of runs<extra></extra>'
+        ), row=1, col=col)
+    
+    fig.add_vline(x=result["ruin_level"], line_dash="dot", line_color="red", row=1, col=2)
+    fig.update_yaxes(title_text="% of Simulations", row=1, col=1)
+    fig.update_layout(
+        template='plotly_white',
+        height=350,
+        bargap=0
+    )
+    return fig
 
 
 if __name__ == "__main__":
@@ -243,10 +246,10 @@ if __name__ == "__main__":
         profit = np.random.normal(50, 100)
         trades.append({'profit': profit})
     
-    fig = render_monte_carlo(trades, simulations=1000)
+    fig = render_monte_carlo(trades, simulations=100_000)
     fig.show()
     
-    stats = calculate_monte_carlo_stats(trades, simulations=1000)
+    stats = calculate_monte_carlo_stats(trades, simulations=100_000)
     print("\nMonte Carlo Statistics:")
     for key, value in stats.items():
         print(f"  {key}: {value:.2f}")
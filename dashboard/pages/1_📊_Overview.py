@@ -15,10 +15,18 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from dashboard.utils.data_loader import load_all_results, detect_data_format, extract_strategy_template
-from dashboard.components.charts import create_bar_chart, create_pie_chart, create_distribution_chart
+from dashboard.utils.query import (
+    has_query_source, filter_options, summary_metrics, query_strategies, metric_histogram,
+    HISTOGRAM_SCALES
+)
+from dashboard.components.charts import (
+    create_bar_chart, create_pie_chart, create_distribution_chart, create_binned_distribution_chart
+)
 from dashboard.components.metrics import calculate_summary_metrics, get_top_strategies
 from dashboard.components.tables import create_sortable_table
-from dashboard.components.filters import create_parquet_filters, apply_filters, show_filter_summary
+from dashboard.components.filters import (
+    create_parquet_filters, create_query_filters, apply_filters, show_filter_summary
+)
 from dashboard.utils.formatters import format_percentage, format_number
 
 # Page config
@@ -27,25 +35,41 @@ st.set_page_config(page_title="Overview", page_icon="📊", layout="wide")
 st.title("🏆 Performance Overview")
 st.markdown("Global performance summary across all strategies")
 
-# Load data
-with st.spinner("Loading backtest results..."):
-    results = load_all_results()
-    data_format = detect_data_format()
+# Parquet results are queried with pushdown filters and cached aggregates;
+# legacy JSON results are loaded into memory
+use_query = has_query_source()
+data_format = detect_data_format()
 
-if results['total_strategies'] == 0:
+if use_query:
+    with st.spinner("Scanning backtest results..."):
+        options = filter_options()
+    total_strategies = options['total_strategies']
+else:
+    with st.spinner("Loading backtest results..."):
+        results = load_all_results()
+    total_strategies = results.get('total_strategies', len(results.get('strategies_df', [])))
+
+if total_strategies == 0:
     st.error("❌ No backtest results found. Please run backtests first.")
     st.info("💡 Run batch processing or sequential backtest to generate results")
     st.stop()
 
-strategies_df = results.get('strategies_df')
-
 # Show data source
-data_source = results['metadata'].get('data_source', 'unknown')
-st.info(f"📊 Data Source: **{data_source}** | Format: **{data_format}**")
+if use_query:
+    st.info(f"📊 Data Source: **query layer (Parquet)** | Format: **{data_format}**")
+    filters = create_query_filters(options)
+    summary = summary_metrics(filters)
+    show_filter_summary(total_strategies, summary['total_strategies'])
+    filtered_df = None
+else:
+    strategies_df = results.get('strategies_df')
+    data_source = results['metadata'].get('data_source', 'unknown')
+    st.info(f"📊 Data Source: **{data_source}** | Format: **{data_format}**")
 
 # Apply filters for parquet format
-filtered_df = strategies_df.copy()
-if data_format == 'parquet':
+if not use_query:
+    filtered_df = strategies_df.copy()
+if not use_query and data_format == 'parquet':
     filters = create_parquet_filters(strategies_df)
     
     # Apply filters
@@ -68,16 +92,16 @@ if data_format == 'parquet':
         min_val, max_val = filters['n_trades']
         filtered_df = filtered_df[(filtered_df['n_trades'] >= min_val) & (filtered_df['n_trades'] <= max_val)]
 
-# Show filter summary
-show_filter_summary(len(strategies_df), len(filtered_df))
+if not use_query:
+    # Show filter summary
+    show_filter_summary(len(strategies_df), len(filtered_df))
+    summary = calculate_summary_metrics(filtered_df)
 
 st.markdown("---")
 
 # Summary metrics
 st.header("📈 Summary Metrics")
 
-summary = calculate_summary_metrics(filtered_df)
-
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
@@ -142,8 +166,14 @@ st.markdown("---")
 # Top strategies
 st.header("🏆 Top Strategies by Sharpe Ratio")
 
-if filtered_df is not None and not filtered_df.empty:
+if use_query:
+    top_20 = query_strategies(filters, top_n=300, sort_by='sharpe_ratio')
+elif filtered_df is not None and not filtered_df.empty:
     top_20 = get_top_strategies(filtered_df, by='sharpe_ratio', n=300)
+else:
+    top_20 = None
+
+if top_20 is not None:
     
     if not top_20.empty:
         # Display table
@@ -227,8 +257,22 @@ if filtered_df is not None and not filtered_df.empty:
         
         col1, col2, col3 = st.columns(3)
         
+        if use_query:
+            # Server-side histograms: bin counts are cached, rows never loaded
+            distributions = [
+                (col1, 'sharpe_ratio', "Sharpe Ratio Distribution", "Sharpe Ratio"),
+                (col2, 'win_rate', "Win Rate Distribution", "Win Rate (%)"),
+                (col3, 'max_drawdown', "Max Drawdown Distribution", "Max Drawdown (%)"),
+            ]
+            for column, metric, title, x_label in distributions:
+                histogram = metric_histogram(metric, bins=30, filters=filters, scale=HISTOGRAM_SCALES[metric])
+                if histogram is not None:
+                    with column:
+                        fig = create_binned_distribution_chart(histogram, title=title, x_label=x_label)
+                        st.plotly_chart(fig, use_container_width=True)
+        
         with col1:
-            if 'sharpe_ratio' in filtered_df.columns:
+            if not use_query and 'sharpe_ratio' in filtered_df.columns:
                 fig = create_distribution_chart(
                     filtered_df['sharpe_ratio'].dropna(),
                     title="Sharpe Ratio Distribution",
@@ -237,7 +281,7 @@ if filtered_df is not None and not filtered_df.empty:
                 st.plotly_chart(fig, use_container_width=True)
         
         with col2:
-            if 'win_rate' in filtered_df.columns:
+            if not use_query and 'win_rate' in filtered_df.columns:
                 wr_data = filtered_df['win_rate'].dropna()
                 # Convert to percentage if needed
                 if wr_data.abs().max() <= 1:
@@ -250,7 +294,7 @@ if filtered_df is not None and not filtered_df.empty:
                 st.plotly_chart(fig, use_container_width=True)
         
         with col3:
-            if 'max_drawdown' in filtered_df.columns:
+            if not use_query and 'max_drawdown' in filtered_df.columns:
                 dd_data = filtered_df['max_drawdown'].dropna().abs()
                 if dd_data.max() <= 1:
                     dd_data = dd_data * 100
@@ -15,9 +15,12 @@ import pandas as pd
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from dashboard.utils.data_loader import load_all_results, detect_data_format, extract_strategy_template
+from dashboard.utils.query import (
+    has_query_source, filter_options, aggregate_strategies, template_performance, lot_size_impact
+)
 from dashboard.components.charts import create_performance_matrix, create_bar_chart
 from dashboard.components.metrics import calculate_template_performance, calculate_lot_size_impact
-from dashboard.components.filters import create_parquet_filters, show_filter_summary
+from dashboard.components.filters import create_parquet_filters, create_query_filters, show_filter_summary
 
 # Page config
 st.set_page_config(page_title="Performance Matrix", page_icon="📈", layout="wide")
@@ -25,34 +28,53 @@ st.set_page_config(page_title="Performance Matrix", page_icon="📈", layout="wi
 st.title("📈 Performance Matrix")
 st.markdown("Analyze strategy performance across templates and lot sizes")
 
-# Load data
-with st.spinner("Loading backtest results..."):
-    results = load_all_results()
-    data_format = detect_data_format()
-
-if results['total_strategies'] == 0:
-    st.error("❌ No backtest results found.")
-    st.stop()
-
-strategies_df = results.get('strategies_df')
-
-# Add template column
-if 'strategy_name' in strategies_df.columns:
-    strategies_df['template'] = strategies_df['strategy_name'].apply(extract_strategy_template)
+# Parquet results are aggregated by the query layer; legacy JSON results
+# are loaded into memory
+use_query = has_query_source()
 
-# Apply filters
-filtered_df = strategies_df.copy()
-if data_format == 'parquet':
-    filters = create_parquet_filters(strategies_df)
+if use_query:
+    with st.spinner("Scanning backtest results..."):
+        options = filter_options()
     
-    if 'lot_size' in filters and filters['lot_size']:
-        filtered_df = filtered_df[filtered_df['lot_size'].isin(filters['lot_size'])]
+    if options['total_strategies'] == 0:
+        st.error("❌ No backtest results found.")
+        st.stop()
     
-    if 'template' in filters and filters['template']:
-        filtered_df['template'] = filtered_df['strategy_name'].apply(extract_strategy_template)
-        filtered_df = filtered_df[filtered_df['template'].isin(filters['template'])]
-
-show_filter_summary(len(strategies_df), len(filtered_df))
+    filters = create_query_filters(options)
+    filtered_count = aggregate_strategies((), (), filters)['count'].sum()
+    show_filter_summary(options['total_strategies'], int(filtered_count))
+    has_lot_size = bool(options.get('lot_size'))
+    has_template = bool(options.get('template'))
+else:
+    with st.spinner("Loading backtest results..."):
+        results = load_all_results()
+        data_format = detect_data_format()
+    
+    if results['total_strategies'] == 0:
+        st.error("❌ No backtest results found.")
+        st.stop()
+    
+    strategies_df = results.get('strategies_df')
+    
+    # Add template column
+    if 'strategy_name' in strategies_df.columns:
+        strategies_df['template'] = strategies_df['strategy_name'].apply(extract_strategy_template)
+    
+    # Apply filters
+    filtered_df = strategies_df.copy()
+    if data_format == 'parquet':
+        filters = create_parquet_filters(strategies_df)
+        
+        if 'lot_size' in filters and filters['lot_size']:
+            filtered_df = filtered_df[filtered_df['lot_size'].isin(filters['lot_size'])]
+        
+        if 'template' in filters and filters['template']:
+            filtered_df['template'] = filtered_df['strategy_name'].apply(extract_strategy_template)
+            filtered_df = filtered_df[filtered_df['template'].isin(filters['template'])]
+    
+    show_filter_summary(len(strategies_df), len(filtered_df))
+    has_lot_size = 'lot_size' in filtered_df.columns
+    has_template = 'template' in filtered_df.columns
 
 st.markdown("---")
 
@@ -65,14 +87,24 @@ metric_choice = st.selectbox(
     index=0
 )
 
+if use_query:
+    # One row per (template, lot size): mean for the heatmap, max for the "best" tables
+    cells = aggregate_strategies(('template', 'lot_size'), (metric_choice,), filters)
+    metric_available = f"{metric_choice}_mean" in cells.columns
+    if metric_available:
+        matrix_df = cells.rename(columns={f"{metric_choice}_mean": metric_choice})
+else:
+    metric_available = metric_choice in filtered_df.columns
+    matrix_df = filtered_df
+
 # Check if we have lot_size data (parquet format)
-if 'lot_size' in filtered_df.columns and 'template' in filtered_df.columns:
-    if metric_choice in filtered_df.columns:
+if has_lot_size and has_template:
+    if metric_available:
         st.subheader(f"{metric_choice.replace('_', ' ').title()} by Template and Lot Size")
         
         try:
             fig = create_performance_matrix(
-                filtered_df,
+                matrix_df,
                 index_col='template',
                 columns_col='lot_size',
                 values_col=metric_choice,
@@ -84,19 +116,25 @@ if 'lot_size' in filtered_df.columns and 'template' in filtered_df.columns:
             # Summary statistics
             col1, col2 = st.columns(2)
             
-            with col1:
-                st.subheader("Best Template per Lot Size")
+            if use_query:
+                best_cells = cells.rename(columns={f"{metric_choice}_max": metric_choice}).dropna(subset=[metric_choice])
+                best_by_lot = best_cells.loc[best_cells.groupby('lot_size')[metric_choice].idxmax(), ['template', metric_choice]]
+                best_by_template = best_cells.loc[best_cells.groupby('template')[metric_choice].idxmax(), ['lot_size', metric_choice]]
+            else:
                 best_by_lot = filtered_df.groupby('lot_size').apply(
                     lambda x: x.nlargest(1, metric_choice)[['template', metric_choice]]
-                ).reset_index(drop=True)
-                st.dataframe(best_by_lot, use_container_width=True)
+                )
+                best_by_template = filtered_df.groupby('template').apply(
+                    lambda x: x.nlargest(1, metric_choice)[['lot_size', metric_choice]]
+                )
+            
+            with col1:
+                st.subheader("Best Template per Lot Size")
+                st.dataframe(best_by_lot.reset_index(drop=True), use_container_width=True)
             
             with col2:
                 st.subheader("Best Lot Size per Template")
-                best_by_template = filtered_df.groupby('template').apply(
-                    lambda x: x.nlargest(1, metric_choice)[['lot_size', metric_choice]]
-                ).reset_index(drop=True)
-                st.dataframe(best_by_template, use_container_width=True)
+                st.dataframe(best_by_template.reset_index(drop=True), use_container_width=True)
         
         except Exception as e:
             st.error(f"Error creating heatmap: {e}")
@@ -110,7 +148,7 @@ st.markdown("---")
 # Template Performance Analysis
 st.header("📊 Template Performance Analysis")
 
-template_stats = calculate_template_performance(filtered_df)
+template_stats = template_performance(filters) if use_query else calculate_template_performance(filtered_df)
 
 if not template_stats.empty:
     st.subheader("Performance by Strategy Template")
@@ -144,10 +182,10 @@ if not template_stats.empty:
 st.markdown("---")
 
 # Lot Size Impact Analysis
-if 'lot_size' in filtered_df.columns:
+if has_lot_size:
     st.header("🔧 Lot Size Impact Analysis")
     
-    lot_stats = calculate_lot_size_impact(filtered_df)
+    lot_stats = lot_size_impact(filters) if use_query else calculate_lot_size_impact(filtered_df)
     
     if not lot_stats.empty:
         st.subheader("Performance Metrics by Lot Size")
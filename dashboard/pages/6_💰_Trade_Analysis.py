@@ -24,6 +24,17 @@ from dashboard.utils.data_loader import (
 from dashboard.utils.formatters import (
     format_currency, format_datetime
 )
+from dashboard.components.monte_carlo import (
+    render_monte_carlo, render_drawdown_distribution
+)
+from monte_carlo_engine import simulate_equity, summarize_simulation
+from config import TRADE_ANALYSIS_CONFIG
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def run_monte_carlo(strategy_name: str, profits: tuple, simulations: int, method: str):
+    """Cached Monte Carlo run for one strategy's trade profits"""
+    return simulate_equity(list(profits), simulations=simulations, method=method)
 
 # Page config
 st.set_page_config(page_title="Trade Analysis", page_icon="💰", layout="wide")
@@ -50,14 +61,14 @@ strategies_with_trades = get_strategies_with_trades()
 if not strategies_with_trades:
     st.warning("⚠️ No detailed trades available. Run backtest to generate trade data.")
     st.info("""
-    **Note:** Only the top 50 strategies per universe have detailed trade data saved.
+    **Note:** Only the top N strategies per universe (STORAGE_CONFIG["detailed_trades_top_n"]) have detailed trade data saved.
     
     This is by design to keep storage manageable while still allowing deep analysis 
     of the best performers.
     
     **To generate detailed trades:**
     1. Run backtests with the updated system
-    2. Top 50 strategies per universe will have detailed trades saved
+    2. The top N strategies per universe will have detailed trades saved
     3. Return to this page to analyze them
     """)
     
@@ -119,9 +130,9 @@ if sort_col in available_metrics.columns:
     available_metrics = available_metrics.sort_values(sort_col, ascending=False)
 
 selected_strategy = st.sidebar.selectbox(
-    "Select Strategy (Top 50 only)",
+    "Select Strategy (Top N only)",
     options=available_metrics['strategy_name'].tolist(),
-    help="Only top 50 strategies per universe have detailed trade data saved"
+    help="Only the top N strategies per universe have detailed trade data saved"
 )
 
 if selected_strategy:
@@ -258,6 +269,42 @@ if selected_strategy:
     else:
         st.warning("No trade data available for this strategy")
     
+    # Monte Carlo (any strategy with detailed trades)
+    if trades and 'pnl_usd' in trades_df:
+        st.markdown("---")
+        st.subheader("🎲 Monte Carlo Simulation")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            mc_simulations = st.select_slider(
+                "Simulations",
+                options=[n for n in (1_000, 10_000, 25_000, 50_000, 100_000)
+                         if n <= TRADE_ANALYSIS_CONFIG.get("monte_carlo_max_simulations", 100_000)],
+                value=TRADE_ANALYSIS_CONFIG.get("monte_carlo_simulations", 10_000)
+            )
+        with col2:
+            mc_method = st.radio(
+                "Method", ["bootstrap", "permutation"], horizontal=True,
+                help="bootstrap: resample trades with replacement; permutation: shuffle trade order"
+            )
+        
+        with st.spinner(f"Running {mc_simulations:,} simulations..."):
+            mc_result = run_monte_carlo(
+                selected_strategy, tuple(trades_df['pnl_usd'].astype(float)), mc_simulations, mc_method
+            )
+        
+        st.plotly_chart(render_monte_carlo(trades, result=mc_result), use_container_width=True)
+        
+        mc_stats = summarize_simulation(mc_result)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Profit Probability", f"{mc_stats['prob_profit']:.1f}%")
+        col2.metric("Ruin Probability", f"{mc_stats['prob_ruin_touched']:.1f}%",
+                    help="Share of runs whose equity ever fell below the ruin level (-50%)")
+        col3.metric("Median Max DD", format_currency(mc_stats['median_max_dd']))
+        col4.metric("95% Worst Max DD", format_currency(mc_stats['p95_max_dd']))
+        
+        st.plotly_chart(render_drawdown_distribution(mc_result), use_container_width=True)
+    
     # Additional insights
     st.markdown("---")
     st.subheader("💡 Insights")
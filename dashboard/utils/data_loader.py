@@ -28,6 +28,12 @@ def get_data_directory() -> Path:
     return results_dir
 
 
+def get_merged_results_path() -> Path:
+    """Path of the merged parquet results from batch processing."""
+    base_dir = Path(__file__).parent.parent.parent
+    return base_dir / "ultra_necrozma_results" / "EURUSD_2025_backtest_results_merged.parquet"
+
+
 def detect_data_format() -> str:
     """
     Detect whether we have parquet (batch processing) or JSON (legacy) data
@@ -35,8 +41,7 @@ def detect_data_format() -> str:
     Returns:
         'parquet' if merged parquet file exists, 'json' otherwise
     """
-    base_dir = Path(__file__).parent.parent.parent
-    parquet_path = base_dir / "ultra_necrozma_results" / "EURUSD_2025_backtest_results_merged.parquet"
+    parquet_path = get_merged_results_path()
     
     if parquet_path.exists():
         return 'parquet'
@@ -58,8 +63,7 @@ def load_merged_results() -> pd.DataFrame:
         - total_return, max_drawdown, win_rate, n_trades, profit_factor
         - avg_win, avg_loss, expectancy, gross_pnl, net_pnl, total_commission
     """
-    base_dir = Path(__file__).parent.parent.parent
-    parquet_path = base_dir / "ultra_necrozma_results" / "EURUSD_2025_backtest_results_merged.parquet"
+    parquet_path = get_merged_results_path()
     
     if parquet_path.exists():
         try:
@@ -116,13 +120,21 @@ def load_legacy_json_results() -> pd.DataFrame:
 # ═══════════════════════════════════════════════════════════════
 
 @st.cache_data(ttl=300)
-def load_all_strategies_metrics(results_dir: Optional[str] = None) -> pd.DataFrame:
+def load_all_strategies_metrics(results_dir: Optional[str] = None,
+                                columns: Optional[List[str]] = None,
+                                filters: Optional[List] = None) -> pd.DataFrame:
     """
     Load lightweight metrics for ALL strategies (Tier 1)
     Fast loading: ~50 MB for 10,000 strategies
     
+    Reads the partitioned Parquet metrics store (metrics/) when it holds
+    any universe, pushing column selection and filters down to the files;
+    otherwise falls back to all_strategies_metrics.json.
+    
     Args:
         results_dir: Optional custom results directory path
+        columns: Optional metric columns to load (key columns always included)
+        filters: Optional filters, e.g. [("sharpe_ratio", ">", 1.0)]
         
     Returns:
         DataFrame with all strategy metrics
@@ -132,6 +144,18 @@ def load_all_strategies_metrics(results_dir: Optional[str] = None) -> pd.DataFra
     else:
         data_dir = get_data_directory()
     
+    metrics_dir = data_dir / "metrics"
+    if metrics_dir.is_dir():
+        try:
+            from core.storage.metrics_store import MetricsStore
+            store = MetricsStore(metrics_dir)
+            # An existing store is authoritative, also when filters match nothing
+            if store.universes():
+                return store.load(columns=columns, filters=filters)
+        except Exception as e:
+            if hasattr(st, 'session_state'):  # Only show error in Streamlit context
+                st.warning(f"⚠️ Error loading metrics store: {e}")
+    
     metrics_file = data_dir / "all_strategies_metrics.json"
     
     if not metrics_file.exists():
@@ -152,8 +176,18 @@ def load_all_strategies_metrics(results_dir: Optional[str] = None) -> pd.DataFra
         # Flatten metrics dict into columns
         if 'metrics' in df.columns:
             metrics_df = pd.json_normalize(df['metrics'])
+            metrics_df = metrics_df.drop(columns=['strategy_name', 'universe'], errors='ignore')
             df = pd.concat([df[['strategy_name', 'universe']], metrics_df], axis=1)
         
+        if filters:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            df = table.filter(pq.filters_to_expression(filters)).to_pandas()
+        if columns is not None:
+            keep = ['strategy_name', 'universe', 'lot_size'] + list(columns)
+            df = df[[c for c in dict.fromkeys(keep) if c in df.columns]]
+        
         return df
         
     except Exception as e:
@@ -167,7 +201,10 @@ def load_all_strategies_metrics(results_dir: Optional[str] = None) -> pd.DataFra
 def load_strategy_detailed_trades(strategy_name: str, results_dir: Optional[str] = None) -> Optional[Dict]:
     """
     Load detailed trades for ONE strategy (Tier 2, on-demand)
-    Only available for top 50 strategies per universe
+    Only available for the top N strategies per universe
+    
+    Reads the strategy's batch from the memory-mapped trade archive when
+    present, otherwise its per-strategy JSON file.
     
     Args:
         strategy_name: Name of the strategy
@@ -181,6 +218,15 @@ def load_strategy_detailed_trades(strategy_name: str, results_dir: Optional[str]
     else:
         data_dir = get_data_directory()
     
+    archive = _trade_archive(data_dir)
+    if archive is not None:
+        try:
+            data = archive.load(strategy_name)
+            if data is not None:
+                return data
+        except Exception as e:
+            print(f"Error loading archived trades for {strategy_name}: {e}")
+    
     trade_file = data_dir / "detailed_trades" / f"{strategy_name}.json"
     
     if not trade_file.exists():
@@ -214,7 +260,22 @@ def get_strategies_with_trades(results_dir: Optional[str] = None) -> List[str]:
     if not trades_dir.exists():
         return []
     
-    return [f.stem for f in trades_dir.glob("*.json")]
+    archive = _trade_archive(data_dir)
+    archived = archive.strategies() if archive is not None else []
+    json_names = [f.stem for f in trades_dir.glob("*.json") if f.name != "archive_index.json"]
+    return list(dict.fromkeys(json_names + archived))
+
+
+def _trade_archive(data_dir: Path):
+    """TradeArchive over data_dir/detailed_trades, or None if there is no archive"""
+    trades_dir = data_dir / "detailed_trades"
+    if not (trades_dir / "archive_index.json").exists():
+        return None
+    try:
+        from core.storage.trade_archive import TradeArchive
+    except ImportError:
+        return None
+    return TradeArchive(trades_dir)
 
 
 # ═══════════════════════════════════════════════════════════════
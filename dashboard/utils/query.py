@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 NECROZMA DASHBOARD - QUERY LAYER 💎🌟⚡
+
+Filtered and aggregated reads over the Parquet backtest results, so pages
+never hold every strategy row in memory.
+
+- Filters (universe, template, lot size, min trades, metric ranges) are
+  pushed down to the Parquet scan
+- Top-N and group-by aggregates are computed batch by batch
+- Only the small results (top-N tables, aggregates, histograms) are
+  cached, keyed by a fingerprint (path, size, mtime) of the scanned files,
+  so the cache refreshes as soon as a results file changes
+
+Sources, in the same priority as load_all_results():
+1. Merged parquet file from batch processing
+2. Smart storage metrics store (backtest_results/metrics/)
+3. universe_*_backtest.parquet files
+
+Legacy JSON-only results have no Parquet source; pages fall back to
+load_all_results() for those (see has_query_source()).
+
+Filters use the dict layout of create_parquet_filters():
+    {'universe': [...], 'template': [...], 'lot_size': [...],
+     'min_trades': 50, 'sharpe_ratio': (1.0, None), ...}
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+
+# Metrics summarized by default
+DEFAULT_METRICS = (
+    'sharpe_ratio', 'total_return', 'win_rate', 'max_drawdown',
+    'n_trades', 'profit_factor', 'net_pnl',
+)
+
+# Filter keys that select values rather than ranges
+LIST_FILTERS = ('universe', 'template', 'lot_size')
+
+# metric_histogram scale per metric, matching the in-memory charts: fractions
+# become percentages, and drawdowns stay positive (Backtester stores abs values)
+HISTOGRAM_SCALES = {'sharpe_ratio': 1.0, 'win_rate': 100.0, 'max_drawdown': 100.0}
+
+
+# ═══════════════════════════════════════════════════════════════
+# 📂 SOURCES
+# ═══════════════════════════════════════════════════════════════
+
+def results_dataset(results_dir: Optional[str] = None):
+    """
+    pyarrow dataset over the best available Parquet results
+
+    Args:
+        results_dir: Optional custom results directory path
+
+    Returns:
+        pyarrow.dataset.Dataset, or None if there are no Parquet results
+    """
+    from dashboard.utils.data_loader import get_data_directory, get_merged_results_path
+    import pyarrow.dataset as ds
+
+    if results_dir is None:
+        merged_path = get_merged_results_path()
+        if merged_path.exists():
+            return ds.dataset(str(merged_path), format="parquet")
+
+    data_dir = Path(results_dir) if results_dir else get_data_directory()
+
+    metrics_dir = data_dir / "metrics"
+    if metrics_dir.is_dir():
+        from core.storage.metrics_store import MetricsStore
+        dataset = MetricsStore(metrics_dir).dataset()
+        if dataset is not None:
+            return dataset
+
+    return _universe_files_dataset(sorted(data_dir.glob('universe_*_backtest.parquet')))
+
+
+def _universe_files_dataset(files: List[Path]):
+    """Dataset over per-universe result files with the universe as a virtual column"""
+    if not files:
+        return None
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+
+    schema = pa.unify_schemas([pq.read_schema(f) for f in files], promote_options="permissive")
+    schema = schema.remove_metadata()
+    if 'universe' not in schema.names:
+        schema = schema.append(pa.field('universe', pa.string()))
+
+    # Each file's universe is its partition expression: filters on it skip whole files
+    universes = [f.stem.replace('_backtest', '') for f in files]
+    return ds.FileSystemDataset.from_paths(
+        [str(f) for f in files], schema=schema, format=ds.ParquetFileFormat(),
+        filesystem=pafs.LocalFileSystem(),
+        partitions=[pc.field('universe') == universe for universe in universes]
+    )
+
+
+def has_query_source(results_dir: Optional[str] = None) -> bool:
+    """Whether the results can be served by the query layer."""
+    return results_dataset(results_dir) is not None
+
+
+def results_fingerprint(results_dir: Optional[str] = None) -> Tuple:
+    """
+    Fingerprint of the scanned result files (cache key)
+
+    Args:
+        results_dir: Optional custom results directory path
+
+    Returns:
+        Tuple of (path, size, mtime_ns) per file
+    """
+    dataset = results_dataset(results_dir)
+    if dataset is None:
+        return ()
+
+    fingerprint = []
+    for path in sorted(dataset.files):
+        stat = os.stat(path)
+        fingerprint.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🔍 FILTERS
+# ═══════════════════════════════════════════════════════════════
+
+def _freeze(filters: Optional[Dict]) -> Tuple:
+    """Filters dict as a hashable, order-independent tuple"""
+    if not filters:
+        return ()
+    frozen = []
+    for key, value in sorted(filters.items()):
+        if isinstance(value, (list, tuple, set, np.ndarray)):
+            value = tuple(sorted(value, key=str)) if key in LIST_FILTERS else tuple(value)
+        frozen.append((key, value))
+    return tuple(frozen)
+
+
+def build_filter_expression(filters: Optional[Dict], schema_names: Sequence[str]):
+    """
+    pyarrow filter expression for a filters dict
+
+    Conditions on columns the source does not have are ignored, as with
+    apply_filters().
+
+    Args:
+        filters: Filters dict (see module docstring)
+        schema_names: Columns available in the source
+
+    Returns:
+        pyarrow.compute.Expression or None
+    """
+    import pyarrow.compute as pc
+
+    if not filters:
+        return None
+
+    names = set(schema_names)
+    conditions = []
+
+    for key, value in filters.items():
+        if value is None or (isinstance(value, (list, tuple)) and len(value) == 0):
+            continue
+
+        if key == 'template':
+            if 'strategy_name' not in names:
+                continue
+            name = pc.field('strategy_name')
+            # Same rule as extract_strategy_template(): text before the first '_'
+            matches = [(name == template) | pc.starts_with(name, pattern=f"{template}_")
+                       for template in value]
+            condition = matches[0]
+            for match in matches[1:]:
+                condition = condition | match
+            conditions.append(condition)
+
+        elif key == 'min_trades':
+            if 'n_trades' in names:
+                conditions.append(pc.field('n_trades') >= value)
+
+        elif key in LIST_FILTERS:
+            if key in names:
+                values = [float(v) for v in value] if key == 'lot_size' else list(value)
+                conditions.append(pc.field(key).isin(values))
+
+        elif key in names:
+            low, high = value
+            if low is not None:
+                conditions.append(pc.field(key) >= low)
+            if high is not None:
+                conditions.append(pc.field(key) <= high)
+
+    if not conditions:
+        return None
+
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+def _scan_batches(dataset, columns: Optional[List[str]], filters: Optional[Dict]):
+    """Record batches of the filtered columns (only columns the source has)"""
+    names = dataset.schema.names
+    if columns is not None:
+        columns = [c for c in dict.fromkeys(columns) if c in names]
+    expression = build_filter_expression(filters, names)
+    for batch in dataset.to_batches(columns=columns, filter=expression):
+        if batch.num_rows:
+            yield batch
+
+
+def _add_template_column(table):
+    """Append the template column (text before the first '_' of strategy_name)"""
+    import pyarrow.compute as pc
+
+    template = pc.list_element(pc.split_pattern(table.column('strategy_name'), pattern='_', max_splits=1), 0)
+    template = pc.if_else(pc.equal(template, ''), 'Unknown', template)
+    return table.append_column('template', template)
+
+
+# ═══════════════════════════════════════════════════════════════
+# ⚙️ STREAMING QUERIES (uncached)
+# ═══════════════════════════════════════════════════════════════
+
+def _top_k_table(dataset, filters: Optional[Dict], k: int, sort_by: str,
+                 ascending: bool, columns: Optional[List[str]]):
+    """Best k rows by sort_by, keeping at most k + one batch in memory"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if sort_by not in dataset.schema.names:
+        return None
+
+    if columns is not None:
+        columns = list(dict.fromkeys(list(columns) + [sort_by]))
+
+    order = "ascending" if ascending else "descending"
+    best = None
+    for batch in _scan_batches(dataset, columns, filters):
+        table = pa.Table.from_batches([batch])
+        if best is not None:
+            table = pa.concat_tables([best, table])
+        best = table.take(pc.select_k_unstable(table, k=k, sort_keys=[(sort_by, order)]))
+
+    if best is None:
+        return None
+    return best.sort_by([(sort_by, order)])
+
+
+def _aggregate_table(dataset, filters: Optional[Dict], group_by: Sequence[str],
+                     metrics: Sequence[str]) -> pd.DataFrame:
+    """
+    Group-by aggregate computed batch by batch
+
+    Per batch: sum, sum of squares, non-null count, min and max of each
+    metric plus the row count; the partials are then combined, so
+    mean = sum / count and std is the sample standard deviation. NaN is
+    skipped like in pandas.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    names = dataset.schema.names
+    metrics = [m for m in metrics if m in names]
+    keys = [k for k in group_by if k in names or k == 'template']
+    if 'template' in keys and 'strategy_name' not in names:
+        keys.remove('template')
+
+    scan_columns = metrics + [k for k in keys if k != 'template']
+    if 'template' in keys:
+        scan_columns.append('strategy_name')
+    if not scan_columns:
+        scan_columns = names[:1]
+    group_keys = keys or ['__all__']
+
+    partial_aggs = [([], 'count_all')]
+    for metric in metrics:
+        partial_aggs += [(metric, 'sum'), (f"{metric}__sq", 'sum'), (metric, 'count'),
+                         (metric, 'min'), (metric, 'max')]
+
+    partials = []
+    for batch in _scan_batches(dataset, scan_columns, filters):
+        table = pa.Table.from_batches([batch])
+        if 'template' in keys:
+            table = _add_template_column(table)
+        if not keys:
+            table = table.append_column('__all__', pa.array(np.zeros(table.num_rows, dtype=np.int8)))
+        for metric in metrics:
+            column = table.column(metric)
+            if pa.types.is_floating(column.type):
+                column = pc.if_else(pc.is_nan(column), None, column)
+            else:
+                column = column.cast(pa.float64())
+            table = table.set_column(table.schema.get_field_index(metric), metric, column)
+            table = table.append_column(f"{metric}__sq", pc.multiply(column, column))
+        partials.append(table.group_by(group_keys).aggregate(partial_aggs))
+
+    output_columns = keys + [f"{m}_{agg}" for m in metrics
+                             for agg in ('mean', 'std', 'min', 'max', 'sum', 'count')] + ['count']
+    if not partials:
+        return pd.DataFrame(columns=output_columns)
+
+    combined = pa.concat_tables(partials, promote_options="permissive")
+    final_aggs = [('count_all', 'sum')]
+    for metric in metrics:
+        final_aggs += [(f"{metric}_sum", 'sum'), (f"{metric}__sq_sum", 'sum'), (f"{metric}_count", 'sum'),
+                       (f"{metric}_min", 'min'), (f"{metric}_max", 'max')]
+    result = combined.group_by(group_keys).aggregate(final_aggs).to_pandas()
+
+    df = pd.DataFrame({key: result[key] for key in keys}, index=result.index)
+    for metric in metrics:
+        total = result[f"{metric}_sum_sum"]
+        count = result[f"{metric}_count_sum"]
+        df[f"{metric}_mean"] = total / count.where(count > 0)
+        variance = (result[f"{metric}__sq_sum_sum"] - total * df[f"{metric}_mean"]) / (count - 1).where(count > 1)
+        df[f"{metric}_std"] = np.sqrt(variance.clip(lower=0))
+        df[f"{metric}_min"] = result[f"{metric}_min_min"]
+        df[f"{metric}_max"] = result[f"{metric}_max_max"]
+        df[f"{metric}_sum"] = total
+        df[f"{metric}_count"] = count
+    df['count'] = result['count_all_sum']
+
+    if keys:
+        df = df.sort_values(keys).reset_index(drop=True)
+    return df[output_columns]
+
+
+def query_strategies(filters: Optional[Dict] = None,
+                     columns: Optional[List[str]] = None,
+                     top_n: Optional[int] = None,
+                     sort_by: str = 'sharpe_ratio',
+                     ascending: bool = False,
+                     results_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Strategy rows matching the filters
+
+    With top_n the scan keeps only the best rows and the result is cached;
+    without it all matching rows are read (uncached) - pass columns to keep
+    that read small.
+
+    Args:
+        filters: Filters dict (see module docstring)
+        columns: Columns to return (default: all)
+        top_n: Return only the best N rows by sort_by
+        sort_by: Metric to rank by
+        ascending: Rank ascending instead of descending
+        results_dir: Optional custom results directory path
+
+    Returns:
+        DataFrame of strategies (with a template column when strategy_name is read)
+    """
+    if top_n is not None:
+        return _cached_top_strategies(
+            results_fingerprint(results_dir), results_dir, _freeze(filters),
+            tuple(columns) if columns is not None else None, int(top_n), sort_by, ascending
+        ).copy()
+
+    dataset = results_dataset(results_dir)
+    if dataset is None:
+        return pd.DataFrame()
+
+    import pyarrow as pa
+    batches = list(_scan_batches(dataset, columns, filters))
+    if not batches:
+        return pd.DataFrame(columns=columns or dataset.schema.names)
+    table = pa.Table.from_batches(batches)
+    if 'strategy_name' in table.schema.names:
+        table = _add_template_column(table)
+    return table.to_pandas()
+
+
+# ═══════════════════════════════════════════════════════════════
+# 💾 CACHED AGGREGATES
+# ═══════════════════════════════════════════════════════════════
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_top_strategies(fingerprint: Tuple, results_dir: Optional[str], frozen_filters: Tuple,
+                           columns: Optional[Tuple], top_n: int, sort_by: str,
+                           ascending: bool) -> pd.DataFrame:
+    dataset = results_dataset(results_dir)
+    if dataset is None:
+        return pd.DataFrame()
+
+    table = _top_k_table(dataset, dict(frozen_filters), top_n, sort_by, ascending,
+                         list(columns) if columns is not None else None)
+    if table is None:
+        return pd.DataFrame()
+    if 'strategy_name' in table.schema.names:
+        table = _add_template_column(table)
+    return table.to_pandas()
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_aggregate(fingerprint: Tuple, results_dir: Optional[str], frozen_filters: Tuple,
+                      group_by: Tuple, metrics: Tuple) -> pd.DataFrame:
+    dataset = results_dataset(results_dir)
+    if dataset is None:
+        return pd.DataFrame()
+    return _aggregate_table(dataset, dict(frozen_filters), group_by, metrics)
+
+
+def aggregate_strategies(group_by: Sequence[str] = ('template',),
+                         metrics: Sequence[str] = DEFAULT_METRICS,
+                         filters: Optional[Dict] = None,
+                         results_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Group-by aggregate over all matching strategies
+
+    Args:
+        group_by: Key columns ('template', 'universe', 'lot_size', ...);
+            empty for a single overall row
+        metrics: Metric columns to aggregate
+        filters: Filters dict (see module docstring)
+        results_dir: Optional custom results directory path
+
+    Returns:
+        DataFrame with the keys, <metric>_mean/_min/_max/_sum/_count per
+        metric and the row count in 'count'
+    """
+    return _cached_aggregate(
+        results_fingerprint(results_dir), results_dir, _freeze(filters),
+        tuple(group_by), tuple(metrics)
+    ).copy()
+
+
+def summary_metrics(filters: Optional[Dict] = None, results_dir: Optional[str] = None) -> Dict:
+    """
+    Summary metrics in the layout of calculate_summary_metrics()
+
+    Args:
+        filters: Filters dict (see module docstring)
+        results_dir: Optional custom results directory path
+
+    Returns:
+        Dictionary with summary metrics
+    """
+    overall = aggregate_strategies((), ('sharpe_ratio', 'total_return', 'win_rate', 'max_drawdown'),
+                                   filters, results_dir)
+    if overall.empty or overall['count'].iloc[0] == 0:
+        return {
+            'total_strategies': 0,
+            'avg_sharpe': 0.0,
+            'avg_return': 0.0,
+            'avg_win_rate': 0.0,
+            'viable_count': 0,
+            'max_sharpe': 0.0,
+            'max_return': 0.0,
+            'min_drawdown': 0.0
+        }
+
+    # Viable strategies (Sharpe > 1.0, win_rate > 0.5)
+    viable_filters = dict(filters or {})
+    viable_filters['sharpe_ratio'] = _intersect_range(viable_filters.get('sharpe_ratio'), np.nextafter(1.0, np.inf))
+    viable_filters['win_rate'] = _intersect_range(viable_filters.get('win_rate'), np.nextafter(0.5, np.inf))
+    viable = aggregate_strategies((), (), viable_filters, results_dir)
+
+    row = overall.iloc[0]
+
+    def value(key, scale=1.0):
+        return float(row[key]) * scale if key in row.index and pd.notna(row[key]) else 0.0
+
+    return {
+        'total_strategies': int(row['count']),
+        'avg_sharpe': value('sharpe_ratio_mean'),
+        'avg_return': value('total_return_mean', 100),
+        'avg_win_rate': value('win_rate_mean', 100),
+        'viable_count': int(viable['count'].iloc[0]) if not viable.empty else 0,
+        'max_sharpe': value('sharpe_ratio_max'),
+        'max_return': value('total_return_max', 100),
+        'min_drawdown': value('max_drawdown_min', 100),
+    }
+
+
+def _stats_table(group_key: str, columns: Dict[str, List[str]], filters: Optional[Dict],
+                 results_dir: Optional[str]) -> pd.DataFrame:
+    """Aggregate with only the requested <metric>_<stat> columns, rounded like the pandas versions"""
+    stats = aggregate_strategies((group_key,), tuple(columns), filters, results_dir)
+    if stats.empty or group_key not in stats.columns:
+        return pd.DataFrame()
+    wanted = [f"{metric}_{agg}" for metric, aggs in columns.items() for agg in aggs]
+    return stats[[group_key] + [c for c in wanted if c in stats.columns]].round(4)
+
+
+def template_performance(filters: Optional[Dict] = None, results_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Performance by strategy template, in the layout of calculate_template_performance()
+
+    Args:
+        filters: Filters dict (see module docstring)
+        results_dir: Optional custom results directory path
+
+    Returns:
+        DataFrame with template statistics, best average Sharpe first
+    """
+    stats = _stats_table('template', {
+        'sharpe_ratio': ['mean', 'std', 'max', 'count'],
+        'total_return': ['mean', 'max'],
+        'win_rate': ['mean'],
+        'max_drawdown': ['mean'],
+        'profit_factor': ['mean'],
+        'n_trades': ['mean'],
+    }, filters, results_dir)
+    if 'sharpe_ratio_mean' in stats.columns:
+        stats = stats.sort_values('sharpe_ratio_mean', ascending=False)
+    return stats
+
+
+def lot_size_impact(filters: Optional[Dict] = None, results_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Performance by lot size, in the layout of calculate_lot_size_impact()
+
+    Args:
+        filters: Filters dict (see module docstring)
+        results_dir: Optional custom results directory path
+
+    Returns:
+        DataFrame with lot size statistics
+    """
+    return _stats_table('lot_size', {
+        'sharpe_ratio': ['mean', 'std', 'max'],
+        'total_return': ['mean', 'std', 'max'],
+        'win_rate': ['mean'],
+        'max_drawdown': ['mean'],
+        'n_trades': ['mean'],
+    }, filters, results_dir)
+
+
+def _intersect_range(current: Optional[Tuple], low: float) -> Tuple:
+    """Range filter narrowed to values >= low"""
+    if not current:
+        return (float(low), None)
+    current_low, current_high = current
+    return (max(low, current_low) if current_low is not None else float(low), current_high)
+
+
+def filter_options(results_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Values and ranges for building filter widgets, without loading rows
+
+    Args:
+        results_dir: Optional custom results directory path
+
+    Returns:
+        Dictionary with total_strategies, lists for 'universe', 'template'
+        and 'lot_size' (when available) and (min, max) per default metric
+    """
+    options: Dict[str, Any] = {}
+    overall = aggregate_strategies((), DEFAULT_METRICS, None, results_dir)
+    options['total_strategies'] = int(overall['count'].iloc[0]) if not overall.empty else 0
+
+    for metric in DEFAULT_METRICS:
+        if f"{metric}_min" in overall.columns and not overall.empty:
+            options[metric] = (float(overall[f"{metric}_min"].iloc[0]), float(overall[f"{metric}_max"].iloc[0]))
+
+    for key in LIST_FILTERS:
+        grouped = aggregate_strategies((key,), (), None, results_dir)
+        if key in grouped.columns:
+            options[key] = grouped[key].dropna().tolist()
+
+    return options
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _cached_histogram(fingerprint: Tuple, results_dir: Optional[str], frozen_filters: Tuple,
+                      metric: str, bins: int, low: float, high: float, scale: float) -> Dict:
+    dataset = results_dataset(results_dir)
+    edges = np.linspace(*sorted((low * scale, high * scale)), bins + 1)
+    counts = np.zeros(bins, dtype=np.int64)
+    if dataset is not None:
+        for batch in _scan_batches(dataset, [metric], dict(frozen_filters)):
+            values = batch.column(0).to_numpy(zero_copy_only=False).astype(np.float64) * scale
+            counts += np.histogram(values[np.isfinite(values)], bins=edges)[0]
+    return {'edges': edges, 'counts': counts}
+
+
+def metric_histogram(metric: str, bins: int = 30, filters: Optional[Dict] = None,
+                     scale: float = 1.0, results_dir: Optional[str] = None) -> Optional[Dict]:
+    """
+    Histogram of one metric over all matching strategies
+
+    Args:
+        metric: Metric column
+        bins: Number of equal-width bins between the metric's min and max
+        filters: Filters dict (see module docstring)
+        scale: Multiplier applied to values (e.g. 100 for percentages)
+        results_dir: Optional custom results directory path
+
+    Returns:
+        Dictionary with edges, counts, mean and count, or None if no data
+    """
+    overall = aggregate_strategies((), (metric,), filters, results_dir)
+    if overall.empty or f"{metric}_count" not in overall.columns or overall[f"{metric}_count"].iloc[0] == 0:
+        return None
+
+    row = overall.iloc[0]
+    low, high = float(row[f"{metric}_min"]), float(row[f"{metric}_max"])
+    if not (np.isfinite(low) and np.isfinite(high)):
+        return None
+    if high <= low:
+        high = low + 1e-9
+
+    histogram = _cached_histogram(
+        results_fingerprint(results_dir), results_dir, _freeze(filters),
+        metric, int(bins), low, high, float(scale)
+    )
+    return {
+        'edges': histogram['edges'],
+        'counts': histogram['counts'],
+        'mean': float(row[f"{metric}_mean"]) * scale,
+        'count': int(row[f"{metric}_count"]),
+    }
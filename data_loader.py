@@ -9,6 +9,7 @@ Photon Storage System:  CSV → Parquet Crystallization
 Technical: Data ingestion and Parquet conversion module
 """
 
+import importlib.util
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -70,21 +71,178 @@ def ensure_datetime_column(df, column='timestamp', utc=True):
 # 🌟 PRISM FORM:  CSV → PARQUET CRYSTALLIZATION
 # ═══════════════════════════════════════════════════════════════
 
-def crystallize_csv_to_parquet(csv_path=None, parquet_path=None, force=False):
+# Final crystal layout (one Parquet row group per CSV chunk)
+CRYSTAL_COLUMNS = ["timestamp", "bid", "ask", "mid_price", "spread_pips", "pips_change"]
+
+# Approximate bytes per CSV line, used to size pyarrow reader blocks
+CSV_BYTES_PER_ROW = 64
+
+
+def _resolve_csv_columns(csv_path):
+    """
+    Map source CSV header to crystal column names
+    
+    Args:
+        csv_path: Path to CSV
+        
+    Returns:
+        dict: {source_column: crystal_column} for timestamp, bid and ask
+    """
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    lookup = {col.lower().strip(): col for col in header}
+    
+    source = {}
+    for key in ("timestamp", "bid", "ask"):
+        configured = CSV_COLUMNS.get(key, key)
+        if configured in header:
+            source[configured] = key
+        elif key in lookup:
+            source[lookup[key]] = key
+    
+    if "timestamp" not in source.values():
+        # Try to find timestamp column
+        for col in header:
+            if "time" in col.lower():
+                source[col] = "timestamp"
+                break
+    
+    missing = {"timestamp", "bid", "ask"} - set(source.values())
+    if missing:
+        raise ValueError(f"❌ CSV is missing required columns: {sorted(missing)}")
+    
+    return source
+
+
+def _iter_csv_chunks(csv_path, source_columns, chunk_size, engine):
+    """
+    Stream typed CSV chunks
+    
+    Args:
+        csv_path: Path to CSV
+        source_columns: {source_column: crystal_column}
+        chunk_size: Rows per chunk (approximate for pyarrow)
+        engine: "pandas" or "pyarrow"
+        
+    Yields:
+        pd.DataFrame: Chunk with crystal column names (timestamp, bid, ask)
+    """
+    price_cols = [col for col, key in source_columns.items() if key != "timestamp"]
+    
+    if engine == "pyarrow":
+        import pyarrow.csv as pv
+        
+        reader = pv.open_csv(
+            csv_path,
+            read_options=pv.ReadOptions(block_size=max(chunk_size * CSV_BYTES_PER_ROW, 1 << 20)),
+            convert_options=pv.ConvertOptions(
+                include_columns=list(source_columns),
+                column_types={col: pa.float64() for col in price_cols}
+            )
+        )
+        for batch in reader:
+            yield batch.to_pandas().rename(columns=source_columns)
+    else:
+        reader = pd.read_csv(
+            csv_path,
+            usecols=list(source_columns),
+            dtype={col: "float64" for col in price_cols},
+            chunksize=chunk_size
+        )
+        for chunk in reader:
+            yield chunk.rename(columns=source_columns)
+
+
+def _refract_chunk(chunk, prev_mid, price_dtype):
+    """
+    Parse timestamps and derive crystal fields for one chunk
+    
+    Args:
+        chunk: DataFrame with timestamp, bid, ask
+        prev_mid: Last mid price of the previous chunk (NaN for the first)
+        price_dtype: dtype for bid/ask/mid_price
+        
+    Returns:
+        pd.DataFrame: Chunk in CRYSTAL_COLUMNS layout
+    """
+    ts = chunk["timestamp"]
+    if pd.api.types.is_datetime64_any_dtype(ts.dtype):
+        ts = ts.dt.tz_localize("UTC") if ts.dt.tz is None else ts.dt.tz_convert("UTC")
+    else:
+        ts = pd.to_datetime(ts, utc=True)
+    ts = ts.dt.as_unit("ns")
+    
+    bid = chunk["bid"].to_numpy(dtype=np.float64)
+    ask = chunk["ask"].to_numpy(dtype=np.float64)
+    mid = (bid + ask) / 2
+    
+    # Price change in pips, continuing across the chunk boundary
+    pips_change = np.diff(mid, prepend=prev_mid) * 10000
+    
+    out = pd.DataFrame({
+        "timestamp": ts.array,
+        "bid": bid.astype(price_dtype, copy=False),
+        "ask": ask.astype(price_dtype, copy=False),
+        "mid_price": mid.astype(price_dtype, copy=False),
+        # Spread in pips (for EURUSD: 1 pip = 0.0001)
+        "spread_pips": ((ask - bid) * 10000).astype(np.float32),
+        "pips_change": pips_change.astype(np.float32),
+    })
+    return out
+
+
+def _crystal_schema(price_dtype):
+    """Arrow schema for the crystal"""
+    price_type = pa.from_numpy_dtype(np.dtype(price_dtype))
+    return pa.schema([
+        ("timestamp", pa.timestamp("ns", tz="UTC")),
+        ("bid", price_type),
+        ("ask", price_type),
+        ("mid_price", price_type),
+        ("spread_pips", pa.float32()),
+        ("pips_change", pa.float32()),
+    ])
+
+
+def _resort_crystal(path, schema):
+    """
+    Sort a written crystal by timestamp and recompute pips_change
+    
+    Only needed when the CSV is not in chronological order; loads the
+    compact Arrow table (not the CSV) into memory.
+    """
+    table = pq.read_table(path).sort_by("timestamp")
+    mid = table.column("mid_price").to_numpy().astype(np.float64)
+    pips_change = (np.diff(mid, prepend=np.nan) * 10000).astype(np.float32)
+    table = table.set_column(
+        table.schema.get_field_index("pips_change"), "pips_change", pa.array(pips_change)
+    )
+    pq.write_table(table.cast(schema), path, compression=PARQUET_COMPRESSION)
+    return table.num_rows
+
+
+def crystallize_csv_to_parquet(csv_path=None, parquet_path=None, force=False,
+                               engine="auto", chunk_size=None, price_dtype="float64"):
     """
     Convert CSV tick data to Parquet format (Crystallization)
-    Technical: CSV ingestion with chunked reading, Parquet serialization
+    Technical: Streaming CSV ingestion, one Parquet row group per chunk
+    
+    Memory stays bounded by the chunk size: each chunk is parsed, refracted
+    and written before the next one is read.
     
     Args: 
         csv_path:  Path to input CSV (default: from config)
         parquet_path: Path to output Parquet (default: from config)
         force:  Overwrite existing Parquet if True
+        engine: CSV reader - "pandas", "pyarrow" or "auto" (pyarrow if available)
+        chunk_size: Rows per chunk / row group (default: CSV_CHUNK_SIZE)
+        price_dtype: dtype for bid/ask/mid_price ("float64" or "float32")
         
     Returns:
         Path:  Path to created Parquet file
     """
     csv_path = Path(csv_path or CSV_FILE)
     parquet_path = Path(parquet_path or PARQUET_FILE)
+    chunk_size = chunk_size or CSV_CHUNK_SIZE
     
     print("""
 ╔══════════════════════════════════════════════════════════════╗
@@ -106,131 +264,82 @@ def crystallize_csv_to_parquet(csv_path=None, parquet_path=None, force=False):
     if not csv_path.exists():
         raise FileNotFoundError(f"❌ Source light not found: {csv_path}")
     
+    if not PYARROW_AVAILABLE:
+        raise ImportError("❌ pyarrow is required for crystallization: pip install pyarrow")
+    
+    if engine == "auto":
+        engine = "pyarrow" if importlib.util.find_spec("pyarrow.csv") is not None else "pandas"
+    
     csv_size_gb = csv_path.stat().st_size / (1024**3)
     print(f"📂 Source:  {csv_path}")
     print(f"💾 Size: {csv_size_gb:.2f} GB")
     print(f"🎯 Target: {parquet_path}")
+    print(f"🔧 Reader: {engine} ({chunk_size:,} rows/chunk)")
     print()
     
     # Create output directory
     parquet_path. parent.mkdir(parents=True, exist_ok=True)
     
-    # ═══ PHASE 1: ABSORB LIGHT (Read CSV) ═══
-    print("🌟 Phase 1: ABSORBING LIGHT (Reading CSV)")
+    # ═══ STREAM: ABSORB → REFRACT → CRYSTALLIZE (per chunk) ═══
+    print("🌟 Streaming light into crystal (Read → Process → Write)")
     print("─" * 60)
     
     start_time = time.time()
-    chunks = []
-    total_rows = 0
-    
-    for i, chunk in enumerate(pd.read_csv(csv_path, chunksize=CSV_CHUNK_SIZE)):
-        chunks.append(chunk)
-        total_rows += len(chunk)
-        
-        if (i + 1) % 5 == 0:
-            elapsed = time.time() - start_time
-            speed = total_rows / elapsed
-            print(f"   💫 Chunk {i+1}:  {total_rows:,} rows absorbed "
-                  f"({speed: ,.0f} rows/sec)")
-    
-    # Concatenate
-    print(f"\n   ⚡ Fusing {len(chunks)} light fragments...")
-    df = pd.concat(chunks, ignore_index=True)
-    del chunks
-    gc.collect()
-    
-    read_time = time.time() - start_time
-    print(f"   ✅ {len(df):,} rows absorbed in {read_time:.1f}s")
-    
-    # ═══ PHASE 2: REFRACT LIGHT (Process Data) ═══
-    print(f"\n🔮 Phase 2: REFRACTING LIGHT (Processing)")
-    print("─" * 60)
-    
-    process_start = time.time()
-    
-    # Rename columns if needed
-    col_map = {v: k for k, v in CSV_COLUMNS.items() if v in df.columns}
-    if col_map:
-        df = df.rename(columns=col_map)
+    source_columns = _resolve_csv_columns(csv_path)
+    schema = _crystal_schema(price_dtype)
     
-    # Parse timestamp
-    print("   ⏰ Parsing temporal coordinates...")
-    ts_col = CSV_COLUMNS.get("timestamp", "Timestamp")
-    if ts_col in df.columns:
-        df["timestamp"] = pd.to_datetime(df[ts_col], utc=True)
-    elif "timestamp" not in df.columns:
-        # Try to find timestamp column
-        for col in df.columns:
-            if "time" in col.lower():
-                df["timestamp"] = pd.to_datetime(df[col], utc=True)
-                break
-    
-    # Standardize column names
-    df.columns = df.columns.str.lower().str.strip()
-    
-    # Calculate derived fields
-    print("   💎 Crystallizing derived fields...")
-    
-    # Mid price
-    if "bid" in df.columns and "ask" in df.columns:
-        df["mid_price"] = (df["bid"] + df["ask"]) / 2
+    # Write to a temporary file so an interrupted run never leaves a partial crystal
+    tmp_path = parquet_path.with_name(parquet_path.name + ".tmp")
+    total_rows = 0
+    prev_mid = np.nan
+    prev_ts = None
+    out_of_order = False
+    
+    try:
+        with pq.ParquetWriter(tmp_path, schema, compression=PARQUET_COMPRESSION) as writer:
+            for i, chunk in enumerate(_iter_csv_chunks(csv_path, source_columns, chunk_size, engine)):
+                if len(chunk) == 0:
+                    continue
+                
+                crystal = _refract_chunk(chunk, prev_mid, price_dtype)
+                del chunk
+                
+                ts = crystal["timestamp"]
+                if not ts.is_monotonic_increasing or (prev_ts is not None and ts.iloc[0] < prev_ts):
+                    out_of_order = True
+                prev_ts = ts.iloc[-1]
+                prev_mid = float(crystal["mid_price"].iloc[-1])
+                
+                writer.write_table(pa.Table.from_pandas(crystal, schema=schema, preserve_index=False))
+                total_rows += len(crystal)
+                del crystal
+                
+                if (i + 1) % 5 == 0:
+                    elapsed = time.time() - start_time
+                    speed = total_rows / elapsed
+                    print(f"   💫 Chunk {i+1}:  {total_rows:,} rows crystallized "
+                          f"({speed: ,.0f} rows/sec)")
         
-        # Spread in pips (for EURUSD: 1 pip = 0.0001)
-        df["spread_pips"] = (df["ask"] - df["bid"]) * 10000
+        # Sort by timestamp (only if the source was not chronological)
+        if out_of_order:
+            print("   🌀 Source not chronological - aligning temporal dimension...")
+            _resort_crystal(tmp_path, schema)
         
-        # Price change in pips
-        df["pips_change"] = df["mid_price"]. diff() * 10000
-    
-    # Sort by timestamp
-    print("   🌀 Aligning temporal dimension...")
-    df = df.sort_values("timestamp").reset_index(drop=True)
-    
-    # Select final columns
-    final_columns = ["timestamp", "bid", "ask", "mid_price", "spread_pips", "pips_change"]
-    final_columns = [c for c in final_columns if c in df.columns]
-    df = df[final_columns]
-    
-    # Optimize dtypes
-    print("   ⚡ Optimizing crystal structure...")
-    df["bid"] = df["bid"].astype("float64")
-    df["ask"] = df["ask"].astype("float64")
-    df["mid_price"] = df["mid_price"].astype("float64")
-    df["spread_pips"] = df["spread_pips"].astype("float32")
-    df["pips_change"] = df["pips_change"].astype("float32")
-    
-    process_time = time.time() - process_start
-    print(f"   ✅ Refraction complete in {process_time:.1f}s")
-    
-    # ═══ PHASE 3: CRYSTALLIZE (Save Parquet) ═══
-    print(f"\n💎 Phase 3: CRYSTALLIZING (Saving Parquet)")
-    print("─" * 60)
+        tmp_path.replace(parquet_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        gc.collect()
     
-    crystal_start = time.time()
-    
-    # Memory usage before
-    mem_before = df.memory_usage(deep=True).sum() / (1024**3)
-    print(f"   📊 DataFrame memory:  {mem_before:.2f} GB")
-    
-    # Save to Parquet
-    print(f"   💎 Compressing with {PARQUET_COMPRESSION}...")
-    df.to_parquet(
-        parquet_path,
-        engine="pyarrow",
-        compression=PARQUET_COMPRESSION,
-        index=False
-    )
-    
-    crystal_time = time.time() - crystal_start
+    total_time = time.time() - start_time
     parquet_size_gb = parquet_path.stat().st_size / (1024**3)
     compression_ratio = csv_size_gb / parquet_size_gb
     
-    print(f"   ✅ Crystal formed in {crystal_time:.1f}s")
+    print(f"   ✅ {total_rows:,} rows crystallized in {total_time:.1f}s")
     print(f"   💾 Crystal size: {parquet_size_gb:.2f} GB")
     print(f"   📉 Compression ratio: {compression_ratio:.1f}x")
     
     # ═══ SUMMARY ═══
-    total_time = time.time() - start_time
-    
     print(f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║                                                              ║
@@ -238,7 +347,7 @@ def crystallize_csv_to_parquet(csv_path=None, parquet_path=None, force=False):
 ║                                                              ║
 ╠══════════════════════════════════════════════════════════════╣
 ║                                                              ║
-║   📊 Rows:         {len(df):>15,}                            ║
+║   📊 Rows:         {total_rows:>15,}                            ║
 ║   📂 CSV Size:    {csv_size_gb: >15.2f} GB                        ║
 ║   💎 Parquet:      {parquet_size_gb: >15.2f} GB                        ║
 ║   📉 Compression: {compression_ratio: >15.1f}x                         ║
@@ -313,7 +422,7 @@ def load_crystal(parquet_path=None):
 # 🔮 TEMPORAL RESAMPLING (OHLC Aggregation)
 # ═══════════════════════════════════════════════════════════════
 
-def resample_to_ohlc(df, interval_minutes):
+def resample_to_ohlc(df, interval_minutes, cache=None):
     """
     Resample tick data to OHLC candles (Temporal Compression)
     Technical: Time-based resampling with OHLC aggregation
@@ -321,11 +430,14 @@ def resample_to_ohlc(df, interval_minutes):
     Args:
         df: DataFrame with tick data
         interval_minutes:  Candle interval in minutes
+        cache: Optional OHLCCache - reuse bars cached for this DataFrame
+               (or derive them from a finer cached interval)
         
     Returns:
         pd.DataFrame: OHLC data
     """
     from lore import print_legendary_banner
+    from ohlc_cache import resample_ticks, spread_average
     
     # Show Dialga banner for temporal transformation
     if interval_minutes >= 5:  # Only show for major timeframes
@@ -340,24 +452,20 @@ def resample_to_ohlc(df, interval_minutes):
             df = df.copy()
             df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True, errors='coerce')
     
-    # Set timestamp as index
-    df_temp = df.set_index("timestamp")
+    # Base bars (OHLC + tick count + spread sums)
+    if cache is not None:
+        bars = cache.get_bars(interval_minutes, tick_data=df)
+    else:
+        bars = resample_ticks(df, interval_minutes)
     
-    # Resample
-    ohlc = df_temp["mid_price"].resample(f"{interval_minutes}min").agg({
-        "open": "first",
-        "high": "max",
-        "low": "min",
-        "close": "last"
-    }).dropna()
+    ohlc = bars[["timestamp", "open", "high", "low", "close"]].copy()
     
     # Add additional columns
-    if "spread_pips" in df_temp.columns:
-        spread = df_temp["spread_pips"].resample(f"{interval_minutes}min").mean()
-        ohlc["spread_avg"] = spread
+    if "spread_sum" in bars.columns:
+        ohlc["spread_avg"] = spread_average(bars)
     
     # Volume (tick count)
-    ohlc["tick_volume"] = df_temp["mid_price"].resample(f"{interval_minutes}min").count()
+    ohlc["tick_volume"] = bars["tick_volume"].to_numpy()
     
     # Calculate candle metrics
     ohlc["body"] = ohlc["close"] - ohlc["open"]
@@ -369,8 +477,6 @@ def resample_to_ohlc(df, interval_minutes):
     # Direction
     ohlc["direction"] = np.where(ohlc["body"] > 0, "up", "down")
     
-    ohlc = ohlc.reset_index()
-    
     print(f"   ✅ {len(ohlc):,} candles created (Temporal signatures detected)")
     
     return ohlc
@@ -18,9 +18,13 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from scipy import stats
 import json
+import multiprocessing
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
 from config import OUTPUT_DIR, FILE_PREFIX
+from monte_carlo_engine import bootstrap_ci
+from label_store import read_labels, outcome_codes, OUTCOME_TARGET, OUTCOME_STOP
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -33,9 +37,14 @@ EDGE_CONFIG = {
     "max_p_value": 0.05,         # Statistical significance threshold
     "min_profit_factor": 1.3,    # Minimum profit factor
     "oos_split": 0.2,            # 20% out-of-sample validation
+    "n_workers": 1,              # Processes for regime × label analysis
 }
 
 
+# Label columns needed for regime × label analysis
+OUTCOME_COLUMNS = ["up_outcome", "down_outcome"]
+
+
 # ═══════════════════════════════════════════════════════════════
 # 📊 STATISTICAL FUNCTIONS
 # ═══════════════════════════════════════════════════════════════
@@ -76,6 +85,9 @@ def calculate_bootstrap_ci(
     """
     Bootstrap confidence interval for win rate
     
+    All resamples are drawn as one (iterations × outcomes) index matrix
+    (see monte_carlo_engine.bootstrap_ci).
+    
     Args:
         outcomes: Array of 1s (win) and 0s (loss)
         n_iterations: Number of bootstrap samples
@@ -84,17 +96,36 @@ def calculate_bootstrap_ci(
     Returns:
         (lower_bound, mean, upper_bound)
     """
-    if len(outcomes) == 0:
-        return (0.0, 0.0, 0.0)
+    return bootstrap_ci(outcomes, n_iterations=n_iterations, confidence=confidence)
+
+
+def calculate_bootstrap_ci_from_counts(
+    successes: int,
+    n: int,
+    n_iterations: int = 1000,
+    confidence: float = 0.95
+) -> Tuple[float, float, float]:
+    """
+    Bootstrap confidence interval for a win rate given only counts
     
-    np.random.seed(42)
-    bootstrap_means = []
+    Resampling n binary outcomes with replacement is a Binomial(n, p)
+    draw, so the bootstrap means are drawn directly instead of
+    materializing the 0/1 array.
     
-    for _ in range(n_iterations):
-        sample = np.random.choice(outcomes, size=len(outcomes), replace=True)
-        bootstrap_means.append(sample.mean())
+    Args:
+        successes: Number of 1s (wins)
+        n: Number of outcomes
+        n_iterations: Number of bootstrap samples
+        confidence: Confidence level (default 95%)
+        
+    Returns:
+        (lower_bound, mean, upper_bound)
+    """
+    if n == 0:
+        return (0.0, 0.0, 0.0)
     
-    bootstrap_means = np.array(bootstrap_means)
+    rng = np.random.RandomState(42)
+    bootstrap_means = rng.binomial(n, successes / n, size=n_iterations) / n
     
     alpha = 1 - confidence
     lower = np.percentile(bootstrap_means, alpha / 2 * 100)
@@ -112,6 +143,10 @@ def load_labels(labels_dir: Path = None, batch_mode: bool = False) -> Dict[str,
     """
     Load all label parquet files
     
+    Files are read in the compact label format (int8 outcomes, float32
+    values); legacy files are converted on load. Config constants from the
+    file metadata are kept in df.attrs["label_metadata"].
+    
     Args:
         labels_dir: Directory containing label parquets
         batch_mode: If True, returns file paths instead of loaded DataFrames (memory-efficient)
@@ -150,7 +185,9 @@ def load_labels(labels_dir: Path = None, batch_mode: bool = False) -> Dict[str,
                 config_key = config_key[len(FILE_PREFIX):]
             
             try:
-                labels[config_key] = pd.read_parquet(f)
+                labels_df, meta = read_labels(f)
+                labels_df.attrs["label_metadata"] = meta
+                labels[config_key] = labels_df
             except Exception as e:
                 print(f"   ⚠️ Failed to load {f.name}: {e}")
     
@@ -212,34 +249,207 @@ def parse_config_key(config_key: str) -> Optional[Tuple[float, float, int]]:
         return None
 
 
+def _align_regimes(labels_df: pd.DataFrame, regimes_df: pd.DataFrame) -> np.ndarray:
+    """
+    Regime of each label row
+    
+    Joins on timestamp when both sides have one, otherwise by position
+    (row i of the labels is candle i of the regimes).
+    
+    Returns:
+        Array of regime ids, one per label row (NaN/-1 where unknown)
+    """
+    if 'timestamp' in labels_df.columns and 'timestamp' in regimes_df.columns:
+        return labels_df[['timestamp']].merge(
+            regimes_df[['timestamp', 'regime']], on='timestamp', how='left'
+        )['regime'].to_numpy()
+    
+    regimes = regimes_df['regime'].to_numpy()[:len(labels_df)]
+    if len(regimes) < len(labels_df):
+        regimes = np.concatenate([regimes, np.full(len(labels_df) - len(regimes), -1)])
+    return regimes
+
+
+def regime_outcome_counts(
+    regime_idx: np.ndarray,
+    outcomes: np.ndarray,
+    n_regimes: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rows, wins and losses per regime in one pass
+    
+    Args:
+        regime_idx: Regime index per row (0..n_regimes-1, -1 = skip)
+        outcomes: int8 outcome codes per row
+        n_regimes: Number of regimes
+        
+    Returns:
+        (rows, wins, losses) arrays of length n_regimes
+    """
+    keep = regime_idx >= 0
+    # Flat bin = regime * 3 + (outcome + 1): columns are stop / none / target
+    bins = regime_idx[keep].astype(np.int64) * 3 + (outcomes[keep].astype(np.int64) + 1)
+    counts = np.bincount(bins, minlength=n_regimes * 3).reshape(n_regimes, 3)
+    return counts.sum(axis=1), counts[:, OUTCOME_TARGET + 1], counts[:, OUTCOME_STOP + 1]
+
+
+def _regime_indices(regimes: np.ndarray, unique_regimes: np.ndarray) -> np.ndarray:
+    """Map regime ids to positions in unique_regimes (-1 for noise/unknown)"""
+    regimes = pd.to_numeric(pd.Series(regimes), errors='coerce').to_numpy(dtype=np.float64)
+    if len(unique_regimes) == 0:
+        return np.full(len(regimes), -1)
+    
+    known = unique_regimes.astype(np.float64)
+    pos = np.clip(np.searchsorted(known, regimes), 0, len(known) - 1)
+    # NaN never compares equal, so unmatched rows fall out here
+    return np.where(known[pos] == regimes, pos, -1)
+
+
+def _analyze_config(
+    config_key: str,
+    labels_data,
+    regimes_df: pd.DataFrame,
+    unique_regimes: np.ndarray,
+    config: Dict
+) -> Optional[List[Dict]]:
+    """
+    Regime × direction metrics for one label config
+    
+    Args:
+        config_key: Config string like "T10_S5_H30"
+        labels_data: Labeled DataFrame or Path to a label file
+        regimes_df: DataFrame with 'regime' column
+        unique_regimes: Sorted regime ids to report (noise excluded)
+        config: Analysis configuration
+        
+    Returns:
+        List of result rows, or None if the config could not be processed
+    """
+    min_trades = config.get("min_trades", 100)
+    
+    parsed = parse_config_key(config_key)
+    if parsed is None:
+        return None
+    target_pips, stop_pips, horizon_min = parsed
+    
+    # Load label data if it's a Path (outcome columns only)
+    if isinstance(labels_data, Path):
+        labels_df, _ = read_labels(labels_data, columns=OUTCOME_COLUMNS)
+    else:
+        labels_df = labels_data
+    
+    regime_idx = _regime_indices(_align_regimes(labels_df, regimes_df), unique_regimes)
+    n_regimes = len(unique_regimes)
+    
+    # Per-regime counts for both directions, all regimes at once
+    direction_counts = {}
+    for direction in ['up', 'down']:
+        outcome_col = f'{direction}_outcome'
+        if outcome_col in labels_df.columns:
+            outcomes = outcome_codes(labels_df[outcome_col].to_numpy())
+            direction_counts[direction] = regime_outcome_counts(regime_idx, outcomes, n_regimes)
+    
+    # Win gives target_pips, loss gives -stop_pips; R = risk = stop_pips
+    r_multiple = target_pips / stop_pips
+    
+    results = []
+    for pos, regime_id in enumerate(unique_regimes):
+        for direction, (rows, wins_by_regime, losses_by_regime) in direction_counts.items():
+            if rows[pos] < min_trades:
+                continue
+            
+            wins = int(wins_by_regime[pos])
+            losses = int(losses_by_regime[pos])
+            total = wins + losses
+            
+            if total < min_trades:
+                continue
+            
+            win_rate = wins / total if total > 0 else 0
+            gross_profit = wins * target_pips
+            gross_loss = losses * stop_pips
+            profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
+            p_value = calculate_p_value(wins, total, null_hypothesis=0.5)
+            expectancy_r = (win_rate * r_multiple) - ((1 - win_rate) * 1)
+            
+            # Bootstrap over every row of the regime (target = 1, else 0)
+            ci_lower, ci_mean, ci_upper = calculate_bootstrap_ci_from_counts(wins, int(rows[pos]))
+            
+            results.append({
+                'regime': regime_id.item(),
+                'config': config_key,
+                'direction': direction,
+                'target_pips': target_pips,
+                'stop_pips': stop_pips,
+                'horizon_min': horizon_min,
+                'risk_reward': r_multiple,
+                'n_trades': total,
+                'wins': wins,
+                'losses': losses,
+                'win_rate': win_rate,
+                'profit_factor': profit_factor,
+                'expectancy_r': expectancy_r,
+                'p_value': p_value,
+                'ci_lower': ci_lower,
+                'ci_upper': ci_upper,
+                'is_significant': p_value < config.get('max_p_value', 0.05),
+            })
+    
+    return results
+
+
+# Worker-side state for parallel config analysis
+_worker_regimes = None
+
+
+def _init_config_worker(regimes_df, unique_regimes, config):
+    """Pool initializer: receive the regimes once per worker"""
+    global _worker_regimes
+    _worker_regimes = (regimes_df, unique_regimes, config)
+
+
+def _analyze_config_worker(task):
+    """Pool task: analyze one (config_key, labels_data) pair"""
+    config_key, labels_data = task
+    regimes_df, unique_regimes, config = _worker_regimes
+    try:
+        return config_key, _analyze_config(config_key, labels_data, regimes_df, unique_regimes, config), None
+    except Exception as e:
+        return config_key, None, str(e)
+
+
 def analyze_regime_label_performance(
     labels: Dict[str, pd.DataFrame],
     regimes_df: pd.DataFrame,
     config: Dict = None,
     batch_mode: bool = True,
-    sample_size: Optional[int] = None
+    sample_size: Optional[int] = None,
+    n_workers: int = None
 ) -> pd.DataFrame:
     """
     Cross Regime × Label to find which configs work in which regimes
     
     This is the CORE function - Phase 4 of the pipeline
     
-    Memory-efficient implementation: processes one label at a time to avoid OOM
+    Each config is aligned with the regimes once and all regimes are
+    counted in a single bincount over (regime, outcome) pairs, so the cost
+    grows with the number of configs rather than configs × regimes × rows.
     
     Args:
-        labels: Dictionary of config_key -> labeled DataFrame
+        labels: Dictionary of config_key -> labeled DataFrame (or Path)
         regimes_df: DataFrame with 'regime' column
         config: Analysis configuration
         batch_mode: If True, processes labels one at a time (memory-efficient)
         sample_size: If provided, randomly sample this many rows from regimes_df
+        n_workers: Worker processes for configs (default: config["n_workers"], 1 = in-process)
         
     Returns:
         DataFrame with performance metrics per regime×config
     """
     if config is None:
         config = EDGE_CONFIG
-    
-    min_trades = config.get("min_trades", 100)
+    if n_workers is None:
+        n_workers = config.get("n_workers", 1)
     
     print(f"\n🔬 Analyzing Regime × Label Performance...")
     print(f"   Configs: {len(labels)}")
@@ -252,204 +462,49 @@ def analyze_regime_label_performance(
         regimes_df = regimes_df.sample(n=sample_size, random_state=42)
         print(f"   ✅ Sampled dataset has {len(regimes_df):,} rows")
     
-    results = []
-    
     # Get unique regimes (exclude noise = -1)
-    unique_regimes = sorted([r for r in regimes_df['regime'].unique() if r != -1])
-    
-    # Process each label configuration individually to avoid loading all in memory
-    if batch_mode:
-        print(f"   🔄 Processing in batch mode (one label at a time)...")
+    unique_regimes = np.array(sorted(r for r in regimes_df['regime'].dropna().unique() if r != -1))
+    
+    results_by_config = {}
+    
+    if n_workers > 1 and len(labels) > 1:
+        print(f"   ⚡ Processing {len(labels)} configs on {n_workers} workers...")
+        # Spawned workers: forking after numba/pyarrow have started their
+        # thread pools can deadlock the interpreter at exit
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_config_worker,
+            initargs=(regimes_df, unique_regimes, config)
+        ) as executor:
+            for config_key, rows, error in executor.map(_analyze_config_worker, labels.items()):
+                if error is not None:
+                    print(f"   ⚠️ Failed to process {config_key}: {error}")
+                elif rows is None:
+                    print(f"   ⚠️ Could not parse config: {config_key}")
+                else:
+                    results_by_config[config_key] = rows
+    else:
+        if batch_mode:
+            print(f"   🔄 Processing in batch mode (one label at a time)...")
         
         for idx, (config_key, labels_data) in enumerate(labels.items(), 1):
-            print(f"   [{idx}/{len(labels)}] Processing {config_key}...", end=' ')
-            
-            # Load label data if it's a Path
-            if isinstance(labels_data, Path):
-                try:
-                    labels_df = pd.read_parquet(labels_data)
-                except Exception as e:
-                    print(f"⚠️ Failed to load {labels_data}: {e}")
-                    continue
-            else:
-                labels_df = labels_data
-            
-            # Parse config
-            parsed = parse_config_key(config_key)
-            if parsed is None:
-                print(f"⚠️ Could not parse")
+            try:
+                rows = _analyze_config(config_key, labels_data, regimes_df, unique_regimes, config)
+            except Exception as e:
+                print(f"   ⚠️ Failed to process {config_key}: {e}")
                 continue
             
-            target_pips, stop_pips, horizon_min = parsed
-            
-            # Merge with regimes (align by index or timestamp)
-            if 'timestamp' in labels_df.columns and 'timestamp' in regimes_df.columns:
-                merged = labels_df.merge(regimes_df[['timestamp', 'regime']], on='timestamp', how='left')
-            else:
-                # Assume same index
-                merged = labels_df.copy()
-                merged['regime'] = regimes_df['regime'].values[:len(labels_df)]
-            
-            # Analyze each regime
-            regime_results = 0
-            for regime_id in unique_regimes:
-                regime_data = merged[merged['regime'] == regime_id]
-                
-                if len(regime_data) < min_trades:
-                    continue
-                
-                # Calculate metrics for both directions
-                for direction in ['up', 'down']:
-                    outcome_col = f'{direction}_outcome'
-                    
-                    if outcome_col not in regime_data.columns:
-                        continue
-                    
-                    # Count wins (target hit) and losses (stop hit)
-                    outcomes = regime_data[outcome_col]
-                    wins = (outcomes == 'target').sum()
-                    losses = (outcomes == 'stop').sum()
-                    total = wins + losses
-                    
-                    if total < min_trades:
-                        continue
-                    
-                    win_rate = wins / total if total > 0 else 0
-                    
-                    # Calculate profit factor
-                    # Win gives target_pips, loss gives -stop_pips
-                    gross_profit = wins * target_pips
-                    gross_loss = losses * stop_pips
-                    profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
-                    
-                    # Calculate p-value
-                    p_value = calculate_p_value(wins, total, null_hypothesis=0.5)
-                    
-                    # Calculate expectancy (in R-multiples)
-                    # R = risk = stop_pips
-                    # Win = target_pips / stop_pips R, Loss = -1 R
-                    r_multiple = target_pips / stop_pips
-                    expectancy_r = (win_rate * r_multiple) - ((1 - win_rate) * 1)
-                    
-                    # Bootstrap confidence interval
-                    outcome_binary = np.where(outcomes == 'target', 1, 0)
-                    outcome_binary = outcome_binary[~pd.isna(outcomes)]
-                    ci_lower, ci_mean, ci_upper = calculate_bootstrap_ci(outcome_binary)
-                    
-                    results.append({
-                        'regime': regime_id,
-                        'config': config_key,
-                        'direction': direction,
-                        'target_pips': target_pips,
-                        'stop_pips': stop_pips,
-                        'horizon_min': horizon_min,
-                        'risk_reward': r_multiple,
-                        'n_trades': total,
-                        'wins': wins,
-                        'losses': losses,
-                        'win_rate': win_rate,
-                        'profit_factor': profit_factor,
-                        'expectancy_r': expectancy_r,
-                        'p_value': p_value,
-                        'ci_lower': ci_lower,
-                        'ci_upper': ci_upper,
-                        'is_significant': p_value < config.get('max_p_value', 0.05),
-                    })
-                    regime_results += 1
-            
-            print(f"({regime_results} results)")
-            
-            # Free memory - explicitly delete and trigger garbage collection
-            del merged
-            del labels_df
-            import gc
-            gc.collect()
-            
-    else:
-        # Original non-batch mode (loads all labels in memory)
-        print(f"   ⚠️ Running in non-batch mode (higher memory usage)...")
-        
-        for config_key, labels_df in labels.items():
-            # Parse config
-            parsed = parse_config_key(config_key)
-            if parsed is None:
+            if rows is None:
                 print(f"   ⚠️ Could not parse config: {config_key}")
                 continue
             
-            target_pips, stop_pips, horizon_min = parsed
-            
-            # Merge with regimes (align by index or timestamp)
-            if 'timestamp' in labels_df.columns and 'timestamp' in regimes_df.columns:
-                merged = labels_df.merge(regimes_df[['timestamp', 'regime']], on='timestamp', how='left')
-            else:
-                # Assume same index
-                merged = labels_df.copy()
-                merged['regime'] = regimes_df['regime'].values[:len(labels_df)]
-            
-            # Analyze each regime
-            for regime_id in unique_regimes:
-                regime_data = merged[merged['regime'] == regime_id]
-                
-                if len(regime_data) < min_trades:
-                    continue
-                
-                # Calculate metrics for UP direction
-                for direction in ['up', 'down']:
-                    outcome_col = f'{direction}_outcome'
-                    
-                    if outcome_col not in regime_data.columns:
-                        continue
-                    
-                    # Count wins (target hit) and losses (stop hit)
-                    outcomes = regime_data[outcome_col]
-                    wins = (outcomes == 'target').sum()
-                    losses = (outcomes == 'stop').sum()
-                    total = wins + losses
-                    
-                    if total < min_trades:
-                        continue
-                    
-                    win_rate = wins / total if total > 0 else 0
-                    
-                    # Calculate profit factor
-                    # Win gives target_pips, loss gives -stop_pips
-                    gross_profit = wins * target_pips
-                    gross_loss = losses * stop_pips
-                    profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
-                    
-                    # Calculate p-value
-                    p_value = calculate_p_value(wins, total, null_hypothesis=0.5)
-                    
-                    # Calculate expectancy (in R-multiples)
-                    # R = risk = stop_pips
-                    # Win = target_pips / stop_pips R, Loss = -1 R
-                    r_multiple = target_pips / stop_pips
-                    expectancy_r = (win_rate * r_multiple) - ((1 - win_rate) * 1)
-                    
-                    # Bootstrap confidence interval
-                    outcome_binary = np.where(outcomes == 'target', 1, 0)
-                    outcome_binary = outcome_binary[~pd.isna(outcomes)]
-                    ci_lower, ci_mean, ci_upper = calculate_bootstrap_ci(outcome_binary)
-                    
-                    results.append({
-                        'regime': regime_id,
-                        'config': config_key,
-                        'direction': direction,
-                        'target_pips': target_pips,
-                        'stop_pips': stop_pips,
-                        'horizon_min': horizon_min,
-                        'risk_reward': r_multiple,
-                        'n_trades': total,
-                        'wins': wins,
-                        'losses': losses,
-                        'win_rate': win_rate,
-                        'profit_factor': profit_factor,
-                        'expectancy_r': expectancy_r,
-                        'p_value': p_value,
-                        'ci_lower': ci_lower,
-                        'ci_upper': ci_upper,
-                        'is_significant': p_value < config.get('max_p_value', 0.05),
-                    })
+            if batch_mode:
+                print(f"   [{idx}/{len(labels)}] {config_key} ({len(rows)} results)")
+            results_by_config[config_key] = rows
+    
+    results = [row for config_key in labels if config_key in results_by_config
+               for row in results_by_config[config_key]]
     
     results_df = pd.DataFrame(results)
     print(f"   ✅ Analyzed {len(results_df)} regime×config×direction combinations")
@@ -532,6 +587,8 @@ def validate_out_of_sample(
             continue
         
         labels_df = labels[config_key]
+        if isinstance(labels_df, Path):
+            labels_df, _ = read_labels(labels_df, columns=OUTCOME_COLUMNS)
         
         # Merge with regimes
         if 'timestamp' in labels_df.columns and 'timestamp' in regimes_df.columns:
@@ -554,15 +611,15 @@ def validate_out_of_sample(
         outcome_col = f'{direction}_outcome'
         
         # In-sample metrics
-        is_outcomes = is_data[outcome_col]
-        is_wins = (is_outcomes == 'target').sum()
-        is_total = is_wins + (is_outcomes == 'stop').sum()
+        is_outcomes = outcome_codes(is_data[outcome_col].to_numpy())
+        is_wins = int((is_outcomes == OUTCOME_TARGET).sum())
+        is_total = is_wins + int((is_outcomes == OUTCOME_STOP).sum())
         is_win_rate = is_wins / is_total if is_total > 0 else 0
         
         # Out-of-sample metrics
-        oos_outcomes = oos_data[outcome_col]
-        oos_wins = (oos_outcomes == 'target').sum()
-        oos_total = oos_wins + (oos_outcomes == 'stop').sum()
+        oos_outcomes = outcome_codes(oos_data[outcome_col].to_numpy())
+        oos_wins = int((oos_outcomes == OUTCOME_TARGET).sum())
+        oos_total = oos_wins + int((oos_outcomes == OUTCOME_STOP).sum())
         oos_win_rate = oos_wins / oos_total if oos_total > 0 else 0
         
         # Calculate degradation
@@ -753,6 +810,8 @@ if __name__ == "__main__":
                         help="Maximum p-value for significance")
     parser.add_argument("--min-pf", type=float, default=1.3,
                         help="Minimum profit factor")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for regime × label analysis")
     
     args = parser.parse_args()
     
@@ -762,6 +821,7 @@ if __name__ == "__main__":
         "max_p_value": args.max_p_value,
         "min_profit_factor": args.min_pf,
         "oos_split": 0.2,
+        "n_workers": args.workers,
     }
     
     edges = find_edge(
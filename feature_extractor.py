@@ -14,6 +14,8 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import warnings
 
+from feature_table import grouped_feature_stats
+
 warnings.filterwarnings("ignore")
 
 
@@ -111,7 +113,9 @@ def extract_features_from_universe(universe_data: Dict) -> pd.DataFrame:
     a feature DataFrame that can be combined with OHLC data.
     
     Args:
-        universe_data: Universe result dictionary from JSON file
+        universe_data: Universe result dictionary from JSON file, or an
+            analyzer result with a "features" table (statistics are then
+            computed from the table)
         
     Returns:
         DataFrame with aggregated features (single row with mean statistics
@@ -122,6 +126,13 @@ def extract_features_from_universe(universe_data: Dict) -> pd.DataFrame:
     try:
         results = universe_data.get("results", {})
         
+        # In-memory analyzer results carry the per-target feature table
+        feature_table = universe_data.get("features")
+        if isinstance(feature_table, pd.DataFrame) and not feature_table.empty:
+            results = {}
+            for (level_name, direction), stats in grouped_feature_stats(feature_table).items():
+                results.setdefault(level_name, {})[direction] = {"feature_stats": stats}
+        
         for level_name, level_data in results.items():
             if not isinstance(level_data, dict):
                 continue
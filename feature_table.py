@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - FEATURE TABLE 💎🌟⚡
+
+Columnar storage of the per-target window features of a universe
+"One crystal lattice instead of a million shards"
+
+Technical: one DataFrame per universe instead of lists of feature dicts
+- One row per extracted target; level, direction and pattern signature are
+  category columns, signature_code is the signature's integer code and
+  target_index is the candle index of the target
+- Feature columns are float64; a feature a window does not have is NaN
+- Statistics (mean/std/min/max per feature) and pattern counts are
+  computed per (level, direction) group with column-wise reductions
+- Pickles as a few NumPy blocks, so results cross process boundaries
+  without millions of small Python objects
+- Pattern signatures are binned for whole columns at once and packed into
+  integer codes (one base-(n_bins + 1) digit per key feature, 0 = absent);
+  SignatureCodec.decode turns a code back into the readable signature
+
+Usage:
+    table = build_feature_table(records, levels, directions, indices)
+    stats = grouped_feature_stats(table)[("Medium", "up")]
+    counts = grouped_pattern_counts(table)[("Medium", "up")]
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Non-feature columns of a feature table
+META_COLUMNS = ("level", "direction", "signature", "signature_code", "target_index")
+
+STAT_SUFFIXES = ("mean", "std", "min", "max")
+
+# Key features of a pattern signature, with fixed bin edges and labels
+# (analyzer.create_pattern_signature)
+SIGNATURE_FEATURES = (
+    "dfa_alpha", "hurst", "d1_mean", "stat_trend_slope",
+    "ohlc_up_ratio", "photon_efficiency"
+)
+SIGNATURE_EDGES = (-0.5, -0.1, 0.1, 0.5)
+SIGNATURE_LABELS = ("VL", "L", "N", "H", "VH")
+UNKNOWN_SIGNATURE = "UNKNOWN"
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🔮 PATTERN SIGNATURES (Integer Codes)
+# ═══════════════════════════════════════════════════════════════
+
+class SignatureCodec:
+    """
+    Vectorized pattern signatures as integer codes
+
+    Each key feature is one digit of the code in base len(labels) + 1:
+    0 when the feature is absent, otherwise 1 + its bin. A NaN value of a
+    present feature falls in the top bin, as in create_pattern_signature
+    (every comparison with NaN is False). Codes are
+    reversible, so patterns can be counted with integer group-bys and
+    turned into readable signatures only for reporting.
+    """
+
+    def __init__(
+        self,
+        features: Sequence[str] = SIGNATURE_FEATURES,
+        edges: Union[Sequence[float], Dict[str, Sequence[float]]] = SIGNATURE_EDGES,
+        labels: Sequence[str] = SIGNATURE_LABELS
+    ):
+        """
+        Initialize codec
+
+        Args:
+            features: Key features, least significant digit first
+            edges: Inner bin edges (len(labels) - 1 values) shared by all
+                features, or a {feature: edges} dict
+            labels: Bin labels, lowest bin first
+        """
+        self.features = tuple(features)
+        self.labels = tuple(labels)
+        self.base = len(self.labels) + 1
+        if isinstance(edges, dict):
+            self.edges = {feat: np.asarray(edges[feat], dtype=np.float64) for feat in self.features}
+        else:
+            self.edges = {feat: np.asarray(edges, dtype=np.float64) for feat in self.features}
+
+    @classmethod
+    def from_quantiles(
+        cls,
+        table: pd.DataFrame,
+        features: Sequence[str] = SIGNATURE_FEATURES,
+        n_bins: int = 5
+    ) -> "SignatureCodec":
+        """
+        Codec with per-feature quantile bins of a feature table
+
+        Args:
+            table: Feature table whose columns set the bin edges
+            features: Key features
+            n_bins: Bins per feature (equally populated)
+
+        Returns:
+            SignatureCodec: Labels VL..VH for 5 bins, Q1..Qn otherwise
+        """
+        quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+        edges = {}
+        for feat in features:
+            values = table[feat].to_numpy(dtype=np.float64) if feat in table.columns else np.empty(0)
+            values = values[~np.isnan(values)]
+            edges[feat] = np.quantile(values, quantiles) if len(values) else np.full(n_bins - 1, np.inf)
+        labels = SIGNATURE_LABELS if n_bins == len(SIGNATURE_LABELS) else [f"Q{i + 1}" for i in range(n_bins)]
+        return cls(features, edges, labels)
+
+    def encode(self, table: pd.DataFrame,
+               present: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+        """
+        Signature codes of every row of a feature table
+
+        Args:
+            table: Feature table
+            present: {feature: bool mask} of rows that have the feature;
+                a table alone cannot tell a missing key from a NaN value
+                (default: NaN means absent)
+
+        Returns:
+            np.ndarray: int64 codes (0 = no key feature, "UNKNOWN")
+        """
+        present = present or {}
+        codes = np.zeros(len(table), dtype=np.int64)
+        weight = 1
+        for feat in self.features:
+            if feat in table.columns:
+                values = table[feat].to_numpy(dtype=np.float64)
+                digits = np.searchsorted(self.edges[feat], values, side="right") + 1
+                nan = np.isnan(values)
+                digits[nan] = len(self.labels)
+                digits[nan & ~present.get(feat, ~nan)] = 0
+                codes += digits * weight
+            weight *= self.base
+        return codes
+
+    def decode(self, code: int) -> str:
+        """Readable signature of one code ("dfa:VH|hur:N|...")"""
+        parts = []
+        code = int(code)
+        for feat in self.features:
+            code, digit = divmod(code, self.base)
+            if digit:
+                parts.append(f"{feat[:3]}:{self.labels[digit - 1]}")
+        return "|".join(parts) if parts else UNKNOWN_SIGNATURE
+
+    def lookup(self, codes: Sequence[int]) -> Dict[int, str]:
+        """{code: signature} for the distinct codes"""
+        return {int(code): self.decode(code) for code in np.unique(codes)}
+
+    def categorical(self, codes: np.ndarray) -> pd.Categorical:
+        """Readable signatures of codes as a categorical (one decode per distinct code)"""
+        unique, inverse = np.unique(codes, return_inverse=True)
+        return pd.Categorical.from_codes(inverse, [self.decode(code) for code in unique])
+
+
+DEFAULT_CODEC = SignatureCodec()
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🧱 TABLE CONSTRUCTION
+# ═══════════════════════════════════════════════════════════════
+
+def build_feature_table(
+    records: Sequence[dict],
+    levels: Sequence[str],
+    directions: Sequence[str],
+    target_indices: Sequence[int],
+    codec: Optional[SignatureCodec] = None
+) -> pd.DataFrame:
+    """
+    Build a feature table from per-target feature dicts
+
+    Args:
+        records: Feature dict of each target (the same dict may appear
+            for several targets sharing a window)
+        levels: Movement level of each target
+        directions: Direction of each target
+        target_indices: Candle index of each target
+        codec: Pattern signature codec (default: fixed bins of
+            analyzer.create_pattern_signature)
+
+    Returns:
+        pd.DataFrame: Meta columns followed by one float64 column per
+        feature, in first-seen key order
+    """
+    codec = codec or DEFAULT_CODEC
+    features = pd.DataFrame.from_records(records).astype(np.float64) if len(records) else pd.DataFrame()
+    present = {
+        feat: np.fromiter((feat in record for record in records), dtype=bool, count=len(records))
+        for feat in codec.features if feat in features.columns
+    }
+    codes = codec.encode(features, present)
+
+    meta = pd.DataFrame({
+        "level": pd.Categorical(levels),
+        "direction": pd.Categorical(directions),
+        "signature": codec.categorical(codes),
+        "signature_code": codes,
+        "target_index": np.asarray(target_indices, dtype=np.int64),
+    })
+    if features.empty:
+        return meta
+    return pd.concat([meta, features], axis=1)
+
+
+def empty_feature_table() -> pd.DataFrame:
+    """Feature table without targets"""
+    return build_feature_table([], [], [], [])
+
+
+def feature_columns(table: pd.DataFrame) -> List[str]:
+    """Feature (non-meta) columns of a feature table"""
+    return [col for col in table.columns if col not in META_COLUMNS]
+
+
+# ═══════════════════════════════════════════════════════════════
+# 📊 STATISTICS
+# ═══════════════════════════════════════════════════════════════
+
+def calculate_feature_stats(features: Union[pd.DataFrame, Sequence[dict]]) -> Dict[str, float]:
+    """
+    Calculate statistics of the features of many targets
+    Technical: Column-wise mean/std/min/max, NaN counted as missing
+
+    Args:
+        features: Feature table (meta columns are ignored) or list of
+            feature dictionaries
+
+    Returns:
+        dict: {feature}_mean, _std, _min, _max for every feature with at
+        least one value
+    """
+    if not isinstance(features, pd.DataFrame):
+        if not features:
+            return {}
+        features = pd.DataFrame.from_records(
+            [{k: v for k, v in f.items() if isinstance(v, (int, float))} for f in features]
+        )
+    if features.empty:
+        return {}
+
+    numeric = features[feature_columns(features)].select_dtypes(include=[np.number, "bool"])
+    values = numeric.to_numpy(dtype=np.float64)
+    present = ~np.isnan(values).all(axis=0)
+    if not present.any():
+        return {}
+    columns = numeric.columns[present]
+    values = values[:, present]
+
+    with np.errstate(invalid="ignore"):
+        reductions = (
+            np.nanmean(values, axis=0),
+            np.nanstd(values, axis=0),
+            np.nanmin(values, axis=0),
+            np.nanmax(values, axis=0),
+        )
+
+    stats = {}
+    for i, key in enumerate(columns):
+        for suffix, reduced in zip(STAT_SUFFIXES, reductions):
+            stats[f"{key}_{suffix}"] = float(reduced[i])
+    return stats
+
+
+def grouped_feature_stats(table: pd.DataFrame) -> Dict[Tuple[str, str], Dict[str, float]]:
+    """
+    Feature statistics of every (level, direction) group of a feature table
+
+    Returns:
+        dict: {(level, direction): calculate_feature_stats(group)}
+    """
+    if table.empty:
+        return {}
+    return {
+        (level, direction): calculate_feature_stats(group)
+        for (level, direction), group in table.groupby(["level", "direction"], observed=True, sort=False)
+    }
+
+
+def grouped_pattern_counts(
+    table: pd.DataFrame,
+    codec: Optional[SignatureCodec] = None
+) -> Dict[Tuple[str, str], Dict[str, int]]:
+    """
+    Occurrences of each pattern signature per (level, direction) group
+    Technical: bincount over (group, signature code) keys
+
+    Args:
+        table: Feature table
+        codec: Codec of the table's signature codes (default: fixed bins)
+
+    Returns:
+        dict: {(level, direction): {signature: count}}, most frequent
+        first, ties in order of first occurrence
+    """
+    if table.empty:
+        return {}
+    codec = codec or DEFAULT_CODEC
+
+    group_ids, groups = pd.factorize(
+        pd.MultiIndex.from_arrays([table["level"], table["direction"]])
+    )
+    keys, unique_keys = pd.factorize(
+        group_ids.astype(np.int64) * codec.base ** len(codec.features) + table["signature_code"].to_numpy()
+    )
+    counts = np.bincount(keys)
+    order = np.argsort(-counts, kind="stable")
+
+    grouped: Dict[Tuple[str, str], Dict[str, int]] = {}
+    for key, count in zip(unique_keys[order], counts[order]):
+        group, code = divmod(int(key), codec.base ** len(codec.features))
+        grouped.setdefault(groups[group], {})[codec.decode(code)] = int(count)
+    return grouped
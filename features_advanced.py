@@ -16,7 +16,7 @@ Technical: Advanced time series feature extraction
 
 import numpy as np
 from scipy import stats
-from scipy.spatial. distance import pdist, cdist
+from scipy.spatial. distance import pdist
 import warnings
 
 warnings.filterwarnings("ignore")
@@ -167,11 +167,88 @@ def _find_line_lengths(binary_array):
     return lengths
 
 
-def recurrence_features(data, threshold_mult=0.1, max_size=300):
+# Points kept by recurrence_features (most recent); the kernel needs O(n) memory
+RQA_MAX_SIZE = 5000
+
+
+@njit(cache=True)
+def _rqa_kernel(data, threshold):
+    """
+    Single pass over the upper triangle of the recurrence plot
+    
+    R[i, j] = |x_i - x_j| <= threshold is symmetric with a full main
+    diagonal, so every line of the full plot is seen from the upper
+    triangle alone:
+    - Diagonal k > 0 mirrors diagonal -k (each line counted twice)
+    - Column j is (upper cells (i, j), i < j) + diagonal + row j's upper
+      cells, so the upper run ending at (j-1, j) joins the leading run of
+      row j through the diagonal point
+    
+    Only run lengths per diagonal/column (O(n)) and a histogram of
+    diagonal line lengths are kept.
+    
+    Returns:
+        (n_recurrent, diag_hist, vert_count, vert_points, vert_max):
+        recurrent points of the full plot, count of upper-triangle
+        diagonal lines per length, and vertical lines (length >= 2)
+    """
+    n = len(data)
+    diag_run = np.zeros(n, np.int64)   # run on diagonal k ending at the previous row
+    col_run = np.zeros(n, np.int64)    # run in column j above the diagonal
+    diag_hist = np.zeros(n + 1, np.int64)
+    upper = 0
+    vert_count = 0
+    vert_points = 0
+    vert_max = 0
+    
+    for i in range(n):
+        # Row i = column i below the diagonal, read top to bottom
+        run = col_run[i] + 1   # upper run joins the diagonal point
+        col_run[i] = 0
+        xi = data[i]
+        for j in range(i + 1, n):
+            k = j - i
+            if abs(xi - data[j]) <= threshold:
+                upper += 1
+                diag_run[k] += 1
+                col_run[j] += 1
+                run += 1
+            else:
+                if diag_run[k] > 0:
+                    diag_hist[diag_run[k]] += 1
+                    diag_run[k] = 0
+                if col_run[j] >= 2:
+                    vert_count += 1
+                    vert_points += col_run[j]
+                    vert_max = max(vert_max, col_run[j])
+                col_run[j] = 0
+                if run >= 2:
+                    vert_count += 1
+                    vert_points += run
+                    vert_max = max(vert_max, run)
+                run = 0
+        if run >= 2:
+            vert_count += 1
+            vert_points += run
+            vert_max = max(vert_max, run)
+        
+        # Diagonal k = n - i - 1 ends at (i, n - 1)
+        k = n - 1 - i
+        if k > 0 and diag_run[k] > 0:
+            diag_hist[diag_run[k]] += 1
+            diag_run[k] = 0
+    
+    return n + 2 * upper, diag_hist, vert_count, vert_points, vert_max
+
+
+def recurrence_features(data, threshold_mult=0.1, max_size=RQA_MAX_SIZE):
     """
     Recurrence Quantification Analysis - RQA (Dialga's Time Echo)
     Technical: Analyze patterns in recurrence plots
     
+    Lines are measured by a Numba kernel in one pass over the upper
+    triangle, without building the n×n matrix (see _rqa_kernel).
+    
     Returns:
         dict: RQA features including:
             - recurrence_rate: Probability of recurrence
@@ -187,7 +264,7 @@ def recurrence_features(data, threshold_mult=0.1, max_size=300):
     
     data = np.asarray(data, dtype=np.float64)
     
-    # Limit size for performance
+    # Limit size (the kernel is O(n²) time, O(n) memory)
     if n > max_size:
         data = data[-max_size:]
         n = max_size
@@ -197,11 +274,7 @@ def recurrence_features(data, threshold_mult=0.1, max_size=300):
         if threshold == 0:
             threshold = 0.01
         
-        # Build recurrence matrix
-        dist_matrix = cdist(data. reshape(-1, 1), data.reshape(-1, 1), metric="euclidean")
-        recurrence = (dist_matrix <= threshold).astype(np.int32)
-        
-        total_recurrence = np.sum(recurrence)
+        total_recurrence, diag_hist, vert_count, vert_points, vert_max = _rqa_kernel(data, threshold)
         
         # Recurrence rate
         rr = total_recurrence / (n * n)
@@ -211,46 +284,37 @@ def recurrence_features(data, threshold_mult=0.1, max_size=300):
             return features
         
         # ═══ DIAGONAL LINES (Determinism) ═══
-        diag_lengths = []
-        
-        for k in range(1, n):
-            diag = np.diag(recurrence, k)
-            diag_lengths.extend(_find_line_lengths(diag))
+        # Off-diagonal lines come in mirrored pairs: points double, ratios don't change
+        lengths = np.arange(len(diag_hist))
+        line_counts = diag_hist.copy()
+        line_counts[:2] = 0
+        n_lines = int(line_counts.sum())
+        
+        if n_lines > 0:
+            total_diag_points = 2 * int(np.dot(lengths, line_counts))
+            det = total_diag_points / (total_recurrence - n + 1)
+            features["determinism"] = float(min(det, 1.0))
+            features["avg_diagonal_length"] = float(total_diag_points / (2 * n_lines))
+            present = np.nonzero(line_counts)[0]
+            min_length, max_length = int(present[0]), int(present[-1])
+            features["max_diagonal_length"] = float(max_length)
             
-            if k > 0:
-                diag = np.diag(recurrence, -k)
-                diag_lengths.extend(_find_line_lengths(diag))
-        
-        if diag_lengths:
-            diag_lengths = [l for l in diag_lengths if l >= 2]
-            if diag_lengths:
-                total_diag_points = sum(diag_lengths)
-                det = total_diag_points / (total_recurrence - n + 1)
-                features["determinism"] = float(min(det, 1.0))
-                features["avg_diagonal_length"] = float(np. mean(diag_lengths))
-                features["max_diagonal_length"] = float(np.max(diag_lengths))
-                
-                # Entropy of diagonal line distribution
-                hist, _ = np.histogram(diag_lengths, bins=min(20, max(diag_lengths)))
-                hist = hist[hist > 0]
-                if len(hist) > 0:
-                    probs = hist / sum(hist)
-                    features["entropy_diagonal"] = float(-np.sum(probs * np.log2(probs)))
+            # Entropy of diagonal line distribution
+            hist, _ = np.histogram(
+                present, bins=min(20, max_length),
+                range=(min_length, max_length), weights=line_counts[present]
+            )
+            hist = hist[hist > 0]
+            if len(hist) > 0:
+                probs = hist / sum(hist)
+                features["entropy_diagonal"] = float(-np.sum(probs * np.log2(probs)))
         
         # ═══ VERTICAL LINES (Laminarity) ═══
-        vert_lengths = []
-        
-        for col in range(n):
-            vert_lengths.extend(_find_line_lengths(recurrence[:, col]))
-        
-        if vert_lengths: 
-            vert_lengths = [l for l in vert_lengths if l >= 2]
-            if vert_lengths:
-                total_vert_points = sum(vert_lengths)
-                lam = total_vert_points / total_recurrence
-                features["laminarity"] = float(min(lam, 1.0))
-                features["trapping_time"] = float(np.mean(vert_lengths))
-                features["max_vertical_length"] = float(np. max(vert_lengths))
+        if vert_count > 0:
+            lam = vert_points / total_recurrence
+            features["laminarity"] = float(min(lam, 1.0))
+            features["trapping_time"] = float(vert_points / vert_count)
+            features["max_vertical_length"] = float(vert_max)
         
         # ═══ RATIO FEATURES ═══
         if "determinism" in features and "laminarity" in features: 
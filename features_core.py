@@ -909,6 +909,540 @@ def extract_core_features(prices, pips=None):
     return features
 
 
+# ═══════════════════════════════════════════════════════════════
+# 🧮 BATCHED EXTRACTION (All Windows at Once)
+# Technical: Same features for a 2-D (n_windows × lookback) array
+# ═══════════════════════════════════════════════════════════════
+#
+# Each *_batch function takes one window per row and returns a dict of
+# columns (one value per window) with the keys, in the order, of the
+# single-window function. Features a window would not have (e.g. spectral
+# features of a constant window) are NaN.
+
+def window_view(series, lookback, ends=None):
+    """
+    Strided (n_windows × lookback) view of a 1-D series
+    
+    Args:
+        series: 1-D array (e.g. close prices)
+        lookback: Window length
+        ends: Optional indices one past each window's last element
+            (window k is series[ends[k] - lookback:ends[k]]); default: all
+            windows
+        
+    Returns:
+        2-D array, a view when ends is None and a copy otherwise
+    """
+    windows = np.lib.stride_tricks.sliding_window_view(np.asarray(series, dtype=np.float64), lookback)
+    if ends is None:
+        return windows
+    return windows[np.asarray(ends, dtype=np.int64) - lookback]
+
+
+def _lstsq_slope(x, y):
+    """Least-squares slope of each row of y against x (np.polyfit(x, row, 1)[0])"""
+    xc = x - x.mean()
+    yc = y - y.mean(axis=1, keepdims=True)
+    return yc @ xc / (xc @ xc)
+
+
+def statistical_features_batch(windows):
+    """statistical_features for every row"""
+    windows = np.asarray(windows, dtype=np.float64)
+    n_windows, n = windows.shape
+    if n < 5:
+        return {}
+    
+    mean = windows.mean(axis=1)
+    std = windows.std(axis=1)
+    low, high = windows.min(axis=1), windows.max(axis=1)
+    q50, q75, q25, q10, q90 = np.percentile(windows, [50, 75, 25, 10, 90], axis=1)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Trend (stats.linregress)
+        x = np.arange(n) - (n - 1) / 2.0
+        centered = windows - mean[:, None]
+        ssxm = np.mean(x * x)
+        ssxym = centered @ x / n
+        ssym = np.mean(centered * centered, axis=1)
+        r = np.clip(ssxym / np.sqrt(ssxm * ssym), -1.0, 1.0)
+        r = np.where(ssym == 0.0, np.where(ssxym == 0.0, np.nan, 0.0), r)
+        
+        # Autocorrelation lag-1 (np.corrcoef)
+        a = windows[:, :-1] - windows[:, :-1].mean(axis=1, keepdims=True)
+        b = windows[:, 1:] - windows[:, 1:].mean(axis=1, keepdims=True)
+        autocorr = np.clip(
+            (a * b).sum(axis=1) / np.sqrt((a * a).sum(axis=1) * (b * b).sum(axis=1)), -1.0, 1.0
+        )
+        cv = np.where(mean != 0, std / np.abs(mean), np.nan)
+    
+    return {
+        "stat_mean": mean,
+        "stat_median": q50,
+        "stat_std": std,
+        "stat_var": windows.var(axis=1),
+        "stat_range": high - low,
+        "stat_iqr": q75 - q25,
+        "stat_skewness": stats.skew(windows, axis=1),
+        "stat_kurtosis": stats.kurtosis(windows, axis=1),
+        "stat_min": low,
+        "stat_max": high,
+        "stat_q10": q10,
+        "stat_q90": q90,
+        "stat_cv": cv,
+        "stat_trend_slope": ssxym / ssxm,
+        "stat_trend_r2": r ** 2,
+        "stat_autocorr_1": np.where(np.isnan(autocorr), 0.0, autocorr),
+    }
+
+
+def calculate_derivatives_batch(windows):
+    """calculate_derivatives for every row"""
+    windows = np.asarray(windows, dtype=np.float64)
+    if windows.shape[1] < 6:
+        return {}
+    
+    features = {}
+    d = windows
+    for order, names in (
+        (1, ("mean", "std", "current", "max", "min", "abs_mean", "positive_ratio")),
+        (2, ("mean", "std", "current", "abs_mean")),
+        (3, ("mean", "std", "current")),
+        (4, ("mean", "current")),
+        (5, ("mean", "current")),
+    ):
+        if order > 1 and d.shape[1] < 2:
+            break
+        d = np.diff(d, axis=1)
+        values = {
+            "mean": lambda: d.mean(axis=1),
+            "std": lambda: d.std(axis=1),
+            "current": lambda: d[:, -1],
+            "max": lambda: d.max(axis=1),
+            "min": lambda: d.min(axis=1),
+            "abs_mean": lambda: np.abs(d).mean(axis=1),
+            "positive_ratio": lambda: (d > 0).mean(axis=1),
+        }
+        for name in names:
+            features[f"d{order}_{name}"] = values[name]()
+    
+    return features
+
+
+def spectral_features_batch(windows):
+    """spectral_features for every row (one rFFT call for all windows)"""
+    windows = np.asarray(windows, dtype=np.float64)
+    n_windows, length = windows.shape
+    if length < 16:
+        return {}
+    
+    centered = windows - windows.mean(axis=1, keepdims=True)
+    power = np.abs(np.fft.rfft(centered, axis=1)) ** 2
+    n = length // 2
+    power_pos = power[:, 1:n]
+    freqs_pos = fftfreq(length)[1:n]
+    n_pos = power_pos.shape[1]
+    if n_pos == 0:
+        return {}
+    
+    total_power = power_pos.sum(axis=1)
+    valid = total_power > 0
+    features = {}
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Top 5 dominant frequencies
+        top_idx = np.argsort(power_pos, axis=1)[:, ::-1][:, :5]
+        for i in range(top_idx.shape[1]):
+            idx = top_idx[:, i]
+            features[f"fft_freq_{i+1}"] = freqs_pos[idx]
+            features[f"fft_power_{i+1}"] = np.take_along_axis(power_pos, idx[:, None], axis=1)[:, 0]
+        
+        # Spectral bands energy distribution
+        n_bands = 4
+        band_size = n_pos // n_bands
+        if band_size > 0:
+            for i in range(n_bands):
+                start = i * band_size
+                end = start + band_size if i < n_bands - 1 else n_pos
+                features[f"fft_band_{i+1}_ratio"] = power_pos[:, start:end].sum(axis=1) / total_power
+        
+        centroid = power_pos @ freqs_pos / total_power
+        features["spectral_centroid"] = centroid
+        features["spectral_spread"] = np.sqrt(
+            np.sum(((freqs_pos[None, :] - centroid[:, None]) ** 2) * power_pos, axis=1) / total_power
+        )
+        geometric_mean = np.exp(np.mean(np.log(power_pos + 1e-10), axis=1))
+        features["spectral_flatness"] = geometric_mean / (power_pos.mean(axis=1) + 1e-10)
+        power_norm = power_pos / (total_power[:, None] + 1e-10)
+        features["spectral_entropy"] = -np.sum(power_norm * np.log2(power_norm + 1e-10), axis=1)
+        
+        # Spectral rolloff (np.searchsorted on each row's cumulative power)
+        rolloff_idx = (np.cumsum(power_pos, axis=1) < 0.85 * total_power[:, None]).sum(axis=1)
+        features["spectral_rolloff"] = np.where(
+            rolloff_idx < n_pos, freqs_pos[np.minimum(rolloff_idx, n_pos - 1)], np.nan
+        )
+    
+    # Constant windows have no spectral features
+    for key in features:
+        features[key] = np.where(valid, features[key], np.nan)
+    return features
+
+
+def wavelet_features_batch(windows, levels=5):
+    """wavelet_features for every row"""
+    windows = np.asarray(windows, dtype=np.float64)
+    if windows.shape[1] < 2 ** levels:
+        return {}
+    
+    features = {}
+    signal_data = windows
+    level_energies = []
+    
+    for level in range(1, levels + 1):
+        if signal_data.shape[1] < 2:
+            break
+        n = signal_data.shape[1] // 2 * 2
+        signal_data = signal_data[:, :n]
+        approx = (signal_data[:, ::2] + signal_data[:, 1::2]) / 2
+        detail = (signal_data[:, ::2] - signal_data[:, 1::2]) / 2
+        
+        energy = np.sum(detail ** 2, axis=1)
+        level_energies.append(energy)
+        features[f"wavelet_d{level}_energy"] = energy
+        features[f"wavelet_d{level}_std"] = detail.std(axis=1)
+        features[f"wavelet_d{level}_max"] = np.abs(detail).max(axis=1)
+        features[f"wavelet_d{level}_mean"] = np.abs(detail).mean(axis=1)
+        signal_data = approx
+    
+    total_energy = np.sum(level_energies, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i, energy in enumerate(level_energies, 1):
+            features[f"wavelet_d{i}_ratio"] = np.where(total_energy > 0, energy / total_energy, np.nan)
+    
+    if signal_data.shape[1] > 0:
+        features["wavelet_approx_mean"] = signal_data.mean(axis=1)
+        features["wavelet_approx_std"] = signal_data.std(axis=1)
+        features["wavelet_approx_energy"] = np.sum(signal_data ** 2, axis=1)
+    
+    return features
+
+
+@njit(cache=True)
+def _lyapunov_rows(windows):
+    """lyapunov_exponent of every row"""
+    n_windows, n = windows.shape
+    out = np.zeros(n_windows)
+    if n < 30:
+        return out
+    lags = np.array([3, 5, 10, 15, 20])
+    for w in range(n_windows):
+        prices = windows[w]
+        total = 0.0
+        count = 0
+        for i in range(n - 20):
+            d0 = abs(prices[i] - prices[i + 1])
+            if d0 > 1e-10:
+                for lag in lags:
+                    if i + lag + 1 < n:
+                        dt = abs(prices[i + lag] - prices[i + lag + 1])
+                        if dt > 1e-10:
+                            total += np.log(dt / d0) / lag
+                            count += 1
+        out[w] = total / count if count > 0 else 0.0
+    return out
+
+
+@njit(cache=True)
+def _dfa_rows(windows):
+    """dfa_alpha of every row (rows shorter than 64 give 0.5)"""
+    n_windows, n = windows.shape
+    out = np.full(n_windows, 0.5)
+    if n < 64:
+        return out
+    for w in range(n_windows):
+        scales, fluctuations = _dfa_core(windows[w])
+        # Log-log least-squares slope over scales with a fluctuation
+        count = 0
+        sx = 0.0
+        sy = 0.0
+        for i in range(len(scales)):
+            if fluctuations[i] > 0:
+                count += 1
+                sx += np.log(scales[i])
+                sy += np.log(fluctuations[i])
+        if count < 2:
+            continue
+        mx = sx / count
+        my = sy / count
+        num = 0.0
+        den = 0.0
+        for i in range(len(scales)):
+            if fluctuations[i] > 0:
+                dx = np.log(scales[i]) - mx
+                num += dx * (np.log(fluctuations[i]) - my)
+                den += dx * dx
+        out[w] = num / den
+    return out
+
+
+def _hurst_rows(windows):
+    """hurst_exponent of every row"""
+    n_windows, n = windows.shape
+    lags = np.arange(2, min(25, n // 2))
+    if n < 20 or len(lags) < 2:
+        return np.full(n_windows, 0.5)
+    
+    tau = np.empty((n_windows, len(lags)))
+    for j, lag in enumerate(lags):
+        tau[:, j] = np.std(windows[:, lag:] - windows[:, :-lag], axis=1)
+    tau = np.where(tau > 0, tau, 1e-10)
+    return _lstsq_slope(np.log(lags), np.log(tau))
+
+
+def _higuchi_rows(windows, k_max=10):
+    """fractal_dimension_higuchi of every row"""
+    n_windows, n = windows.shape
+    if n < k_max * 4:
+        return np.ones(n_windows)
+    
+    L = np.empty((n_windows, k_max))
+    for k in range(1, k_max + 1):
+        Lk = np.zeros(n_windows)
+        for m in range(1, k + 1):
+            n_max = (n - m) // k
+            points = windows[:, m - 1:m + n_max * k:k]
+            Lk += np.abs(np.diff(points, axis=1)).sum(axis=1) * (n - 1) / (k * n_max * k)
+        L[:, k - 1] = Lk / k
+    return -_lstsq_slope(np.log(np.arange(1, k_max + 1)), np.log(L + 1e-10))
+
+
+def chaos_features_batch(windows):
+    """chaos_features for every row"""
+    windows = np.ascontiguousarray(windows, dtype=np.float64)
+    dfa = _dfa_rows(windows)
+    hurst = _hurst_rows(windows)
+    return {
+        "lyapunov": _lyapunov_rows(windows),
+        "dfa_alpha": dfa,
+        "hurst": hurst,
+        "fractal_dim": _higuchi_rows(windows),
+        "regime_dfa": np.where(dfa > 0.6, 1, np.where(dfa < 0.4, -1, 0)),
+        "regime_hurst": np.where(hurst > 0.55, 1, np.where(hurst < 0.45, -1, 0)),
+    }
+
+
+@njit(cache=True)
+def _histogram_entropy_rows(rows):
+    """
+    shannon_entropy of every row
+    
+    Bins follow np.histogram(row, bins=min(15, max(5, n // 3))) exactly;
+    rows with non-finite values give 0.0.
+    """
+    n_rows, n = rows.shape
+    out = np.zeros(n_rows)
+    if n < 5:
+        return out
+    n_bins = min(15, max(5, n // 3))
+    hist = np.zeros(n_bins, np.int64)
+    edges = np.empty(n_bins + 1)
+    
+    for r in range(n_rows):
+        lo = rows[r, 0]
+        hi = rows[r, 0]
+        finite = True
+        for j in range(n):
+            v = rows[r, j]
+            if not np.isfinite(v):
+                finite = False
+                break
+            lo = min(lo, v)
+            hi = max(hi, v)
+        if not finite:
+            continue
+        if lo == hi:
+            lo -= 0.5
+            hi += 0.5
+        
+        step = (hi - lo) / n_bins
+        for b in range(n_bins):
+            edges[b] = b * step + lo
+        edges[n_bins] = hi
+        
+        hist[:] = 0
+        denom = hi - lo
+        for j in range(n):
+            v = rows[r, j]
+            idx = int((v - lo) / denom * n_bins)
+            if idx == n_bins:
+                idx -= 1
+            if v < edges[idx]:
+                idx -= 1
+            elif v >= edges[idx + 1] and idx != n_bins - 1:
+                idx += 1
+            hist[idx] += 1
+        
+        entropy = 0.0
+        for b in range(n_bins):
+            if hist[b] > 0:
+                prob = hist[b] / n
+                entropy -= prob * np.log2(prob)
+        out[r] = entropy
+    return out
+
+
+@njit(cache=True)
+def _permutation_entropy_rows(rows, order):
+    """permutation_entropy (delay 1) of every row"""
+    n_rows, n = rows.shape
+    out = np.zeros(n_rows)
+    if n < order + 10:
+        return out
+    
+    max_entropy = 0.0
+    for a in range(2, order + 1):
+        max_entropy += np.log2(a)
+    
+    n_patterns = n - order + 1
+    counts = np.zeros(order ** order, np.int64)
+    rank = np.empty(order, np.int64)
+    for r in range(n_rows):
+        counts[:] = 0
+        for i in range(n_patterns):
+            for a in range(order):
+                rank[a] = a
+            # Stable insertion sort of the indices by value (np.argsort order)
+            for a in range(1, order):
+                j = a
+                while j > 0 and rows[r, i + rank[j]] < rows[r, i + rank[j - 1]]:
+                    tmp = rank[j]
+                    rank[j] = rank[j - 1]
+                    rank[j - 1] = tmp
+                    j -= 1
+            code = 0
+            for a in range(order):
+                code = code * order + rank[a]
+            counts[code] += 1
+        
+        entropy = 0.0
+        for code in range(len(counts)):
+            if counts[code] > 0:
+                prob = counts[code] / n_patterns
+                entropy -= prob * np.log2(prob)
+        out[r] = entropy / max_entropy
+    return out
+
+
+@njit(cache=True)
+def _sample_entropy_rows(rows, m, r_mult):
+    """sample_entropy of every row (last 300 values)"""
+    n_rows, n = rows.shape
+    out = np.zeros(n_rows)
+    if n < 30:
+        return out
+    start = max(0, n - 300)
+    for i in range(n_rows):
+        data = rows[i, start:]
+        r = r_mult * np.std(data)
+        if r == 0:
+            continue
+        A, B = _sample_entropy_core(data, m, r)
+        if B > 0 and A > 0:
+            out[i] = -np.log(A / B)
+    return out
+
+
+@njit(cache=True)
+def _approximate_entropy_rows(rows, m, r_mult):
+    """approximate_entropy of every row (last 200 values)"""
+    n_rows, total = rows.shape
+    out = np.zeros(n_rows)
+    if total < 30:
+        return out
+    start = max(0, total - 200)
+    n = total - start
+    for row in range(n_rows):
+        data = rows[row, start:]
+        r = r_mult * np.std(data)
+        if r == 0:
+            continue
+        phis = np.zeros(2)
+        for p in range(2):
+            m_val = m + p
+            n_templates = n - m_val + 1
+            acc = 0.0
+            for i in range(n_templates):
+                count = 0
+                for j in range(n_templates):
+                    diff = 0.0
+                    for k in range(m_val):
+                        diff = max(diff, abs(data[j + k] - data[i + k]))
+                    if diff <= r:
+                        count += 1
+                acc += np.log(count / n_templates + 1e-10)
+            phis[p] = acc / n_templates
+        out[row] = phis[0] - phis[1]
+    return out
+
+
+def entropy_features_batch(data):
+    """entropy_features for every row"""
+    data = np.ascontiguousarray(data, dtype=np.float64)
+    features = {
+        "entropy_shannon": _histogram_entropy_rows(data),
+        "entropy_sample": _sample_entropy_rows(data, 2, 0.2),
+        "entropy_permutation": _permutation_entropy_rows(data, 3),
+        "entropy_approximate": _approximate_entropy_rows(data, 2, 0.2),
+    }
+    
+    # Average of the positive entropies
+    stacked = np.column_stack(list(features.values()))
+    positive = stacked > 0
+    n_positive = positive.sum(axis=1)
+    with np.errstate(invalid="ignore"):
+        features["entropy_average"] = np.where(
+            n_positive > 0, np.where(positive, stacked, 0.0).sum(axis=1) / n_positive, 0.0
+        )
+    return features
+
+
+def extract_core_features_batch(windows, pips=None):
+    """
+    Extract all core features for many windows at once (Prism Core Analysis)
+    Technical: extract_core_features over the rows of a 2-D array
+    
+    Args:
+        windows: (n_windows × lookback) price array, e.g. window_view(closes, lookback)
+        pips: Optional (n_windows × lookback - 1) pips array
+        
+    Returns:
+        pd.DataFrame: One row per window, columns in extract_core_features
+        order; features a window would not have are NaN
+    """
+    import pandas as pd
+    
+    windows = np.asarray(windows, dtype=np.float64)
+    n_windows, n = windows.shape
+    if n < 10:
+        return pd.DataFrame(index=range(n_windows))
+    
+    if pips is None:
+        pips = np.diff(windows, axis=1) * 10000
+    else:
+        pips = np.asarray(pips, dtype=np.float64)
+    
+    features = {}
+    features.update(statistical_features_batch(windows))
+    features.update(calculate_derivatives_batch(windows))
+    features.update(spectral_features_batch(windows))
+    features.update(wavelet_features_batch(windows))
+    features.update(chaos_features_batch(windows))
+    if pips.shape[1] >= 30:
+        features.update(entropy_features_batch(pips))
+    
+    return pd.DataFrame(features)
+
+
 # ═══════════════════════════════════════════════════════════════
 # 🎮 TEST
 # ═══════════════════════════════════════════════════════════════
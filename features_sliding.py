@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - SLIDING WINDOW FEATURES 💎🌟⚡
+
+Incremental feature extraction over every lookback window of an OHLC series
+"The prism turns once; every window catches its light"
+
+Technical: analyzer.extract_window_features, computed for all windows at once
+- Moments, trend regression and lag-1 autocorrelation slide over the
+  series with O(1) updates of power sums (re-anchored once per window
+  length to keep the sums well conditioned)
+- Ordinal-pattern counts for permutation entropy slide the same way
+- Histogram (Shannon) entropy, order statistics and candle statistics are
+  computed for all windows in single vectorized/compiled passes
+- Spectral, wavelet, chaos and sample/approximate entropy have no cheap
+  window update; prefetch() computes them for a batch of windows with the
+  features_core *_batch functions (one rFFT call, compiled row loops)
+- The advanced features, and windows that were not prefetched, are
+  computed per window on demand and cached by window, so every window is
+  extracted at most once
+
+The returned dicts hold the same keys, in the same order, as
+extract_window_features; values agree up to floating point rounding.
+
+Usage:
+    engine = SlidingWindowFeatures(ohlc, lookback=30)
+    engine.prefetch(target_indices)  # optional, batches the costly groups
+    features = engine.features(i)   # window ohlc[i - lookback:i]
+"""
+
+from typing import Dict, Iterable
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    # Dummy decorator if Numba not available
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return decorator
+
+from config import FEATURE_GROUPS, MIN_SAMPLES
+from features_core import (
+    spectral_features, wavelet_features, chaos_features,
+    sample_entropy, approximate_entropy,
+    window_view, spectral_features_batch, wavelet_features_batch, chaos_features_batch,
+    _histogram_entropy_rows, _sample_entropy_rows, _approximate_entropy_rows
+)
+from features_advanced import extract_advanced_features
+
+
+# Minimum window sizes of the extractors (see features_core / features_advanced)
+MIN_CORE_PRICES = 10
+MIN_ENTROPY_PIPS = 30
+
+# Permutation entropy settings (features_core.permutation_entropy defaults)
+PERMUTATION_ORDER = 3
+
+ADVANCED_GROUPS = ("quantum", "multifractal", "recurrence", "patterns", "ultra")
+
+
+# ═══════════════════════════════════════════════════════════════
+# ⚡ SLIDING KERNELS (Numba)
+# ═══════════════════════════════════════════════════════════════
+
+@njit(cache=True)
+def _sliding_moments(x, w):
+    """
+    Sliding moments, trend regression and lag-1 autocorrelation
+
+    Power sums of (x - anchor) are updated in O(1) per step. The anchor is
+    reset to the window's first value (and the sums recomputed) once per
+    window length, or when a non-finite value leaves the window.
+
+    Returns:
+        Array (n_windows, 6): mean, m2, m3, m4 (central, biased),
+        ssxym (covariance with 0..w-1, biased) and lag-1 autocorrelation
+        (NaN when either lagged series is constant)
+    """
+    n_windows = len(x) - w + 1
+    out = np.empty((max(n_windows, 0), 6))
+    eps = 2.220446049250313e-16
+    xbar = (w - 1) / 2.0
+    k = w - 1
+
+    c = 0.0
+    s1 = 0.0
+    s2 = 0.0
+    s3 = 0.0
+    s4 = 0.0
+    t = 0.0
+    p = 0.0
+    steps = w
+
+    for s in range(n_windows):
+        if steps >= w or not np.isfinite(x[s - 1]):
+            # Re-anchor: recompute every sum for this window
+            c = x[s]
+            s1 = 0.0
+            s2 = 0.0
+            s3 = 0.0
+            s4 = 0.0
+            t = 0.0
+            p = 0.0
+            for i in range(w):
+                y = x[s + i] - c
+                y2 = y * y
+                s1 += y
+                s2 += y2
+                s3 += y2 * y
+                s4 += y2 * y2
+                t += i * y
+                if i > 0:
+                    p += (x[s + i - 1] - c) * y
+            steps = 0
+        else:
+            yo = x[s - 1] - c
+            yi = x[s + w - 1] - c
+            yo2 = yo * yo
+            yi2 = yi * yi
+            s1 += yi - yo
+            s2 += yi2 - yo2
+            s3 += yi2 * yi - yo2 * yo
+            s4 += yi2 * yi2 - yo2 * yo2
+            t += w * yi - s1
+            p += (x[s + w - 2] - c) * yi - yo * (x[s] - c)
+        steps += 1
+
+        mu = s1 / w
+        raw2 = s2 / w
+        raw3 = s3 / w
+        m2 = raw2 - mu * mu
+        if m2 <= 8.0 * w * eps * raw2:
+            # Constant window (up to rounding of the running sums)
+            m2 = 0.0
+            m3 = 0.0
+            m4 = 0.0
+        else:
+            m3 = raw3 - 3.0 * mu * raw2 + 2.0 * mu * mu * mu
+            m4 = s4 / w - 4.0 * mu * raw3 + 6.0 * mu * mu * raw2 - 3.0 * mu * mu * mu * mu
+
+        out[s, 0] = mu + c
+        out[s, 1] = m2
+        out[s, 2] = m3
+        out[s, 3] = m4
+        out[s, 4] = t / w - xbar * mu
+
+        # Lag-1 autocorrelation of x[:-1] vs x[1:]
+        autocorr = np.nan
+        if k > 1:
+            y_first = x[s] - c
+            y_last = x[s + w - 1] - c
+            ma = (s1 - y_last) / k
+            mb = (s1 - y_first) / k
+            raw_a = (s2 - y_last * y_last) / k
+            raw_b = (s2 - y_first * y_first) / k
+            va = raw_a - ma * ma
+            vb = raw_b - mb * mb
+            if va > 8.0 * w * eps * raw_a and vb > 8.0 * w * eps * raw_b:
+                autocorr = (p / k - ma * mb) / np.sqrt(va * vb)
+                autocorr = min(1.0, max(-1.0, autocorr))
+        out[s, 5] = autocorr
+
+    return out
+
+
+@njit(cache=True)
+def _sliding_ordinal_entropy(x, w, order):
+    """
+    Normalized permutation entropy of every window of length w
+
+    Ordinal patterns (argsort codes, ties broken by position) are counted
+    once per position; the per-window counts slide in O(1).
+    """
+    n_windows = len(x) - w + 1
+    out = np.zeros(max(n_windows, 0))
+    n_patterns = len(x) - order + 1
+    if n_windows <= 0 or n_patterns <= 0:
+        return out
+
+    # Pattern code of every position: argsort of x[i:i + order] in base `order`
+    codes = np.empty(n_patterns, np.int64)
+    rank = np.empty(order, np.int64)
+    for i in range(n_patterns):
+        for a in range(order):
+            rank[a] = a
+        # Stable insertion sort of the indices by value
+        for a in range(1, order):
+            j = a
+            while j > 0 and x[i + rank[j]] < x[i + rank[j - 1]]:
+                tmp = rank[j]
+                rank[j] = rank[j - 1]
+                rank[j - 1] = tmp
+                j -= 1
+        code = 0
+        for a in range(order):
+            code = code * order + rank[a]
+        codes[i] = code
+
+    max_entropy = 0.0
+    for a in range(2, order + 1):
+        max_entropy += np.log2(a)
+
+    counts = np.zeros(order ** order, np.int64)
+    per_window = w - order + 1
+    for i in range(per_window):
+        counts[codes[i]] += 1
+
+    for s in range(n_windows):
+        if s > 0:
+            counts[codes[s - 1]] -= 1
+            counts[codes[s + per_window - 1]] += 1
+        entropy = 0.0
+        for code in range(len(counts)):
+            if counts[code] > 0:
+                prob = counts[code] / per_window
+                entropy -= prob * np.log2(prob)
+        out[s] = entropy / max_entropy
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🌌 SLIDING WINDOW ENGINE
+# ═══════════════════════════════════════════════════════════════
+
+class SlidingWindowFeatures:
+    """
+    Window features for every lookback window of one OHLC series
+
+    Window-updatable features are computed for all windows when the engine
+    is built; the rest are computed when a window is first requested.
+    """
+
+    def __init__(self, ohlc, lookback: int):
+        """
+        Initialize sliding engine
+
+        Args:
+            ohlc: OHLC DataFrame (resample_to_ohlc layout)
+            lookback: Window length in candles
+        """
+        self.ohlc = ohlc
+        self.lookback = int(lookback)
+        self.closes = ohlc["close"].to_numpy(dtype=np.float64)
+        self.n_windows = max(len(self.closes) - self.lookback + 1, 0)
+        self._cache: Dict[int, dict] = {}
+        self._prefetched: Dict[int, dict] = {}
+
+        w = self.lookback
+        self._core_enabled = FEATURE_GROUPS.get("statistical", True) and w >= MIN_CORE_PRICES
+        self._entropy_enabled = self._core_enabled and w - 1 >= MIN_ENTROPY_PIPS
+        self._advanced_enabled = any(FEATURE_GROUPS.get(g, True) for g in ADVANCED_GROUPS)
+
+        self.statistical = self._statistical_columns() if self._core_enabled else {}
+        self.derivatives = self._derivative_columns() if self._core_enabled else {}
+        self.entropy = self._entropy_columns() if self._entropy_enabled else {}
+        self.candles = self._ohlc_columns()
+
+    # ═══════════════════════════════════════════════════════════════
+    # 📊 WINDOW-UPDATABLE COLUMNS
+    # ═══════════════════════════════════════════════════════════════
+
+    def _statistical_columns(self) -> Dict[str, np.ndarray]:
+        """statistical_features for every window"""
+        w = self.lookback
+        prices = self.closes
+        moments = _sliding_moments(prices, w)
+        mean, m2, m3, m4, ssxym, autocorr = moments.T
+        view = sliding_window_view(prices, w)
+        q50, q75, q25, q10, q90 = np.percentile(view, [50, 75, 25, 10, 90], axis=1)
+        low, high = view.min(axis=1), view.max(axis=1)
+        std = np.sqrt(m2)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # scipy.stats skew/kurtosis: NaN for a constant window
+            constant = m2 <= (np.finfo(np.float64).eps * mean) ** 2
+            skewness = np.where(constant, np.nan, m3 / m2 ** 1.5)
+            kurtosis = np.where(constant, np.nan, m4 / m2 ** 2 - 3.0)
+            cv = std / np.abs(mean)
+            ssxm = (w * w - 1) / 12.0
+            slope = ssxym / ssxm
+            r = np.clip(ssxym / np.sqrt(ssxm * m2), -1.0, 1.0)
+            r = np.where(m2 == 0.0, np.where(ssxym == 0.0, np.nan, 0.0), r)
+
+        return {
+            "stat_mean": mean,
+            "stat_median": q50,
+            "stat_std": std,
+            "stat_var": m2,
+            "stat_range": high - low,
+            "stat_iqr": q75 - q25,
+            "stat_skewness": skewness,
+            "stat_kurtosis": kurtosis,
+            "stat_min": low,
+            "stat_max": high,
+            "stat_q10": q10,
+            "stat_q90": q90,
+            "stat_cv": cv,
+            "stat_trend_slope": slope,
+            "stat_trend_r2": r ** 2,
+            "stat_autocorr_1": np.where(np.isnan(autocorr), 0.0, autocorr),
+        }
+
+    def _derivative_columns(self) -> Dict[str, np.ndarray]:
+        """calculate_derivatives for every window (D1-D5 of the window's prices)"""
+        w = self.lookback
+        columns = {}
+        keys = {
+            1: ("mean", "std", "current", "max", "min", "abs_mean", "positive_ratio"),
+            2: ("mean", "std", "current", "abs_mean"),
+            3: ("mean", "std", "current"),
+            4: ("mean", "current"),
+            5: ("mean", "current"),
+        }
+        d = self.closes
+        for order, names in keys.items():
+            d = np.diff(d)
+            size = w - order
+            moments = _sliding_moments(d, size)
+            view = sliding_window_view(d, size)
+            values = {
+                "mean": moments[:, 0],
+                "std": np.sqrt(moments[:, 1]),
+                "current": view[:, -1],
+            }
+            if "max" in names:
+                values["max"] = view.max(axis=1)
+                values["min"] = view.min(axis=1)
+                values["positive_ratio"] = (view > 0).mean(axis=1)
+            if "abs_mean" in names:
+                values["abs_mean"] = np.abs(view).mean(axis=1)
+            for name in names:
+                columns[f"d{order}_{name}"] = values[name]
+        return columns
+
+    def _entropy_columns(self) -> Dict[str, np.ndarray]:
+        """Window-updatable entropies of the window's pips"""
+        pips = np.diff(self.closes) * 10000
+        size = self.lookback - 1
+        return {
+            "entropy_shannon": _histogram_entropy_rows(sliding_window_view(pips, size)),
+            "entropy_permutation": _sliding_ordinal_entropy(pips, size, PERMUTATION_ORDER),
+        }
+
+    def _ohlc_columns(self) -> Dict[str, np.ndarray]:
+        """extract_ohlc_features for every window"""
+        w = self.lookback
+        ohlc = self.ohlc
+        columns = {}
+
+        # Same early exits as extract_ohlc_features (missing columns)
+        if "body_pips" not in ohlc.columns or self.n_windows == 0:
+            return columns
+
+        def view_of(values):
+            return sliding_window_view(np.asarray(values, dtype=np.float64), w)
+
+        bodies = view_of(ohlc["body_pips"])
+        columns["ohlc_body_mean"] = bodies.mean(axis=1)
+        columns["ohlc_body_std"] = bodies.std(axis=1)
+        columns["ohlc_body_sum"] = bodies.sum(axis=1)
+
+        if "range_pips" not in ohlc.columns:
+            return columns
+        ranges = view_of(ohlc["range_pips"])
+        columns["ohlc_range_mean"] = ranges.mean(axis=1)
+        columns["ohlc_range_std"] = ranges.std(axis=1)
+        columns["ohlc_range_max"] = ranges.max(axis=1)
+
+        columns["ohlc_up_ratio"] = (bodies > 0).sum(axis=1) / w
+        columns["ohlc_down_ratio"] = (bodies < 0).sum(axis=1) / w
+
+        if "upper_wick" in ohlc.columns and "lower_wick" in ohlc.columns:
+            upper = view_of(ohlc["upper_wick"].to_numpy() * 10000).mean(axis=1)
+            lower = view_of(ohlc["lower_wick"].to_numpy() * 10000).mean(axis=1)
+            columns["ohlc_upper_wick_mean"] = upper
+            columns["ohlc_lower_wick_mean"] = lower
+            columns["ohlc_wick_ratio"] = upper / (lower + 1e-10)
+
+        if w > 1:
+            net_change = (self.closes[w - 1:] - self.closes[:len(self.closes) - w + 1]) * 10000
+            total_change = sliding_window_view(np.abs(np.diff(self.closes)), w - 1).sum(axis=1) * 10000
+            columns["ohlc_trend_efficiency"] = np.abs(net_change) / (total_change + 1e-10)
+
+        if "tick_volume" in ohlc.columns:
+            volumes = view_of(ohlc["tick_volume"])
+            columns["ohlc_volume_mean"] = volumes.mean(axis=1)
+            if w > 3:
+                columns["ohlc_volume_trend"] = (
+                    volumes[:, -3:].mean(axis=1) / (volumes[:, :-3].mean(axis=1) + 1e-10)
+                )
+            else:
+                columns["ohlc_volume_trend"] = np.ones(self.n_windows)
+
+        if "spread_avg" in ohlc.columns:
+            spreads = view_of(ohlc["spread_avg"])
+            columns["ohlc_spread_mean"] = spreads.mean(axis=1)
+            columns["ohlc_spread_std"] = spreads.std(axis=1)
+
+        return columns
+
+    # ═══════════════════════════════════════════════════════════════
+    # 🧮 BATCHED COLUMNS
+    # ═══════════════════════════════════════════════════════════════
+
+    def prefetch(self, ends: Iterable[int]):
+        """
+        Batch-compute the non-updatable core features of many windows
+
+        Spectral, wavelet, chaos and sample/approximate entropy features of
+        the windows ending before each index are computed at once and used
+        by features(); windows already extracted or prefetched are skipped.
+
+        Args:
+            ends: Target indices (as passed to features())
+        """
+        if not self._core_enabled or self.lookback < MIN_SAMPLES:
+            return
+
+        w = self.lookback
+        pending = sorted({
+            int(end) for end in ends
+            if w <= end <= len(self.closes) and end not in self._cache and end not in self._prefetched
+        })
+        if not pending:
+            return
+
+        windows = np.ascontiguousarray(window_view(self.closes, w, pending))
+        # Spectral/wavelet features a window does not have come back as NaN
+        optional = {**spectral_features_batch(windows), **wavelet_features_batch(windows)}
+        chaos = chaos_features_batch(windows)
+        entropy = {}
+        if self._entropy_enabled:
+            pips = np.diff(windows, axis=1) * 10000
+            entropy = {
+                "entropy_sample": _sample_entropy_rows(pips, 2, 0.2),
+                "entropy_approximate": _approximate_entropy_rows(pips, 2, 0.2),
+            }
+
+        for k, end in enumerate(pending):
+            row = {key: values[k].item() for key, values in optional.items() if not np.isnan(values[k])}
+            row.update(self._row(chaos, k))
+            row.update(self._row(entropy, k))
+            self._prefetched[end] = row
+
+    # ═══════════════════════════════════════════════════════════════
+    # 💎 PER-WINDOW FEATURES
+    # ═══════════════════════════════════════════════════════════════
+
+    @staticmethod
+    def _row(columns: Dict[str, np.ndarray], s: int) -> dict:
+        return {key: values[s].item() for key, values in columns.items()}
+
+    def features(self, end: int) -> dict:
+        """
+        Features of the window ohlc[end - lookback:end]
+
+        Args:
+            end: Index of the candle following the window (target index)
+
+        Returns:
+            dict: Same features as extract_window_features(window)
+        """
+        cached = self._cache.get(end)
+        if cached is not None:
+            return cached
+
+        s = end - self.lookback
+        if s < 0 or s >= self.n_windows:
+            raise IndexError(f"No {self.lookback}-candle window ends before index {end}")
+
+        features = {}
+        if self.lookback < MIN_SAMPLES:
+            return features
+
+        try:
+            prices = self.closes[s:end]
+            pips = np.diff(prices) * 10000
+
+            if self._core_enabled:
+                batched = self._prefetched.pop(end, None)
+                if batched is None:
+                    batched = {
+                        **spectral_features(prices),
+                        **wavelet_features(prices),
+                        **chaos_features(prices),
+                    }
+                    if self._entropy_enabled:
+                        batched["entropy_sample"] = sample_entropy(pips)
+                        batched["entropy_approximate"] = approximate_entropy(pips)
+
+                statistical = self._row(self.statistical, s)
+                if statistical["stat_mean"] == 0:
+                    del statistical["stat_cv"]
+                features.update(statistical)
+                features.update(self._row(self.derivatives, s))
+                for key in batched:
+                    if not key.startswith("entropy_"):
+                        features[key] = batched[key]
+
+                if self._entropy_enabled:
+                    entropy = {
+                        "entropy_shannon": float(self.entropy["entropy_shannon"][s]),
+                        "entropy_sample": batched["entropy_sample"],
+                        "entropy_permutation": float(self.entropy["entropy_permutation"][s]),
+                        "entropy_approximate": batched["entropy_approximate"],
+                    }
+                    positive = [v for v in entropy.values() if v > 0]
+                    entropy["entropy_average"] = float(np.mean(positive)) if positive else 0.0
+                    features.update(entropy)
+
+            if self._advanced_enabled:
+                features.update(extract_advanced_features(prices, pips))
+
+            features.update(self._row(self.candles, s))
+
+        except Exception:
+            pass
+
+        self._cache[end] = features
+        return features
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - COMPACT LABEL STORAGE 💎🌟⚡
+
+Columnar on-disk format for labeling results
+"Every future, folded to a byte"
+
+Technical: One Parquet file per target/stop/horizon config
+- Outcomes as int8 codes (1 = target, -1 = stop, 0 = none)
+- MFE/MAE/times as float32, NaN when the level was never reached
+- Config constants (target, stop, horizon, pip value) stored once in the
+  file's key-value metadata instead of repeated on every row
+- candle_idx is implied by row position (row i labels candle i)
+- Files can be written block by block (LabelWriter), one row group each
+
+Legacy files (string outcomes, per-row constants) are still readable;
+read_labels() converts them to the compact columns on load.
+
+Usage:
+    write_labels(path, labels_df, {"target_pip": 10, "stop_pip": 5, "horizon_minutes": 60})
+    labels_df, meta = read_labels(path, columns=["up_outcome", "down_outcome"])
+    legacy_df = expand_labels(labels_df, meta)
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🔧 FORMAT DEFINITION
+# ═══════════════════════════════════════════════════════════════
+
+LABEL_FORMAT_VERSION = 2
+
+# Parquet key-value metadata key holding the JSON config header
+LABEL_METADATA_KEY = b"necrozma.labels"
+
+OUTCOME_TARGET = 1
+OUTCOME_STOP = -1
+OUTCOME_NONE = 0
+
+OUTCOME_NAMES = {OUTCOME_TARGET: "target", OUTCOME_STOP: "stop", OUTCOME_NONE: "none"}
+OUTCOME_CODES = {name: code for code, name in OUTCOME_NAMES.items()}
+
+DIRECTIONS = ("up", "down")
+
+# Per-direction value columns (float32, NaN = missing)
+VALUE_FIELDS = ("mfe", "mae", "time_to_target", "time_to_stop")
+
+LABEL_COLUMNS = [
+    f"{direction}_{field}"
+    for direction in DIRECTIONS
+    for field in ("outcome",) + VALUE_FIELDS
+]
+
+# Per-row constant columns of the legacy format, moved into metadata
+LEGACY_CONSTANT_COLUMNS = ("target_pip", "stop_pip", "horizon_minutes")
+
+
+def outcome_codes(outcomes) -> np.ndarray:
+    """
+    Outcome column as int8 codes
+
+    Args:
+        outcomes: int8 codes (compact format) or 'target'/'stop'/'none' strings (legacy)
+
+    Returns:
+        np.ndarray[int8]
+    """
+    values = np.asarray(outcomes)
+    if values.dtype.kind in "iu":
+        return values.astype(np.int8, copy=False)
+    if values.dtype.kind == "f":
+        return np.nan_to_num(values, nan=OUTCOME_NONE).astype(np.int8)
+
+    codes = np.zeros(len(values), dtype=np.int8)
+    codes[values == "target"] = OUTCOME_TARGET
+    codes[values == "stop"] = OUTCOME_STOP
+    return codes
+
+
+def _missing_as_nan(values) -> np.ndarray:
+    """Object/None columns of the legacy format as float32 with NaN"""
+    return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float32)
+
+
+# ═══════════════════════════════════════════════════════════════
+# 📦 BUILD / WRITE
+# ═══════════════════════════════════════════════════════════════
+
+def build_label_frame(
+    outcomes_up: np.ndarray, outcomes_down: np.ndarray,
+    mfe_up: np.ndarray, mfe_down: np.ndarray,
+    mae_up: np.ndarray, mae_down: np.ndarray,
+    time_target_up: np.ndarray, time_target_down: np.ndarray,
+    time_stop_up: np.ndarray, time_stop_down: np.ndarray,
+    n_candles: int = None
+) -> pd.DataFrame:
+    """
+    Compact label DataFrame from labeling kernel output
+
+    Times use the kernels' convention of -1 for "not reached", which
+    becomes NaN here.
+
+    Args:
+        outcomes_up/down: Outcome codes per candle
+        mfe_up/down, mae_up/down: Excursions in pips
+        time_target_up/down, time_stop_up/down: Minutes to level (-1 if not hit)
+        n_candles: Number of leading candles to keep (default: all)
+
+    Returns:
+        DataFrame with LABEL_COLUMNS
+    """
+    if n_candles is None:
+        n_candles = len(outcomes_up)
+
+    def times(values):
+        values = np.asarray(values[:n_candles], dtype=np.float32)
+        return np.where(values >= 0, values, np.float32(np.nan))
+
+    per_direction = {
+        "up": (outcomes_up, mfe_up, mae_up, time_target_up, time_stop_up),
+        "down": (outcomes_down, mfe_down, mae_down, time_target_down, time_stop_down),
+    }
+
+    data = {}
+    for direction in DIRECTIONS:
+        outcomes, mfe, mae, time_target, time_stop = per_direction[direction]
+        data[f"{direction}_outcome"] = np.asarray(outcomes[:n_candles], dtype=np.int8)
+        data[f"{direction}_mfe"] = np.asarray(mfe[:n_candles], dtype=np.float32)
+        data[f"{direction}_mae"] = np.asarray(mae[:n_candles], dtype=np.float32)
+        data[f"{direction}_time_to_target"] = times(time_target)
+        data[f"{direction}_time_to_stop"] = times(time_stop)
+
+    return pd.DataFrame(data, columns=LABEL_COLUMNS)
+
+
+def write_labels(path: Path, labels_df: pd.DataFrame, metadata: Dict, compression: str = "zstd"):
+    """
+    Write a compact label file
+
+    Args:
+        path: Output parquet path
+        labels_df: Compact DataFrame (see build_label_frame)
+        metadata: Config constants, e.g. target_pip, stop_pip, horizon_minutes, pip_value
+        compression: Parquet codec
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    header = {"format_version": LABEL_FORMAT_VERSION, "n_candles": len(labels_df)}
+    header.update(metadata)
+
+    table = pa.Table.from_pandas(labels_df, preserve_index=False)
+    schema_metadata = dict(table.schema.metadata or {})
+    # The pandas block is only needed to round-trip an index
+    schema_metadata.pop(b"pandas", None)
+    schema_metadata[LABEL_METADATA_KEY] = json.dumps(header).encode()
+    table = table.replace_schema_metadata(schema_metadata)
+
+    pq.write_table(table, path, compression=compression)
+
+
+class LabelWriter:
+    """
+    Write a compact label file in row blocks
+
+    Streaming counterpart of write_labels for labelers that produce the
+    candles block by block. Rows go to a temporary file that replaces the
+    target path on close(), so an interrupted run never leaves a partial
+    label file behind (label_dataframe resumes from existing files).
+
+    Usage:
+        writer = LabelWriter(path, {"target_pip": 10, ...}, n_candles=len(df) - 1)
+        writer.write(block_df)
+        writer.close()
+    """
+
+    def __init__(self, path: Path, metadata: Dict, n_candles: int, compression: str = "zstd"):
+        """
+        Initialize writer
+
+        Args:
+            path: Output parquet path
+            metadata: Config constants (see write_labels)
+            n_candles: Total rows that will be written (stored in the header)
+            compression: Parquet codec
+        """
+        import pyarrow as pa
+
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.compression = compression
+        self.rows = 0
+        self._writer = None
+
+        header = {"format_version": LABEL_FORMAT_VERSION, "n_candles": int(n_candles)}
+        header.update(metadata)
+        self.schema = pa.schema(
+            [(col, pa.int8() if col.endswith("_outcome") else pa.float32()) for col in LABEL_COLUMNS],
+            metadata={LABEL_METADATA_KEY: json.dumps(header).encode()}
+        )
+
+    def write(self, labels_df: pd.DataFrame):
+        """Append the next rows (compact DataFrame, see build_label_frame)"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.tmp_path, self.schema, compression=self.compression)
+        table = pa.Table.from_pandas(labels_df[LABEL_COLUMNS], schema=self.schema, preserve_index=False)
+        self._writer.write_table(table)
+        self.rows += len(labels_df)
+
+    def close(self) -> Path:
+        """Finish the file and move it into place"""
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            pq.write_table(self.schema.empty_table(), self.tmp_path, compression=self.compression)
+        else:
+            self._writer.close()
+            self._writer = None
+        self.tmp_path.replace(self.path)
+        return self.path
+
+    def abort(self):
+        """Discard the partial file"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self.tmp_path.unlink(missing_ok=True)
+
+
+# ═══════════════════════════════════════════════════════════════
+# 📥 READ
+# ═══════════════════════════════════════════════════════════════
+
+def label_metadata(path: Path) -> Dict:
+    """
+    Config header of a label file (footer read only, no column data)
+
+    Args:
+        path: Label parquet path
+
+    Returns:
+        Metadata dict (format_version 1 for legacy files)
+    """
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(path)
+    raw = (schema.metadata or {}).get(LABEL_METADATA_KEY)
+    if raw is not None:
+        return json.loads(raw)
+
+    meta = {"format_version": 1}
+    legacy = [c for c in LEGACY_CONSTANT_COLUMNS if c in schema.names]
+    if legacy:
+        first = pq.ParquetFile(path).read_row_group(0, columns=legacy).slice(0, 1).to_pylist()
+        if first:
+            meta.update(first[0])
+    return meta
+
+
+def _compact_from_legacy(legacy_df: pd.DataFrame) -> pd.DataFrame:
+    """Convert legacy label columns to the compact representation"""
+    data = {}
+    for col in legacy_df.columns:
+        if col.endswith("_outcome"):
+            data[col] = outcome_codes(legacy_df[col].to_numpy())
+        elif any(col.endswith(f"_{field}") for field in VALUE_FIELDS):
+            data[col] = _missing_as_nan(legacy_df[col].to_numpy())
+    return pd.DataFrame(data, index=legacy_df.index)
+
+
+def read_labels(path: Path, columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Read a label file in the compact representation
+
+    Legacy files are converted on load, so callers see int8 outcomes and
+    float32 values regardless of which format is on disk.
+
+    Args:
+        path: Label parquet path
+        columns: Subset of LABEL_COLUMNS to read (default: all)
+
+    Returns:
+        Tuple of (DataFrame, metadata dict)
+    """
+    import pyarrow.parquet as pq
+
+    meta = label_metadata(path)
+
+    if meta["format_version"] >= LABEL_FORMAT_VERSION:
+        df = pq.read_table(path, columns=columns).to_pandas()
+        return df, meta
+
+    available = pq.read_schema(path).names
+    wanted = [c for c in (columns or LABEL_COLUMNS) if c in available]
+    df = _compact_from_legacy(pq.read_table(path, columns=wanted).to_pandas())
+    return df[[c for c in wanted if c in df.columns]], meta
+
+
+def expand_labels(labels_df: pd.DataFrame, metadata: Dict, prices: np.ndarray = None) -> pd.DataFrame:
+    """
+    Expand compact labels to the wide per-row layout
+
+    Rebuilds candle_idx, the constant config columns, string outcomes,
+    hit flags and R-multiples. Missing values stay NaN.
+
+    Args:
+        labels_df: Compact DataFrame (from read_labels)
+        metadata: Its metadata dict
+        prices: Optional mid prices of the labeled data, to restore entry_price
+
+    Returns:
+        Wide DataFrame in the layout produced before the compact format
+    """
+    n = len(labels_df)
+    target = metadata.get("target_pip")
+    stop = metadata.get("stop_pip")
+
+    data = {"candle_idx": np.arange(n)}
+    if prices is not None:
+        data["entry_price"] = np.asarray(prices)[:n]
+    for col in LEGACY_CONSTANT_COLUMNS:
+        if metadata.get(col) is not None:
+            data[col] = metadata[col]
+
+    names = np.array([OUTCOME_NAMES[OUTCOME_NONE], OUTCOME_NAMES[OUTCOME_TARGET], OUTCOME_NAMES[OUTCOME_STOP]])
+    for direction in DIRECTIONS:
+        outcome_col = f"{direction}_outcome"
+        if outcome_col not in labels_df.columns:
+            continue
+        codes = outcome_codes(labels_df[outcome_col].to_numpy())
+        data[outcome_col] = names[codes]  # -1 indexes the last entry ('stop')
+        data[f"{direction}_hit_target"] = codes == OUTCOME_TARGET
+        data[f"{direction}_hit_stop"] = codes == OUTCOME_STOP
+        for field in ("time_to_target", "time_to_stop", "mfe", "mae"):
+            col = f"{direction}_{field}"
+            if col in labels_df.columns:
+                data[col] = labels_df[col].to_numpy()
+        if target is not None and stop:
+            data[f"{direction}_r_multiple"] = np.where(
+                codes == OUTCOME_TARGET, target / stop,
+                np.where(codes == OUTCOME_STOP, -1.0, np.nan)
+            )
+
+    return pd.DataFrame(data)
@@ -28,6 +28,7 @@ from tqdm import tqdm
 warnings.filterwarnings("ignore")
 
 from config import TARGET_PIPS, STOP_PIPS, TIME_HORIZONS, LABELING_METRICS, CACHE_CONFIG, FILE_PREFIX
+from label_store import build_label_frame, read_labels, expand_labels, LabelWriter
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -360,6 +361,509 @@ def label_all_candles_vectorized(
     )
 
 
+@njit(parallel=True, cache=True, fastmath=True)
+def label_all_configs_vectorized(
+    prices: np.ndarray,           # float64[:] - mid prices
+    timestamps_ns: np.ndarray,    # int64[:] - timestamps as int64 nanoseconds
+    target_pips: np.ndarray,      # float64[:] - target levels in pips
+    stop_pips: np.ndarray,        # float64[:] - stop levels in pips
+    horizons_ns: np.ndarray,      # int64[:] - horizons in ns, sorted ascending
+    pip_value: float,             # value of 1 pip (0.0001 for EUR/USD)
+    start: int = 0,               # first candle of the block
+    stop: int = -1                # end of the block (-1 = all candles)
+) -> tuple:
+    """
+    Scan the forward window of every candle ONCE for a whole config grid
+    
+    For each candle the longest horizon is walked a single time, recording
+    the first-hit index of every target and stop level (with the running
+    MFE/MAE at that point) and the end index and MFE/MAE at every horizon
+    boundary. Any (target, stop, horizon) config can then be derived
+    without rescanning (see _labels_for_config).
+    
+    Direction axis: 0 = up (long), 1 = down (short).
+    
+    Only candles [start, stop) are labeled (their forward windows still
+    read ticks past stop), so the (m, 2, levels) outputs of a block are
+    bounded by the block size rather than the data size.
+    
+    Args:
+        prices: Array of mid prices (float64)
+        timestamps_ns: Array of timestamps as int64 nanoseconds
+        target_pips: Target levels in pips
+        stop_pips: Stop levels in pips
+        horizons_ns: Horizons in nanoseconds, sorted ascending
+        pip_value: Value of 1 pip (default 0.0001 for EUR/USD)
+        start: First candle of the block
+        stop: End of the block, exclusive (-1 = last candle)
+        
+    Returns:
+        Tuple of 9 arrays, row k = candle start + k (m = stop - start):
+        - horizon_end: int64 (m, n_horizons) - first index past each horizon
+        - horizon_mfe / horizon_mae: float64 (m, 2, n_horizons)
+        - target_idx: int64 (m, 2, n_targets) - first hit index (global), -1 if never
+        - target_mfe / target_mae: float64 (m, 2, n_targets) - excursions up to the hit
+        - stop_idx: int64 (m, 2, n_stops)
+        - stop_mfe / stop_mae: float64 (m, 2, n_stops)
+    """
+    n = len(prices)
+    if stop < 0 or stop > n:
+        stop = n
+    m = max(stop - start, 0)
+    n_targets = len(target_pips)
+    n_stops = len(stop_pips)
+    n_horizons = len(horizons_ns)
+    
+    horizon_end = np.empty((m, n_horizons), dtype=np.int64)
+    horizon_mfe = np.zeros((m, 2, n_horizons), dtype=np.float64)
+    horizon_mae = np.zeros((m, 2, n_horizons), dtype=np.float64)
+    target_idx = np.full((m, 2, n_targets), -1, dtype=np.int64)
+    target_mfe = np.zeros((m, 2, n_targets), dtype=np.float64)
+    target_mae = np.zeros((m, 2, n_targets), dtype=np.float64)
+    stop_idx = np.full((m, 2, n_stops), -1, dtype=np.int64)
+    stop_mfe = np.zeros((m, 2, n_stops), dtype=np.float64)
+    stop_mae = np.zeros((m, 2, n_stops), dtype=np.float64)
+    
+    for k in prange(m):
+        i = start + k
+        entry_price = prices[i]
+        entry_time_ns = timestamps_ns[i]
+        
+        mfe_up = 0.0
+        mae_up = 0.0
+        mfe_down = 0.0
+        mae_down = 0.0
+        
+        h = 0
+        j = i + 1
+        while j < n:
+            # Close every horizon that ends before this tick
+            while h < n_horizons and timestamps_ns[j] > entry_time_ns + horizons_ns[h]:
+                horizon_end[k, h] = j
+                horizon_mfe[k, 0, h] = mfe_up
+                horizon_mae[k, 0, h] = mae_up
+                horizon_mfe[k, 1, h] = mfe_down
+                horizon_mae[k, 1, h] = mae_down
+                h += 1
+            if h == n_horizons:
+                break
+            
+            price = prices[j]
+            
+            excursion = (price - entry_price) / pip_value
+            if excursion > mfe_up:
+                mfe_up = excursion
+            if excursion < mae_up:
+                mae_up = excursion
+            
+            excursion = (entry_price - price) / pip_value
+            if excursion > mfe_down:
+                mfe_down = excursion
+            if excursion < mae_down:
+                mae_down = excursion
+            
+            for t in range(n_targets):
+                if target_idx[k, 0, t] < 0 and price >= entry_price + (target_pips[t] * pip_value):
+                    target_idx[k, 0, t] = j
+                    target_mfe[k, 0, t] = mfe_up
+                    target_mae[k, 0, t] = mae_up
+                if target_idx[k, 1, t] < 0 and price <= entry_price - (target_pips[t] * pip_value):
+                    target_idx[k, 1, t] = j
+                    target_mfe[k, 1, t] = mfe_down
+                    target_mae[k, 1, t] = mae_down
+            
+            for s in range(n_stops):
+                if stop_idx[k, 0, s] < 0 and price <= entry_price - (stop_pips[s] * pip_value):
+                    stop_idx[k, 0, s] = j
+                    stop_mfe[k, 0, s] = mfe_up
+                    stop_mae[k, 0, s] = mae_up
+                if stop_idx[k, 1, s] < 0 and price >= entry_price + (stop_pips[s] * pip_value):
+                    stop_idx[k, 1, s] = j
+                    stop_mfe[k, 1, s] = mfe_down
+                    stop_mae[k, 1, s] = mae_down
+            
+            j += 1
+        
+        # Horizons reaching past the end of the data
+        while h < n_horizons:
+            horizon_end[k, h] = j
+            horizon_mfe[k, 0, h] = mfe_up
+            horizon_mae[k, 0, h] = mae_up
+            horizon_mfe[k, 1, h] = mfe_down
+            horizon_mae[k, 1, h] = mae_down
+            h += 1
+    
+    return (
+        horizon_end, horizon_mfe, horizon_mae,
+        target_idx, target_mfe, target_mae,
+        stop_idx, stop_mfe, stop_mae
+    )
+
+
+def _labels_for_config(scan: tuple, timestamps_ns: np.ndarray,
+                       t: int, s: int, h: int, start: int = 0) -> tuple:
+    """
+    Derive one (target, stop, horizon) config from a shared scan
+    
+    Reproduces label_all_candles_vectorized exactly, including its early
+    exit: once both target and stop are hit, MFE/MAE stop at the later hit.
+    
+    Args:
+        scan: Output of label_all_configs_vectorized
+        timestamps_ns: Array of timestamps as int64 nanoseconds
+        t, s, h: Indices into the scanned target, stop and horizon arrays
+        start: First candle of the scanned block
+        
+    Returns:
+        Tuple of 10 arrays (one row per candle of the block) in the order
+        of label_all_candles_vectorized
+    """
+    (horizon_end, horizon_mfe, horizon_mae,
+     target_idx, target_mfe, target_mae,
+     stop_idx, stop_mfe, stop_mae) = scan
+    
+    end = horizon_end[:, h]
+    entry_ns = timestamps_ns[start:start + len(end)]
+    results = []
+    for d in (0, 1):
+        ti = target_idx[:, d, t]
+        si = stop_idx[:, d, s]
+        hit_target = (ti >= 0) & (ti < end)
+        hit_stop = (si >= 0) & (si < end)
+        both = hit_target & hit_stop
+        
+        outcomes = np.where(
+            both, np.where(ti < si, 1, -1),
+            np.where(hit_target, 1, np.where(hit_stop, -1, 0))
+        ).astype(np.int8)
+        
+        target_last = ti > si
+        mfe = np.where(both, np.where(target_last, target_mfe[:, d, t], stop_mfe[:, d, s]),
+                       horizon_mfe[:, d, h])
+        mae = np.where(both, np.where(target_last, target_mae[:, d, t], stop_mae[:, d, s]),
+                       horizon_mae[:, d, h])
+        
+        time_target = np.where(
+            hit_target, (timestamps_ns[np.maximum(ti, 0)] - entry_ns) / 60_000_000_000.0, -1.0
+        )
+        time_stop = np.where(
+            hit_stop, (timestamps_ns[np.maximum(si, 0)] - entry_ns) / 60_000_000_000.0, -1.0
+        )
+        results.append((outcomes, mfe, mae, time_target, time_stop))
+    
+    up, down = results
+    return (
+        up[0], down[0],
+        up[1], down[1],
+        up[2], down[2],
+        up[3], down[3],
+        up[4], down[4]
+    )
+
+
+# Memory budget of one shared-scan block (label_all_configs_vectorized outputs)
+SCAN_BLOCK_MB = 512
+
+
+def _scan_block_size(n_targets: int, n_stops: int, n_horizons: int,
+                     max_mb: float = SCAN_BLOCK_MB) -> int:
+    """Candles per shared-scan block so the block's scan output fits in max_mb"""
+    bytes_per_candle = 8 * (n_horizons + 2 * 2 * n_horizons + 2 * 3 * (n_targets + n_stops))
+    return max(1, int(max_mb * 1024 * 1024 // bytes_per_candle))
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🗂️ INDEXED LABELING (First-passage lookups, O(n log n) per config)
+# ═══════════════════════════════════════════════════════════════
+
+# Prices per block of the block sparse table (memory ≈ 8 * log2(n) / block bytes per price)
+PRICE_INDEX_BLOCK_SIZE = 64
+
+
+@njit(cache=True)
+def _build_block_sparse_table(values: np.ndarray, block_size: int, use_max: bool) -> np.ndarray:
+    """
+    Sparse table of block maxima (or minima)
+    
+    Level k holds the max/min of 2^k consecutive blocks starting at each block.
+    
+    Args:
+        values: Price array
+        block_size: Prices per block
+        use_max: True for range-max, False for range-min
+        
+    Returns:
+        np.ndarray: float64 (n_levels, n_blocks)
+    """
+    n = len(values)
+    n_blocks = (n + block_size - 1) // block_size
+    n_levels = 1
+    while (1 << n_levels) <= n_blocks:
+        n_levels += 1
+    
+    table = np.empty((n_levels, max(n_blocks, 1)), dtype=np.float64)
+    for b in range(n_blocks):
+        lo = b * block_size
+        hi = min(lo + block_size, n)
+        best = values[lo]
+        for j in range(lo + 1, hi):
+            if (values[j] > best) if use_max else (values[j] < best):
+                best = values[j]
+        table[0, b] = best
+    
+    for k in range(1, n_levels):
+        half = 1 << (k - 1)
+        for b in range(n_blocks - (1 << k) + 1):
+            a = table[k - 1, b]
+            c = table[k - 1, b + half]
+            table[k, b] = (a if a > c else c) if use_max else (a if a < c else c)
+    
+    return table
+
+
+@njit(cache=True)
+def _range_extreme(values, table, block_size, lo, hi, use_max):
+    """Max/min of values[lo:hi] (hi > lo) using partial blocks + sparse table"""
+    first_full = (lo + block_size - 1) // block_size
+    last_full = hi // block_size  # exclusive
+    
+    best = values[lo]
+    if first_full >= last_full:
+        for j in range(lo + 1, hi):
+            if (values[j] > best) if use_max else (values[j] < best):
+                best = values[j]
+        return best
+    
+    for j in range(lo, first_full * block_size):
+        if (values[j] > best) if use_max else (values[j] < best):
+            best = values[j]
+    for j in range(last_full * block_size, hi):
+        if (values[j] > best) if use_max else (values[j] < best):
+            best = values[j]
+    
+    span = last_full - first_full
+    k = 0
+    while (1 << (k + 1)) <= span:
+        k += 1
+    a = table[k, first_full]
+    c = table[k, last_full - (1 << k)]
+    for v in (a, c):
+        if (v > best) if use_max else (v < best):
+            best = v
+    return best
+
+
+@njit(cache=True)
+def _first_crossing(values, table, block_size, lo, hi, level, at_least):
+    """
+    First index j in [lo, hi) with values[j] >= level (or <= level)
+    
+    Scans the partial head block, descends the sparse table to find the
+    first full block that can contain a crossing, then scans inside it.
+    
+    Returns:
+        int: Index of the first crossing, -1 if none
+    """
+    if hi <= lo:
+        return -1
+    
+    head_end = min(hi, ((lo + block_size - 1) // block_size) * block_size)
+    for j in range(lo, head_end):
+        if (values[j] >= level) if at_least else (values[j] <= level):
+            return j
+    
+    b = head_end // block_size
+    last_full = hi // block_size  # exclusive
+    if b < last_full:
+        for k in range(table.shape[0] - 1, -1, -1):
+            step = 1 << k
+            if b + step <= last_full:
+                v = table[k, b]
+                if (v < level) if at_least else (v > level):
+                    b += step
+    
+    start = max(b * block_size, head_end)
+    for j in range(start, hi):
+        if (values[j] >= level) if at_least else (values[j] <= level):
+            return j
+        if b < last_full and j == (b + 1) * block_size - 1:
+            # A full block was selected by the table, so the crossing is inside it
+            break
+    return -1
+
+
+def build_price_index(prices: np.ndarray, block_size: int = PRICE_INDEX_BLOCK_SIZE) -> tuple:
+    """
+    Build range-max/range-min structures for indexed labeling
+    
+    Args:
+        prices: Array of mid prices
+        block_size: Prices per block
+        
+    Returns:
+        Tuple: (table_max, table_min, block_size)
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    return (
+        _build_block_sparse_table(prices, block_size, True),
+        _build_block_sparse_table(prices, block_size, False),
+        block_size
+    )
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _label_all_candles_indexed_numba(prices, timestamps_ns, target_pip, stop_pip, horizon_ns,
+                                     pip_value, table_max, table_min, block_size):
+    n = len(prices)
+    
+    outcomes_up = np.zeros(n, dtype=np.int8)
+    outcomes_down = np.zeros(n, dtype=np.int8)
+    max_favorable_up = np.zeros(n, dtype=np.float64)
+    max_favorable_down = np.zeros(n, dtype=np.float64)
+    max_adverse_up = np.zeros(n, dtype=np.float64)
+    max_adverse_down = np.zeros(n, dtype=np.float64)
+    time_to_target_up = np.full(n, -1.0, dtype=np.float64)
+    time_to_target_down = np.full(n, -1.0, dtype=np.float64)
+    time_to_stop_up = np.full(n, -1.0, dtype=np.float64)
+    time_to_stop_down = np.full(n, -1.0, dtype=np.float64)
+    
+    horizon_end = np.searchsorted(timestamps_ns, timestamps_ns + horizon_ns, side="right")
+    
+    for i in prange(n - 1):
+        entry_price = prices[i]
+        entry_time_ns = timestamps_ns[i]
+        lo = i + 1
+        end = horizon_end[i]
+        if end <= lo:
+            continue
+        
+        for d in range(2):
+            if d == 0:
+                target_idx = _first_crossing(prices, table_max, block_size, lo, end,
+                                             entry_price + (target_pip * pip_value), True)
+                stop_idx = _first_crossing(prices, table_min, block_size, lo, end,
+                                           entry_price - (stop_pip * pip_value), False)
+            else:
+                target_idx = _first_crossing(prices, table_min, block_size, lo, end,
+                                             entry_price - (target_pip * pip_value), False)
+                stop_idx = _first_crossing(prices, table_max, block_size, lo, end,
+                                           entry_price + (stop_pip * pip_value), True)
+            
+            # Same early exit as the scan: excursions stop once both are hit
+            cutoff = end
+            if target_idx >= 0 and stop_idx >= 0:
+                cutoff = max(target_idx, stop_idx) + 1
+            
+            high = _range_extreme(prices, table_max, block_size, lo, cutoff, True)
+            low = _range_extreme(prices, table_min, block_size, lo, cutoff, False)
+            
+            if target_idx >= 0 and stop_idx >= 0:
+                outcome = 1 if target_idx < stop_idx else -1
+            elif target_idx >= 0:
+                outcome = 1
+            elif stop_idx >= 0:
+                outcome = -1
+            else:
+                outcome = 0
+            
+            time_target = -1.0
+            time_stop = -1.0
+            if target_idx >= 0:
+                time_target = float(timestamps_ns[target_idx] - entry_time_ns) / 60_000_000_000.0
+            if stop_idx >= 0:
+                time_stop = float(timestamps_ns[stop_idx] - entry_time_ns) / 60_000_000_000.0
+            
+            if d == 0:
+                outcomes_up[i] = outcome
+                max_favorable_up[i] = max(0.0, (high - entry_price) / pip_value)
+                max_adverse_up[i] = min(0.0, (low - entry_price) / pip_value)
+                time_to_target_up[i] = time_target
+                time_to_stop_up[i] = time_stop
+            else:
+                outcomes_down[i] = outcome
+                max_favorable_down[i] = max(0.0, (entry_price - low) / pip_value)
+                max_adverse_down[i] = min(0.0, (entry_price - high) / pip_value)
+                time_to_target_down[i] = time_target
+                time_to_stop_down[i] = time_stop
+    
+    return (
+        outcomes_up, outcomes_down,
+        max_favorable_up, max_favorable_down,
+        max_adverse_up, max_adverse_down,
+        time_to_target_up, time_to_target_down,
+        time_to_stop_up, time_to_stop_down
+    )
+
+
+def label_all_candles_indexed(
+    prices: np.ndarray,
+    timestamps_ns: np.ndarray,
+    target_pip: float,
+    stop_pip: float,
+    horizon_ns: int,
+    pip_value: float,
+    price_index: tuple = None
+) -> tuple:
+    """
+    Indexed equivalent of label_all_candles_vectorized - O(n log n) per config
+    
+    Instead of walking every tick of the horizon, each candle binary-searches
+    the horizon end, finds the first target/stop crossing by descending a
+    block sparse table of range max/min, and reads MFE/MAE as range queries.
+    Pays off on tick data, where one horizon spans thousands of ticks.
+    
+    Args:
+        prices: Array of mid prices (float64)
+        timestamps_ns: Array of timestamps as int64 nanoseconds (sorted)
+        target_pip: Target level in pips
+        stop_pip: Stop loss level in pips
+        horizon_ns: Time horizon in nanoseconds (int64)
+        pip_value: Value of 1 pip (default 0.0001 for EUR/USD)
+        price_index: Prebuilt build_price_index(prices) to reuse across configs
+        
+    Returns:
+        Tuple of 10 arrays in the order of label_all_candles_vectorized
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    if price_index is None:
+        price_index = build_price_index(prices)
+    table_max, table_min, block_size = price_index
+    
+    return _label_all_candles_indexed_numba(
+        prices, np.ascontiguousarray(timestamps_ns, dtype=np.int64),
+        float(target_pip), float(stop_pip), np.int64(horizon_ns), float(pip_value),
+        table_max, table_min, block_size
+    )
+
+
+def _choose_labeling_method(timestamps_ns: np.ndarray, longest_horizon_ns: int, n_configs: int) -> str:
+    """
+    Pick "scan" or "indexed" labeling by estimated work per candle
+    
+    The shared scan walks the longest horizon once per candle; the indexed
+    path does a few block-sparse-table lookups per candle per config.
+    
+    Args:
+        timestamps_ns: Array of timestamps as int64 nanoseconds (sorted)
+        longest_horizon_ns: Longest horizon in nanoseconds
+        n_configs: Number of configs to label
+        
+    Returns:
+        str: "scan" or "indexed"
+    """
+    n = len(timestamps_ns)
+    if n < 2:
+        return "scan"
+    
+    sample = timestamps_ns[::max(1, n // 1000)]
+    window = np.mean(np.searchsorted(timestamps_ns, sample + longest_horizon_ns, side="right")
+                     - np.searchsorted(timestamps_ns, sample, side="right"))
+    
+    # 8 lookups (2 crossings + 2 range queries per direction) of ~block + log2(n) steps
+    indexed_cost = n_configs * 8 * (PRICE_INDEX_BLOCK_SIZE + np.log2(n))
+    return "indexed" if indexed_cost < window else "scan"
+
+
 # ═══════════════════════════════════════════════════════════════
 # 💾 CACHE UTILITIES
 # ═══════════════════════════════════════════════════════════════
@@ -464,12 +968,14 @@ def _get_labels_dir():
     return labels_dir
 
 
-def load_label_results(config_key: str) -> pd.DataFrame:
+def load_label_results(config_key: str, compact: bool = False) -> pd.DataFrame:
     """
     Load a specific labeled dataset from disk
     
     Args:
         config_key: Configuration key (e.g., "T5_S5_H1")
+        compact: If True, return the on-disk columns (int8 outcomes, float32
+                 values, constants in df.attrs) instead of the wide layout
         
     Returns:
         DataFrame with labeled results for that configuration
@@ -484,16 +990,28 @@ def load_label_results(config_key: str) -> pd.DataFrame:
     if not file_path.exists():
         raise FileNotFoundError(f"Label file not found: {file_path}")
     
-    return pd.read_parquet(file_path)
+    return _load_label_file(file_path, compact)
+
 
+def _load_label_file(file_path: Path, compact: bool = False) -> pd.DataFrame:
+    """Read one label file, expanded to the wide layout unless compact"""
+    labels_df, meta = read_labels(file_path)
+    if not compact:
+        labels_df = expand_labels(labels_df, meta)
+    labels_df.attrs["label_metadata"] = meta
+    return labels_df
 
-def load_all_label_results() -> Dict[str, pd.DataFrame]:
+
+def load_all_label_results(compact: bool = False) -> Dict[str, pd.DataFrame]:
     """
     Load all labeled datasets from disk
     
     ⚠️  WARNING: This loads ALL results into memory at once!
     Only use this if you have enough RAM, or load specific configs with load_label_results()
     
+    Args:
+        compact: If True, keep the on-disk compact columns (see load_label_results)
+    
     Returns:
         Dictionary mapping config_key -> DataFrame
         
@@ -516,7 +1034,7 @@ def load_all_label_results() -> Dict[str, pd.DataFrame]:
     
     for file_path in parquet_files:
         config_key = file_path.stem
-        results[config_key] = pd.read_parquet(file_path)
+        results[config_key] = _load_label_file(file_path, compact)
     
     print(f"   ✅ Loaded {len(results)} configurations into memory")
     
@@ -676,7 +1194,9 @@ def label_dataframe(
     pip_value: float = 0.0001,
     progress_callback = None,
     use_cache: bool = None,
-    return_dict: bool = False
+    return_dict: bool = False,
+    method: str = "auto",
+    scan_block_mb: float = SCAN_BLOCK_MB
 ) -> Union[List[str], Dict[str, pd.DataFrame]]:
     """
     Label entire dataframe with multiple targets/stops/horizons
@@ -694,6 +1214,12 @@ def label_dataframe(
         use_cache: Whether to use cache (default: from CACHE_CONFIG)
         return_dict: If True, returns Dict[str, pd.DataFrame] (backward compatibility, memory-intensive!)
                      If False (default), returns List[str] of saved file paths (memory-efficient)
+        method: "scan" (one shared forward scan for all configs), "indexed"
+                (first-passage lookups per config, best when horizons span
+                many ticks) or "auto" (pick by estimated cost)
+        scan_block_mb: Memory budget of the shared scan; candles are
+                       scanned in blocks that fit it and each config file
+                       is written block by block
         
     Returns:
         List[str]: List of saved file paths (if return_dict=False)
@@ -772,107 +1298,129 @@ def label_dataframe(
     print(f"   Targets: {target_pips}")
     print(f"   Stops: {stop_pips}")
     print(f"   Horizons: {horizons}")
-    print(f"   Processing: Vectorized Numba (1000x faster - parallel execution)")
+    print(f"   Processing: Vectorized Numba (one shared forward scan for all configs)")
     print(f"   Storage: Memory-efficient (save each config immediately to labels/)")
     print()
     
+    # Horizon grid shared by both labeling methods
+    n_candles = len(df) - 1  # Exclude last candle
+    blocks = [(0, len(df))]
+    price_index = None
+    if configs_to_process:
+        target_levels = np.asarray(sorted(set(target_pips)), dtype=np.float64)
+        stop_levels = np.asarray(sorted(set(stop_pips)), dtype=np.float64)
+        horizon_levels = sorted(set(horizons))
+        horizons_ns = np.asarray([int(h * 60 * 1_000_000_000) for h in horizon_levels], dtype=np.int64)
+        
+        if method == "auto":
+            method = _choose_labeling_method(timestamps_ns, horizons_ns[-1], len(configs_to_process))
+        
+        if method == "indexed":
+            # Range max/min structures built once, queried per config
+            print(f"   🗂️  Indexed first-passage lookups: {len(configs_to_process)} configs × "
+                  f"{len(df):,} candles")
+            price_index = build_price_index(prices)
+        else:
+            # One forward scan for the whole grid (each config is derived from
+            # it), in candle blocks so the scan output stays within budget
+            block_size = _scan_block_size(len(target_levels), len(stop_levels), len(horizon_levels),
+                                          scan_block_mb)
+            blocks = [(start, min(start + block_size, len(df))) for start in range(0, len(df), block_size)]
+            print(f"   🚀 Shared scan: {len(df):,} candles × "
+                  f"{len(target_levels)} targets × {len(stop_levels)} stops × {len(horizon_levels)} horizons"
+                  f" ({len(blocks)} block{'s' if len(blocks) != 1 else ''})")
+            prices = prices.astype(np.float64)
+        target_pos = {v: k for k, v in enumerate(target_levels)}
+        stop_pos = {v: k for k, v in enumerate(stop_levels)}
+        horizon_pos = {v: k for k, v in enumerate(horizon_levels)}
+    
     # Process each configuration with progress bar
-    with tqdm(
-        total=total_configs,
-        desc="🏷️  Labeling Progress",
-        initial=len(existing_files),
-        unit="config",
-        ncols=100,
-        bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]"
-    ) as pbar:
-        for config_idx, config in configs_to_process:
-            target = config["target"]
-            stop = config["stop"]
-            horizon = config["horizon"]
-            
-            # Format config key with integers when possible (for consistency)
-            config_key = format_config_key(target, stop, horizon)
-            
-            # Update progress bar description with current label
-            pbar.set_description(f"🏷️  Label: {config_key}")
-            
-            if progress_callback:
-                progress_callback(config_idx, total_configs, f"Labeling {config_key}")
-            
-            # Convert horizon from minutes to nanoseconds ONCE
-            horizon_ns = int(horizon * 60 * 1_000_000_000)
-            
-            # Use vectorized Numba function - processes ALL candles at once (100x faster!)
-            pbar.write(f"  🚀 Vectorized processing {len(df):,} candles...")
-            
-            (outcomes_up, outcomes_down,
-             mfe_up, mfe_down,
-             mae_up, mae_down,
-             time_target_up, time_target_down,
-             time_stop_up, time_stop_down) = label_all_candles_vectorized(
-                prices=prices,
-                timestamps_ns=timestamps_ns,
-                target_pip=target,
-                stop_pip=stop,
-                horizon_ns=horizon_ns,
-                pip_value=pip_value
-            )
-            
-            # Convert result arrays to DataFrame (only ONCE at the end)
-            n_candles = len(df) - 1  # Exclude last candle
-            
-            # Create results dictionary from arrays
-            results_df = pd.DataFrame({
-                'candle_idx': np.arange(n_candles),
-                'entry_price': prices[:n_candles],
-                'target_pip': target,
-                'stop_pip': stop,
-                'horizon_minutes': horizon,
+    writers = {}
+    try:
+        with tqdm(
+            total=total_configs,
+            desc="🏷️  Labeling Progress",
+            initial=len(existing_files),
+            unit="config",
+            ncols=100,
+            bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]"
+        ) as pbar:
+            for block_no, (start, stop) in enumerate(blocks):
+                last_block = block_no == len(blocks) - 1
+                block_rows = max(0, min(stop, n_candles) - start)
                 
-                # UP direction
-                'up_outcome': np.where(outcomes_up[:n_candles] == 1, 'target',
-                                      np.where(outcomes_up[:n_candles] == -1, 'stop', 'none')),
-                'up_hit_target': outcomes_up[:n_candles] == 1,
-                'up_hit_stop': outcomes_up[:n_candles] == -1,
-                'up_time_to_target': np.where(time_target_up[:n_candles] >= 0, time_target_up[:n_candles], None),
-                'up_time_to_stop': np.where(time_stop_up[:n_candles] >= 0, time_stop_up[:n_candles], None),
-                'up_mfe': mfe_up[:n_candles],
-                'up_mae': mae_up[:n_candles],
-                'up_r_multiple': np.where(outcomes_up[:n_candles] == 1, target / stop,
-                                         np.where(outcomes_up[:n_candles] == -1, -1.0, None)),
+                scan = None
+                if configs_to_process and price_index is None:
+                    scan = label_all_configs_vectorized(
+                        prices, timestamps_ns, target_levels, stop_levels, horizons_ns, pip_value, start, stop
+                    )
+                    if len(blocks) > 1:
+                        pbar.write(f"  🧱 Block {block_no + 1}/{len(blocks)}: candles {start:,}-{stop - 1:,}")
                 
-                # DOWN direction
-                'down_outcome': np.where(outcomes_down[:n_candles] == 1, 'target',
-                                        np.where(outcomes_down[:n_candles] == -1, 'stop', 'none')),
-                'down_hit_target': outcomes_down[:n_candles] == 1,
-                'down_hit_stop': outcomes_down[:n_candles] == -1,
-                'down_time_to_target': np.where(time_target_down[:n_candles] >= 0, time_target_down[:n_candles], None),
-                'down_time_to_stop': np.where(time_stop_down[:n_candles] >= 0, time_stop_down[:n_candles], None),
-                'down_mfe': mfe_down[:n_candles],
-                'down_mae': mae_down[:n_candles],
-                'down_r_multiple': np.where(outcomes_down[:n_candles] == 1, target / stop,
-                                           np.where(outcomes_down[:n_candles] == -1, -1.0, None)),
-            })
-            
-            # 💾 SAVE IMMEDIATELY to disk (memory-efficient!)
-            cache_file = labels_dir / f"{config_key}.parquet"
-            results_df.to_parquet(cache_file, index=False)
-            saved_files.append(str(cache_file))
-            pbar.write(f"  💾 Saved {config_key} ({len(results_df):,} rows) to {cache_file.name}")
-            
-            # 🗑️ CLEAR MEMORY immediately after saving!
-            del results_df
-            del outcomes_up, outcomes_down
-            del mfe_up, mfe_down, mae_up, mae_down
-            del time_target_up, time_target_down, time_stop_up, time_stop_down
-            
-            # Run garbage collection periodically (every 10 configs) to free memory
-            # More frequent than this has diminishing returns and impacts performance
-            if (config_idx + 1) % 10 == 0:
-                gc.collect()
-            
-            # Update main progress bar
-            pbar.update(1)
+                for config_idx, config in configs_to_process:
+                    target = config["target"]
+                    stop_pip = config["stop"]
+                    horizon = config["horizon"]
+                    
+                    # Format config key with integers when possible (for consistency)
+                    config_key = format_config_key(target, stop_pip, horizon)
+                    
+                    if block_no == 0:
+                        # Update progress bar description with current label
+                        pbar.set_description(f"🏷️  Label: {config_key}")
+                        
+                        if progress_callback:
+                            progress_callback(config_idx, total_configs, f"Labeling {config_key}")
+                        
+                        writers[config_key] = LabelWriter(labels_dir / f"{config_key}.parquet", {
+                            "target_pip": float(target),
+                            "stop_pip": float(stop_pip),
+                            "horizon_minutes": int(horizon) if horizon == int(horizon) else float(horizon),
+                            "pip_value": float(pip_value),
+                        }, n_candles=n_candles)
+                    
+                    # Derive this config from the shared scan, or query the price index
+                    if scan is not None:
+                        config_arrays = _labels_for_config(
+                            scan, timestamps_ns,
+                            target_pos[float(target)], stop_pos[float(stop_pip)], horizon_pos[horizon], start
+                        )
+                    else:
+                        config_arrays = label_all_candles_indexed(
+                            prices, timestamps_ns, target, stop_pip,
+                            horizons_ns[horizon_pos[horizon]], pip_value, price_index
+                        )
+                    
+                    # Compact columns: int8 outcomes, float32 values, candle_idx implied by row
+                    if block_rows > 0:
+                        writers[config_key].write(build_label_frame(*config_arrays, n_candles=block_rows))
+                    
+                    # 🗑️ CLEAR MEMORY immediately after writing!
+                    del config_arrays
+                    
+                    if not last_block:
+                        continue
+                    
+                    # 💾 Config complete: move the file into place
+                    cache_file = writers.pop(config_key).close()
+                    saved_files.append(str(cache_file))
+                    pbar.write(f"  💾 Saved {config_key} ({n_candles:,} rows) to {cache_file.name}")
+                    
+                    # Run garbage collection periodically (every 10 configs) to free memory
+                    # More frequent than this has diminishing returns and impacts performance
+                    if (config_idx + 1) % 10 == 0:
+                        gc.collect()
+                    
+                    # Update main progress bar
+                    pbar.update(1)
+                
+                del scan
+    finally:
+        # Interrupted: drop partial files so a rerun labels those configs again
+        for writer in writers.values():
+            writer.abort()
+
+    del price_index
     
     print(f"\n✅ All {total_configs} configs saved to {labels_dir}/")
     print(f"   📊 Total files: {len(saved_files)}")
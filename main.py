@@ -258,6 +258,14 @@ Examples:
         help="Run strategy generation + backtesting using existing base. Can run multiple times."
     )
     
+    parser.add_argument(
+        "--regime-model",
+        type=str,
+        default=None,
+        help="Saved regime model for --search-light when regimes.parquet is missing "
+             "(default: <output>/<prefix>regime_model.joblib from --generate-base)"
+    )
+    
     parser.add_argument(
         "--skip-telegram",
         action="store_true",
@@ -1314,6 +1322,10 @@ def run_generate_base(df, args):
             # Save regimes to file
             regimes_df.to_parquet(regimes_path, compression='snappy')
             print(f"   💾 Regimes saved to: {regimes_path}")
+            
+            # Save fitted scaler/model so new data can be assigned without refitting
+            regime_model_path = detector.save_model(OUTPUT_DIR / f"{FILE_PREFIX}regime_model.joblib")
+            print(f"   💾 Regime model saved to: {regime_model_path}")
         
         lore.broadcast(EventType.REGIME_CHANGE, 
                       message=f"Detected {n_regimes} distinct market regimes")
@@ -1411,7 +1423,10 @@ def run_search_light(df, args):
                 f"   Run --generate-base first to create base files!"
             )
         
-        if not regimes_path.exists():
+        regime_model_path = Path(getattr(args, 'regime_model', None) or
+                                 OUTPUT_DIR / f"{FILE_PREFIX}regime_model.joblib")
+        
+        if not regimes_path.exists() and not regime_model_path.exists():
             raise FileNotFoundError(
                 f"❌ Regimes file not found: {regimes_path}\n"
                 f"   Run --generate-base first to create base files!"
@@ -1424,13 +1439,40 @@ def run_search_light(df, args):
         n_patterns = len(patterns.get('important_features', []))
         print(f"   ✅ Patterns loaded: {n_patterns} features")
         
-        # Load regimes
-        print(f"   Loading regimes from: {regimes_path}")
-        regimes_df = pd.read_parquet(regimes_path)
-        
         from regime_detector import RegimeDetector
-        detector = RegimeDetector()
-        regime_analysis = detector.analyze_regimes(regimes_df)
+        
+        # Load regimes (or assign them with the saved base model)
+        if regimes_path.exists():
+            print(f"   Loading regimes from: {regimes_path}")
+            regimes_df = pd.read_parquet(regimes_path)
+            detector = RegimeDetector()
+        else:
+            print(f"   Assigning regimes with saved model: {regime_model_path}")
+            start_time = time.time()
+            detector = RegimeDetector.load_model(regime_model_path)
+            
+            # The model may use the tick features added in Step 4.5 (compute them now)
+            missing = [c for c in detector.feature_cols if c not in df.columns]
+            if missing and {'pips_change', 'mid_price'} <= set(df.columns):
+                from batch_utils import prepare_features
+                prepare_features(df)
+                missing = [c for c in detector.feature_cols if c not in df.columns]
+            
+            if missing:
+                regimes_df = None
+                print(f"   ⚠️  Data lacks regime features {missing[:5]}"
+                      f"{'...' if len(missing) > 5 else ''}, continuing without regimes")
+            else:
+                regimes = detector.predict(df)
+                # The analysis only reads the regime-naming features, so only
+                # those are copied next to the labels
+                analysis_cols = detector.analysis_columns(df)
+                regimes_df = df[analysis_cols].assign(regime=regimes)
+                regimes_df.to_parquet(regimes_path, compression='snappy')
+                print(f"   ✅ {len(regimes):,} rows assigned in {time.time() - start_time:.1f}s "
+                      f"(saved to {regimes_path})")
+        
+        regime_analysis = detector.analyze_regimes(regimes_df) if regimes_df is not None else {}
         n_regimes = regime_analysis.get('n_regimes', 0)
         print(f"   ✅ Regimes loaded: {n_regimes} regimes")
         
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - MONTE CARLO ENGINE 💎🌟⚡
+
+Vectorized Monte Carlo / bootstrap simulation of trade sequences
+"A hundred thousand futures, drawn at once"
+
+Technical: every simulation of a chunk is one row of a (sims × trades)
+index matrix
+- Resamples (with replacement) or permutations are drawn as a whole
+  matrix, gathered from the profit array and cumulated along axis 1
+- Chunks are sized so sims × trades stays under max_cells, capping memory
+  regardless of the simulation count
+- Final equity, max drawdown, minimum equity (risk of ruin) are reduced
+  per row inside the chunk; only one value per simulation is kept
+- Percentile bands are computed on at most band_points trade indices, so
+  the kept band matrix is band_points × sims float32
+
+Usage:
+    result = simulate_equity(profits, simulations=100_000)
+    result["bands"][50], result["prob_ruin"], result["max_drawdowns"]
+    lower, mean, upper = bootstrap_ci(outcomes, n_iterations=10_000)
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🔧 CONFIGURATION
+# ═══════════════════════════════════════════════════════════════
+
+# Cells (simulations × trades) materialized per chunk: ~32 MB of float64
+DEFAULT_MAX_CELLS = 4_000_000
+
+# Trade indices at which percentile bands are evaluated
+DEFAULT_BAND_POINTS = 250
+
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+# Equity below this fraction of the initial capital counts as ruin
+DEFAULT_RUIN_FRACTION = 0.5
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🎲 SAMPLING
+# ═══════════════════════════════════════════════════════════════
+
+def _chunk_sizes(total: int, n_items: int, max_cells: int):
+    """Split total simulations into chunks of at most max_cells cells"""
+    per_chunk = max(1, max_cells // max(n_items, 1))
+    for start in range(0, total, per_chunk):
+        yield start, min(per_chunk, total - start)
+
+
+def draw_indices(
+    rng: np.random.Generator,
+    n_items: int,
+    n_sims: int,
+    method: str = "bootstrap"
+) -> np.ndarray:
+    """
+    Draw a (n_sims × n_items) matrix of sample indices
+
+    Args:
+        rng: Random generator
+        n_items: Number of items (trades) per simulation
+        n_sims: Number of simulations (rows)
+        method: "bootstrap" (with replacement) or "permutation" (shuffled order)
+
+    Returns:
+        Integer index matrix
+    """
+    if method == "bootstrap":
+        return rng.integers(0, n_items, size=(n_sims, n_items))
+    if method == "permutation":
+        return rng.permuted(np.broadcast_to(np.arange(n_items), (n_sims, n_items)), axis=1)
+    raise ValueError(f"Unknown Monte Carlo method: {method!r} (expected 'bootstrap' or 'permutation')")
+
+
+def band_indices(n_trades: int, band_points: int = DEFAULT_BAND_POINTS) -> np.ndarray:
+    """
+    Trade indices at which percentile bands are evaluated
+
+    Every trade when n_trades <= band_points, otherwise band_points evenly
+    spaced indices including the first and last trade.
+    """
+    if n_trades <= band_points:
+        return np.arange(n_trades)
+    return np.unique(np.linspace(0, n_trades - 1, band_points).round().astype(np.int64))
+
+
+# ═══════════════════════════════════════════════════════════════
+# 📈 EQUITY SIMULATION
+# ═══════════════════════════════════════════════════════════════
+
+def simulate_equity(
+    profits: Sequence[float],
+    simulations: int = 1000,
+    initial_capital: float = 10000.0,
+    method: str = "bootstrap",
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    ruin_fraction: float = DEFAULT_RUIN_FRACTION,
+    band_points: int = DEFAULT_BAND_POINTS,
+    seed: Optional[int] = 42,
+    max_cells: int = DEFAULT_MAX_CELLS
+) -> Dict:
+    """
+    Simulate equity curves from resampled or reordered trade profits
+
+    Args:
+        profits: Profit of each trade
+        simulations: Number of simulated sequences
+        initial_capital: Starting capital
+        method: "bootstrap" (with replacement) or "permutation"
+        percentiles: Percentile bands to compute at each band index
+        ruin_fraction: Equity below initial_capital * ruin_fraction is ruin
+        band_points: Maximum number of trade indices with band values
+        seed: Random seed (None for a fresh generator)
+        max_cells: Maximum simulations × trades materialized at once
+
+    Returns:
+        Dictionary with:
+        - trade_numbers: 1-based trade numbers of the band values
+        - bands: {percentile: equity array at trade_numbers}
+        - final_equities, max_drawdowns, min_equities: one value per simulation
+        - prob_profit, prob_ruin (final equity below the ruin level) and
+          prob_ruin_touched (equity ever below the ruin level), in percent
+        Empty dict if there are no profits.
+    """
+    profits = np.asarray(profits, dtype=np.float64)
+    n_trades = len(profits)
+    if n_trades == 0 or simulations <= 0:
+        return {}
+
+    rng = np.random.default_rng(seed)
+    columns = band_indices(n_trades, band_points)
+
+    final_equities = np.empty(simulations)
+    max_drawdowns = np.empty(simulations)
+    min_equities = np.empty(simulations)
+    # Band values stored trade-major so each percentile runs over contiguous rows
+    band_values = np.empty((len(columns), simulations), dtype=np.float32)
+
+    for start, size in _chunk_sizes(simulations, n_trades, max_cells):
+        rows = slice(start, start + size)
+        equity = profits[draw_indices(rng, n_trades, size, method)]
+        np.cumsum(equity, axis=1, out=equity)
+        equity += initial_capital
+
+        final_equities[rows] = equity[:, -1]
+        min_equities[rows] = equity.min(axis=1)
+        band_values[:, rows] = equity[:, columns].T
+
+        # Drawdown from the running peak, reduced in place
+        peak = np.maximum.accumulate(equity, axis=1)
+        np.subtract(equity, peak, out=equity)
+        max_drawdowns[rows] = equity.min(axis=1)
+
+    band_matrix = np.percentile(band_values, list(percentiles), axis=1)
+    ruin_level = initial_capital * ruin_fraction
+
+    return {
+        "simulations": simulations,
+        "n_trades": n_trades,
+        "method": method,
+        "initial_capital": initial_capital,
+        "ruin_level": ruin_level,
+        "trade_numbers": columns + 1,
+        "bands": {p: band_matrix[i].astype(np.float64) for i, p in enumerate(percentiles)},
+        "final_equities": final_equities,
+        "max_drawdowns": max_drawdowns,
+        "min_equities": min_equities,
+        "prob_profit": (final_equities > initial_capital).mean() * 100,
+        "prob_ruin": (final_equities < ruin_level).mean() * 100,
+        "prob_ruin_touched": (min_equities < ruin_level).mean() * 100,
+    }
+
+
+def summarize_simulation(result: Dict) -> Dict:
+    """
+    Scalar statistics of a simulate_equity result
+
+    Returns:
+        Dictionary with probabilities (percent), final-equity and
+        max-drawdown percentiles
+    """
+    if not result:
+        return {}
+
+    final_equities = result["final_equities"]
+    max_drawdowns = result["max_drawdowns"]
+    return {
+        "prob_profit": result["prob_profit"],
+        "prob_ruin": result["prob_ruin"],
+        "prob_ruin_touched": result["prob_ruin_touched"],
+        "median_final": np.median(final_equities),
+        "p5_final": np.percentile(final_equities, 5),
+        "p95_final": np.percentile(final_equities, 95),
+        "median_max_dd": np.median(max_drawdowns),
+        # Drawdowns are negative: the 5th percentile is the deep tail
+        "p95_max_dd": np.percentile(max_drawdowns, 5),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════
+# 📊 BOOTSTRAP
+# ═══════════════════════════════════════════════════════════════
+
+def bootstrap_means(
+    values: Sequence[float],
+    n_iterations: int = 1000,
+    seed: Optional[int] = 42,
+    max_cells: int = DEFAULT_MAX_CELLS
+) -> np.ndarray:
+    """
+    Means of n_iterations resamples (with replacement) of values
+
+    Args:
+        values: Sample to resample
+        n_iterations: Number of bootstrap samples
+        seed: Random seed (None for a fresh generator)
+        max_cells: Maximum iterations × values materialized at once
+
+    Returns:
+        Array of bootstrap means (empty if values is empty)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return np.empty(0)
+
+    rng = np.random.default_rng(seed)
+    means = np.empty(n_iterations)
+    for start, size in _chunk_sizes(n_iterations, n, max_cells):
+        means[start:start + size] = values[draw_indices(rng, n, size)].mean(axis=1)
+    return means
+
+
+def bootstrap_ci(
+    values: Sequence[float],
+    n_iterations: int = 1000,
+    confidence: float = 0.95,
+    seed: Optional[int] = 42
+) -> Tuple[float, float, float]:
+    """
+    Percentile bootstrap confidence interval of the mean
+
+    Args:
+        values: Sample to resample
+        n_iterations: Number of bootstrap samples
+        confidence: Confidence level (default 95%)
+        seed: Random seed
+
+    Returns:
+        (lower_bound, mean, upper_bound), zeros for an empty sample
+    """
+    means = bootstrap_means(values, n_iterations, seed)
+    if len(means) == 0:
+        return (0.0, 0.0, 0.0)
+
+    alpha = 1 - confidence
+    lower, upper = np.percentile(means, [alpha / 2 * 100, (1 - alpha / 2) * 100])
+    return (lower, means.mean(), upper)
@@ -0,0 +1,773 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - OHLC BAR CACHE 💎🌟⚡
+
+Persistent OHLC bars per (dataset, interval)
+"Time compressed once, remembered forever"
+
+Technical: Parquet bar cache shared by every consumer of resampled ticks
+- One Parquet file per interval, fingerprinted by source size/mtime/hash
+  (in-memory DataFrames by a hash of every tick row)
+- Disk persistence is opt-in (CACHE_CONFIG['cache_ohlc']); bars held in
+  memory are always reused and bounded (least recently used evicted)
+- Coarser intervals derived from finer cached bars (not from ticks)
+- Growing sources extend cached bars with only the new ticks
+- Single-pass Numba resampler emitting several intervals per tick scan
+
+Base bars hold only aggregable columns (open/high/low/close, tick count,
+spread sum/count), so coarser intervals can be derived exactly. Callers
+format them (see data_loader.resample_to_ohlc, ohlc_generator).
+
+Usage:
+    cache = OHLCCache()
+    bars = cache.get_bars(5, parquet_path="data/EURUSD_2025.parquet")
+    bars = cache.get_bars(15, tick_data=df)
+"""
+
+import hashlib
+import json
+import os
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    # Dummy decorator if Numba not available
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return decorator
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as pads
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🔧 CONSTANTS
+# ═══════════════════════════════════════════════════════════════
+
+# Bytes hashed from the start of a source file
+FINGERPRINT_HEAD_BYTES = 1 << 20
+
+# Bump when the base bar layout changes
+CACHE_VERSION = 2
+
+# Tick columns bars are built from (other columns never affect bars)
+TICK_COLUMNS = ("timestamp", "mid_price", "bid", "ask", "close", "spread_pips")
+
+# Bar sets kept in memory per cache instance
+DEFAULT_MEMORY_ENTRIES = 8
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🔮 BASE BARS
+# ═══════════════════════════════════════════════════════════════
+
+def _tick_columns(tick_data):
+    """
+    Extract (timestamp, mid, spread) series from tick data
+
+    Mid price comes from mid_price, bid/ask or close (in that order).
+    """
+    if "mid_price" in tick_data.columns:
+        mid = tick_data["mid_price"]
+    elif "bid" in tick_data.columns and "ask" in tick_data.columns:
+        mid = (tick_data["bid"] + tick_data["ask"]) / 2
+    elif "close" in tick_data.columns:
+        mid = tick_data["close"]
+    else:
+        raise ValueError("❌ Data missing price columns (need mid_price, bid/ask, or close)!")
+
+    spread = tick_data["spread_pips"] if "spread_pips" in tick_data.columns else None
+    return tick_data["timestamp"], mid, spread
+
+
+def tick_content_hash(tick_data):
+    """
+    Fingerprint of tick data from every row of its bar-building columns
+
+    Unlike a sampled fingerprint, any changed tick (including in-place
+    edits of the same DataFrame) changes the hash.
+
+    Args:
+        tick_data: Tick DataFrame
+
+    Returns:
+        str: MD5 hex digest
+    """
+    columns = [c for c in TICK_COLUMNS if c in tick_data.columns]
+    h = hashlib.md5(str([(c, str(tick_data[c].dtype)) for c in columns]).encode())
+    h.update(str(len(tick_data)).encode())
+    if columns and len(tick_data):
+        h.update(pd.util.hash_pandas_object(tick_data[columns], index=False).values.tobytes())
+    return h.hexdigest()
+
+
+# id(DataFrame) -> (weak reference, content hash), see tick_data_token
+_content_hashes = {}
+
+
+def tick_data_token(tick_data):
+    """
+    tick_content_hash of a DataFrame, computed once per object
+
+    The hash is O(ticks), so it is kept for as long as the DataFrame
+    lives and every later lookup with the same object is free. Edit ticks
+    on a copy, or call forget_tick_data() after editing them in place.
+
+    Args:
+        tick_data: Tick DataFrame
+
+    Returns:
+        str: MD5 hex digest
+    """
+    key = id(tick_data)
+    entry = _content_hashes.get(key)
+    if entry is not None and entry[0]() is tick_data:
+        return entry[1]
+
+    token = tick_content_hash(tick_data)
+
+    def _drop(ref, key=key):
+        if _content_hashes.get(key, (None,))[0] is ref:
+            del _content_hashes[key]
+
+    _content_hashes[key] = (weakref.ref(tick_data, _drop), token)
+    return token
+
+
+def forget_tick_data(tick_data):
+    """Drop the memoized hash of a DataFrame (after editing it in place)"""
+    entry = _content_hashes.get(id(tick_data))
+    if entry is not None and entry[0]() is tick_data:
+        del _content_hashes[id(tick_data)]
+
+
+def _utc_str(timestamp):
+    """Canonical string for a timestamp (naive values are taken as UTC)"""
+    timestamp = pd.Timestamp(timestamp)
+    return str(timestamp.tz_localize("UTC") if timestamp.tz is None else timestamp.tz_convert("UTC"))
+
+
+@njit(cache=True)
+def _resample_ohlc_numba(ts, prices, spread, origin, widths, bin_offsets):
+    """
+    Single-pass multi-interval OHLC aggregation (Numba JIT)
+
+    Walks time-sorted ticks once and updates the current bar of every
+    interval. A bar opens on the first tick with a valid price (column 0);
+    NaN prices in other columns are skipped like pandas first/max/min/last.
+
+    Args:
+        ts: Sorted int64 timestamps (NaT = int64 min, skipped)
+        prices: float64 (n_ticks, n_series) - column 0 is mid, then bid/ask
+        spread: float64 spread per tick (empty array if unavailable)
+        origin: Bin origin, in the same unit as ts
+        widths: int64 bar widths in the same unit, one per interval
+        bin_offsets: Start of each interval's slice in the output (len n_intervals + 1)
+
+    Returns:
+        Tuple: (bar_starts, ohlc[n_bins, n_series, 4], tick_count,
+                spread_sum, spread_count, n_bars per interval)
+    """
+    n = len(ts)
+    n_intervals = len(widths)
+    n_series = prices.shape[1]
+    total = bin_offsets[n_intervals]
+    has_spread = len(spread) > 0
+    nat = np.iinfo(np.int64).min
+
+    bar_starts = np.empty(total, dtype=np.int64)
+    ohlc = np.full((total, n_series, 4), np.nan)
+    tick_count = np.zeros(total, dtype=np.int64)
+    spread_sum = np.zeros(total, dtype=np.float64)
+    spread_count = np.zeros(total, dtype=np.int64)
+    n_bars = np.zeros(n_intervals, dtype=np.int64)
+    current = np.zeros(n_intervals, dtype=np.int64)
+
+    for i in range(n):
+        t = ts[i]
+        if t == nat or np.isnan(prices[i, 0]):
+            continue
+
+        for k in range(n_intervals):
+            b = (t - origin) // widths[k]
+            if n_bars[k] == 0 or b != current[k]:
+                current[k] = b
+                j = bin_offsets[k] + n_bars[k]
+                n_bars[k] += 1
+                bar_starts[j] = origin + b * widths[k]
+            else:
+                j = bin_offsets[k] + n_bars[k] - 1
+
+            tick_count[j] += 1
+            for p in range(n_series):
+                v = prices[i, p]
+                if np.isnan(v):
+                    continue
+                if np.isnan(ohlc[j, p, 0]):
+                    ohlc[j, p, 0] = v
+                    ohlc[j, p, 1] = v
+                    ohlc[j, p, 2] = v
+                else:
+                    if v > ohlc[j, p, 1]:
+                        ohlc[j, p, 1] = v
+                    if v < ohlc[j, p, 2]:
+                        ohlc[j, p, 2] = v
+                ohlc[j, p, 3] = v
+
+            if has_spread:
+                s = spread[i]
+                if not np.isnan(s):
+                    spread_sum[j] += s
+                    spread_count[j] += 1
+
+    return bar_starts, ohlc, tick_count, spread_sum, spread_count, n_bars
+
+
+def _resolve_origin(index, origin):
+    """Default origin: midnight of the first tick's day"""
+    if origin is None:
+        return index.min().normalize()
+    return pd.Timestamp(origin)
+
+
+def _price_series(tick_data, mid):
+    """Price series aggregated per bar: mid (+ bid/ask when present)"""
+    series = {"": mid}
+    if "bid" in tick_data.columns and "ask" in tick_data.columns:
+        series["bid_"] = tick_data["bid"]
+        series["ask_"] = tick_data["ask"]
+    return series
+
+
+def _resample_ticks_pandas(tick_data, interval_minutes, origin=None):
+    """pandas fallback for resample_ticks (used when Numba is unavailable)"""
+    timestamps, mid, spread = _tick_columns(tick_data)
+    index = pd.DatetimeIndex(timestamps)
+    origin = _resolve_origin(index, origin)
+    rule = f"{interval_minutes}min"
+
+    series = _price_series(tick_data, mid)
+    valid = pd.Series(np.asarray(mid), index=index).notna().to_numpy()
+    index = index[valid]
+
+    bars = None
+    for prefix, values in series.items():
+        grouped = pd.Series(np.asarray(values)[valid], index=index).resample(rule, origin=origin)
+        part = grouped.agg(["first", "max", "min", "last"])
+        part.columns = [f"{prefix}{name}" for name in ("open", "high", "low", "close")]
+        if bars is None:
+            bars = part
+            bars["tick_volume"] = grouped.size()
+            if spread is not None:
+                spread_grouped = pd.Series(np.asarray(spread)[valid], index=index).resample(rule, origin=origin)
+                bars["spread_sum"] = spread_grouped.sum().astype(np.float64)
+                bars["spread_count"] = spread_grouped.count()
+        else:
+            bars = bars.join(part)
+
+    bars = bars[bars["tick_volume"] > 0]
+    bars.index.name = "timestamp"
+    return bars.reset_index()
+
+
+def resample_ticks_multi(tick_data, intervals, origin=None):
+    """
+    Resample ticks to base bars for several intervals in one scan
+
+    Args:
+        tick_data: DataFrame with datetime 'timestamp' and price columns
+        intervals: Bar intervals in minutes
+        origin: Bin origin (default: midnight of the first tick's day)
+
+    Returns:
+        dict: {interval_minutes: base bars DataFrame}. Base bars have
+              timestamp, open, high, low, close, tick_volume, plus
+              spread_sum/spread_count and bid_*/ask_* OHLC when the ticks
+              carry spread_pips and bid/ask.
+    """
+    intervals = [int(i) for i in intervals]
+    if not NUMBA_AVAILABLE:
+        return {i: _resample_ticks_pandas(tick_data, i, origin) for i in intervals}
+
+    timestamps, mid, spread = _tick_columns(tick_data)
+    index = pd.DatetimeIndex(timestamps)
+    series = _price_series(tick_data, mid)
+
+    # Work in the index's own resolution (avoids converting every timestamp)
+    unit = index.unit
+    ts = index.asi8
+    ticks_per_minute = np.timedelta64(1, "m") // np.timedelta64(1, unit)
+    prices = np.column_stack([np.asarray(v, dtype=np.float64) for v in series.values()])
+    spread = np.asarray(spread, dtype=np.float64) if spread is not None else np.empty(0)
+
+    valid = index.notna()
+    n_valid = int(valid.sum())
+    if n_valid == 0:
+        return {i: _resample_ticks_pandas(tick_data, i, origin) for i in intervals}
+
+    origin = _resolve_origin(index, origin)
+    origin_value = pd.DatetimeIndex([origin]).as_unit(unit).asi8[0]
+
+    # Kernel needs time order (crystals are already sorted)
+    if np.any(ts[1:] < ts[:-1]):
+        order = np.argsort(ts, kind="stable")
+        ts, prices = ts[order], prices[order]
+        if len(spread):
+            spread = spread[order]
+
+    # Upper bound on bars per interval: ticks, or bins spanned
+    valid_ts = ts[ts != np.iinfo(np.int64).min]
+    first, last = valid_ts.min(), valid_ts.max()
+    widths = np.array([i * ticks_per_minute for i in intervals], dtype=np.int64)
+    capacity = [min(n_valid, (last - origin_value) // w - (first - origin_value) // w + 1) for w in widths]
+    bin_offsets = np.concatenate([[0], np.cumsum(capacity)]).astype(np.int64)
+
+    bar_starts, ohlc, tick_count, spread_sum, spread_count, n_bars = _resample_ohlc_numba(
+        ts, prices, spread, origin_value, widths, bin_offsets
+    )
+
+    results = {}
+    for k, interval in enumerate(intervals):
+        sl = slice(bin_offsets[k], bin_offsets[k] + n_bars[k])
+        starts = pd.DatetimeIndex(bar_starts[sl].view(f"datetime64[{unit}]"))
+        if index.tz is not None:
+            starts = starts.tz_localize("UTC").tz_convert(index.tz)
+
+        data = {"timestamp": starts}
+        for p, prefix in enumerate(series):
+            for c, name in enumerate(("open", "high", "low", "close")):
+                data[f"{prefix}{name}"] = ohlc[sl, p, c]
+            if p == 0:
+                data["tick_volume"] = tick_count[sl]
+                if len(spread):
+                    data["spread_sum"] = spread_sum[sl]
+                    data["spread_count"] = spread_count[sl]
+        results[interval] = pd.DataFrame(data)
+
+    return results
+
+
+def resample_ticks(tick_data, interval_minutes, origin=None):
+    """
+    Resample ticks to base bars
+
+    Args:
+        tick_data: DataFrame with datetime 'timestamp' and price columns
+        interval_minutes: Bar interval in minutes
+        origin: Bin origin (default: midnight of the first tick's day)
+
+    Returns:
+        pd.DataFrame: Base bars (see resample_ticks_multi)
+    """
+    return resample_ticks_multi(tick_data, [interval_minutes], origin)[int(interval_minutes)]
+
+
+def derive_bars(bars, interval_minutes, origin):
+    """
+    Aggregate finer base bars into a coarser interval
+
+    Exact when interval_minutes is a multiple of the finer interval and
+    both share the same origin.
+
+    Args:
+        bars: Base bars from resample_ticks()
+        interval_minutes: Target interval in minutes
+        origin: Bin origin used for the finer bars
+
+    Returns:
+        pd.DataFrame: Base bars at the coarser interval
+    """
+    agg = {"open": "first", "high": "max", "low": "min", "close": "last", "tick_volume": "sum"}
+    if "spread_sum" in bars.columns:
+        agg.update({"spread_sum": "sum", "spread_count": "sum"})
+    for prefix in ("bid_", "ask_"):
+        if f"{prefix}open" in bars.columns:
+            agg.update({f"{prefix}open": "first", f"{prefix}high": "max",
+                        f"{prefix}low": "min", f"{prefix}close": "last"})
+
+    coarse = bars.set_index("timestamp").resample(f"{interval_minutes}min", origin=origin).agg(agg)
+    coarse = coarse[coarse["tick_volume"] > 0]
+    coarse.index.name = "timestamp"
+    return coarse.reset_index()
+
+
+def spread_average(bars):
+    """Mean spread per bar (NaN where no spread was recorded)"""
+    count = bars["spread_count"].to_numpy()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, bars["spread_sum"].to_numpy() / count, np.nan)
+
+
+# ═══════════════════════════════════════════════════════════════
+# 💾 OHLC CACHE
+# ═══════════════════════════════════════════════════════════════
+
+class OHLCCache:
+    """
+    Persistent base-bar cache keyed by (dataset, interval)
+
+    Datasets are either Parquet tick files (fingerprinted by path, size,
+    mtime and a hash of the first MiB) or in-memory DataFrames
+    (fingerprinted by a hash of every tick row, once per DataFrame; see
+    tick_data_token). Each interval is stored as
+    bars_<N>m.parquet with a JSON sidecar describing the source it was
+    built from. With persist=False nothing is written to disk and only the
+    in-memory LRU is used.
+    """
+
+    def __init__(self, cache_dir=None, verbose=True, persist=True,
+                 max_memory_entries=DEFAULT_MEMORY_ENTRIES):
+        """
+        Initialize OHLC cache
+
+        Args:
+            cache_dir: Cache directory (default: <cache_dir>/ohlc from CACHE_CONFIG)
+            verbose: Print cache hits/builds
+            persist: Read and write bars on disk
+            max_memory_entries: Bar sets kept in memory (LRU)
+        """
+        if cache_dir is None:
+            from config import CACHE_CONFIG
+            cache_dir = Path(CACHE_CONFIG["cache_dir"]) / "ohlc"
+        self.cache_dir = Path(cache_dir)
+        self.verbose = verbose
+        self.persist = persist
+        self.max_memory_entries = max_memory_entries
+        self._memory = OrderedDict()
+
+    # ─── Dataset identity ───────────────────────────────────────
+
+    @staticmethod
+    def file_fingerprint(path):
+        """
+        Fingerprint a source file
+
+        Args:
+            path: Source Parquet path
+
+        Returns:
+            dict: size, mtime_ns and MD5 of the first FINGERPRINT_HEAD_BYTES
+        """
+        path = Path(path)
+        stat = path.stat()
+        with open(path, "rb") as f:
+            head_hash = hashlib.md5(f.read(FINGERPRINT_HEAD_BYTES)).hexdigest()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "head_hash": head_hash}
+
+    def _dataset_dir(self, parquet_path=None, tick_data=None):
+        """Resolve (directory, fingerprint) for a dataset"""
+        if parquet_path is not None:
+            path = Path(parquet_path).resolve()
+            if not path.exists():
+                raise FileNotFoundError(f"❌ Crystal not found: {parquet_path}")
+            path_hash = hashlib.md5(str(path).encode()).hexdigest()[:8]
+            return self.cache_dir / f"{path.stem}_{path_hash}", self.file_fingerprint(path)
+
+        fingerprint = tick_data_token(tick_data)
+        return self.cache_dir / f"df_{fingerprint[:16]}", {"content_hash": fingerprint}
+
+    # ─── Entries ────────────────────────────────────────────────
+
+    @staticmethod
+    def _paths(dataset_dir, interval):
+        return dataset_dir / f"bars_{interval}m.parquet", dataset_dir / f"bars_{interval}m.json"
+
+    def _read_entry(self, dataset_dir, interval):
+        """Load the sidecar of a cached interval (None if missing/corrupt)"""
+        if not self.persist:
+            return None
+        bars_path, meta_path = self._paths(dataset_dir, interval)
+        if not (bars_path.exists() and meta_path.exists()):
+            return None
+        try:
+            with open(meta_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("version") == CACHE_VERSION else None
+
+    def _write_entry(self, dataset_dir, interval, bars, entry):
+        """Atomically write bars and sidecar (bars first, sidecar last)"""
+        if not self.persist:
+            return
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+        bars_path, meta_path = self._paths(dataset_dir, interval)
+        suffix = f".{os.getpid()}.tmp"
+
+        bars.to_parquet(str(bars_path) + suffix, index=False)
+        os.replace(str(bars_path) + suffix, bars_path)
+
+        entry = dict(entry, version=CACHE_VERSION, interval=interval, n_bars=len(bars),
+                     last_bar=str(bars["timestamp"].iloc[-1]) if len(bars) else None)
+        with open(str(meta_path) + suffix, "w") as f:
+            json.dump(entry, f, indent=2)
+        os.replace(str(meta_path) + suffix, meta_path)
+
+    def cached_intervals(self, parquet_path=None, tick_data=None):
+        """
+        List intervals with cached bars for a dataset
+
+        Returns:
+            list: Interval minutes, ascending
+        """
+        dataset_dir, _ = self._dataset_dir(parquet_path, tick_data)
+        return self._intervals_in(dataset_dir)
+
+    def _intervals_in(self, dataset_dir):
+        if not self.persist or not dataset_dir.exists():
+            return []
+        intervals = []
+        for meta_path in dataset_dir.glob("bars_*m.json"):
+            try:
+                intervals.append(int(meta_path.stem[len("bars_"):-1]))
+            except ValueError:
+                continue
+        return sorted(intervals)
+
+    # ─── Public API ─────────────────────────────────────────────
+
+    def get_bars(self, interval_minutes, parquet_path=None, tick_data=None):
+        """
+        Base bars for a dataset and interval, building them if needed
+
+        Resolution order: cached and current → derived from the largest
+        cached finer interval → extended with new ticks (growing Parquet
+        source) → resampled from ticks.
+
+        Args:
+            interval_minutes: Bar interval in minutes
+            parquet_path: Tick Parquet file (either this or tick_data)
+            tick_data: Tick DataFrame
+
+        Returns:
+            pd.DataFrame: Base bars (see resample_ticks); shared, do not modify
+        """
+        if parquet_path is None and tick_data is None:
+            raise ValueError("❌ Provide parquet_path or tick_data")
+
+        interval = int(interval_minutes)
+        dataset_dir, fingerprint = self._dataset_dir(parquet_path, tick_data)
+        memory_key = self._memory_key(dataset_dir, fingerprint, interval)
+        if memory_key in self._memory:
+            self._memory.move_to_end(memory_key)
+            return self._memory[memory_key]
+
+        bars = self._resolve(dataset_dir, fingerprint, interval, parquet_path, tick_data)
+        self._remember(memory_key, bars)
+        return bars
+
+    def warm(self, intervals, parquet_path=None, tick_data=None):
+        """
+        Build every missing or stale interval from a single tick scan
+
+        Args:
+            intervals: Interval minutes to have cached
+            parquet_path: Tick Parquet file (either this or tick_data)
+            tick_data: Tick DataFrame
+
+        Returns:
+            list: Intervals that were (re)built
+        """
+        dataset_dir, fingerprint = self._dataset_dir(parquet_path, tick_data)
+        stale = sorted({
+            int(i) for i in intervals
+            if self._memory_key(dataset_dir, fingerprint, int(i)) not in self._memory
+            and (self._read_entry(dataset_dir, int(i)) or {}).get("source") != fingerprint
+        })
+        if stale:
+            self._build_from_ticks(dataset_dir, fingerprint, stale, parquet_path, tick_data)
+        return stale
+
+    def clear_memory(self):
+        """Drop bars held in memory (disk cache is kept)"""
+        self._memory.clear()
+
+    @staticmethod
+    def _memory_key(dataset_dir, fingerprint, interval):
+        return (str(dataset_dir), interval, json.dumps(fingerprint, sort_keys=True))
+
+    def _remember(self, memory_key, bars):
+        """Hold bars in memory, evicting the least recently used"""
+        self._memory[memory_key] = bars
+        self._memory.move_to_end(memory_key)
+        while len(self._memory) > max(self.max_memory_entries, 0):
+            self._memory.popitem(last=False)
+
+    # ─── Resolution ─────────────────────────────────────────────
+
+    def _resolve(self, dataset_dir, fingerprint, interval, parquet_path, tick_data):
+        bars_path, _ = self._paths(dataset_dir, interval)
+        entry = self._read_entry(dataset_dir, interval)
+
+        # 1. Cached and current
+        if entry is not None and entry["source"] == fingerprint:
+            self._log(f"💾 OHLC cache hit: {interval}min ({entry['n_bars']:,} bars)")
+            return pd.read_parquet(bars_path)
+
+        # 2. Derived from a finer cached interval
+        finer = [
+            f for f in self._intervals_in(dataset_dir)
+            if f < interval and interval % f == 0 and self._read_entry(dataset_dir, f) is not None
+        ]
+        if finer:
+            base = max(finer)
+            base_bars = self.get_bars(base, parquet_path, tick_data)
+            origin = pd.Timestamp(self._read_entry(dataset_dir, base)["origin"])
+            bars = derive_bars(base_bars, interval, origin)
+            self._write_entry(dataset_dir, interval, bars,
+                              {"source": fingerprint, "origin": str(origin), "derived_from": base,
+                               "ticks_before_last_bar": None})
+            self._log(f"💎 OHLC {interval}min derived from cached {base}min bars ({len(bars):,} bars)")
+            return bars
+
+        # 3. Growing source: extend with new ticks only
+        if entry is not None and parquet_path is not None:
+            bars = self._extend(dataset_dir, entry, interval, parquet_path, fingerprint)
+            if bars is not None:
+                return bars
+
+        # 4. Full resample from ticks
+        return self._build_from_ticks(dataset_dir, fingerprint, [interval], parquet_path, tick_data)[interval]
+
+    def _build_from_ticks(self, dataset_dir, fingerprint, intervals, parquet_path, tick_data):
+        """Resample several intervals from ticks in one scan and cache them"""
+        if tick_data is None:
+            tick_data = self._read_ticks(parquet_path)
+        if len(tick_data) == 0:
+            raise ValueError("❌ Tick data is empty!")
+        ticks_ts = pd.DatetimeIndex(_tick_columns(tick_data)[0])
+        origin = ticks_ts.min().normalize()
+
+        all_bars = resample_ticks_multi(tick_data, intervals, origin=origin)
+        for interval, bars in all_bars.items():
+            self._remember(self._memory_key(dataset_dir, fingerprint, interval), bars)
+            self._write_entry(dataset_dir, interval, bars,
+                              {"source": fingerprint, "origin": str(origin), "derived_from": None,
+                               "first_tick": _utc_str(ticks_ts.min()),
+                               "ticks_before_last_bar": self._count_before(ticks_ts, bars)})
+            self._log(f"🕐 OHLC {interval}min resampled from ticks ({len(bars):,} bars, cached)")
+        return all_bars
+
+    def _extend(self, dataset_dir, entry, interval, parquet_path, fingerprint):
+        """
+        Append bars for ticks added to a growing Parquet source
+
+        The cached prefix is trusted only if the source did not shrink, its
+        first tick is unchanged and the number of ticks before the last
+        cached bar still matches. The last cached bar is rebuilt since it
+        may have been incomplete.
+
+        Returns:
+            pd.DataFrame or None: Extended bars (None → full rebuild needed)
+        """
+        if (not PYARROW_AVAILABLE or entry.get("ticks_before_last_bar") is None
+                or not entry.get("last_bar")
+                or fingerprint["size"] < entry["source"].get("size", 0)):
+            return None
+
+        dataset = pads.dataset(str(parquet_path))
+        ts_type = dataset.schema.field("timestamp").type
+        if not pa.types.is_timestamp(ts_type):
+            return None
+
+        head = dataset.head(1, columns=["timestamp"]).to_pandas()
+        if len(head) == 0 or _utc_str(head["timestamp"].iloc[0]) != entry.get("first_tick"):
+            return None
+
+        last_bar = pd.Timestamp(entry["last_bar"])
+        boundary = pa.scalar(last_bar, type=ts_type)
+        if dataset.count_rows(filter=pc.field("timestamp") < boundary) != entry["ticks_before_last_bar"]:
+            return None
+
+        columns = [c for c in TICK_COLUMNS if c in dataset.schema.names]
+        new_ticks = dataset.to_table(filter=pc.field("timestamp") >= boundary, columns=columns).to_pandas()
+
+        bars_path, _ = self._paths(dataset_dir, interval)
+        cached = pd.read_parquet(bars_path)
+        origin = pd.Timestamp(entry["origin"])
+        tail = resample_ticks(new_ticks, interval, origin=origin)
+        bars = pd.concat([cached[cached["timestamp"] < last_bar], tail], ignore_index=True)
+
+        ticks_before = entry["ticks_before_last_bar"] + self._count_before(
+            pd.DatetimeIndex(new_ticks["timestamp"]), bars)
+        self._write_entry(dataset_dir, interval, bars,
+                          {"source": fingerprint, "origin": str(origin), "derived_from": None,
+                           "first_tick": entry["first_tick"], "ticks_before_last_bar": ticks_before,
+                           "appended_ticks": len(new_ticks)})
+        self._log(f"➕ OHLC {interval}min extended with {len(new_ticks):,} new ticks ({len(bars):,} bars)")
+        return bars
+
+    @staticmethod
+    def _count_before(timestamps, bars):
+        """Ticks strictly before the start of the last bar"""
+        if len(bars) == 0:
+            return 0
+        return int((timestamps < bars["timestamp"].iloc[-1]).sum())
+
+    @staticmethod
+    def _read_ticks(parquet_path):
+        """Read only the columns needed to build bars"""
+        from data_loader import ensure_datetime_column
+
+        if PYARROW_AVAILABLE:
+            names = pads.dataset(str(parquet_path)).schema.names
+            columns = [c for c in TICK_COLUMNS if c in names]
+            ticks = pd.read_parquet(parquet_path, columns=columns)
+        else:
+            ticks = pd.read_parquet(parquet_path)
+        return ensure_datetime_column(ticks, "timestamp", utc=True)
+
+    def _log(self, message):
+        if self.verbose:
+            print(f"   {message}", flush=True)
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🌐 DEFAULT INSTANCE
+# ═══════════════════════════════════════════════════════════════
+
+_default_cache = None
+
+
+def default_ohlc_cache():
+    """
+    Process-wide OHLC cache (None when CACHE_CONFIG disables caching)
+
+    Bars are always reused in memory; writing them to disk is opt-in
+    (CACHE_CONFIG["cache_ohlc"]).
+
+    Returns:
+        OHLCCache or None
+    """
+    global _default_cache
+    from config import CACHE_CONFIG
+
+    if not CACHE_CONFIG.get("enabled", True):
+        return None
+    cache_dir = Path(CACHE_CONFIG["cache_dir"]) / "ohlc"
+    persist = bool(CACHE_CONFIG.get("cache_ohlc", False))
+    if (_default_cache is None or _default_cache.cache_dir != cache_dir
+            or _default_cache.persist != persist):
+        _default_cache = OHLCCache(
+            cache_dir,
+            persist=persist,
+            max_memory_entries=CACHE_CONFIG.get("ohlc_memory_entries", DEFAULT_MEMORY_ENTRIES)
+        )
+    return _default_cache
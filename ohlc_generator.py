@@ -23,6 +23,7 @@ warnings.filterwarnings("ignore")
 
 from config import PARQUET_FILE
 from data_loader import load_crystal, ensure_datetime_column
+from ohlc_cache import default_ohlc_cache, resample_ticks, spread_average
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -33,16 +34,22 @@ def generate_ohlc_bars(
     tick_data: Optional[pd.DataFrame] = None,
     parquet_path: Optional[Path] = None,
     interval_minutes: int = 5,
-    lookback: Optional[int] = None
+    lookback: Optional[int] = None,
+    use_cache: bool = True
 ) -> pd.DataFrame:
     """
     Generate OHLC bars from tick data
     
+    Bars built from a parquet file go through the persistent OHLC cache,
+    so each (file, interval) is resampled once and coarser intervals are
+    derived from finer cached bars.
+    
     Args:
         tick_data: DataFrame with tick data (optional if parquet_path provided)
         parquet_path: Path to parquet file (optional if tick_data provided)
         interval_minutes: Candle interval in minutes (default: 5)
         lookback: Lookback period (currently not used, for metadata)
+        use_cache: Use the OHLC cache for parquet sources (default: True)
         
     Returns:
         DataFrame with OHLC bars containing:
@@ -58,6 +65,16 @@ def generate_ohlc_bars(
         ValueError: If neither tick_data nor parquet_path is provided
         ValueError: If data is empty or missing required columns
     """
+    # Cached bars for parquet sources (no tick loading on a cache hit)
+    cache = default_ohlc_cache() if (tick_data is None and use_cache) else None
+    if cache is not None:
+        if parquet_path is None:
+            parquet_path = PARQUET_FILE
+        
+        print(f"🕐 Generating {interval_minutes}min OHLC bars for {parquet_path}...", flush=True)
+        bars = cache.get_bars(interval_minutes, parquet_path=parquet_path)
+        return _finalize_ohlc(bars)
+    
     # Load data if not provided
     if tick_data is None:
         if parquet_path is None:
@@ -88,27 +105,24 @@ def generate_ohlc_bars(
     # Ensure timestamp is datetime
     tick_data = ensure_datetime_column(tick_data, 'timestamp', utc=True)
     
-    # Calculate mid_price if needed
-    if not has_mid_price and has_bid_ask:
-        tick_data = tick_data.copy()
-        tick_data["mid_price"] = (tick_data["bid"] + tick_data["ask"]) / 2
-    elif not has_mid_price and has_close:
-        tick_data = tick_data.copy()
-        tick_data["mid_price"] = tick_data["close"]
-    
-    # Set timestamp as index for resampling
-    df_temp = tick_data.set_index("timestamp")
-    
-    # Resample to OHLC
-    ohlc = df_temp["mid_price"].resample(f"{interval_minutes}min").agg({
-        "open": "first",
-        "high": "max",
-        "low": "min",
-        "close": "last"
-    }).dropna()
+    # Resample to OHLC (mid_price from bid/ask or close if needed)
+    return _finalize_ohlc(resample_ticks(tick_data, interval_minutes))
+
+
+def _finalize_ohlc(bars: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn base bars (see ohlc_cache.resample_ticks) into backtest OHLC bars
+    
+    Args:
+        bars: Base bars with timestamp, open, high, low, close, tick_volume
+        
+    Returns:
+        DataFrame with OHLC bars and derived metrics
+    """
+    ohlc = bars[["timestamp", "open", "high", "low", "close"]].copy()
     
     # Add volume (tick count)
-    ohlc["volume"] = df_temp["mid_price"].resample(f"{interval_minutes}min").count()
+    ohlc["volume"] = bars["tick_volume"].to_numpy()
     
     # Add mid_price as alias for close (for backtester compatibility)
     ohlc["mid_price"] = ohlc["close"]
@@ -119,11 +133,8 @@ def generate_ohlc_bars(
     ohlc["range_pips"] = (ohlc["high"] - ohlc["low"]) * 10000
     
     # Add spread if available
-    if "spread_pips" in df_temp.columns:
-        ohlc["spread_avg"] = df_temp["spread_pips"].resample(f"{interval_minutes}min").mean()
-    
-    # Reset index to get timestamp as column
-    ohlc = ohlc.reset_index()
+    if "spread_sum" in bars.columns:
+        ohlc["spread_avg"] = spread_average(bars)
     
     # Validate output
     if len(ohlc) == 0:
@@ -9,6 +9,9 @@ Market Regime Detection System
 Features:
 - Unsupervised clustering (K-Means, HDBSCAN)
 - Automatic optimal cluster detection
+- Scalable mode for tick-derived features (sampled model selection,
+  MiniBatchKMeans, HDBSCAN fit-on-sample + chunked prediction)
+- Persisted scaler/model for assigning regimes to new data without refitting
 - Regime characterization
 - Transition probability matrices
 - Performance analysis by regime
@@ -16,8 +19,10 @@ Features:
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
-from sklearn.cluster import KMeans
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional, Union
+import joblib
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import silhouette_score, davies_bouldin_score
 import warnings
@@ -34,6 +39,70 @@ except ImportError:
 from config import REGIME_CONFIG
 
 
+# ═══════════════════════════════════════════════════════════════
+# 🧮 SAMPLING HELPERS
+# ═══════════════════════════════════════════════════════════════
+
+def stratified_sample_indices(n_rows: int, sample_size: int,
+                              n_strata: int = 100, random_state: int = 42) -> np.ndarray:
+    """
+    Sorted row indices sampled evenly across contiguous strata
+    
+    Feature rows are in time order, so each stratum is a period of the
+    dataset and every period contributes in proportion to its length.
+    
+    Args:
+        n_rows: Number of rows
+        sample_size: Number of rows to draw
+        n_strata: Number of contiguous blocks
+        random_state: Seed
+        
+    Returns:
+        Sorted int64 indices (all rows if sample_size >= n_rows)
+    """
+    if sample_size >= n_rows:
+        return np.arange(n_rows)
+    
+    rng = np.random.RandomState(random_state)
+    n_strata = max(1, min(n_strata, sample_size))
+    bounds = np.linspace(0, n_rows, n_strata + 1).astype(np.int64)
+    quotas = np.diff(np.linspace(0, sample_size, n_strata + 1).astype(np.int64))
+    
+    indices = [
+        start + rng.choice(end - start, size=min(quota, end - start), replace=False)
+        for start, end, quota in zip(bounds[:-1], bounds[1:], quotas)
+        if end > start and quota > 0
+    ]
+    return np.sort(np.concatenate(indices))
+
+
+def predict_in_chunks(predict_fn, X: np.ndarray, chunk_size: int,
+                      dtype=np.int32) -> np.ndarray:
+    """
+    Apply a label-assignment function to X in row chunks
+    
+    Args:
+        predict_fn: Callable mapping a 2D chunk to a label array
+        X: Feature matrix (or DataFrame; chunks are sliced with iloc)
+        chunk_size: Rows per chunk
+        dtype: Output label dtype
+        
+    Returns:
+        Label array of length len(X)
+    """
+    labels = np.empty(len(X), dtype=dtype)
+    for start in range(0, len(X), chunk_size):
+        stop = min(start + chunk_size, len(X))
+        chunk = X.iloc[start:stop] if isinstance(X, pd.DataFrame) else X[start:stop]
+        labels[start:stop] = predict_fn(chunk)
+    return labels
+
+
+def regime_dtype(n_clusters: int):
+    """Smallest signed integer dtype holding regime ids and the -1 noise label"""
+    return np.int8 if n_clusters <= np.iinfo(np.int8).max else np.int16
+
+
 # ═══════════════════════════════════════════════════════════════
 # 🎯 REGIME DETECTION
 # ═══════════════════════════════════════════════════════════════
@@ -59,6 +128,7 @@ class RegimeDetector:
         self.scaler = StandardScaler()
         self.best_model = None
         self.best_n_clusters = None
+        self.feature_cols = None
         self.regime_names = {}
         
     def _select_features(self, df: pd.DataFrame) -> List[str]:
@@ -97,18 +167,48 @@ class RegimeDetector:
         
         return selected[:30]  # Limit to 30 features
     
-    def _find_optimal_clusters(self, X: np.ndarray) -> int:
+    def _use_scalable(self, n_rows: int, scalable: Optional[bool]) -> bool:
+        """Resolve scalable=None to the row-count threshold from config"""
+        if scalable is None:
+            return n_rows > self.config.get("scalable_threshold", 200_000)
+        return scalable
+    
+    def _min_cluster_size(self, n_rows: int) -> int:
+        """Dynamic HDBSCAN min_cluster_size for a dataset of n_rows"""
+        config_min_size = self.config.get("min_cluster_size", 100)
+        min_absolute = self.config.get("min_cluster_size_absolute", 10000)
+        min_pct = self.config.get("min_cluster_size_pct", 0.01)
+        
+        # Dynamic: at least min_pct of data or min_absolute points, whichever is larger
+        return max(min_absolute, int(n_rows * min_pct), config_min_size)
+    
+    def _find_optimal_clusters(self, X: np.ndarray, scalable: bool = False) -> int:
         """
         Find optimal number of clusters using elbow method and silhouette
         
+        In scalable mode candidates are fit with MiniBatchKMeans on a
+        stratified sample and silhouette is scored on a bounded subsample,
+        so the cost no longer depends on the number of rows.
+        
         Args:
             X: Scaled feature matrix
+            scalable: Select k on samples instead of the full matrix
             
         Returns:
             Optimal number of clusters
         """
         n_range = self.config.get("n_clusters_range", [2, 3, 4, 5, 6])
         
+        silhouette_kwargs = {}
+        if scalable:
+            sample_idx = stratified_sample_indices(len(X), self.config.get("selection_sample_size", 50_000))
+            X = X[sample_idx]
+            silhouette_kwargs = {
+                "sample_size": min(len(X), self.config.get("silhouette_sample_size", 10_000)),
+                "random_state": 42,
+            }
+            print(f"   🎲 Selecting k on a stratified sample of {len(X):,} rows")
+        
         best_score = -1
         best_n = n_range[0]
         
@@ -117,12 +217,16 @@ class RegimeDetector:
         for n in n_range:
             if n >= len(X):
                 continue
-                
-            kmeans = KMeans(n_clusters=n, random_state=42, n_init=10)
+            
+            if scalable:
+                kmeans = MiniBatchKMeans(n_clusters=n, random_state=42, n_init=3,
+                                         batch_size=self.config.get("minibatch_size", 4096))
+            else:
+                kmeans = KMeans(n_clusters=n, random_state=42, n_init=10)
             labels = kmeans.fit_predict(X)
             
             # Silhouette score (higher is better)
-            silhouette = silhouette_score(X, labels)
+            silhouette = silhouette_score(X, labels, **silhouette_kwargs)
             
             # Davies-Bouldin score (lower is better, invert for comparison)
             db_score = davies_bouldin_score(X, labels)
@@ -152,13 +256,16 @@ class RegimeDetector:
         return best_n
     
     def detect_regimes_kmeans(self, df: pd.DataFrame, 
-                             feature_cols: List[str] = None) -> pd.DataFrame:
+                             feature_cols: List[str] = None,
+                             scalable: Optional[bool] = None) -> pd.DataFrame:
         """
         Detect regimes using K-Means clustering
         
         Args:
             df: DataFrame with features
             feature_cols: List of feature columns (auto-select if None)
+            scalable: Sampled k selection + MiniBatchKMeans + chunked
+                      assignment (None = auto above config["scalable_threshold"] rows)
             
         Returns:
             DataFrame with added 'regime' column
@@ -170,6 +277,7 @@ class RegimeDetector:
             feature_cols = self._select_features(df)
         
         print(f"   Using {len(feature_cols)} features")
+        self.feature_cols = list(feature_cols)
         
         # Prepare data
         X = df[feature_cols].fillna(0).values
@@ -177,15 +285,25 @@ class RegimeDetector:
         # Scale features
         X_scaled = self.scaler.fit_transform(X)
         
+        scalable = self._use_scalable(len(X_scaled), scalable)
+        
         # Find optimal clusters
-        n_clusters = self._find_optimal_clusters(X_scaled)
+        n_clusters = self._find_optimal_clusters(X_scaled, scalable=scalable)
         self.best_n_clusters = n_clusters
         
         print(f"\n   📊 Selected {n_clusters} clusters (regimes)")
         
         # Fit final model
-        self.best_model = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        labels = self.best_model.fit_predict(X_scaled)
+        if scalable:
+            print(f"   🔄 Fitting MiniBatchKMeans on {len(X_scaled):,} rows...")
+            self.best_model = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, n_init=3,
+                                              batch_size=self.config.get("minibatch_size", 4096))
+            self.best_model.fit(X_scaled)
+            labels = predict_in_chunks(self.best_model.predict, X_scaled,
+                                       self.config.get("predict_chunk_size", 500_000))
+        else:
+            self.best_model = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+            labels = self.best_model.fit_predict(X_scaled)
         
         # Add to dataframe
         result_df = df.copy()
@@ -194,20 +312,24 @@ class RegimeDetector:
         return result_df
     
     def detect_regimes_hdbscan(self, df: pd.DataFrame,
-                               feature_cols: List[str] = None) -> pd.DataFrame:
+                               feature_cols: List[str] = None,
+                               scalable: Optional[bool] = None) -> pd.DataFrame:
         """
         Detect regimes using HDBSCAN (density-based)
         
         Args:
             df: DataFrame with features
             feature_cols: List of feature columns (auto-select if None)
+            scalable: Fit on a stratified sample and assign the remaining rows
+                      with approximate_predict in chunks (None = auto above
+                      config["scalable_threshold"] rows)
             
         Returns:
             DataFrame with added 'regime' column
         """
         if not HDBSCAN_AVAILABLE:
             print("⚠️  HDBSCAN not available, falling back to K-Means")
-            return self.detect_regimes_kmeans(df, feature_cols)
+            return self.detect_regimes_kmeans(df, feature_cols, scalable=scalable)
         
         print("🟣 Detecting regimes with HDBSCAN...")
         
@@ -216,6 +338,7 @@ class RegimeDetector:
             feature_cols = self._select_features(df)
         
         print(f"   Using {len(feature_cols)} features")
+        self.feature_cols = list(feature_cols)
         
         # Prepare data
         X = df[feature_cols].fillna(0).values
@@ -224,22 +347,41 @@ class RegimeDetector:
         X_scaled = self.scaler.fit_transform(X)
         
         # Fit HDBSCAN with dynamic min_cluster_size
-        config_min_size = self.config.get("min_cluster_size", 100)
-        min_absolute = self.config.get("min_cluster_size_absolute", 10000)
         min_pct = self.config.get("min_cluster_size_pct", 0.01)
-        
-        # Dynamic: at least min_pct of data or min_absolute points, whichever is larger
-        min_cluster_size = max(min_absolute, int(len(df) * min_pct), config_min_size)
+        min_cluster_size = self._min_cluster_size(len(df))
         print(f"   Using min_cluster_size={min_cluster_size:,} ({min_pct*100:.0f}% of {len(df):,} rows)")
         
-        print(f"   🔄 Processing HDBSCAN clustering on {len(df):,} samples...")
-        clusterer = hdbscan.HDBSCAN(
-            min_cluster_size=min_cluster_size,
-            min_samples=10,
-            metric='euclidean'
-        )
+        scalable = self._use_scalable(len(X_scaled), scalable)
+        fit_size = self.config.get("hdbscan_fit_sample_size", 200_000)
         
-        labels = clusterer.fit_predict(X_scaled)
+        if scalable and fit_size < len(X_scaled):
+            # Same fraction of the sample as of the full data
+            sample_idx = stratified_sample_indices(len(X_scaled), fit_size)
+            sample_min_size = max(2, int(round(min_cluster_size * len(sample_idx) / len(X_scaled))))
+            
+            print(f"   🔄 Fitting HDBSCAN on a stratified sample of {len(sample_idx):,} rows "
+                  f"(min_cluster_size={sample_min_size:,})...")
+            clusterer = hdbscan.HDBSCAN(
+                min_cluster_size=sample_min_size,
+                min_samples=10,
+                metric='euclidean',
+                prediction_data=True
+            )
+            clusterer.fit(X_scaled[sample_idx])
+            
+            print(f"   🔄 Assigning {len(X_scaled):,} rows in chunks...")
+            labels = predict_in_chunks(
+                lambda chunk: hdbscan.approximate_predict(clusterer, chunk)[0],
+                X_scaled, self.config.get("predict_chunk_size", 500_000)
+            )
+        else:
+            print(f"   🔄 Processing HDBSCAN clustering on {len(df):,} samples...")
+            clusterer = hdbscan.HDBSCAN(
+                min_cluster_size=min_cluster_size,
+                min_samples=10,
+                metric='euclidean'
+            )
+            labels = clusterer.fit_predict(X_scaled)
         print(f"   ✅ HDBSCAN clustering complete")
         
         # Count clusters (excluding noise label -1)
@@ -259,7 +401,8 @@ class RegimeDetector:
     
     def detect_regimes(self, df: pd.DataFrame, 
                        method: str = "auto",
-                       feature_cols: List[str] = None) -> pd.DataFrame:
+                       feature_cols: List[str] = None,
+                       scalable: Optional[bool] = None) -> pd.DataFrame:
         """
         Detect market regimes
         
@@ -267,6 +410,7 @@ class RegimeDetector:
             df: DataFrame with features
             method: "kmeans", "hdbscan", or "auto"
             feature_cols: List of feature columns (auto-select if None)
+            scalable: Sample-based fitting for large inputs (None = auto by row count)
             
         Returns:
             DataFrame with added 'regime' column
@@ -275,43 +419,210 @@ class RegimeDetector:
             method = "hdbscan" if HDBSCAN_AVAILABLE else "kmeans"
         
         if method == "hdbscan":
-            return self.detect_regimes_hdbscan(df, feature_cols)
+            return self.detect_regimes_hdbscan(df, feature_cols, scalable=scalable)
         else:
-            return self.detect_regimes_kmeans(df, feature_cols)
+            return self.detect_regimes_kmeans(df, feature_cols, scalable=scalable)
     
-    def characterize_regimes(self, df: pd.DataFrame,
-                            feature_cols: List[str] = None) -> Dict:
+    # ───────────────────────────────────────────────────────────
+    # 💾 PERSISTENCE & PREDICTION
+    # ───────────────────────────────────────────────────────────
+    
+    MODEL_FORMAT_VERSION = 1
+    
+    def save_model(self, path: Union[str, Path]) -> Path:
         """
-        Characterize each regime by analyzing feature distributions
+        Save the fitted scaler, clustering model and feature list
         
         Args:
-            df: DataFrame with 'regime' column
-            feature_cols: Features to use for characterization
+            path: Output file (joblib)
             
         Returns:
-            Dictionary with regime characteristics
+            Path written
         """
-        if "regime" not in df.columns:
-            raise ValueError("DataFrame must have 'regime' column")
+        if self.best_model is None or self.feature_cols is None:
+            raise ValueError("No fitted model to save (run detect_regimes first)")
+        
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump({
+            "format_version": self.MODEL_FORMAT_VERSION,
+            "scaler": self.scaler,
+            "model": self.best_model,
+            "feature_cols": self.feature_cols,
+            "n_clusters": self.best_n_clusters,
+            "regime_names": self.regime_names,
+        }, path, compress=3)
+        return path
+    
+    @classmethod
+    def load_model(cls, path: Union[str, Path], config: Dict = None) -> "RegimeDetector":
+        """
+        Restore a detector saved with save_model()
         
-        if feature_cols is None:
-            feature_cols = self._select_features(df)
+        Args:
+            path: Model file
+            config: Configuration dictionary (uses REGIME_CONFIG if None)
+            
+        Returns:
+            RegimeDetector ready for predict()
+        """
+        state = joblib.load(path)
+        if state.get("format_version") != cls.MODEL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported regime model format: {state.get('format_version')}")
+        
+        detector = cls(config)
+        detector.scaler = state["scaler"]
+        detector.best_model = state["model"]
+        detector.feature_cols = state["feature_cols"]
+        detector.best_n_clusters = state["n_clusters"]
+        detector.regime_names = state["regime_names"]
+        return detector
+    
+    def _predict_scaled(self, X_scaled: np.ndarray) -> np.ndarray:
+        """Assign regimes to already-scaled rows with the fitted model"""
+        if HDBSCAN_AVAILABLE and isinstance(self.best_model, hdbscan.HDBSCAN):
+            return hdbscan.approximate_predict(self.best_model, X_scaled)[0]
+        return self.best_model.predict(X_scaled)
+    
+    def _predict_chunk(self, chunk) -> np.ndarray:
+        """Scale and assign one chunk of feature rows"""
+        if isinstance(chunk, pd.DataFrame):
+            chunk = chunk[self.feature_cols].fillna(0).to_numpy(dtype=np.float64)
+        else:
+            chunk = np.nan_to_num(np.asarray(chunk, dtype=np.float64), nan=0.0)
+        return self._predict_scaled(self.scaler.transform(chunk))
+    
+    def predict(self, data: Union[pd.DataFrame, np.ndarray],
+                chunk_size: int = None) -> np.ndarray:
+        """
+        Assign regimes to new rows without refitting
+        
+        Rows are scaled and assigned chunk by chunk; only the selected
+        feature columns of one chunk are materialized at a time and the
+        input frame is never copied.
+        
+        Args:
+            data: DataFrame containing feature_cols, or a matrix whose
+                  columns are already in feature_cols order
+            chunk_size: Rows per chunk (default: config["predict_chunk_size"])
+            
+        Returns:
+            int8/int16 regime array aligned with the input rows (-1 = noise)
+        """
+        if self.best_model is None or self.feature_cols is None:
+            raise ValueError("No fitted model (run detect_regimes or load_model first)")
+        
+        if isinstance(data, pd.DataFrame):
+            missing = [c for c in self.feature_cols if c not in data.columns]
+            if missing:
+                raise ValueError(f"Missing feature columns for regime prediction: {missing}")
+        
+        if HDBSCAN_AVAILABLE and isinstance(self.best_model, hdbscan.HDBSCAN) \
+                and getattr(self.best_model, "prediction_data_", None) is None:
+            self.best_model.generate_prediction_data()
+        
+        if chunk_size is None:
+            chunk_size = self.config.get("predict_chunk_size", 500_000)
+        
+        return predict_in_chunks(self._predict_chunk, data, chunk_size,
+                                 dtype=regime_dtype(self.best_n_clusters or 0))
+    
+    def predict_parquet(self, path: Union[str, Path], batch_size: int = None) -> np.ndarray:
+        """
+        Assign regimes to the rows of a Parquet file, streaming record batches
         
-        # Key features for characterization
+        Only feature_cols are read, one batch at a time.
+        
+        Args:
+            path: Parquet file with feature_cols
+            batch_size: Rows per batch (default: config["predict_chunk_size"])
+            
+        Returns:
+            int8/int16 regime array, one entry per row
+        """
+        import pyarrow.parquet as pq
+        
+        if self.best_model is None or self.feature_cols is None:
+            raise ValueError("No fitted model (run detect_regimes or load_model first)")
+        if batch_size is None:
+            batch_size = self.config.get("predict_chunk_size", 500_000)
+        
+        parquet_file = pq.ParquetFile(path)
+        labels = np.empty(parquet_file.metadata.num_rows, dtype=regime_dtype(self.best_n_clusters or 0))
+        
+        start = 0
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=self.feature_cols):
+            chunk = batch.to_pandas()
+            labels[start:start + len(chunk)] = self.predict(chunk, chunk_size=len(chunk) or 1)
+            start += len(chunk)
+        
+        return labels
+    
+    def _key_features(self, feature_cols: List[str]) -> List[str]:
+        """
+        Features used to characterize and name regimes
+        
+        Args:
+            feature_cols: Candidate features (see _select_features)
+            
+        Returns:
+            List of key feature names
+        """
         key_features = []
-        seen_patterns = set()
         
         for pattern in ["volatility", "atr", "std", "trend", "momentum", "volume", "entropy", "rsi"]:
             # Find the first column that matches this pattern
             for col in feature_cols:
                 if pattern in col.lower() and col not in key_features:
                     key_features.append(col)
-                    seen_patterns.add(pattern)
                     break
         
         if not key_features:
             key_features = feature_cols[:5]
         
+        return key_features
+    
+    def analysis_columns(self, df: pd.DataFrame) -> List[str]:
+        """
+        Feature columns of df that analyze_regimes reads
+        
+        analyze_regimes on just these plus 'regime' gives the same result
+        as on every feature_col, without copying the full feature frame.
+        
+        Args:
+            df: DataFrame containing feature_cols
+            
+        Returns:
+            Key feature names, in _select_features order
+        """
+        if self.feature_cols is None:
+            raise ValueError("No fitted model (run detect_regimes or load_model first)")
+        
+        # Feature selection only looks at names and dtypes, so no rows are needed
+        selected = self._select_features(df.iloc[:0][self.feature_cols])
+        key_features = set(self._key_features(selected))
+        return [col for col in selected if col in key_features]
+    
+    def characterize_regimes(self, df: pd.DataFrame,
+                            feature_cols: List[str] = None) -> Dict:
+        """
+        Characterize each regime by analyzing feature distributions
+        
+        Args:
+            df: DataFrame with 'regime' column
+            feature_cols: Features to use for characterization
+            
+        Returns:
+            Dictionary with regime characteristics
+        """
+        if "regime" not in df.columns:
+            raise ValueError("DataFrame must have 'regime' column")
+        
+        if feature_cols is None:
+            feature_cols = self._select_features(df)
+        
+        key_features = self._key_features(feature_cols)
+        
         # Calculate global percentiles for each key feature
         global_percentiles = {}
         for feature in key_features:
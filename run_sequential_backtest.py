@@ -533,7 +533,7 @@ def create_mock_dataframe_fallback(universe_data: Dict, interval: int = 5, lookb
 
 
 def backtest_universe(universe_data: Dict, strategies: List, parquet_path: Path = None, 
-                      verbose: bool = False) -> Tuple[List[BacktestResults], Dict]:
+                      verbose: bool = False, n_workers: int = 1) -> Tuple[List[BacktestResults], Dict]:
     """
     Backtest all strategies for a universe
     
@@ -542,6 +542,8 @@ def backtest_universe(universe_data: Dict, strategies: List, parquet_path: Path
         strategies: List of Strategy objects
         parquet_path: Path to parquet file (default: from config)
         verbose: Whether to print detailed output
+        n_workers: Worker processes; above 1 the bars are shared with a
+            process pool and only metrics come back (no trade lists)
         
     Returns:
         Tuple of (list of BacktestResults, stats dict)
@@ -572,19 +574,20 @@ def backtest_universe(universe_data: Dict, strategies: List, parquet_path: Path
     results = []
     failed = 0
     
-    for i, strategy in enumerate(strategies):
-        try:
-            if verbose and i % 10 == 0:
-                print(f"      Backtesting strategy {i+1}/{len(strategies)}...", flush=True)
-            
-            result = backtester.backtest(strategy, df, initial_capital=INITIAL_CAPITAL)
-            results.append(result)
-            
-        except Exception as e:
+    outcomes = backtester.iter_strategy_results(
+        strategies, df, n_workers=n_workers, initial_capital=INITIAL_CAPITAL
+    )
+    for i, (name, result, error) in enumerate(outcomes):
+        if verbose and i % 10 == 0:
+            print(f"      Backtested strategy {i+1}/{len(strategies)}...", flush=True)
+        
+        if error is not None:
             if verbose:
-                print(f"      ⚠️  Strategy {strategy.name} failed: {e}", flush=True)
+                print(f"      ⚠️  Strategy {name} failed: {error}", flush=True)
             failed += 1
             continue
+        
+        results.append(result)
     
     stats = {
         "total_strategies": len(strategies),
@@ -672,7 +675,7 @@ def save_universe_backtest_results(universe_data: Dict, results: List[BacktestRe
         smart_storage.save_universe_results(
             universe_name=universe_name,
             results=results_dicts,
-            top_n=50  # Save detailed trades for top 50 strategies
+            top_n=STORAGE_CONFIG.get("detailed_trades_top_n", 50)
         )
     
     return output_file
@@ -816,13 +819,17 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Initialize smart storage
-    smart_storage = SmartBacktestStorage(output_dir=str(output_dir))
+    smart_storage = SmartBacktestStorage(
+        output_dir=str(output_dir),
+        metrics_backend=STORAGE_CONFIG.get("metrics_backend", "json"),
+        trades_backend=STORAGE_CONFIG.get("trades_backend", "json")
+    )
     
     print(f"\n💾 Output directory: {output_dir}", flush=True)
     print(f"⚙️  CPU threshold: {args.cpu_threshold}%", flush=True)
     print(f"❄️  Cooling duration: {args.cooling_duration}s", flush=True)
     print(f"📊 Max strategies per universe: {args.max_strategies}", flush=True)
-    print(f"🗄️  Smart storage enabled: Metrics + Top 50 trades per universe", flush=True)
+    print(f"🗄️  Smart storage enabled: Metrics + Top {STORAGE_CONFIG.get('detailed_trades_top_n', 50)} trades per universe", flush=True)
     
     # NEW: Display multi-worker settings
     if args.workers > 1:
@@ -831,7 +838,7 @@ def main():
         print(f"   CPU Limit: {args.cpu_limit}%", flush=True)
         print(f"   Cooldown: {args.cooldown}s", flush=True)
         print(f"   Nice Priority: {'Yes' if args.nice else 'No'}", flush=True)
-        print(f"   ⚠️  Note: Parallel execution framework prepared but currently sequential", flush=True)
+        print(f"   Strategies of each universe are backtested in parallel", flush=True)
     else:
         print(f"\n📌 Sequential Mode (1 worker)", flush=True)
     
@@ -867,7 +874,9 @@ def main():
             # Backtest
             print(f"   📊 Backtesting... (CPU: {cpu_str})", flush=True)
             backtest_start = time.time()
-            results, backtest_stats = backtest_universe(universe_data, strategies, PARQUET_FILE, args.verbose)
+            results, backtest_stats = backtest_universe(
+                universe_data, strategies, PARQUET_FILE, args.verbose, n_workers=args.workers
+            )
             backtest_time = time.time() - backtest_start
             
             # Find best strategy for this universe
@@ -49,6 +49,13 @@ V3_OPTIMAL_LOOKBACK = 5  # MeanReverterV3 proven optimal lookback period
 class Strategy:
     """Base class for trading strategies"""
     
+    # Params that only affect trade execution, never generate_signals output
+    EXECUTION_PARAMS = ("stop_loss_pips", "take_profit_pips")
+    
+    # Params that affect generate_signals output. None means every param
+    # except EXECUTION_PARAMS; templates can narrow this to share signals.
+    SIGNAL_PARAMS = None
+    
     def __init__(self, name: str, params: Dict):
         """
         Initialize strategy
@@ -65,6 +72,17 @@ class Strategy:
         """Add a trading rule"""
         self.rules.append(rule)
     
+    def signal_params(self) -> Dict:
+        """
+        Params that determine generate_signals output
+        
+        Strategies with equal signal params produce identical signals on the
+        same data, so their signal series can be shared (see SignalCache).
+        """
+        if self.SIGNAL_PARAMS is not None:
+            return {k: self.params[k] for k in self.SIGNAL_PARAMS if k in self.params}
+        return {k: v for k, v in self.params.items() if k not in self.EXECUTION_PARAMS}
+    
     @staticmethod
     def extract_date_from_index(index_value):
         """
@@ -401,6 +419,11 @@ class MeanReverterV3(Strategy):
     # Class constant: Optimal lookback period proven in backtesting
     OPTIMAL_LOOKBACK = 5
     
+    # lookback_periods is ignored (fixed at OPTIMAL_LOOKBACK)
+    SIGNAL_PARAMS = ("threshold_std", "adaptive_threshold", "volatility_lookback",
+                     "require_confirmation", "confirmation_periods",
+                     "use_session_filter", "active_hours", "max_trades_per_day")
+    
     def __init__(self, params: Dict):
         super().__init__("MeanReverterV3", params)
         
@@ -512,6 +535,10 @@ class MomentumBurst(Strategy):
     this version uses a simple loop that ALWAYS enforces limits.
     """
     
+    # The factory's "cooldown" variation is not read here (cooldown_minutes is)
+    SIGNAL_PARAMS = ("lookback_periods", "threshold_std", "threshold",
+                     "volume_multiplier", "max_trades_per_day", "cooldown_minutes")
+    
     def __init__(self, params: Dict):
         super().__init__("MomentumBurst", params)
         self.lookback = params.get("lookback_periods", 15)
@@ -10,6 +10,13 @@ EPSILON = 1e-10  # Small value to prevent division by zero
 class Strategy:
     """Base class for trading strategies"""
     
+    # Params that only affect trade execution, never generate_signals output
+    EXECUTION_PARAMS = ("stop_loss_pips", "take_profit_pips")
+    
+    # Params that affect generate_signals output. None means every param
+    # except EXECUTION_PARAMS; templates can narrow this to share signals.
+    SIGNAL_PARAMS = None
+    
     def __init__(self, name: str, params: Dict):
         """
         Initialize strategy
@@ -26,6 +33,17 @@ class Strategy:
         """Add a trading rule"""
         self.rules.append(rule)
     
+    def signal_params(self) -> Dict:
+        """
+        Params that determine generate_signals output
+        
+        Strategies with equal signal params produce identical signals on the
+        same data, so their signal series can be shared (see SignalCache).
+        """
+        if self.SIGNAL_PARAMS is not None:
+            return {k: self.params[k] for k in self.SIGNAL_PARAMS if k in self.params}
+        return {k: v for k, v in self.params.items() if k not in self.EXECUTION_PARAMS}
+    
     @staticmethod
     def extract_date_from_index(index_value):
         """
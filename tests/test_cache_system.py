@@ -28,6 +28,8 @@ from labeler import (
     clear_label_cache,
     label_dataframe
 )
+from utils.caching import SignalCache, dataframe_fingerprint
+from strategy_templates.base import Strategy
 
 
 @pytest.fixture
@@ -278,5 +280,102 @@ class TestUniverseCache:
             universe_file.unlink()
 
 
+class CountingStrategy(Strategy):
+    """Strategy that counts generate_signals calls"""
+    
+    calls = 0
+    
+    def __init__(self, params):
+        super().__init__("Counting", params)
+    
+    def generate_signals(self, df):
+        CountingStrategy.calls += 1
+        signals = pd.Series(0, index=df.index)
+        signals.iloc[::self.params["lookback"]] = 1
+        return signals
+
+
+class TestSignalCache:
+    """Test shared signal cache across strategy variants"""
+    
+    def test_fingerprint_detects_changes(self, mock_dataframe):
+        """Fingerprint should be stable and change with the data"""
+        fp1 = dataframe_fingerprint(mock_dataframe)
+        assert fp1 == dataframe_fingerprint(mock_dataframe.copy())
+        
+        modified = mock_dataframe.copy()
+        modified.loc[0, 'mid_price'] += 0.01
+        assert fp1 != dataframe_fingerprint(modified)
+    
+    def test_execution_params_share_signals(self, mock_dataframe):
+        """Strategies differing only in SL/TP should generate signals once"""
+        CountingStrategy.calls = 0
+        cache = SignalCache(max_mb=16)
+        
+        a = CountingStrategy({"lookback": 5, "stop_loss_pips": 10, "take_profit_pips": 20})
+        b = CountingStrategy({"lookback": 5, "stop_loss_pips": 30, "take_profit_pips": 60})
+        c = CountingStrategy({"lookback": 7, "stop_loss_pips": 10, "take_profit_pips": 20})
+        
+        signals_a = cache.get_signals(a, mock_dataframe)
+        signals_b = cache.get_signals(b, mock_dataframe)
+        cache.get_signals(c, mock_dataframe)
+        
+        assert CountingStrategy.calls == 2
+        assert cache.hits == 1
+        assert (signals_a.values == signals_b.values).all()
+    
+    def test_lru_eviction_respects_budget(self, mock_dataframe):
+        """Cache should evict least recently used entries beyond max_mb"""
+        n = len(mock_dataframe)
+        cache = SignalCache(max_mb=(2.5 * n) / (1024 * 1024))
+        
+        for lookback in (2, 3, 4):
+            cache.get_signals(CountingStrategy({"lookback": lookback}), mock_dataframe)
+        
+        assert len(cache) == 2
+        assert cache.current_bytes <= cache.max_bytes
+
+    def test_fingerprint_hashes_every_row(self):
+        """A change in any single row changes the fingerprint"""
+        df = pd.DataFrame({'mid_price': np.linspace(1.1, 1.2, 50_000)})
+        fp = dataframe_fingerprint(df)
+        
+        df.loc[1, 'mid_price'] += 0.01
+        assert dataframe_fingerprint(df) != fp
+    
+    def test_backtester_sees_in_place_edits(self, mock_dataframe):
+        """backtest() on an edited df does not reuse the old cached signals"""
+        from backtester import Backtester
+        
+        class ThresholdStrategy(Strategy):
+            def generate_signals(self, df):
+                return pd.Series((df['mid_price'] > 1.1).astype(int), index=df.index)
+        
+        backtester = Backtester()
+        strategy = ThresholdStrategy("Threshold", {"stop_loss_pips": 10, "take_profit_pips": 20})
+        backtester.backtest(strategy, mock_dataframe)
+        
+        mock_dataframe['mid_price'] = 1.0
+        signals = backtester._generate_signals(strategy, mock_dataframe)
+        assert (signals == 0).all()
+
+    def test_standalone_backtest_skips_fingerprint(self, mock_dataframe, monkeypatch):
+        """Only pinned batches hash the df; single backtest() calls do not"""
+        import backtester as backtester_module
+        from backtester import Backtester
+
+        def fail(df):
+            raise AssertionError("fingerprint computed for a standalone backtest")
+
+        monkeypatch.setattr(backtester_module, "dataframe_fingerprint", fail)
+        CountingStrategy.calls = 0
+        backtester = Backtester()
+        strategy = CountingStrategy({"lookback": 5, "stop_loss_pips": 10, "take_profit_pips": 20})
+
+        backtester.backtest(strategy, mock_dataframe)
+        backtester.backtest(strategy, mock_dataframe)
+        assert CountingStrategy.calls == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - CRYSTALLIZATION TESTS 💎🌟⚡
+
+Tests for streaming CSV → Parquet conversion
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from data_loader import crystallize_csv_to_parquet
+
+
+@pytest.fixture
+def exness_csv(tmp_path):
+    """Write a small CSV in the Exness tick format"""
+    n = 2500
+    np.random.seed(7)
+    timestamps = pd.date_range('2025-01-01', periods=n, freq='137ms', tz='UTC')
+    mid = 1.10 + np.cumsum(np.random.randn(n) * 0.00001)
+    df = pd.DataFrame({
+        'Exness': 'exness',
+        'Symbol': 'EURUSDm',
+        'Timestamp': timestamps.strftime('%Y-%m-%d %H:%M:%S.%fZ'),
+        'Bid': mid - 0.00005,
+        'Ask': mid + 0.00005,
+    })
+    path = tmp_path / "ticks.csv"
+    df.to_csv(path, index=False)
+    return path, df, timestamps
+
+
+class TestStreamingCrystallization:
+    """Test chunked CSV → Parquet conversion"""
+
+    @pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+    def test_matches_full_conversion(self, exness_csv, tmp_path, engine):
+        """Chunked output should match converting the whole CSV at once"""
+        csv_path, source, timestamps = exness_csv
+        out_path = tmp_path / f"ticks_{engine}.parquet"
+
+        crystallize_csv_to_parquet(csv_path, out_path, force=True, engine=engine, chunk_size=400)
+        df = pd.read_parquet(out_path)
+
+        assert list(df.columns) == ["timestamp", "bid", "ask", "mid_price", "spread_pips", "pips_change"]
+        assert len(df) == len(source)
+        assert str(df['timestamp'].dtype) == 'datetime64[ns, UTC]'
+        np.testing.assert_array_equal(df['timestamp'].values, timestamps.values)
+
+        # pips_change must continue across chunk boundaries
+        mid = (source['Bid'].values + source['Ask'].values) / 2
+        assert np.isnan(df['pips_change'].iloc[0])
+        np.testing.assert_allclose(df['pips_change'].values[1:], np.diff(mid) * 10000, atol=1e-4)
+        assert df['spread_pips'].dtype == np.float32
+
+    def test_one_row_group_per_chunk(self, exness_csv, tmp_path):
+        """Each pandas chunk is written as its own row group"""
+        csv_path, _, _ = exness_csv
+        out_path = tmp_path / "ticks.parquet"
+
+        crystallize_csv_to_parquet(csv_path, out_path, force=True, engine="pandas", chunk_size=500)
+
+        assert pq.ParquetFile(out_path).num_row_groups == 5
+        assert not (tmp_path / "ticks.parquet.tmp").exists()
+
+    def test_unsorted_source_is_sorted(self, exness_csv, tmp_path):
+        """Out-of-order CSVs still produce a chronological crystal"""
+        csv_path, source, timestamps = exness_csv
+        shuffled_path = tmp_path / "shuffled.csv"
+        source.sample(frac=1, random_state=0).to_csv(shuffled_path, index=False)
+        out_path = tmp_path / "shuffled.parquet"
+
+        crystallize_csv_to_parquet(shuffled_path, out_path, force=True, engine="pandas",
+                                   chunk_size=400, price_dtype="float32")
+        df = pd.read_parquet(out_path)
+
+        assert df['timestamp'].is_monotonic_increasing
+        np.testing.assert_array_equal(df['timestamp'].values, timestamps.values)
+        assert df['bid'].dtype == np.float32
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
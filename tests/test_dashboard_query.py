@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 NECROZMA DASHBOARD - QUERY LAYER TESTS 💎🌟⚡
+
+Tests for pushdown queries and cached aggregates (dashboard.utils.query)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("streamlit")
+
+from core.storage import MetricsStore
+from dashboard.utils import query
+from dashboard.components.metrics import (
+    calculate_summary_metrics, calculate_template_performance, calculate_lot_size_impact
+)
+
+TEMPLATES = ["TrendFollower", "MeanReverter", "BreakoutTrader"]
+
+
+def make_universe(n, seed):
+    """Metric rows of one universe"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "strategy_name": [f"{TEMPLATES[i % 3]}_L{i}_T{seed}" for i in range(n)],
+        "lot_size": rng.choice([0.01, 0.1, 1.0], n),
+        "sharpe_ratio": rng.normal(0, 1, n),
+        "total_return": rng.normal(0, 0.1, n),
+        "win_rate": rng.uniform(0.3, 0.7, n),
+        "max_drawdown": -rng.uniform(0, 0.3, n),
+        "profit_factor": rng.uniform(0.5, 2.0, n),
+        "n_trades": rng.integers(0, 200, n),
+    })
+    df.loc[::40, "sharpe_ratio"] = np.nan
+    return df
+
+
+@pytest.fixture
+def metrics_results(tmp_path):
+    """Results directory with a metrics store, plus the same rows in memory"""
+    store = MetricsStore(tmp_path / "metrics")
+    frames = []
+    for u in range(3):
+        df = make_universe(1500, u)
+        store.write(f"universe_{u:03d}", df.to_dict("records"))
+        frames.append(df.assign(universe=f"universe_{u:03d}"))
+    full = pd.concat(frames, ignore_index=True)
+    full["template"] = full["strategy_name"].str.split("_").str[0]
+    return str(tmp_path), full
+
+
+FILTERS = {
+    "universe": ["universe_000", "universe_002"],
+    "template": ["TrendFollower", "BreakoutTrader"],
+    "lot_size": [0.1, 1.0],
+    "min_trades": 50,
+    "sharpe_ratio": (-0.5, None),
+}
+
+
+def apply_in_pandas(df, filters):
+    mask = (
+        df["universe"].isin(filters["universe"])
+        & df["template"].isin(filters["template"])
+        & df["lot_size"].isin(filters["lot_size"])
+        & (df["n_trades"] >= filters["min_trades"])
+        & (df["sharpe_ratio"] >= filters["sharpe_ratio"][0])
+    )
+    return df[mask]
+
+
+def test_top_n_matches_pandas(metrics_results):
+    results_dir, full = metrics_results
+    expected = apply_in_pandas(full, FILTERS).nlargest(40, "sharpe_ratio")
+
+    top = query.query_strategies(FILTERS, top_n=40, results_dir=results_dir)
+
+    np.testing.assert_allclose(top["sharpe_ratio"], expected["sharpe_ratio"])
+    assert list(top["strategy_name"]) == list(expected["strategy_name"])
+    assert set(top["template"]) <= set(FILTERS["template"])
+
+
+def test_aggregates_match_pandas_helpers(metrics_results):
+    results_dir, full = metrics_results
+    selected = apply_in_pandas(full, FILTERS)
+
+    summary = query.summary_metrics(FILTERS, results_dir=results_dir)
+    expected = calculate_summary_metrics(selected)
+    for key, value in expected.items():
+        assert summary[key] == pytest.approx(float(value)), key
+
+    pd.testing.assert_frame_equal(
+        query.template_performance(results_dir=results_dir).reset_index(drop=True),
+        calculate_template_performance(full.drop(columns="template")).reset_index(drop=True),
+        check_dtype=False, atol=1e-3
+    )
+    pd.testing.assert_frame_equal(
+        query.lot_size_impact(results_dir=results_dir),
+        calculate_lot_size_impact(full),
+        check_dtype=False, atol=1e-3
+    )
+
+
+def test_filter_options_and_histogram(metrics_results):
+    results_dir, full = metrics_results
+
+    options = query.filter_options(results_dir)
+    assert options["total_strategies"] == len(full)
+    assert options["universe"] == ["universe_000", "universe_001", "universe_002"]
+    assert sorted(options["template"]) == sorted(TEMPLATES)
+    assert options["lot_size"] == [0.01, 0.1, 1.0]
+    assert options["n_trades"] == (full["n_trades"].min(), full["n_trades"].max())
+
+    histogram = query.metric_histogram("win_rate", bins=10, filters=FILTERS, scale=100, results_dir=results_dir)
+    selected = apply_in_pandas(full, FILTERS)
+    assert histogram["counts"].sum() == len(selected)
+    assert histogram["mean"] == pytest.approx(selected["win_rate"].mean() * 100)
+
+
+def test_drawdown_histogram_matches_legacy_sign(tmp_path):
+    """Query-path drawdown bins cover the same positive % range as the in-memory chart"""
+    store = MetricsStore(tmp_path / "metrics")
+    df = make_universe(500, 0)
+    # Backtester reports drawdowns as positive fractions
+    df["max_drawdown"] = df["max_drawdown"].abs()
+    store.write("universe_000", df.to_dict("records"))
+
+    histogram = query.metric_histogram(
+        "max_drawdown", bins=10, scale=query.HISTOGRAM_SCALES["max_drawdown"], results_dir=str(tmp_path)
+    )
+
+    # Legacy path of the Overview page
+    legacy = df["max_drawdown"].dropna().abs()
+    if legacy.max() <= 1:
+        legacy = legacy * 100
+
+    assert histogram["edges"][0] >= 0
+    assert histogram["edges"][0] == pytest.approx(legacy.min())
+    assert histogram["edges"][-1] == pytest.approx(legacy.max())
+    assert histogram["mean"] == pytest.approx(legacy.mean())
+
+
+def test_cache_follows_file_fingerprint(metrics_results):
+    """Aggregates refresh when a results file is added, without clearing the cache"""
+    results_dir, full = metrics_results
+    before = query.aggregate_strategies((), ("sharpe_ratio",), results_dir=results_dir)
+
+    MetricsStore(Path(results_dir) / "metrics").write("universe_003", make_universe(100, 9).to_dict("records"))
+    after = query.aggregate_strategies((), ("sharpe_ratio",), results_dir=results_dir)
+
+    assert before["count"].iloc[0] == len(full)
+    assert after["count"].iloc[0] == len(full) + 100
+
+
+def test_universe_backtest_files_source(tmp_path):
+    """Per-universe backtest parquet files get the universe from the file name"""
+    for u in range(3):
+        make_universe(200, u).to_parquet(tmp_path / f"universe_{u:03d}_5min_5lb_backtest.parquet")
+
+    top = query.query_strategies({"universe": ["universe_001_5min_5lb"]}, top_n=5, results_dir=str(tmp_path))
+    by_universe = query.aggregate_strategies(("universe",), ("sharpe_ratio",), results_dir=str(tmp_path))
+
+    assert set(top["universe"]) == {"universe_001_5min_5lb"}
+    np.testing.assert_allclose(top["sharpe_ratio"], make_universe(200, 1)["sharpe_ratio"].nlargest(5))
+    assert by_universe["count"].tolist() == [200, 200, 200]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
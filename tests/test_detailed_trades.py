@@ -270,6 +270,30 @@ def test_multiple_strategies():
     print(f"✅ Multiple strategies: Strategy1={n_trades1} trades, Strategy2={n_trades2} trades")
 
 
+def test_batch_context_matches_per_trade():
+    """Test that the batch trade table matches per-trade context extraction"""
+    df = create_test_dataframe(n_samples=1000, with_datetime=True)
+    df['pips_change'] = df['close'].diff() * 10000
+    signals = pd.Series(np.random.RandomState(0).choice([-1, 0, 0, 1], len(df)), index=df.index)
+    backtester = Backtester()
+    backtester.df = df
+    trades = backtester.simulate_trades(signals, df['mid_price'], 3, 5)
+    
+    table = backtester.detailed_trades_table(trades)
+    records = backtester._detailed_trade_records(table)
+    
+    assert len(table) == len(trades) > 0
+    assert 'exit_volatility' in table.columns
+    for record, entry_idx, exit_idx in zip(records, trades['entry_idx'], trades['exit_idx']):
+        expected = backtester._get_market_context(int(entry_idx))
+        context = record['market_context']
+        for key in ('volatility', 'trend_strength', 'volume_relative', 'spread_pips'):
+            np.testing.assert_allclose(context[key], expected[key], equal_nan=True)
+        for key in ('pattern_detected', 'pattern_sequence', 'hour_of_day', 'day_of_week'):
+            assert context[key] == expected[key]
+        assert record['price_history'] == backtester._get_price_history(int(entry_idx), int(exit_idx))
+
+
 # ═══════════════════════════════════════════════════════════════
 # 🎯 MAIN
 # ═══════════════════════════════════════════════════════════════
@@ -289,5 +313,6 @@ if __name__ == "__main__":
     test_to_dict_includes_detailed_trades()
     test_exit_reasons()
     test_multiple_strategies()
+    test_batch_context_matches_per_trade()
     
     print("\n✅ All tests passed!")
@@ -21,8 +21,10 @@ from edge_analyzer import (
     analyze_regime_label_performance,
     filter_edge_candidates,
     validate_out_of_sample,
+    regime_outcome_counts,
     EDGE_CONFIG
 )
+from label_store import write_labels, outcome_codes
 
 
 class TestStatisticalFunctions:
@@ -178,6 +180,49 @@ class TestEdgeAnalysis:
             assert (validated['oos_win_rate'] >= 0).all(), "OOS win rate should be >= 0"
             assert (validated['oos_win_rate'] <= 1).all(), "OOS win rate should be <= 1"
 
+    
+    def test_compact_label_files_match_legacy(self, sample_labels, sample_regimes, tmp_path):
+        """Compact int8 label files give the same stats as legacy string outcomes"""
+        pytest.importorskip("pyarrow")
+        legacy = sample_labels['T10_S5_H30'].drop(columns=['timestamp'])
+        compact = pd.DataFrame({col: outcome_codes(legacy[col].to_numpy()) for col in legacy.columns})
+        
+        path = tmp_path / "T10_S5_H30.parquet"
+        write_labels(path, compact, {"target_pip": 10.0, "stop_pip": 5.0, "horizon_minutes": 30})
+        assert pd.read_parquet(path)['up_outcome'].dtype == np.int8
+        
+        config = {'min_trades': 10}
+        expected = analyze_regime_label_performance({'T10_S5_H30': legacy}, sample_regimes, config)
+        from_file = analyze_regime_label_performance({'T10_S5_H30': path}, sample_regimes, config)
+        
+        cols = ['regime', 'direction', 'n_trades', 'wins', 'losses', 'win_rate', 'p_value']
+        pd.testing.assert_frame_equal(from_file[cols], expected[cols])
+
+    
+    def test_grouped_counts_match_per_regime_filter(self, sample_labels, sample_regimes):
+        """One bincount pass gives the same counts as filtering each regime"""
+        outcomes = outcome_codes(sample_labels['T10_S5_H30']['up_outcome'].to_numpy())
+        regimes = sample_regimes['regime'].to_numpy()
+        
+        rows, wins, losses = regime_outcome_counts(regimes, outcomes, 3)
+        
+        for regime_id in range(3):
+            mask = regimes == regime_id
+            assert rows[regime_id] == mask.sum()
+            assert wins[regime_id] == (outcomes[mask] == 1).sum()
+            assert losses[regime_id] == (outcomes[mask] == -1).sum()
+    
+    def test_parallel_workers_match_sequential(self, sample_labels, sample_regimes):
+        """Configs analyzed in worker processes give identical results"""
+        labels = dict(sample_labels)
+        labels['T20_S10_H60'] = sample_labels['T10_S5_H30'].iloc[::-1].reset_index(drop=True)
+        config = {'min_trades': 10}
+        
+        sequential = analyze_regime_label_performance(labels, sample_regimes, config)
+        parallel = analyze_regime_label_performance(labels, sample_regimes, config, n_workers=2)
+        
+        pd.testing.assert_frame_equal(parallel, sequential)
+
 
 class TestConfigParsing:
     """Test configuration parsing"""
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - FEATURE TABLE TESTS 💎🌟⚡
+
+Tests for the columnar per-target feature storage (feature_table) and its
+use in analyzer.process_universe
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from feature_table import (
+    build_feature_table, calculate_feature_stats, grouped_feature_stats,
+    grouped_pattern_counts, feature_columns, SignatureCodec
+)
+from feature_extractor import extract_features_from_universe
+from analyzer import create_pattern_signature
+
+
+@pytest.fixture
+def table():
+    """Six targets in two groups, one feature missing for some windows"""
+    records = [
+        {"a": 1.0, "b": 10.0, "hurst": 0.7},
+        {"a": 2.0, "hurst": 0.3},
+        {"a": 3.0, "b": 30.0, "hurst": 0.7},
+        {"a": -1.0, "b": 5.0},
+        {"a": -2.0, "b": 6.0},
+        {"a": -3.0},
+    ]
+    return build_feature_table(
+        records,
+        levels=["Small"] * 3 + ["Large"] * 3,
+        directions=["up"] * 3 + ["down"] * 3,
+        target_indices=range(6),
+    )
+
+
+def test_table_layout_and_stats(table):
+    """Category meta columns, float features, NaN-aware statistics"""
+    assert feature_columns(table) == ["a", "b", "hurst"]
+    assert table["signature"].dtype == "category"
+    assert table["a"].dtype == np.float64
+
+    stats = grouped_feature_stats(table)
+    small = stats[("Small", "up")]
+    assert small["a_mean"] == pytest.approx(2.0)
+    assert small["b_mean"] == pytest.approx(20.0)
+    assert small["b_std"] == pytest.approx(10.0)
+    assert small["b_min"] == 10.0 and small["b_max"] == 30.0
+
+    # Same statistics from the equivalent feature dicts
+    dicts = [{"a": 1.0, "b": 10.0, "hurst": 0.7}, {"a": 2.0, "hurst": 0.3}, {"a": 3.0, "b": 30.0, "hurst": 0.7}]
+    assert calculate_feature_stats(dicts) == pytest.approx(small)
+    assert calculate_feature_stats([]) == {}
+
+    counts = grouped_pattern_counts(table)
+    assert counts[("Small", "up")] == {"hur:VH": 2, "hur:H": 1}
+    assert counts[("Large", "down")] == {"UNKNOWN": 3}
+
+
+def test_signature_codes_match_create_pattern_signature():
+    """Vectorized codes decode to the per-dict signatures; quantile bins"""
+    rng = np.random.default_rng(0)
+    keys = ["dfa_alpha", "hurst", "d1_mean", "stat_trend_slope", "ohlc_up_ratio"]
+    values = rng.choice([-0.5, -0.1, 0.1, 0.5], size=(500, 5)) + rng.normal(0, 0.3, (500, 5))
+    records = [
+        {key: value for key, value in zip(keys, row) if value > -0.9}
+        for row in values
+    ]
+    table = build_feature_table(records, ["L"] * 500, ["up"] * 500, range(500))
+
+    codec = SignatureCodec()
+    codes = codec.encode(table)
+    assert codes.dtype == np.int64
+    assert [codec.decode(code) for code in codes] == [create_pattern_signature(r) for r in records]
+    assert list(table["signature"]) == [create_pattern_signature(r) for r in records]
+    assert codec.decode(0) == "UNKNOWN"
+
+    quantile = SignatureCodec.from_quantiles(table, keys[:1], n_bins=4)
+    bins = pd.Series([quantile.decode(code) for code in quantile.encode(table)])
+    present = table["dfa_alpha"].notna()
+    assert bins[present].value_counts().to_dict() == pytest.approx(
+        {f"dfa:Q{i}": present.sum() / 4 for i in range(1, 5)}, abs=1)
+
+
+def test_nan_feature_signature_matches_create_pattern_signature():
+    """A NaN key feature lands in the top bin (as create_pattern_signature), a missing one is skipped"""
+    records = [
+        {"dfa_alpha": np.nan, "hurst": 0.2},
+        {"hurst": 0.2},
+        {"dfa_alpha": 0.0, "hurst": np.nan},
+    ]
+    table = build_feature_table(records, ["L"] * 3, ["up"] * 3, range(3))
+
+    expected = [create_pattern_signature(r) for r in records]
+    assert expected[0] == "dfa:VH|hur:H"
+    assert expected[1] == "hur:H"
+    assert list(table["signature"]) == expected
+    assert table["signature_code"].nunique() == 3
+
+
+def test_extract_features_from_table(table):
+    """extract_features_from_universe reads the table like feature_stats results"""
+    from_table = extract_features_from_universe({"features": table})
+    from_stats = extract_features_from_universe({
+        "results": {
+            level: {direction: {"feature_stats": stats}}
+            for (level, direction), stats in grouped_feature_stats(table).items()
+        }
+    })
+    pd.testing.assert_frame_equal(from_table, from_stats)
+    assert from_table["a_mean"].iloc[0] == pytest.approx(0.0)
+
+
+def test_process_universe_returns_table():
+    """Universe results hold one table row per extracted target"""
+    from analyzer import process_universe
+
+    rng = np.random.default_rng(1)
+    n = 30000
+    prices = 1.1 + np.cumsum(rng.normal(0, 5e-5, n))
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-01", periods=n, freq="1s"),
+        "bid": prices - 0.00005,
+        "ask": prices + 0.00005,
+        "mid_price": prices,
+        "spread_pips": 1.0,
+        "pips_change": np.concatenate([[0], np.diff(prices) * 10000]),
+    })
+    result = process_universe(df, interval=1, lookback=10, universe_name="test_1m_10lb")
+
+    table = result["features"]
+    results = result["results"]
+    extracted = sum(results[l][d]["debug_stats"]["features_extracted"] for l in results for d in results[l])
+    assert len(table) == extracted > 0
+    assert "all_features" not in results[table["level"].iloc[0]][table["direction"].iloc[0]]
+    assert len(result["ohlc"]) == result["metadata"]["total_candles"]
+
+    for (level, direction), counts in grouped_pattern_counts(table).items():
+        patterns = results[level][direction]["patterns"]
+        assert {sig: data["count"] for sig, data in patterns.items()} == counts
+        assert results[level][direction]["feature_stats"]["stat_mean_mean"] == pytest.approx(
+            table.loc[(table["level"] == level) & (table["direction"] == direction), "stat_mean"].mean())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
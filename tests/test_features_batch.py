@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - BATCHED FEATURE EXTRACTION TESTS 💎🌟⚡
+
+Tests that features_core.extract_core_features_batch reproduces
+extract_core_features row by row
+"""
+
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from features_core import extract_core_features, extract_core_features_batch, window_view
+
+
+@pytest.mark.parametrize("lookback", [12, 40, 70])
+def test_batch_matches_per_window(lookback):
+    """Same columns in per-window key order; absent features are NaN"""
+    rng = np.random.default_rng(lookback)
+    closes = np.round(1.1 + np.cumsum(rng.normal(0, 3e-5, 1500)), 5)
+    closes[300:300 + lookback + 5] = 1.1  # constant windows
+    windows = window_view(closes, lookback)[::9]
+
+    table = extract_core_features_batch(windows)
+    assert len(table) == len(windows)
+
+    for i, window in enumerate(windows):
+        expected = extract_core_features(window)
+        assert [key for key in table.columns if key in expected] == list(expected)
+        for key in table.columns:
+            if key not in expected:
+                assert np.isnan(table[key].iloc[i]), key
+            else:
+                assert table[key].iloc[i] == pytest.approx(
+                    expected[key], rel=1e-7, abs=1e-10, nan_ok=True), (i, key)
+
+
+def test_window_view():
+    """All windows as a view, selected windows by end index"""
+    series = np.arange(10.0)
+    assert window_view(series, 4).shape == (7, 4)
+    assert np.array_equal(window_view(series, 4, ends=[4, 10]), [[0, 1, 2, 3], [6, 7, 8, 9]])
+
+    assert extract_core_features_batch(window_view(series, 5)).empty
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - SLIDING WINDOW FEATURE TESTS 💎🌟⚡
+
+Tests that the incremental engine (features_sliding) reproduces
+analyzer.extract_window_features window by window
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyzer import extract_window_features
+from data_loader import resample_to_ohlc
+from features_sliding import SlidingWindowFeatures, _sliding_moments, _sliding_ordinal_entropy
+from features_core import permutation_entropy, shannon_entropy, _histogram_entropy_rows
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import stats
+
+
+@pytest.fixture(scope="module")
+def ohlc():
+    """1-minute candles from quantized synthetic ticks (ties in pips)"""
+    rng = np.random.default_rng(3)
+    n = 30000
+    prices = np.round(1.1 + np.cumsum(rng.normal(0, 3e-5, n)), 5)
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-01", periods=n, freq="1s"),
+        "bid": prices - 0.00005,
+        "ask": prices + 0.00005,
+        "mid_price": prices,
+        "spread_pips": 1.0,
+        "pips_change": np.concatenate([[0], np.diff(prices) * 10000]),
+    })
+    return resample_to_ohlc(df, 1)
+
+
+def assert_same_features(expected, actual):
+    assert list(actual) == list(expected)
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, rel=1e-7, abs=1e-12, nan_ok=True), key
+
+
+@pytest.mark.parametrize("lookback", [5, 12, 31])
+def test_matches_extract_window_features(ohlc, lookback):
+    """Same keys in the same order, same values up to rounding"""
+    engine = SlidingWindowFeatures(ohlc, lookback)
+
+    for end in range(lookback, len(ohlc), 23):
+        expected = extract_window_features(ohlc.iloc[end - lookback:end].copy())
+        assert_same_features(expected, engine.features(end))
+
+
+@pytest.mark.parametrize("lookback", [12, 70])
+def test_prefetched_windows_match(ohlc, lookback):
+    """Batch-prefetched windows give the same features as per-window extraction"""
+    ends = list(range(lookback, len(ohlc), 41))
+    engine = SlidingWindowFeatures(ohlc, lookback)
+    engine.prefetch(ends)
+    assert len(engine._prefetched) == len(ends)
+
+    for end in ends:
+        expected = extract_window_features(ohlc.iloc[end - lookback:end].copy())
+        assert_same_features(expected, engine.features(end))
+    assert not engine._prefetched
+
+
+def test_sliding_kernels_match_direct_computation():
+    """Power-sum updates stay accurate over long series with drift"""
+    rng = np.random.default_rng(0)
+    x = 1.3 + np.cumsum(rng.normal(0, 1e-4, 5000))
+    pips = np.round(np.diff(x) * 10000, 1)
+    w = 40
+
+    moments = _sliding_moments(x, w)
+    ordinal = _sliding_ordinal_entropy(pips, w, 3)
+    histogram = _histogram_entropy_rows(sliding_window_view(pips, w))
+
+    for s in range(0, len(x) - w + 1, 97):
+        window = x[s:s + w]
+        assert moments[s, 0] == pytest.approx(window.mean(), rel=1e-14)
+        assert moments[s, 1] == pytest.approx(window.var(), rel=1e-8)
+        assert moments[s, 2] / moments[s, 1] ** 1.5 == pytest.approx(stats.skew(window), rel=1e-6, abs=1e-9)
+        assert moments[s, 4] / ((w * w - 1) / 12) == pytest.approx(
+            stats.linregress(np.arange(w), window).slope, rel=1e-8)
+        assert moments[s, 5] == pytest.approx(np.corrcoef(window[:-1], window[1:])[0, 1], rel=1e-8)
+
+    for s in range(0, len(pips) - w + 1, 97):
+        assert ordinal[s] == pytest.approx(permutation_entropy(pips[s:s + w]), rel=1e-12)
+        assert histogram[s] == pytest.approx(shannon_entropy(pips[s:s + w]), rel=1e-12)
+
+
+def test_windows_are_cached(ohlc):
+    """A window is extracted once, however many targets share it"""
+    engine = SlidingWindowFeatures(ohlc, 20)
+    first = engine.features(100)
+    assert engine.features(100) is first
+    assert len(engine._cache) == 1
+
+    with pytest.raises(IndexError):
+        engine.features(10)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
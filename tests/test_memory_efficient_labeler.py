@@ -24,6 +24,7 @@ from labeler import (
     load_all_label_results,
     _get_labels_dir
 )
+from label_store import label_metadata
 
 
 @pytest.fixture
@@ -112,22 +113,48 @@ class TestMemoryEfficientLabeling:
         # Check structure
         assert len(df) == len(small_dataframe) - 1, "Should have N-1 rows"
         
-        # Check expected columns exist
+        # Compact columns only: candle_idx is the row position
         expected_columns = [
-            'candle_idx', 'entry_price', 'target_pip', 'stop_pip', 'horizon_minutes',
-            'up_outcome', 'up_hit_target', 'up_hit_stop', 'up_time_to_target', 'up_time_to_stop',
-            'up_mfe', 'up_mae', 'up_r_multiple',
-            'down_outcome', 'down_hit_target', 'down_hit_stop', 'down_time_to_target', 'down_time_to_stop',
-            'down_mfe', 'down_mae', 'down_r_multiple'
+            'up_outcome', 'up_mfe', 'up_mae', 'up_time_to_target', 'up_time_to_stop',
+            'down_outcome', 'down_mfe', 'down_mae', 'down_time_to_target', 'down_time_to_stop'
         ]
-        
-        for col in expected_columns:
-            assert col in df.columns, f"Column {col} should exist"
+        assert list(df.columns) == expected_columns
         
         # Check data types
-        assert df['target_pip'].iloc[0] == 10
-        assert df['stop_pip'].iloc[0] == 5
-        assert df['horizon_minutes'].iloc[0] == 60
+        assert df['up_outcome'].dtype == np.int8
+        assert df['up_mfe'].dtype == np.float32
+        assert df['up_time_to_target'].dtype == np.float32
+        assert set(df['up_outcome'].unique()) <= {-1, 0, 1}
+        
+        # Config constants live in the file metadata
+        meta = label_metadata(saved_files[0])
+        assert meta['target_pip'] == 10
+        assert meta['stop_pip'] == 5
+        assert meta['horizon_minutes'] == 60
+        assert meta['n_candles'] == len(df)
+    
+    def test_expanded_labels_keep_legacy_layout(self, small_dataframe, temp_labels_dir):
+        """load_label_results expands compact files to the wide per-row layout"""
+        label_dataframe(
+            small_dataframe,
+            target_pips=[10],
+            stop_pips=[5],
+            horizons=[60],
+            use_cache=False,
+            return_dict=False
+        )
+        
+        df = load_label_results("T10_S5_H60")
+        compact = load_label_results("T10_S5_H60", compact=True)
+        
+        np.testing.assert_array_equal(df['candle_idx'].values, np.arange(len(compact)))
+        assert (df['target_pip'] == 10).all() and (df['horizon_minutes'] == 60).all()
+        
+        hit = compact['up_outcome'] == 1
+        assert (df.loc[hit, 'up_outcome'] == 'target').all()
+        assert (df.loc[hit, 'up_r_multiple'] == 2.0).all()
+        assert df['up_hit_stop'].sum() == (compact['up_outcome'] == -1).sum()
+        assert df.loc[~hit, 'up_time_to_target'].isna().all()
     
     def test_resume_support_skips_existing_files(self, small_dataframe, temp_labels_dir):
         """Test that labeling can resume and skip already processed configs"""
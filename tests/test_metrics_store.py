@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - METRICS STORE TESTS 💎🌟⚡
+
+Tests for the partitioned Parquet metrics store (core.storage.metrics_store)
+"""
+
+import pytest
+import json
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("pyarrow")
+
+from core.storage import MetricsStore, SmartBacktestStorage
+
+
+def make_rows(n, sharpe_offset=0.0, lot_sizes=(0.01, 0.1)):
+    """Metric dicts for n strategies at each lot size"""
+    return [
+        {
+            "strategy_name": f"Strategy_{i}",
+            "lot_size": lot_size,
+            "sharpe_ratio": i * 0.1 + sharpe_offset,
+            "n_trades": 10 + i,
+            "params": {"stop_loss_pips": 10, "take_profit_pips": 20},
+        }
+        for i in range(n)
+        for lot_size in lot_sizes
+    ]
+
+
+def part_files(store):
+    return sorted(store.root.glob("universe=*/part-*.parquet"))
+
+
+def test_new_universes_are_appended(tmp_path):
+    """Writing another universe adds a file and leaves existing ones untouched"""
+    store = MetricsStore(tmp_path / "metrics")
+    store.write("universe_001_5min_5lb", make_rows(5))
+    first_files = part_files(store)
+    first_mtime = first_files[0].stat().st_mtime_ns
+
+    store.write("universe_002_15min_5lb", make_rows(3))
+
+    files = part_files(store)
+    assert len(files) == 2
+    assert first_files[0] in files
+    assert first_files[0].stat().st_mtime_ns == first_mtime
+    assert store.count() == 16
+    assert store.universes() == ["universe_001_5min_5lb", "universe_002_15min_5lb"]
+
+
+def test_primary_key_upsert(tmp_path):
+    """Re-saving (strategy, universe, lot) replaces the row instead of duplicating it"""
+    store = MetricsStore(tmp_path / "metrics")
+    store.write("u1", make_rows(4))
+    store.write("u2", make_rows(4))
+
+    store.write("u1", make_rows(2, sharpe_offset=5.0, lot_sizes=(0.1,)) + make_rows(1, lot_sizes=(1.0,)))
+
+    df = store.load()
+    assert len(df) == 8 + 8 + 1
+    assert not df.duplicated(subset=["strategy_name", "universe", "lot_size"]).any()
+
+    u1 = df[df["universe"] == "u1"].set_index(["strategy_name", "lot_size"])
+    assert u1.loc[("Strategy_1", 0.1), "sharpe_ratio"] == pytest.approx(5.1)
+    assert u1.loc[("Strategy_1", 0.01), "sharpe_ratio"] == pytest.approx(0.1)
+    assert ("Strategy_0", 1.0) in u1.index
+    # Other universes keep their rows
+    assert df[df["universe"] == "u2"]["sharpe_ratio"].max() == pytest.approx(0.3)
+
+
+def test_load_pushes_down_filters_and_columns(tmp_path):
+    """Column selection, metric filters and universe pruning"""
+    store = MetricsStore(tmp_path / "metrics")
+    store.write("u1", make_rows(10))
+    store.write("u2", make_rows(10, sharpe_offset=1.0))
+
+    df = store.load(columns=["sharpe_ratio"], filters=[("sharpe_ratio", ">", 1.45)])
+    assert list(df.columns) == ["strategy_name", "universe", "lot_size", "sharpe_ratio"]
+    assert (df["sharpe_ratio"] > 1.45).all()
+    assert set(df["universe"]) == {"u2"}
+    assert len(df) == 10  # Strategy_5..9 of u2, two lots each
+
+    only_u1 = store.load(universes=["u1"], filters=[("lot_size", "==", 0.1)])
+    assert set(only_u1["universe"]) == {"u1"}
+    assert len(only_u1) == 10
+    assert json.loads(only_u1["params"].iloc[0]) == {"stop_loss_pips": 10, "take_profit_pips": 20}
+
+    assert store.load(universes=["missing"]).empty
+
+
+def test_smart_storage_parquet_backend(tmp_path):
+    """SmartBacktestStorage writes Tier 1 to the store instead of the JSON file"""
+    results = [
+        {"strategy_name": f"S{i}", "lot_size": 0.1, "sharpe_ratio": float(i),
+         "trades_detailed": [{"pnl": 1}], "equity_curve": [1, 2]}
+        for i in range(20)
+    ]
+    storage = SmartBacktestStorage(output_dir=str(tmp_path), metrics_backend="parquet")
+    storage.save_universe_results("u1", results, top_n=3)
+    storage.save_universe_results("u1", results[:5], top_n=3)
+
+    assert not storage.metrics_file.exists()
+    df = storage.load_metrics(filters=[("sharpe_ratio", ">=", 15)])
+    assert sorted(df["strategy_name"]) == [f"S{i}" for i in range(15, 20)]
+    assert "trades_detailed" not in df.columns
+    assert storage.metrics_store.count() == 20
+    assert len(storage.get_available_detailed_strategies()) == 6
+
+
+def test_json_backend_load_metrics_matches_store(tmp_path):
+    """load_metrics returns the same rows for both backends"""
+    results = [{"strategy_name": f"S{i}", "lot_size": 0.1, "sharpe_ratio": float(i)} for i in range(6)]
+    frames = []
+    for backend in ("json", "parquet"):
+        storage = SmartBacktestStorage(output_dir=str(tmp_path / backend), metrics_backend=backend)
+        storage.save_universe_results("u1", results, top_n=0)
+        df = storage.load_metrics(columns=["sharpe_ratio"], filters=[("sharpe_ratio", "<", 3)])
+        frames.append(df.sort_values("strategy_name").reset_index(drop=True))
+
+    assert frames[0].to_dict("records") == frames[1].to_dict("records")
+
+
+def test_import_json(tmp_path):
+    """Existing all_strategies_metrics.json can be moved into the store"""
+    storage = SmartBacktestStorage(output_dir=str(tmp_path))
+    storage.save_universe_results("u1", make_rows(3), top_n=0)
+    storage.save_universe_results("u2", make_rows(2), top_n=0)
+
+    store = MetricsStore(tmp_path / "metrics")
+    assert store.import_json(storage.metrics_file) == 10
+    assert store.universes() == ["u1", "u2"]
+
+
+
+def test_dashboard_loader_keeps_empty_store_results(tmp_path):
+    """A filter matching nothing in the store never falls back to stale JSON rows"""
+    pytest.importorskip("streamlit")
+    from dashboard.utils.data_loader import load_all_strategies_metrics
+
+    storage = SmartBacktestStorage(output_dir=str(tmp_path), metrics_backend="json")
+    storage.save_universe_results("u1", make_rows(3, sharpe_offset=1000.0), top_n=0)  # stale
+    MetricsStore(tmp_path / "metrics").write("u1", make_rows(3))
+
+    loaded = load_all_strategies_metrics(str(tmp_path), filters=[("sharpe_ratio", ">", 0.15)])
+    assert sorted(set(loaded["strategy_name"])) == ["Strategy_2"]
+    assert load_all_strategies_metrics(str(tmp_path), filters=[("sharpe_ratio", ">", 100)]).empty
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - MONTE CARLO ENGINE TESTS 💎🌟⚡
+
+Tests for the vectorized Monte Carlo / bootstrap engine (monte_carlo_engine)
+"""
+
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from monte_carlo_engine import (
+    simulate_equity, summarize_simulation, bootstrap_means, bootstrap_ci, draw_indices, band_indices
+)
+
+
+def reference_simulation(profits, indices, initial_capital):
+    """Per-simulation loop over the same index rows"""
+    finals, max_dds, mins = [], [], []
+    for row in indices:
+        equity = initial_capital + np.cumsum(profits[row])
+        finals.append(equity[-1])
+        max_dds.append((equity - np.maximum.accumulate(equity)).min())
+        mins.append(equity.min())
+    return np.array(finals), np.array(max_dds), np.array(mins)
+
+
+@pytest.mark.parametrize("method", ["bootstrap", "permutation"])
+def test_chunking_matches_loop(method):
+    """Chunked matrix simulation equals the per-simulation loop on the same draws"""
+    profits = np.random.default_rng(0).normal(20, 100, 120)
+    result = simulate_equity(profits, simulations=500, method=method, seed=7, max_cells=1000)
+
+    # max_cells=1000 -> chunks of 8 simulations drawn from the same generator
+    rng = np.random.default_rng(7)
+    indices = np.vstack([draw_indices(rng, 120, min(8, 500 - s), method) for s in range(0, 500, 8)])
+    finals, max_dds, mins = reference_simulation(profits, indices, 10000.0)
+
+    np.testing.assert_allclose(result["final_equities"], finals)
+    np.testing.assert_allclose(result["max_drawdowns"], max_dds)
+    np.testing.assert_allclose(result["min_equities"], mins)
+    assert result["prob_ruin_touched"] >= result["prob_ruin"]
+    if method == "permutation":
+        # Reordering never changes the total
+        np.testing.assert_allclose(finals, 10000.0 + profits.sum())
+
+
+def test_bands_and_statistics():
+    """Bands are ordered, sampled on at most band_points trades and consistent with the finals"""
+    profits = np.random.default_rng(1).normal(5, 50, 2000)
+    result = simulate_equity(profits, simulations=20_000, band_points=100)
+
+    assert len(result["trade_numbers"]) <= 100
+    assert result["trade_numbers"][0] == 1 and result["trade_numbers"][-1] == 2000
+    assert np.all(result["bands"][5] <= result["bands"][50])
+    assert np.all(result["bands"][50] <= result["bands"][95])
+    assert result["bands"][50][-1] == pytest.approx(np.median(result["final_equities"]), rel=1e-4)
+
+    stats = summarize_simulation(result)
+    assert stats["p5_final"] < stats["median_final"] < stats["p95_final"]
+    assert stats["p95_max_dd"] <= stats["median_max_dd"] <= 0
+    assert 0 <= stats["prob_ruin"] <= stats["prob_ruin_touched"] <= 100
+
+    assert np.array_equal(band_indices(50, 100), np.arange(50))
+    assert simulate_equity([], simulations=100) == {}
+
+
+def test_bootstrap_ci():
+    """Vectorized bootstrap of a mean"""
+    outcomes = np.array([1] * 60 + [0] * 40)
+    means = bootstrap_means(outcomes, n_iterations=5000, max_cells=3000)
+    assert len(means) == 5000
+    assert means.mean() == pytest.approx(0.6, abs=0.01)
+    assert means.std() == pytest.approx(np.sqrt(0.6 * 0.4 / 100), rel=0.1)
+
+    lower, mean, upper = bootstrap_ci(outcomes)
+    assert lower < 0.6 < upper
+    assert bootstrap_ci([]) == (0.0, 0.0, 0.0)
+
+    with pytest.raises(ValueError):
+        simulate_equity([1.0, -1.0], method="shuffle")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
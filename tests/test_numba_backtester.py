@@ -14,7 +14,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from backtester import Backtester, NUMBA_AVAILABLE
+from backtester import Backtester, NUMBA_AVAILABLE, _simulate_trades_numba, compute_metrics
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -278,6 +278,135 @@ def test_numba_backtester_exit_reasons():
         assert all(reason in valid_reasons for reason in exit_reasons), "All exit reasons should be valid"
 
 
+def test_batch_kernel_matches_single_simulation():
+    """Test that the batched SL/TP/lot kernel matches one-at-a-time simulation"""
+    config = {
+        'capital': {
+            'initial_capital': 10000,
+            'default_lot_size': 0.1,
+            'pip_value_per_lot': 10,
+            'pip_decimal_places': 4
+        },
+        'backtester': {
+            'lot_sizes': [0.01, 0.1, 1.0],
+            'commission_per_lot': 0.05
+        }
+    }
+    
+    backtester = Backtester(config=config)
+    
+    np.random.seed(7)
+    n = 2000
+    mid = 1.0500 + np.cumsum(np.random.randn(n) * 0.0001)
+    df = pd.DataFrame({
+        'bid': mid - 0.00005,
+        'ask': mid + 0.00005,
+        'mid_price': mid,
+    })
+    signals = pd.Series(np.random.choice([-1, 0, 0, 0, 1], size=n), index=df.index)
+    
+    sl_tp_pairs = [(5, 10), (10, 20), (20, 40), (15, 15)]
+    batch = backtester.simulate_trades_batch(
+        signals, df['mid_price'], sl_tp_pairs,
+        bid_prices=df['bid'], ask_prices=df['ask']
+    )
+    
+    for c, (sl, tp) in enumerate(sl_tp_pairs):
+        start, end = batch['trade_offsets'][c], batch['trade_offsets'][c + 1]
+        for l, lot in enumerate(config['backtester']['lot_sizes']):
+            single = _simulate_trades_numba(
+                signals.values.astype(np.int8),
+                df['bid'].values, df['ask'].values,
+                sl, tp, 0.0001, 10, lot, 0.05
+            )
+            assert end - start == len(single[0]), "Trade count should match"
+            np.testing.assert_array_equal(batch['entry_idx'][start:end], single[0])
+            np.testing.assert_array_equal(batch['exit_idx'][start:end], single[1])
+            np.testing.assert_allclose(batch['pnl'][start:end, l], single[4])
+            np.testing.assert_allclose(batch['gross_pnl'][start:end, l], single[5])
+            np.testing.assert_array_equal(batch['exit_reason'][start:end], single[8])
+
+
+def test_backtest_param_grid():
+    """Test that backtest_param_grid matches per-strategy backtests"""
+    config = {
+        'capital': {
+            'initial_capital': 10000,
+            'default_lot_size': 0.1,
+            'pip_value_per_lot': 10,
+            'pip_decimal_places': 4
+        },
+        'backtester': {
+            'lot_sizes': [0.01, 0.1],
+            'commission_per_lot': 0.05
+        }
+    }
+    
+    backtester = Backtester(config=config)
+    
+    np.random.seed(42)
+    n = 1000
+    df = pd.DataFrame({
+        'bid': 1.0500 + np.cumsum(np.random.randn(n) * 0.00005),
+        'ask': 1.0510 + np.cumsum(np.random.randn(n) * 0.00005),
+        'mid_price': 1.0505 + np.cumsum(np.random.randn(n) * 0.00005),
+    })
+    
+    sl_tp_pairs = [(10, 20), (20, 40)]
+    grid = backtester.backtest_param_grid(SimpleStrategy(), df, sl_tp_pairs)
+    
+    assert set(grid.keys()) == set(sl_tp_pairs)
+    for sl, tp in sl_tp_pairs:
+        expected = backtester.backtest(SimpleStrategy(stop_loss=sl, take_profit=tp), df)
+        for lot in (0.01, 0.1):
+            assert grid[(sl, tp)][lot].n_trades == expected[lot].n_trades
+            assert abs(grid[(sl, tp)][lot].net_pnl - expected[lot].net_pnl) < 1e-9
+
+
+def test_backtest_param_grid_keeps_instance_settings():
+    """The grid run leaves save_detailed_trades and lot_size as they were"""
+    backtester = Backtester()
+    backtester.save_detailed_trades = True
+    lot_size = backtester.lot_size
+    
+    np.random.seed(0)
+    df = pd.DataFrame({'mid_price': 1.0505 + np.cumsum(np.random.randn(500) * 0.00005)})
+    backtester.backtest_param_grid(SimpleStrategy(), df, [(10, 20)], lot_sizes=[0.01, 0.5])
+    
+    assert backtester.save_detailed_trades is True
+    assert backtester.lot_size == lot_size
+
+
+
+def test_metrics_kernel_matches_pandas_definitions():
+    """Test that the compiled metrics equal the pandas-based definitions"""
+    backtester = Backtester()
+    np.random.seed(7)
+    pnl = np.round(np.random.randn(250) * 20 + 0.5, 2)
+    pnl[[5, 6, 100]] = 0.0
+    trades = pd.DataFrame({'pnl': pnl})
+    equity = backtester._calculate_equity_curve(trades, 10000)
+    returns = pd.Series(pnl)
+    
+    metrics = compute_metrics(pnl, 10000)
+    
+    assert metrics['n_trades'] == 250
+    assert np.isclose(metrics['win_rate'], (pnl > 0).mean())
+    assert np.isclose(metrics['profit_factor'], pnl[pnl > 0].sum() / abs(pnl[pnl < 0].sum()))
+    assert np.isclose(metrics['sharpe_ratio'], backtester._calculate_sharpe_ratio(returns))
+    assert np.isclose(metrics['sortino_ratio'], backtester._calculate_sortino_ratio(returns))
+    assert np.isclose(metrics['max_drawdown'], backtester._calculate_max_drawdown(equity))
+    assert np.isclose(metrics['ulcer_index'], backtester._calculate_ulcer_index(equity))
+    assert np.isclose(metrics['total_return'], pnl.sum() / 10000)
+    assert np.isclose(metrics['calmar_ratio'], metrics['total_return'] / metrics['max_drawdown'])
+    
+    # Streaks: zero PnL breaks both
+    streaks = compute_metrics(np.array([1.0, 2.0, 0.0, 3.0, -1.0, -1.0, -1.0, 4.0]))
+    assert streaks['max_consecutive_wins'] == 2
+    assert streaks['max_consecutive_losses'] == 3
+    assert compute_metrics(np.array([]))['n_trades'] == 0
+
+
 if __name__ == "__main__":
     print("""
 ╔══════════════════════════════════════════════════════════════╗
@@ -293,6 +422,9 @@ if __name__ == "__main__":
         ("Multi-Lot Support", test_numba_backtester_multi_lot),
         ("Detailed Trades", test_numba_backtester_detailed_trades),
         ("Exit Reasons", test_numba_backtester_exit_reasons),
+        ("Batch Kernel", test_batch_kernel_matches_single_simulation),
+        ("Parameter Grid", test_backtest_param_grid),
+        ("Metrics Kernel", test_metrics_kernel_matches_pandas_definitions),
     ]
     
     passed = 0
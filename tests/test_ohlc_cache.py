@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - OHLC CACHE TESTS 💎🌟⚡
+
+Tests for the persistent OHLC bar cache
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("pyarrow")
+
+import ohlc_cache
+from ohlc_cache import OHLCCache, forget_tick_data, resample_ticks, resample_ticks_multi, derive_bars, _resample_ticks_pandas
+
+
+def make_ticks(n, start="2025-01-01 00:00:00", seed=42):
+    """Irregular tick data with spread"""
+    rng = np.random.default_rng(seed)
+    offsets = np.cumsum(rng.integers(100, 3000, size=n))
+    timestamps = pd.Timestamp(start, tz="UTC") + pd.to_timedelta(offsets, unit="ms")
+    mid = 1.10 + np.cumsum(rng.normal(0, 0.00002, size=n))
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "mid_price": mid,
+        "spread_pips": rng.uniform(0.5, 1.5, size=n).astype(np.float32),
+    })
+
+
+def reference_ohlc(ticks, interval):
+    """Direct pandas resample of the ticks"""
+    temp = ticks.set_index("timestamp")
+    ohlc = temp["mid_price"].resample(f"{interval}min").agg(["first", "max", "min", "last", "count"])
+    ohlc["spread_avg"] = temp["spread_pips"].resample(f"{interval}min").mean()
+    return ohlc[ohlc["count"] > 0].reset_index()
+
+
+@pytest.fixture
+def ticks():
+    return make_ticks(20000)
+
+
+class TestBaseBars:
+    """Test base bar construction and derivation"""
+
+    def test_derived_bars_match_direct_resample(self, ticks):
+        """15min bars derived from 5min bars equal 15min bars from ticks"""
+        origin = ticks["timestamp"].min().normalize()
+        fine = resample_ticks(ticks, 5, origin=origin)
+        derived = derive_bars(fine, 15, origin)
+        direct = resample_ticks(ticks, 15, origin=origin)
+
+        pd.testing.assert_frame_equal(derived, direct, check_dtype=False)
+
+        ref = reference_ohlc(ticks, 15)
+        np.testing.assert_allclose(derived["high"].values, ref["max"].values)
+        np.testing.assert_array_equal(derived["tick_volume"].values, ref["count"].values)
+
+    def test_single_pass_kernel_matches_pandas(self, ticks):
+        """One scan emits every interval, identical to pandas resampling"""
+        ticks['bid'] = ticks['mid_price'] - 0.00005
+        ticks['ask'] = ticks['mid_price'] + 0.00005
+        ticks.loc[10, 'mid_price'] = np.nan
+        ticks.loc[20, 'bid'] = np.nan
+        shuffled = ticks.sample(frac=1, random_state=0)
+
+        multi = resample_ticks_multi(shuffled, [1, 5, 7, 60])
+
+        for interval, bars in multi.items():
+            expected = _resample_ticks_pandas(ticks, interval)
+            pd.testing.assert_frame_equal(bars, expected, check_dtype=False)
+            assert 'ask_high' in bars.columns
+
+
+class TestOHLCCache:
+    """Test persistent caching, derivation and incremental append"""
+
+    def test_parquet_source_is_cached(self, ticks, tmp_path):
+        source = tmp_path / "ticks.parquet"
+        ticks.to_parquet(source, index=False)
+        cache = OHLCCache(tmp_path / "cache", verbose=False)
+
+        bars = cache.get_bars(5, parquet_path=source)
+        assert cache.cached_intervals(parquet_path=source) == [5]
+
+        # Fresh instance reads from disk
+        reloaded = OHLCCache(tmp_path / "cache", verbose=False).get_bars(5, parquet_path=source)
+        pd.testing.assert_frame_equal(bars, reloaded)
+
+    def test_coarser_interval_derived_from_finer(self, ticks, tmp_path):
+        source = tmp_path / "ticks.parquet"
+        ticks.to_parquet(source, index=False)
+        cache = OHLCCache(tmp_path / "cache", verbose=False)
+
+        cache.get_bars(5, parquet_path=source)
+        bars_60 = cache.get_bars(60, parquet_path=source)
+
+        dataset_dir, _ = cache._dataset_dir(parquet_path=source)
+        assert cache._read_entry(dataset_dir, 60)["derived_from"] == 5
+
+        ref = reference_ohlc(ticks, 60)
+        np.testing.assert_allclose(bars_60["open"].values, ref["first"].values)
+        np.testing.assert_allclose(bars_60["close"].values, ref["last"].values)
+        np.testing.assert_allclose(bars_60["spread_sum"].values / bars_60["spread_count"].values,
+                                   ref["spread_avg"].values, rtol=1e-6)
+
+    def test_growing_source_appends_new_ticks(self, tmp_path):
+        all_ticks = make_ticks(30000)
+        source = tmp_path / "ticks.parquet"
+        all_ticks.iloc[:20000].to_parquet(source, index=False)
+        cache = OHLCCache(tmp_path / "cache", verbose=False)
+        cache.get_bars(5, parquet_path=source)
+
+        # Source grows
+        all_ticks.to_parquet(source, index=False)
+        cache.clear_memory()
+        extended = cache.get_bars(5, parquet_path=source)
+
+        dataset_dir, _ = cache._dataset_dir(parquet_path=source)
+        assert 0 < cache._read_entry(dataset_dir, 5)["appended_ticks"] <= 10000 + 1000
+
+        expected = resample_ticks(all_ticks, 5)
+        pd.testing.assert_frame_equal(extended, expected, check_dtype=False)
+
+    def test_warm_builds_intervals_in_one_scan(self, ticks, tmp_path):
+        cache = OHLCCache(tmp_path / "cache", verbose=False)
+
+        assert cache.warm([5, 15, 60], tick_data=ticks) == [5, 15, 60]
+        assert cache.warm([5, 15, 60], tick_data=ticks) == []
+        assert cache.cached_intervals(tick_data=ticks) == [5, 15, 60]
+
+    def test_dataframe_source(self, ticks, tmp_path):
+        cache = OHLCCache(tmp_path / "cache", verbose=False)
+        bars = cache.get_bars(15, tick_data=ticks)
+
+        assert len(bars) == len(reference_ohlc(ticks, 15))
+        assert cache.cached_intervals(tick_data=ticks) == [15]
+
+    def test_dataframe_edits_outside_sample_change_key(self, ticks, tmp_path):
+        """Every tick row is hashed, so edited ticks never return stale bars"""
+        cache = OHLCCache(tmp_path / "cache", verbose=False)
+        before = cache.get_bars(60, tick_data=ticks).copy()
+
+        edited = ticks.copy()
+        edited.loc[12345, "mid_price"] += 0.01
+        after = cache.get_bars(60, tick_data=edited)
+        assert not after["high"].equals(before["high"])
+        pd.testing.assert_frame_equal(after, resample_ticks(edited, 60), check_dtype=False)
+
+        # In place: the memoized hash is dropped explicitly
+        ticks.loc[12345, "mid_price"] += 0.01
+        forget_tick_data(ticks)
+        pd.testing.assert_frame_equal(cache.get_bars(60, tick_data=ticks), after)
+
+    def test_dataframe_hashed_once(self, ticks, tmp_path, monkeypatch):
+        """Repeated lookups with one DataFrame hash its ticks only once"""
+        calls = []
+        original = ohlc_cache.tick_content_hash
+        monkeypatch.setattr(ohlc_cache, "tick_content_hash", lambda df: calls.append(1) or original(df))
+        cache = OHLCCache(tmp_path / "cache", verbose=False, persist=False)
+
+        for interval in (5, 15, 5, 60, 15):
+            cache.get_bars(interval, tick_data=ticks)
+        assert len(calls) == 1
+
+    def test_memory_only_and_lru_bound(self, ticks, tmp_path):
+        """persist=False never touches disk; memory holds at most N bar sets"""
+        cache = OHLCCache(tmp_path / "cache", verbose=False, persist=False, max_memory_entries=2)
+
+        assert cache.warm([5, 15, 60], tick_data=ticks) == [5, 15, 60]
+        assert not (tmp_path / "cache").exists()
+        assert len(cache._memory) == 2
+
+        bars_60 = cache.get_bars(60, tick_data=ticks)
+        assert cache.get_bars(60, tick_data=ticks) is bars_60
+        cache.get_bars(5, tick_data=ticks)
+        assert [key[1] for key in cache._memory] == [60, 5]
+
+
+def test_default_cache_is_opt_in(ticks, tmp_path, monkeypatch):
+    """Memory-only unless CACHE_CONFIG['cache_ohlc'] is set"""
+    from config import CACHE_CONFIG
+
+    monkeypatch.setitem(CACHE_CONFIG, "cache_dir", tmp_path)
+    monkeypatch.setitem(CACHE_CONFIG, "cache_ohlc", False)
+    monkeypatch.setattr(ohlc_cache, "_default_cache", None)
+    cache = ohlc_cache.default_ohlc_cache()
+    cache.verbose = False
+    bars = cache.get_bars(5, tick_data=ticks)
+    assert cache.get_bars(5, tick_data=ticks) is bars
+    assert not (tmp_path / "ohlc").exists()
+
+    monkeypatch.setitem(CACHE_CONFIG, "cache_ohlc", True)
+    cache = ohlc_cache.default_ohlc_cache()
+    cache.verbose = False
+    cache.get_bars(5, tick_data=ticks)
+    assert cache.cache_dir == tmp_path / "ohlc"
+    assert len(list((tmp_path / "ohlc").glob("df_*/bars_5m.parquet"))) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 NECROZMA - PARALLEL BACKTEST TESTS 💎🌟⚡
+
+Tests for process-parallel test_strategies with shared data
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtester import (
+    Backtester, share_backtest_data, restore_backtest_data,
+    strategy_spec, strategy_from_spec, signal_groups
+)
+from strategy_factory import Strategy, TrendFollower
+from tick_store import SharedTickStore
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🧪 TEST HELPERS
+# ═══════════════════════════════════════════════════════════════
+
+class BrokenStrategy(Strategy):
+    """Strategy whose signal generation always fails"""
+
+    def __init__(self, params):
+        super().__init__("Broken", params)
+
+    def generate_signals(self, df):
+        raise RuntimeError("broken on purpose")
+
+
+class NamedStrategy:
+    """Strategy that can't be rebuilt from params alone"""
+
+    def __init__(self, name, stop_loss=10):
+        self.name = name
+        self.params = {"stop_loss_pips": stop_loss}
+
+    def generate_signals(self, df):
+        return pd.Series(0, index=df.index)
+
+
+def create_test_dataframe(n=3000):
+    """Bars with a naive DatetimeIndex and a non-numeric column"""
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({
+        "mid_price": 1.10 + np.cumsum(rng.normal(0, 0.0002, n)),
+        "momentum": rng.normal(0, 1.5, n),
+        "spread_pips": rng.uniform(0.5, 1.5, n).astype(np.float32),
+        "pattern": np.where(rng.random(n) > 0.5, "ohl:H", "ohl:L"),
+    }, index=pd.date_range("2025-01-01", periods=n, freq="5min"))
+    df.index.name = "timestamp"
+    return df
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🧪 TESTS
+# ═══════════════════════════════════════════════════════════════
+
+def test_shared_data_round_trip():
+    """Workers see the same columns, dtypes and index as the parent"""
+    df = create_test_dataframe()
+    store, payload = share_backtest_data(df)
+    try:
+        attached = SharedTickStore.attach(store.name)
+        restored = restore_backtest_data(attached, payload)
+
+        pd.testing.assert_frame_equal(restored, df)
+        assert "pattern" not in attached.columns
+        assert np.shares_memory(restored["momentum"].to_numpy(), attached.arrays["momentum"])
+        del restored
+        attached.close()
+    finally:
+        store.unlink()
+
+
+def test_strategy_spec_round_trip():
+    """Factory strategies travel as specs, others as objects"""
+    strategy = TrendFollower({"lookback_periods": 10, "threshold": 0.5, "stop_loss_pips": 15})
+    strategy.name = "TrendFollower_custom"
+
+    spec = strategy_spec(strategy)
+    rebuilt = strategy_from_spec(spec)
+
+    assert spec["class"] == "TrendFollower"
+    assert type(rebuilt) is TrendFollower
+    assert rebuilt.name == "TrendFollower_custom"
+    assert rebuilt.threshold == 0.5
+
+    named = NamedStrategy("Custom")
+    assert strategy_spec(named) is named
+
+
+def test_parallel_matches_sequential():
+    """Pool results equal in-process results and failures stay isolated"""
+    df = create_test_dataframe()
+    strategies = []
+    for threshold in (0.5, 1.0, 1.5):
+        strategy = TrendFollower({"threshold": threshold, "stop_loss_pips": 10, "take_profit_pips": 20})
+        strategy.name = f"TrendFollower_T{threshold}"
+        strategies.append(strategy)
+    strategies.insert(1, BrokenStrategy({}))
+
+    backtester = Backtester()
+    sequential = backtester.test_strategies(strategies, df, verbose=False, n_workers=1)
+    parallel = backtester.test_strategies(strategies, df, verbose=False, n_workers=2)
+
+    assert list(parallel) == list(sequential) == [s.name for s in strategies if s.name != "Broken"]
+    for name, lot_results in sequential.items():
+        assert set(parallel[name]) == set(lot_results)
+        for lot_size, result in lot_results.items():
+            assert result.n_trades > 0
+            assert parallel[name][lot_size].to_dict() == pytest.approx(result.to_dict(), nan_ok=True)
+            assert parallel[name][lot_size].trades.empty
+
+
+def test_signal_groups_run_as_one_grid(monkeypatch):
+    """SL/TP variants share one simulation and keep their own names and order"""
+    df = create_test_dataframe()
+
+    def trend(threshold, sl, tp, name):
+        strategy = TrendFollower({"threshold": threshold, "stop_loss_pips": sl, "take_profit_pips": tp})
+        strategy.name = name
+        return strategy
+
+    strategies = [
+        trend(0.5, 10, 20, "A1"),
+        trend(1.0, 10, 20, "B"),
+        trend(0.5, 20, 40, "A2"),
+        BrokenStrategy({"stop_loss_pips": 10}),
+        trend(0.5, 10, 20, "A3"),
+        BrokenStrategy({"stop_loss_pips": 20}),
+    ]
+    assert signal_groups(strategies) == [[0, 2, 4], [1], [3, 5]]
+
+    backtester = Backtester()
+    expected = {s.name: backtester.backtest(s, df) for s in strategies if s.name != "Broken"}
+
+    calls = []
+    original = Backtester.simulate_trades_batch
+    monkeypatch.setattr(
+        Backtester, "simulate_trades_batch",
+        lambda self, *args, **kwargs: calls.append(args[2]) or original(self, *args, **kwargs)
+    )
+    outcomes = list(backtester.iter_strategy_results(strategies, df, n_workers=1))
+
+    assert [name for name, _, _ in outcomes] == [s.name for s in strategies]
+    assert calls == [[(10, 20), (20, 40)], [(10, 20)]]
+    for name, results, error in outcomes:
+        if name == "Broken":
+            assert results is None and "broken on purpose" in error
+            continue
+        assert error is None
+        for lot_size, result in results.items():
+            assert result.strategy_name == name
+            assert result.to_dict() == pytest.approx(expected[name][lot_size].to_dict(), nan_ok=True)
+
+    parallel = backtester.test_strategies(strategies, df, verbose=False, n_workers=2)
+    assert list(parallel) == [s.name for s in strategies if s.name != "Broken"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - RECURRENCE QUANTIFICATION TESTS 💎🌟⚡
+
+Tests for the matrix-free RQA kernel (features_advanced.recurrence_features)
+"""
+
+import pytest
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from features_advanced import recurrence_features, extract_advanced_features
+
+
+def runs(values):
+    """Lengths of consecutive True runs"""
+    lengths, current = [], 0
+    for v in values:
+        if v:
+            current += 1
+        elif current:
+            lengths.append(current)
+            current = 0
+    return lengths + ([current] if current else [])
+
+
+def dense_rqa(data, threshold_mult=0.1):
+    """Reference RQA from the full n×n recurrence matrix"""
+    n = len(data)
+    threshold = threshold_mult * np.std(data) or 0.01
+    recurrence = np.abs(data[:, None] - data[None, :]) <= threshold
+    total = recurrence.sum()
+
+    features = {"recurrence_rate": total / (n * n)}
+    diag = [l for k in range(1, n) for d in (k, -k) for l in runs(np.diag(recurrence, d)) if l >= 2]
+    if diag:
+        features["determinism"] = min(sum(diag) / (total - n + 1), 1.0)
+        features["avg_diagonal_length"] = np.mean(diag)
+        features["max_diagonal_length"] = max(diag)
+        hist, _ = np.histogram(diag, bins=min(20, max(diag)))
+        probs = hist[hist > 0] / hist.sum()
+        features["entropy_diagonal"] = -np.sum(probs * np.log2(probs))
+    vert = [l for col in range(n) for l in runs(recurrence[:, col]) if l >= 2]
+    if vert:
+        features["laminarity"] = min(sum(vert) / total, 1.0)
+        features["trapping_time"] = np.mean(vert)
+        features["max_vertical_length"] = max(vert)
+    if "determinism" in features and "laminarity" in features:
+        features["det_lam_ratio"] = features["determinism"] / (features["laminarity"] + 1e-10)
+    return features
+
+
+@pytest.mark.parametrize("kind", ["noise", "quantized", "walk"])
+def test_matches_dense_recurrence_matrix(kind):
+    """Line statistics from the upper-triangle pass equal the full-matrix ones"""
+    rng = np.random.default_rng(len(kind))
+    for n in (20, 57, 200):
+        if kind == "noise":
+            data = rng.normal(0, 1, n)
+        elif kind == "quantized":
+            data = np.round(rng.normal(0, 1, n), 1)
+        else:
+            data = np.round(np.cumsum(rng.normal(0, 1, n)))
+        for threshold_mult in (0.1, 0.5):
+            expected = dense_rqa(data, threshold_mult)
+            actual = recurrence_features(data, threshold_mult=threshold_mult)
+            assert list(actual) == list(expected)
+            for key, value in expected.items():
+                assert actual[key] == pytest.approx(value, rel=1e-12), (kind, n, key)
+
+
+def test_large_windows_and_edge_cases():
+    """Thousands of points without the n×n matrix; short/constant inputs"""
+    rng = np.random.default_rng(0)
+    features = recurrence_features(rng.normal(0, 1, 4000))
+    assert 0 < features["recurrence_rate"] < 1
+    assert 0 <= features["determinism"] <= 1
+
+    assert recurrence_features(np.ones(10)) == {}
+    constant = recurrence_features(np.ones(50))
+    assert constant["recurrence_rate"] == 1.0
+    assert constant["max_vertical_length"] == 50.0
+
+
+def test_run_length_features_present():
+    """Calm/compression streak features (baseline values on a fixed walk)"""
+    prices = 1.1 + np.cumsum(np.random.default_rng(3).normal(0, 0.0001, 500))
+    features = extract_advanced_features(prices)
+
+    assert features["pattern_max_calm_period"] == 4.0
+    assert features["ultra_burst_compression"] == 4.0
+    assert features["ultra_burst_potential"] == pytest.approx(3.991024191613308)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
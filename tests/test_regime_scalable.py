@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the scalable RegimeDetector mode
+
+Sampled model selection, MiniBatchKMeans and HDBSCAN fit-on-sample
+with chunked label assignment, plus model persistence and prediction
+on new data.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.metrics import adjusted_rand_score
+from regime_detector import RegimeDetector, stratified_sample_indices, predict_in_chunks
+from config import REGIME_CONFIG
+
+
+def make_regime_features(n, seed=0):
+    """Three well-separated synthetic regimes in random order"""
+    rng = np.random.default_rng(seed)
+    truth = rng.integers(0, 3, n)
+    centers = np.array([
+        [0.2, 0.0, 0.0, 0.7],
+        [0.85, 0.75, 0.6, 2.0],
+        [0.5, -0.75, -0.6, 1.2],
+    ])
+    X = centers[truth] + rng.normal(0, 0.08, (n, 4))
+    return pd.DataFrame(X, columns=["volatility", "trend", "momentum", "volume"]), truth
+
+
+def small_scalable_config(**overrides):
+    """REGIME_CONFIG with sample sizes small enough for unit tests"""
+    config = dict(REGIME_CONFIG)
+    config.update({
+        "selection_sample_size": 2000,
+        "silhouette_sample_size": 500,
+        "hdbscan_fit_sample_size": 2000,
+        "predict_chunk_size": 1500,
+        "min_cluster_size_absolute": 100,
+    })
+    config.update(overrides)
+    return config
+
+
+class TestSamplingHelpers:
+    """Test stratified sampling and chunked prediction"""
+
+    def test_stratified_sample_covers_every_period(self):
+        idx = stratified_sample_indices(100_000, 1000, n_strata=10)
+
+        assert len(idx) == 1000
+        assert len(np.unique(idx)) == 1000
+        assert np.all(np.diff(idx) > 0)
+        # Each tenth of the data contributes a tenth of the sample
+        np.testing.assert_array_equal(np.bincount(idx // 10_000), np.full(10, 100))
+
+    def test_sample_larger_than_data_returns_all_rows(self):
+        np.testing.assert_array_equal(stratified_sample_indices(50, 100), np.arange(50))
+
+    def test_predict_in_chunks_matches_single_call(self):
+        X = np.random.RandomState(0).randn(1234, 3)
+        predict = lambda chunk: (chunk[:, 0] > 0).astype(int)
+
+        np.testing.assert_array_equal(predict_in_chunks(predict, X, 100), predict(X))
+
+
+class TestScalableClustering:
+    """Test sample-fit-then-predict clustering"""
+
+    def test_kmeans_scalable_recovers_regimes(self):
+        df, truth = make_regime_features(6000)
+        detector = RegimeDetector(small_scalable_config())
+
+        result = detector.detect_regimes_kmeans(df, scalable=True)
+
+        assert detector.best_n_clusters == 3
+        assert adjusted_rand_score(truth, result["regime"]) > 0.99
+        assert type(detector.best_model).__name__ == "MiniBatchKMeans"
+
+    def test_scalable_is_automatic_above_threshold(self):
+        df, _ = make_regime_features(3000)
+        detector = RegimeDetector(small_scalable_config(scalable_threshold=1000))
+
+        detector.detect_regimes(df, method="kmeans")
+
+        assert type(detector.best_model).__name__ == "MiniBatchKMeans"
+
+    def test_hdbscan_fit_on_sample_labels_all_rows(self):
+        pytest.importorskip("hdbscan", reason="HDBSCAN not available")
+        df, truth = make_regime_features(6000)
+        detector = RegimeDetector(small_scalable_config())
+
+        result = detector.detect_regimes_hdbscan(df, scalable=True)
+
+        assert len(result) == len(df)
+        assigned = result["regime"].values != -1
+        assert assigned.mean() > 0.9
+        assert adjusted_rand_score(truth[assigned], result["regime"].values[assigned]) > 0.99
+
+
+class TestRegimePrediction:
+    """Test saved models assigning regimes without refitting"""
+
+    def test_saved_kmeans_predicts_fit_labels(self, tmp_path):
+        df, _ = make_regime_features(3000)
+        detector = RegimeDetector(small_scalable_config())
+        fitted = detector.detect_regimes_kmeans(df, scalable=True)
+        model_path = detector.save_model(tmp_path / "regime_model.joblib")
+
+        loaded = RegimeDetector.load_model(model_path)
+        regimes = loaded.predict(df, chunk_size=700)
+
+        assert regimes.dtype == np.int8
+        np.testing.assert_array_equal(regimes, fitted["regime"].values)
+        assert loaded.feature_cols == detector.feature_cols
+
+    def test_predict_new_rows_and_parquet(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        df, _ = make_regime_features(3000)
+        detector = RegimeDetector(small_scalable_config())
+        detector.detect_regimes_kmeans(df, scalable=True)
+
+        new_df, _ = make_regime_features(2000, seed=1)
+        new_df["extra"] = "not a feature"
+        new_df.to_parquet(tmp_path / "new.parquet", index=False)
+
+        in_memory = detector.predict(new_df)
+        streamed = detector.predict_parquet(tmp_path / "new.parquet", batch_size=300)
+
+        np.testing.assert_array_equal(streamed, in_memory)
+        assert "regime" not in new_df.columns
+
+    def test_analysis_columns_give_same_analysis(self):
+        df, _ = make_regime_features(3000)
+        rng = np.random.default_rng(2)
+        df["spread"] = rng.normal(1.0, 0.1, len(df))
+        df["autocorr_lag1"] = rng.normal(0.0, 0.1, len(df))
+        detector = RegimeDetector(small_scalable_config())
+        detector.detect_regimes_kmeans(df, scalable=True)
+        regimes = detector.predict(df)
+
+        columns = detector.analysis_columns(df)
+        assert set(columns) == {"volatility", "trend", "momentum", "volume"}
+
+        full = detector.analyze_regimes(df[detector.feature_cols].assign(regime=regimes))
+        narrow = detector.analyze_regimes(df[columns].assign(regime=regimes))
+
+        assert narrow["characteristics"] == full["characteristics"]
+        pd.testing.assert_frame_equal(narrow["transitions"], full["transitions"])
+
+    def test_predict_without_model_raises(self):
+        with pytest.raises(ValueError):
+            RegimeDetector().predict(pd.DataFrame({"volatility": [0.1]}))
+
+    def test_hdbscan_model_round_trip(self, tmp_path):
+        pytest.importorskip("hdbscan", reason="HDBSCAN not available")
+        df, _ = make_regime_features(4000)
+        detector = RegimeDetector(small_scalable_config())
+        detector.detect_regimes_hdbscan(df, scalable=True)
+        detector.save_model(tmp_path / "hdbscan.joblib")
+
+        loaded = RegimeDetector.load_model(tmp_path / "hdbscan.joblib")
+        regimes = loaded.predict(df)
+
+        assert regimes.dtype == np.int8
+        np.testing.assert_array_equal(regimes, detector.predict(df))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - SHARED TICK STORE TESTS 💎🌟⚡
+
+Tests for the shared-memory tick store used by parallel workers
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import multiprocessing as mp
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tick_store import SharedTickStore, init_worker_store, get_worker_dataframe
+
+
+@pytest.fixture
+def tick_df():
+    """Create tick data with the columns produced by load_crystal"""
+    n = 5000
+    np.random.seed(42)
+    mid = 1.10 + np.cumsum(np.random.randn(n) * 0.00005)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=n, freq='250ms', tz='UTC'),
+        'bid': mid - 0.00005,
+        'ask': mid + 0.00005,
+        'mid_price': mid,
+        'spread_pips': np.full(n, 1.0, dtype=np.float32),
+        'pips_change': np.diff(mid, prepend=mid[0]).astype(np.float32) * 10000,
+    })
+
+
+def _worker_summary(_):
+    """Read the attached store inside a worker process"""
+    df = get_worker_dataframe()
+    return len(df), float(df['mid_price'].sum()), str(df['timestamp'].iloc[-1])
+
+
+def test_roundtrip_preserves_columns(tick_df):
+    """Attached store should reproduce the original columns and dtypes"""
+    with SharedTickStore.create(tick_df) as store:
+        attached = SharedTickStore.attach(store.name)
+        df = attached.to_dataframe()
+
+        assert list(df.columns) == list(tick_df.columns)
+        # Timestamps are stored as int64 nanoseconds
+        pd.testing.assert_series_equal(df['timestamp'], tick_df['timestamp'].dt.as_unit('ns'))
+        np.testing.assert_array_equal(df['bid'].values, tick_df['bid'].values)
+        assert df['spread_pips'].dtype == np.float32
+
+        del df
+        attached.close()
+
+
+def test_arrays_are_read_only(tick_df):
+    """Workers must not be able to modify shared data"""
+    with SharedTickStore.create(tick_df) as store:
+        attached = SharedTickStore.attach(store.name)
+
+        with pytest.raises(ValueError):
+            attached.bid[0] = 0.0
+
+        assert attached.timestamps_ns.dtype == np.int64
+        attached.close()
+
+
+def test_non_numeric_columns_are_skipped(tick_df):
+    """Object columns can't be shared and are left out"""
+    tick_df['label'] = 'x'
+    with SharedTickStore.create(tick_df) as store:
+        assert 'label' not in store.columns
+        assert 'mid_price' in store.columns
+
+
+def test_pool_workers_attach_by_name(tick_df):
+    """Pool workers should read the store without receiving the DataFrame"""
+    # spawn: fresh workers that can only see the data through the store
+    ctx = mp.get_context("spawn")
+    with SharedTickStore.create(tick_df) as store:
+        with ProcessPoolExecutor(max_workers=2, mp_context=ctx, initializer=init_worker_store,
+                                 initargs=(store.name,)) as executor:
+            results = list(executor.map(_worker_summary, range(4)))
+
+    for n_rows, mid_sum, last_ts in results:
+        assert n_rows == len(tick_df)
+        assert abs(mid_sum - tick_df['mid_price'].sum()) < 1e-9
+        assert last_ts == str(tick_df['timestamp'].iloc[-1])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
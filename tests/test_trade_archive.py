@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - TRADE ARCHIVE TESTS 💎🌟⚡
+
+Tests for the Arrow IPC detailed-trade archive (core.storage.trade_archive)
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("pyarrow")
+
+from core.storage import TradeArchive, SmartBacktestStorage
+
+
+def make_trade(i):
+    """Trade dict in the trades_detailed layout"""
+    return {
+        "entry_time": f"2025-01-01 00:{i:02d}:00",
+        "exit_time": f"2025-01-01 01:{i:02d}:00",
+        "entry_price": 1.1 + i * 1e-4,
+        "exit_price": 1.1 + i * 2e-4,
+        "direction": "LONG" if i % 2 else "SHORT",
+        "pnl_pips": float(i),
+        "pnl_usd": i * 10.0,
+        "pnl_pct": i * 0.001,
+        "duration_minutes": 60,
+        "exit_reason": "TP",
+        "market_context": {
+            "volatility": 0.5,
+            "trend_strength": 1.0,
+            "volume_relative": 1.0,
+            "spread_pips": 1.5,
+            "pattern_detected": "ohl:H",
+            "pattern_sequence": ["ohl:L", "ohl:H"][: 1 + i % 2],
+            "hour_of_day": 0,
+            "day_of_week": "Wednesday",
+        },
+        "price_history": [{"timestamp": "2025-01-01 00:00:00", "price": 1.1}],
+    }
+
+
+def make_results(n, n_trades=20):
+    return [
+        {
+            "strategy_name": f"S{i}",
+            "lot_size": 0.1,
+            "sharpe_ratio": float(i),
+            "trades_detailed": [make_trade(t) for t in range(n_trades)] if i % 3 else [],
+            "equity_curve": list(np.linspace(10000, 10000 + i, 50)),
+            "drawdown_curve": [0.0] * 50,
+        }
+        for i in range(n)
+    ]
+
+
+def test_archive_matches_json_layout(tmp_path):
+    """Archived strategies load exactly like the per-strategy JSON files"""
+    results = make_results(12)
+    json_storage = SmartBacktestStorage(output_dir=str(tmp_path / "json"))
+    arrow_storage = SmartBacktestStorage(output_dir=str(tmp_path / "arrow"), trades_backend="arrow")
+    json_storage.save_universe_results("u1", results, top_n=8)
+    arrow_storage.save_universe_results("u1", results, top_n=8)
+
+    assert sorted(arrow_storage.get_available_detailed_strategies()) == \
+        sorted(json_storage.get_available_detailed_strategies())
+    assert list(arrow_storage.trades_dir.glob("*.arrow")) == [arrow_storage.trades_dir / "u1.arrow"]
+
+    for name in json_storage.get_available_detailed_strategies():
+        assert arrow_storage.load_strategy_trades(name) == json_storage.load_strategy_trades(name)
+    assert arrow_storage.load_strategy_trades("S0") is None  # Not in top 8
+
+
+def test_lookup_across_universes(tmp_path):
+    """Names resolve through the index; a later universe takes over shared names"""
+    archive = TradeArchive(tmp_path)
+    entries = [{"strategy_name": f"S{i}", "metrics": {"sharpe_ratio": i}, "trades": [make_trade(i)]}
+               for i in range(5)]
+    archive.write_universe("u1", entries)
+    archive.write_universe("u2", entries[3:])
+
+    assert archive.load("S1")["universe"] == "u1"
+    assert archive.load("S4")["universe"] == "u2"
+    assert archive.load("S4", universe="u1")["metrics"] == {"sharpe_ratio": 4}
+    assert archive.load("missing") is None
+    assert archive.universes() == ["u1", "u2"]
+
+    # A fresh instance reads the persisted index
+    assert TradeArchive(tmp_path).load("S2")["rank"] == 3
+
+
+def test_trades_frame_and_curves(tmp_path):
+    """Columnar reads without building per-trade dicts"""
+    archive = TradeArchive(tmp_path)
+    results = make_results(3)
+    archive.write_universe("u1", [
+        {"strategy_name": r["strategy_name"], "trades": r["trades_detailed"],
+         "equity_curve": r["equity_curve"], "drawdown_curve": r["drawdown_curve"]}
+        for r in results
+    ])
+
+    trades = archive.load_trades_frame("S2")
+    assert len(trades) == 20
+    np.testing.assert_allclose(trades["pnl_pips"], np.arange(20.0))
+    assert trades["market_context"].iloc[1]["pattern_sequence"].tolist() == ["ohl:L", "ohl:H"]
+    assert archive.load_trades_frame("S0").empty
+
+    curves = archive.load_curves("S2")
+    assert curves["equity_curve"].dtype == np.float64
+    np.testing.assert_allclose(curves["equity_curve"], results[2]["equity_curve"])
+
+
+def test_archive_is_smaller_than_json(tmp_path):
+    """One binary file per universe instead of indented JSON per strategy"""
+    results = make_results(30, n_trades=200)
+    json_storage = SmartBacktestStorage(output_dir=str(tmp_path / "json"))
+    arrow_storage = SmartBacktestStorage(output_dir=str(tmp_path / "arrow"), trades_backend="arrow")
+    json_storage.save_universe_results("u1", results, top_n=30)
+    arrow_storage.save_universe_results("u1", results, top_n=30)
+
+    json_size = sum(f.stat().st_size for f in json_storage.trades_dir.glob("*.json"))
+    arrow_size = sum(f.stat().st_size for f in arrow_storage.trades_dir.iterdir())
+    assert arrow_size < json_size / 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - UNIVERSE SCHEDULER TESTS 💎🌟⚡
+
+Tests for interval grouping, longest-first ordering and the bars shared by
+the lookbacks of one interval (universe_scheduler)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import MIN_SAMPLES
+from analyzer import get_movement_targets, process_universe
+from data_loader import resample_to_ohlc
+from universe_scheduler import (
+    group_by_interval, schedule_universes, IntervalBars,
+    get_interval_bars, release_interval_bars
+)
+
+
+@pytest.fixture
+def tick_df():
+    """Random-walk ticks, one per second"""
+    rng = np.random.default_rng(7)
+    n = 30000
+    prices = 1.1 + np.cumsum(rng.normal(0, 5e-5, n))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-01", periods=n, freq="1s"),
+        "bid": prices - 0.00005,
+        "ask": prices + 0.00005,
+        "mid_price": prices,
+        "spread_pips": 1.0,
+        "pips_change": np.concatenate([[0], np.diff(prices) * 10000]),
+    })
+
+
+def test_schedule_groups_and_orders():
+    """Groups keep lookbacks ascending; schedule runs the largest universes first"""
+    configs = [
+        {"name": f"universe_{i}m_{lb}lb", "interval": i, "lookback": lb}
+        for lb in (20, 5, 10) for i in (15, 1, 5)
+    ]
+    groups = group_by_interval(configs)
+    assert list(groups) == [15, 1, 5]
+    assert [c["lookback"] for c in groups[1]] == [5, 10, 20]
+
+    scheduled = schedule_universes(configs)
+    assert len(scheduled) == len(configs)
+    assert (scheduled[0]["interval"], scheduled[0]["lookback"]) == (1, 20)
+    assert (scheduled[-1]["interval"], scheduled[-1]["lookback"]) == (15, 5)
+    assert {c["base_lookback"] for c in scheduled} == {5}
+    assert "base_lookback" not in configs[0]
+
+    # Measured candle counts override the 1 / interval estimate
+    by_bars = schedule_universes(configs, bar_counts={1: 100, 5: 1000, 15: 10})
+    assert (by_bars[0]["interval"], by_bars[0]["lookback"]) == (5, 20)
+
+
+def test_shared_targets_match_per_lookback(tick_df):
+    """Filtering the base targets equals scanning each lookback on its own"""
+    ohlc = resample_to_ohlc(tick_df, 1)
+    bars = IntervalBars(ohlc, 1, base_lookback=MIN_SAMPLES)
+
+    for lookback in (MIN_SAMPLES, MIN_SAMPLES + 7, 2 * MIN_SAMPLES + 13):
+        expected = get_movement_targets(ohlc, lookback, include_window_data=False)
+        assert bars.targets(lookback) == expected, lookback
+
+    if MIN_SAMPLES > 1:
+        below = bars.targets(MIN_SAMPLES - 1)
+        assert all(not t for dirs in below.values() for t in dirs.values())
+
+    deeper = IntervalBars(ohlc, 1, base_lookback=MIN_SAMPLES + 10)
+    with pytest.raises(ValueError):
+        deeper.targets(MIN_SAMPLES + 5)
+
+
+def test_process_universe_with_shared_bars(tick_df):
+    """Universe results are identical with and without shared bars"""
+    release_interval_bars()
+    lookback = MIN_SAMPLES + 5
+    bars = get_interval_bars(tick_df, 1, base_lookback=MIN_SAMPLES)
+    assert get_interval_bars(tick_df, 1, base_lookback=lookback) is bars
+
+    shared = process_universe(tick_df, 1, lookback, "test_1m", bars=bars)
+    alone = process_universe(tick_df, 1, lookback, "test_1m")
+
+    pd.testing.assert_frame_equal(shared["features"], alone["features"])
+    assert shared["metadata"]["total_candles"] == alone["metadata"]["total_candles"]
+    for level, directions in alone["results"].items():
+        for direction, data in directions.items():
+            assert shared["results"][level][direction]["patterns"] == data["patterns"]
+
+    release_interval_bars(1)
+    assert get_interval_bars(tick_df, 1, base_lookback=MIN_SAMPLES) is not bars
+    release_interval_bars()
+
+
+def test_interval_bars_keyed_by_content_and_bounded(tick_df, monkeypatch):
+    """A re-sent copy of the ticks reuses the bars; the per-process cache stays bounded"""
+    import universe_scheduler
+    from config import CACHE_CONFIG
+
+    release_interval_bars()
+    monkeypatch.setitem(CACHE_CONFIG, "ohlc_memory_entries", 2)
+
+    bars = get_interval_bars(tick_df, 5, base_lookback=MIN_SAMPLES)
+    assert get_interval_bars(tick_df.copy(), 5, base_lookback=MIN_SAMPLES) is bars
+
+    for interval in (1, 15):
+        get_interval_bars(tick_df.copy(), interval, base_lookback=MIN_SAMPLES)
+    assert [key[1] for key in universe_scheduler._interval_bars] == [1, 15]
+    release_interval_bars()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
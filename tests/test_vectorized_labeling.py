@@ -20,6 +20,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from labeler import (
     label_single_candle,
     label_all_candles_vectorized,
+    label_all_configs_vectorized,
+    _labels_for_config,
+    label_all_candles_indexed,
+    build_price_index,
     label_dataframe,
     NUMBA_AVAILABLE
 )
@@ -294,6 +298,85 @@ class TestVectorizedLabeling:
         if len(stop_rows) > 0:
             for r_val in stop_rows['up_r_multiple']:
                 assert r_val == -1.0, f"R-multiple for stop should be -1.0, got {r_val}"
+    
+    def test_shared_scan_matches_per_config_kernel(self, sample_data):
+        """Configs derived from one shared scan equal separate per-config runs"""
+        prices = sample_data['mid_price'].values
+        timestamps_ns = sample_data['timestamp'].values.astype('datetime64[ns]').astype(np.int64)
+        
+        targets = np.array([5.0, 10.0, 20.0])
+        stops = np.array([5.0, 15.0])
+        horizons = [5, 30, 120]
+        horizons_ns = np.array([h * 60 * 1_000_000_000 for h in horizons], dtype=np.int64)
+        
+        scan = label_all_configs_vectorized(prices, timestamps_ns, targets, stops, horizons_ns, 0.0001)
+        
+        for t, target in enumerate(targets):
+            for s, stop in enumerate(stops):
+                for h, horizon in enumerate(horizons):
+                    expected = label_all_candles_vectorized(
+                        prices, timestamps_ns, target, stop, horizons_ns[h], 0.0001
+                    )
+                    derived = _labels_for_config(scan, timestamps_ns, t, s, h)
+                    
+                    for exp, got in zip(expected, derived):
+                        np.testing.assert_allclose(got[:-1], exp[:-1], err_msg=f"T{target}_S{stop}_H{horizon}")
+
+    def test_shared_scan_blocks_match_full_scan(self, sample_data):
+        """Scanning candle blocks and deriving per block equals one full scan"""
+        prices = sample_data['mid_price'].values
+        timestamps_ns = sample_data['timestamp'].values.astype('datetime64[ns]').astype(np.int64)
+
+        targets = np.array([5.0, 10.0])
+        stops = np.array([5.0])
+        horizons_ns = np.array([5, 30], dtype=np.int64) * 60 * 1_000_000_000
+
+        scan = label_all_configs_vectorized(prices, timestamps_ns, targets, stops, horizons_ns, 0.0001)
+        full = _labels_for_config(scan, timestamps_ns, 1, 0, 1)
+
+        blocks = []
+        for start in range(0, len(prices), 300):
+            block_scan = label_all_configs_vectorized(
+                prices, timestamps_ns, targets, stops, horizons_ns, 0.0001, start, start + 300
+            )
+            blocks.append(_labels_for_config(block_scan, timestamps_ns, 1, 0, 1, start))
+
+        for k, column in enumerate(full):
+            np.testing.assert_allclose(np.concatenate([block[k] for block in blocks]), column)
+
+    def test_label_dataframe_blocked_scan(self, sample_data, tmp_path, monkeypatch):
+        """A small scan budget writes the same label files block by block"""
+        monkeypatch.chdir(tmp_path)
+        df = sample_data.iloc[:200]
+        kwargs = dict(target_pips=[5, 10], stop_pips=[5], horizons=[30], use_cache=False,
+                      method="scan", return_dict=True)
+
+        full = label_dataframe(df, **kwargs)
+        for path in (tmp_path / "labels").glob("*.parquet"):
+            path.unlink()
+        blocked = label_dataframe(df, scan_block_mb=0.001, **kwargs)
+
+        assert set(blocked) == set(full)
+        assert not list((tmp_path / "labels").glob("*.tmp"))
+        for key in full:
+            pd.testing.assert_frame_equal(blocked[key], full[key])
+
+    def test_indexed_labeling_matches_scan(self):
+        """First-passage lookups give the same labels as the forward scan"""
+        rng = np.random.default_rng(7)
+        n = 5000
+        prices = 1.1 + np.cumsum(rng.normal(0, 0.00003, n))
+        timestamps_ns = np.cumsum(rng.integers(100, 2000, n)).astype(np.int64) * 1_000_000
+        price_index = build_price_index(prices, block_size=16)
+        
+        for target, stop, horizon in [(5.0, 5.0, 1), (10.0, 5.0, 15), (3.0, 20.0, 60)]:
+            horizon_ns = horizon * 60 * 1_000_000_000
+            expected = label_all_candles_vectorized(prices, timestamps_ns, target, stop, horizon_ns, 0.0001)
+            indexed = label_all_candles_indexed(prices, timestamps_ns, target, stop, horizon_ns, 0.0001,
+                                                price_index)
+            
+            for exp, got in zip(expected, indexed):
+                np.testing.assert_allclose(got[:-1], exp[:-1], err_msg=f"T{target}_S{stop}_H{horizon}")
 
 
 class TestBackwardCompatibility:
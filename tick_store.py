@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - SHARED TICK STORE 💎🌟⚡
+
+Zero-copy tick data shared between processes
+"One crystal, many reflections"
+
+Technical: Tick columns laid out in a single POSIX shared-memory segment
+- Parent loads the dataset once and publishes it by name
+- Workers attach by name and get read-only NumPy views (no pickling, no re-read)
+- Timestamps stored as int64 nanoseconds (UTC)
+
+Usage:
+    # Parent
+    with SharedTickStore.create(df) as store:
+        run_workers(store.name)
+
+    # Worker
+    store = SharedTickStore.attach(name)
+    bid, ask = store.bid, store.ask
+    df = store.to_dataframe()
+"""
+
+import json
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🔧 CONSTANTS
+# ═══════════════════════════════════════════════════════════════
+
+# Segment layout: [8-byte header length][JSON header][aligned column data]
+HEADER_LENGTH_BYTES = 8
+COLUMN_ALIGNMENT = 64
+
+# Column used for timestamps (stored as int64 ns since epoch, UTC)
+TIMESTAMP_COLUMN = "timestamp"
+
+
+def _align(offset):
+    """Round offset up to COLUMN_ALIGNMENT"""
+    return (offset + COLUMN_ALIGNMENT - 1) // COLUMN_ALIGNMENT * COLUMN_ALIGNMENT
+
+
+def _attach_segment(name):
+    """
+    Attach to an existing segment without letting this process own it
+
+    Before Python 3.13 every attach registers the segment with the
+    resource tracker, which unlinks it when the attaching process exits,
+    so registration is skipped for the duration of the attach.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    from multiprocessing import resource_tracker
+    original_register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = original_register
+
+
+# ═══════════════════════════════════════════════════════════════
+# 💎 SHARED TICK STORE
+# ═══════════════════════════════════════════════════════════════
+
+class SharedTickStore:
+    """
+    Read-only tick columns in shared memory
+
+    Only numeric and datetime columns are shared; other columns are skipped.
+    Column arrays returned by this class are views into the segment and
+    are marked read-only.
+    """
+
+    def __init__(self, shm, header, owner):
+        """
+        Use SharedTickStore.create() or SharedTickStore.attach() instead
+
+        Args:
+            shm: SharedMemory segment
+            header: Parsed layout header
+            owner: True if this process created (and must unlink) the segment
+        """
+        self._shm = shm
+        self._header = header
+        self._owner = owner
+        self.n_rows = header["n_rows"]
+        self.arrays = {}
+
+        for col in header["columns"]:
+            arr = np.ndarray(
+                (self.n_rows,),
+                dtype=np.dtype(col["dtype"]),
+                buffer=shm.buf,
+                offset=col["offset"]
+            )
+            arr.flags.writeable = False
+            self.arrays[col["name"]] = arr
+
+    @classmethod
+    def create(cls, df, columns=None, name=None):
+        """
+        Copy DataFrame columns into a new shared-memory segment
+
+        Args:
+            df: Tick DataFrame
+            columns: Columns to share (default: all numeric/datetime columns)
+            name: Segment name (default: generated by the OS)
+
+        Returns:
+            SharedTickStore: Owning store (call unlink() when done)
+        """
+        if columns is None:
+            columns = list(df.columns)
+
+        # Resolve columns to contiguous numpy arrays
+        sources = []
+        for col in columns:
+            series = df[col]
+            if pd.api.types.is_datetime64_any_dtype(series.dtype):
+                if getattr(series.dt, "tz", None) is not None:
+                    series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+                values = series.values.astype("datetime64[ns]").view(np.int64)
+                kind = "datetime"
+            elif pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+                values = series.to_numpy()
+                kind = "numeric"
+            else:
+                continue
+            sources.append((col, values, kind))
+
+        n_rows = len(df)
+
+        header = {
+            "n_rows": n_rows,
+            "columns": [
+                {"name": col, "dtype": values.dtype.str, "kind": kind, "offset": 0}
+                for col, values, kind in sources
+            ]
+        }
+
+        # Offsets only add digits (at most 20 per column) once filled in
+        reserved = len(json.dumps(header).encode()) + 20 * len(sources)
+        data_start = _align(HEADER_LENGTH_BYTES + reserved)
+        offset = data_start
+        for meta, (col, values, kind) in zip(header["columns"], sources):
+            meta["offset"] = offset
+            offset = _align(offset + values.nbytes)
+        total_size = max(offset, data_start + 1)
+
+        header_bytes = json.dumps(header).encode()
+        shm = shared_memory.SharedMemory(name=name, create=True, size=total_size)
+        shm.buf[:HEADER_LENGTH_BYTES] = len(header_bytes).to_bytes(HEADER_LENGTH_BYTES, "little")
+        shm.buf[HEADER_LENGTH_BYTES:HEADER_LENGTH_BYTES + len(header_bytes)] = header_bytes
+
+        for (col, values, kind), meta in zip(sources, header["columns"]):
+            dest = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf, offset=meta["offset"])
+            dest[:] = values
+            del dest
+
+        return cls(shm, header, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Attach to a store created by another process
+
+        Args:
+            name: Segment name (SharedTickStore.name of the creator)
+
+        Returns:
+            SharedTickStore: Non-owning, read-only store
+        """
+        shm = _attach_segment(name)
+        header_len = int.from_bytes(bytes(shm.buf[:HEADER_LENGTH_BYTES]), "little")
+        header = json.loads(bytes(shm.buf[HEADER_LENGTH_BYTES:HEADER_LENGTH_BYTES + header_len]))
+        return cls(shm, header, owner=False)
+
+    @property
+    def name(self):
+        """Segment name workers pass to attach()"""
+        return self._shm.name
+
+    @property
+    def columns(self):
+        """Shared column names"""
+        return list(self.arrays.keys())
+
+    @property
+    def timestamps_ns(self):
+        """Timestamps as int64 nanoseconds (UTC)"""
+        return self.arrays.get(TIMESTAMP_COLUMN)
+
+    @property
+    def bid(self):
+        return self.arrays.get("bid")
+
+    @property
+    def ask(self):
+        return self.arrays.get("ask")
+
+    @property
+    def mid(self):
+        return self.arrays.get("mid_price")
+
+    def to_dataframe(self, columns=None):
+        """
+        Build a DataFrame over the shared columns
+
+        Numeric columns are zero-copy views; the timestamp column is
+        materialized as a tz-aware (UTC) datetime column.
+
+        Args:
+            columns: Subset of columns (default: all)
+
+        Returns:
+            pd.DataFrame
+        """
+        kinds = {col["name"]: col["kind"] for col in self._header["columns"]}
+        data = {}
+        for col in (columns or self.columns):
+            values = self.arrays[col]
+            if kinds[col] == "datetime":
+                data[col] = pd.to_datetime(values, unit="ns", utc=True)
+            else:
+                data[col] = values
+        return pd.DataFrame(data, copy=False)
+
+    def close(self):
+        """Detach from the segment (views become invalid)"""
+        self.arrays = {}
+        try:
+            self._shm.close()
+        except BufferError:
+            # Views still referenced elsewhere; the mapping is released at exit
+            pass
+
+    def unlink(self):
+        """Close and destroy the segment (creator only)"""
+        self.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._owner:
+            self.unlink()
+        else:
+            self.close()
+
+    def __len__(self):
+        return self.n_rows
+
+    def __repr__(self):
+        return f"SharedTickStore(name='{self.name}', rows={self.n_rows:,}, columns={self.columns})"
+
+
+# ═══════════════════════════════════════════════════════════════
+# 👷 WORKER-SIDE ACCESS
+# ═══════════════════════════════════════════════════════════════
+
+_worker_store = None
+_worker_df = None
+
+
+def init_worker_store(name):
+    """
+    Pool initializer: attach this worker to a shared tick store
+
+    Args:
+        name: Segment name from SharedTickStore.name
+    """
+    global _worker_store, _worker_df
+    _worker_store = SharedTickStore.attach(name)
+    _worker_df = None
+
+
+def get_worker_dataframe():
+    """
+    DataFrame view of the store attached by init_worker_store
+
+    Built once per worker and reused across tasks.
+    """
+    global _worker_df
+    if _worker_store is None:
+        raise RuntimeError("No shared tick store attached (call init_worker_store first)")
+    if _worker_df is None:
+        _worker_df = _worker_store.to_dataframe()
+    return _worker_df
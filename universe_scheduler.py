@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡🌟💎 ULTRA NECROZMA - UNIVERSE SCHEDULER 💎🌟⚡
+
+Groups universes by interval so every lookback shares one bar set
+"One turn of the hourglass for every depth of the prism"
+
+Technical: (interval, lookback) universes scheduled per interval group
+- Bars of every interval are built from a single tick scan up front
+  (OHLCCache.warm); coarser intervals can be derived from finer ones
+- Per interval, the OHLC candles and movement targets are computed once
+  (IntervalBars) and every lookback filters the shared targets
+- Each process keeps the IntervalBars of the intervals it has seen (keyed
+  by tick content, bounded LRU), so pool workers resample and scan an
+  interval at most once
+- Work is ordered longest-first (estimated cost ~ bars × lookback) so the
+  largest universes start first and small ones fill the pool at the end
+
+Usage:
+    schedule = schedule_universes(configs)
+    bars = get_interval_bars(df, interval, base_lookback=5)
+    result = process_universe(df, interval, lookback, name, bars=bars)
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from config import MIN_SAMPLES
+
+
+# ═══════════════════════════════════════════════════════════════
+# 📅 PLANNING
+# ═══════════════════════════════════════════════════════════════
+
+def group_by_interval(configs: Sequence[dict]) -> "OrderedDict[int, List[dict]]":
+    """
+    Universe configs grouped by interval (first-seen order)
+
+    Args:
+        configs: Universe configs with 'interval', 'lookback' and 'name'
+
+    Returns:
+        OrderedDict: {interval: [configs]} with lookbacks ascending
+    """
+    groups: "OrderedDict[int, List[dict]]" = OrderedDict()
+    for config in configs:
+        groups.setdefault(int(config["interval"]), []).append(config)
+    for interval in groups:
+        groups[interval].sort(key=lambda c: c["lookback"])
+    return groups
+
+
+def estimate_cost(config: dict, bar_counts: Optional[Dict[int, int]] = None) -> float:
+    """
+    Relative cost of a universe: candles × lookback
+
+    Args:
+        config: Universe config
+        bar_counts: Optional {interval: number of candles}; without it the
+            candle count is taken as proportional to 1 / interval
+
+    Returns:
+        float: Cost estimate (only comparable within one schedule)
+    """
+    interval = int(config["interval"])
+    if bar_counts and interval in bar_counts:
+        n_bars = bar_counts[interval]
+    else:
+        n_bars = 1.0 / interval
+    return n_bars * config["lookback"]
+
+
+def schedule_universes(
+    configs: Sequence[dict],
+    bar_counts: Optional[Dict[int, int]] = None
+) -> List[dict]:
+    """
+    Universe configs in execution order for a worker pool (longest first)
+
+    Each config gets a 'base_lookback': the smallest lookback of its
+    interval group, whose movement targets the whole group shares.
+
+    Args:
+        configs: Universe configs
+        bar_counts: Optional {interval: number of candles} for the estimate
+
+    Returns:
+        list: Config copies sorted by descending estimated cost (ties keep
+        interval-group order)
+    """
+    scheduled = []
+    for interval, group in group_by_interval(configs).items():
+        base_lookback = group[0]["lookback"]
+        for config in group:
+            scheduled.append({**config, "base_lookback": base_lookback})
+    scheduled.sort(key=lambda c: -estimate_cost(c, bar_counts))
+    return scheduled
+
+
+# ═══════════════════════════════════════════════════════════════
+# 🕐 SHARED INTERVAL BARS
+# ═══════════════════════════════════════════════════════════════
+
+class IntervalBars:
+    """
+    OHLC candles and movement targets of one interval, shared by lookbacks
+
+    Movement targets of a lookback are the targets of the base (smallest)
+    lookback whose candle index is at least the lookback, so they are
+    found once per interval and filtered per universe.
+    """
+
+    def __init__(self, ohlc, interval: int, base_lookback: int):
+        """
+        Initialize shared bars
+
+        Args:
+            ohlc: OHLC DataFrame (data_loader.resample_to_ohlc)
+            interval: Candle interval in minutes
+            base_lookback: Smallest lookback that will use these bars
+        """
+        from analyzer import get_movement_targets
+
+        self.ohlc = ohlc
+        self.interval = int(interval)
+        # Windows shorter than MIN_SAMPLES never produce targets
+        self.base_lookback = max(int(base_lookback), MIN_SAMPLES)
+        self._targets = get_movement_targets(ohlc, self.base_lookback, include_window_data=False)
+
+    def targets(self, lookback: int) -> dict:
+        """
+        Movement targets for a lookback (as get_movement_targets)
+
+        Args:
+            lookback: Lookback in candles, at least base_lookback
+
+        Returns:
+            dict: Targets organized by level and direction
+        """
+        if lookback < self.base_lookback:
+            if lookback < MIN_SAMPLES:
+                return {level: {d: [] for d in dirs} for level, dirs in self._targets.items()}
+            raise ValueError(
+                f"❌ Lookback {lookback} is below the shared base lookback {self.base_lookback}"
+            )
+        return {
+            level: {
+                direction: [t for t in target_list if t["index"] >= lookback]
+                for direction, target_list in directions.items()
+            }
+            for level, directions in self._targets.items()
+        }
+
+
+# Per-process IntervalBars, keyed by (tick content token, interval), least
+# recently used first
+_interval_bars: "OrderedDict[tuple, IntervalBars]" = OrderedDict()
+
+
+def get_interval_bars(df, interval: int, base_lookback: int) -> IntervalBars:
+    """
+    Shared bars of an interval for this process, built on first use
+
+    Bars are keyed by the content of the ticks (ohlc_cache.tick_data_token),
+    so a re-sent copy of the same data reuses them. At most
+    CACHE_CONFIG["ohlc_memory_entries"] intervals are kept.
+
+    Args:
+        df: Tick DataFrame
+        interval: Candle interval in minutes
+        base_lookback: Smallest lookback of the interval group
+
+    Returns:
+        IntervalBars
+    """
+    from config import CACHE_CONFIG
+    from data_loader import resample_to_ohlc
+    from ohlc_cache import DEFAULT_MEMORY_ENTRIES, default_ohlc_cache, tick_data_token
+
+    key = (tick_data_token(df), int(interval))
+    bars = _interval_bars.get(key)
+    if bars is None or bars.base_lookback > max(base_lookback, MIN_SAMPLES):
+        ohlc = resample_to_ohlc(df, interval, cache=default_ohlc_cache())
+        bars = IntervalBars(ohlc, interval, base_lookback)
+        _interval_bars[key] = bars
+    _interval_bars.move_to_end(key)
+    while len(_interval_bars) > max(CACHE_CONFIG.get("ohlc_memory_entries", DEFAULT_MEMORY_ENTRIES), 1):
+        _interval_bars.popitem(last=False)
+    return bars
+
+
+def release_interval_bars(interval: Optional[int] = None):
+    """
+    Drop shared bars held by this process
+
+    Args:
+        interval: Only this interval (default: all)
+    """
+    for key in [k for k in _interval_bars if interval is None or k[-1] == int(interval)]:
+        del _interval_bars[key]
+
+
+def warm_bars(df, intervals: Sequence[int]) -> Dict[int, int]:
+    """
+    Build the bars of all intervals from one tick scan (OHLC cache)
+
+    Args:
+        df: Tick DataFrame
+        intervals: Intervals in minutes
+
+    Returns:
+        dict: {interval: number of candles}, empty when caching is disabled
+        (CACHE_CONFIG["enabled"]); bars stay in this process's memory and
+        reach disk only with CACHE_CONFIG["cache_ohlc"]
+    """
+    from ohlc_cache import default_ohlc_cache
+
+    cache = default_ohlc_cache()
+    if cache is None:
+        return {}
+    cache.warm(intervals, tick_data=df)
+    return {int(i): len(cache.get_bars(i, tick_data=df)) for i in intervals}
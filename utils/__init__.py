@@ -8,6 +8,8 @@ __all__ = [
     'CheckpointManager',
     'get_cache_manager',
     'get_checkpoint_manager',
+    'SignalCache',
+    'dataframe_fingerprint',
     'parallel_map',
     'parallel_starmap',
     'PersistentPool',
@@ -15,10 +15,14 @@ Technical: Disk-based caching and checkpointing
 import hashlib
 import json
 import pickle
+from collections import OrderedDict
 from pathlib import Path
 from functools import wraps
 import time
 
+import numpy as np
+import pandas as pd
+
 try:
     from joblib import Memory, dump, load
     JOBLIB_AVAILABLE = True
@@ -270,6 +274,126 @@ class CheckpointManager:
             self.delete_checkpoint(checkpoint["name"])
 
 
+# ═══════════════════════════════════════════════════════════════
+# 📡 SIGNAL CACHE
+# ═══════════════════════════════════════════════════════════════
+
+def dataframe_fingerprint(df):
+    """
+    Content fingerprint of a DataFrame
+    
+    Hashes shape, columns, dtypes and every row including the index, so
+    any edited value (also in place) or differing row changes it. Callers
+    that reuse one df for many lookups should compute it once.
+    
+    Args:
+        df: DataFrame to fingerprint
+        
+    Returns:
+        str: MD5 hex digest
+    """
+    h = hashlib.md5()
+    h.update(str(df.shape).encode())
+    h.update(str(list(zip(df.columns, df.dtypes.astype(str)))).encode())
+    
+    if len(df) > 0:
+        h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    
+    return h.hexdigest()
+
+
+class SignalCache:
+    """
+    In-memory LRU cache of strategy signal series
+    
+    Strategies generated from the same template often differ only in
+    execution params (SL/TP), so their signals are identical. Entries are
+    keyed by (template class, signal params, dataframe fingerprint) and
+    stored as int8 arrays; least recently used entries are evicted once
+    the cache exceeds max_mb.
+    
+    Usage:
+        cache = SignalCache(max_mb=256)
+        signals = cache.get_signals(strategy, df)
+    """
+    
+    def __init__(self, max_mb=256):
+        """
+        Initialize signal cache
+        
+        Args:
+            max_mb: Memory budget for cached signal arrays in MB
+        """
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+    
+    def make_key(self, strategy, df_fingerprint):
+        """Create cache key, or None if the strategy can't declare its signal params"""
+        signal_params = getattr(strategy, "signal_params", None)
+        if signal_params is None:
+            return None
+        
+        cls = type(strategy)
+        params_str = json.dumps(signal_params(), sort_keys=True, default=str)
+        return (f"{cls.__module__}.{cls.__qualname__}", params_str, df_fingerprint)
+    
+    def get_signals(self, strategy, df, df_fingerprint=None):
+        """
+        Get signals for strategy on df, generating them on a cache miss
+        
+        Args:
+            strategy: Strategy object with generate_signals method
+            df: DataFrame passed to generate_signals
+            df_fingerprint: Precomputed dataframe_fingerprint(df) (optional)
+            
+        Returns:
+            pd.Series: Signals (1=buy, -1=sell, 0=neutral) indexed like df
+        """
+        if df_fingerprint is None:
+            df_fingerprint = dataframe_fingerprint(df)
+        
+        key = self.make_key(strategy, df_fingerprint)
+        if key is None:
+            return strategy.generate_signals(df)
+        
+        values = self._entries.get(key)
+        if values is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return pd.Series(values, index=df.index)
+        
+        self.misses += 1
+        signals = strategy.generate_signals(df)
+        values = np.asarray(signals, dtype=np.int8)
+        values.setflags(write=False)  # Shared between strategies
+        self._put(key, values)
+        
+        return pd.Series(values, index=df.index)
+    
+    def _put(self, key, values):
+        """Insert an entry and evict LRU entries beyond the memory budget"""
+        if values.nbytes > self.max_bytes:
+            return
+        
+        self._entries[key] = values
+        self.current_bytes += values.nbytes
+        
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.nbytes
+    
+    def clear(self):
+        """Drop all cached signals"""
+        self._entries.clear()
+        self.current_bytes = 0
+    
+    def __len__(self):
+        return len(self._entries)
+
+
 # ═══════════════════════════════════════════════════════════════
 # 🔧 CONFIG HASHING
 # ═══════════════════════════════════════════════════════════════
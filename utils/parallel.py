@@ -15,7 +15,7 @@ Technical: Enhanced multiprocessing utilities
 
 import numpy as np
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
-from multiprocessing import Pool, cpu_count
+from multiprocessing import cpu_count, get_context
 import psutil
 from .thermal_protection import get_cpu_temperature, check_thermal_status, ThermalMonitor
 
@@ -189,19 +189,30 @@ class PersistentPool:
     Avoids overhead of creating/destroying pool
     """
     
-    def __init__(self, n_workers=None):
+    def __init__(self, n_workers=None, initializer=None, initargs=(), start_method=None):
         """
         Initialize persistent pool
         
         Args:
             n_workers: Number of workers (default: CPU count)
+            initializer: Called once in each worker on startup (e.g. to
+                receive a dataset instead of pickling it with every task)
+            initargs: Arguments for initializer
+            start_method: 'fork', 'spawn' or 'forkserver' (default: platform default)
         """
         self.n_workers = n_workers or cpu_count()
+        self.initializer = initializer
+        self.initargs = initargs
+        self.start_method = start_method
         self.pool = None
     
     def __enter__(self):
         """Enter context manager"""
-        self.pool = Pool(processes=self.n_workers)
+        self.pool = get_context(self.start_method).Pool(
+            processes=self.n_workers,
+            initializer=self.initializer,
+            initargs=self.initargs
+        )
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -232,6 +243,23 @@ class PersistentPool:
         
         return self.pool.map(func, items, chunksize=chunk_size)
     
+    def imap(self, func, items, chunk_size=1):
+        """
+        Lazily map function over items, yielding results in order as they finish
+        
+        Args:
+            func: Function to apply
+            items: Items to process
+            chunk_size: Items sent to a worker per dispatch
+            
+        Returns:
+            iterator: Results
+        """
+        if not self.pool:
+            raise RuntimeError("Pool not initialized. Use 'with' statement.")
+        
+        return self.pool.imap(func, items, chunksize=chunk_size)
+    
     def starmap(self, func, args_list, chunk_size=None):
         """
         Starmap function over argument lists